@@ -0,0 +1,22 @@
+"""
+Benchmarks of the hot paths of mtpy on the example data, run with
+pytest-benchmark (pip install pytest-benchmark).  They are kept out of
+tests/ so the regression tests stay fast.
+
+Save a baseline, for example before a release, into benchmarks/.baselines ::
+
+    pytest benchmarks --benchmark-save=baseline
+
+then compare a later run against the latest saved baseline and fail if the
+mean time of any benchmark got more than 20% slower ::
+
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+
+Baselines are specific to the machine they were saved on, so only compare
+runs made on the same machine.  For the same reason benchmarks/.baselines
+is ignored by git.
+"""
+import os
+
+BENCHMARK_DIR = os.path.normpath(os.path.abspath(os.path.dirname(__file__)))
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, '.baselines')
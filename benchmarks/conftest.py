@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks import BASELINE_DIR
+
+_DEFAULT_STORAGE = 'file://./.benchmarks'
+
+
+def pytest_configure(config):
+    # keep the baselines with the benchmarks whatever directory pytest is
+    # run from, unless another storage is asked for
+    if getattr(config.option, 'benchmark_storage', None) == _DEFAULT_STORAGE:
+        config.option.benchmark_storage = 'file://' + BASELINE_DIR
+
+
+@pytest.fixture(scope='module')
+def bench_dir(tmp_path_factory):
+    """
+    directory for the files written by the benchmarks of a module
+    """
+    return str(tmp_path_factory.mktemp('benchmarks'))
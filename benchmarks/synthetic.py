@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Make inputs of a given size for the benchmarks from the bundled example data,
+so the run time can be followed as the number of stations, periods, grid
+cells or samples grows.  Everything is seeded so each run times the same
+inputs.
+"""
+import os
+import struct
+
+import numpy as np
+
+import mtpy.core.mt as mt
+import mtpy.core.z as mtz
+from tests import TEST_MTPY_ROOT, SAMPLE_DIR
+
+DATA_EDI_DIR = os.path.join(TEST_MTPY_ROOT, 'data', 'edifiles')
+MODEM_DATA_FN = os.path.join(SAMPLE_DIR, 'ModEM', 'ModEM_Data.dat')
+MODEM_MODEL_FN = os.path.join(SAMPLE_DIR, 'ModEM', 'ModEM_Model_File.rho')
+
+
+def make_z(n_periods, seed=0):
+    """
+    make a Z object of n_periods with a 1D response and some noise
+    """
+    random_state = np.random.RandomState(seed)
+    freq = np.logspace(3, -3, n_periods)
+    z_array = np.zeros((n_periods, 2, 2), dtype=complex)
+    z_array[:, 0, 1] = (1 + 1j) * np.sqrt(freq)
+    z_array[:, 1, 0] = -z_array[:, 0, 1]
+    z_array += 0.05 * (random_state.randn(n_periods, 2, 2) +
+                       1j * random_state.randn(n_periods, 2, 2)) * \
+        np.sqrt(freq)[:, None, None]
+    z_err_array = 0.05 * np.abs(z_array)
+
+    return mtz.Z(z_array=z_array, z_err_array=z_err_array, freq=freq)
+
+
+def write_edi_files(save_dir, n_stations, n_periods, edi_dir=DATA_EDI_DIR):
+    """
+    write n_stations edi files of n_periods each by interpolating the
+    example edi files, returns the list of file names
+    """
+    edi_list = sorted([os.path.join(edi_dir, fn) for fn in os.listdir(edi_dir)
+                       if fn.endswith('.edi')])
+    new_freq = None
+    fn_list = []
+    for ii in range(n_stations):
+        mt_obj = mt.MT(edi_list[ii % len(edi_list)])
+        if new_freq is None:
+            new_freq = np.logspace(np.log10(mt_obj.Z.freq.max()),
+                                   np.log10(mt_obj.Z.freq.min()), n_periods)
+        new_z, new_tipper = mt_obj.interpolate(new_freq, bounds_error=False)
+        mt_obj.station = 'syn{0:04}'.format(ii)
+        fn_list.append(mt_obj.write_mt_file(save_dir=save_dir,
+                                            fn_basename=mt_obj.station,
+                                            new_Z_obj=new_z,
+                                            new_Tipper_obj=new_tipper))
+
+    return fn_list
+
+
+def make_modem_data(n_stations, data_fn=MODEM_DATA_FN):
+    """
+    make a ModEM Data object of n_stations by repeating the stations of the
+    example data file on a grid shifted by 10 km
+    """
+    import mtpy.modeling.modem as modem
+
+    modem_data = modem.Data()
+    modem_data.read_data_file(data_fn)
+
+    base_array = modem_data.data_array
+    index = np.arange(n_stations) % base_array.size
+    shift = 10000. * (np.arange(n_stations) // base_array.size)
+    data_array = base_array[index].copy()
+    data_array['station'] = ['syn{0:04}'.format(ii) for ii in range(n_stations)]
+    data_array['rel_east'] += shift
+    data_array['rel_north'] += shift
+    modem_data.data_array = data_array
+
+    return modem_data
+
+
+def make_modem_model(n_north, n_east, n_z, seed=0):
+    """
+    make a ModEM Model of n_north x n_east x n_z cells with a random
+    resistivity between 1 and 10000 Ohm-m
+    """
+    import mtpy.modeling.modem as modem
+
+    random_state = np.random.RandomState(seed)
+    nodes_z = np.round(10 * 1.2 ** np.arange(n_z))
+    return modem.Model(nodes_north=np.repeat(500., n_north),
+                       nodes_east=np.repeat(500., n_east),
+                       nodes_z=nodes_z,
+                       res_model=10 ** random_state.uniform(0, 4, (n_north,
+                                                                   n_east,
+                                                                   n_z)))
+
+
+def write_z3d_file(fn, n_seconds, df=256, seed=0):
+    """
+    write a Z3D file of n_seconds of random data sampled at df with a GPS
+    stamp before each second, in the layout read by zen.Zen3D.read_z3d
+    """
+    random_state = np.random.RandomState(seed)
+
+    header_lines = ['GPS Brd339 Logfile',
+                    'Version = 4147',
+                    'Main.hex Buildnum = 5357',
+                    'ChannelSerial = 0xD474777C',
+                    'Fpga Buildnum = 1125',
+                    'Box number = 24',
+                    'Box Serial = 0x0000010000A8FD71',
+                    'Channel = 1',
+                    'A/D Rate = {0}'.format(df),
+                    'A/D Gain = 1',
+                    'Period = 4294967295',
+                    'Duty = 32767',
+                    'LAT = 0.7080144',
+                    'LONG = -2.0542917',
+                    'ALT = 1000.000',
+                    'NumSats = 12',
+                    'GpsWeek = 2056']
+    schedule_lines = ['Schedule.Date = 2019-06-01',
+                      'Schedule.Time = 00:00:00',
+                      'Schedule.Sync = Y',
+                      'Schedule.NewFile = Y',
+                      'Schedule.S/R = {0}'.format(df)]
+    metadata_lines = ['GPS Brd339/Brd357 Metadata Record',
+                      '|CH.CMP=ex|CH.AZIMUTH=0|CH.LENGTH=100|RX.STN=syn01|'
+                      'CH.NUMBER=1|']
+
+    def _block(lines):
+        block = '\n'.join(lines + ['']).encode()
+        return block + b'\x00' * (512 - len(block))
+
+    # a gps stamp is 16 int32: 2 flags, time in 1/1024 s, lat, lon as float64
+    # then the status values
+    stamp = np.zeros((n_seconds, 16), dtype=np.int32)
+    stamp[:, 0] = 2147483647
+    stamp[:, 1] = -2147483648
+    stamp[:, 2] = (100000 + np.arange(n_seconds)) * 1024
+    lat_lon = np.frombuffer(struct.pack('<2d', 0.7080144, -2.0542917),
+                            dtype=np.int32)
+    stamp[:, 3:7] = lat_lon
+    stamp[:, 7:9] = 12
+    stamp[:, 9:15] = 1
+
+    # the data can not be 0 or a gps flag
+    data = random_state.randint(-2 ** 20, 2 ** 20, (n_seconds, df))
+    data[data == 0] = 1
+    blocks = np.hstack([stamp, data.astype(np.int32)])
+
+    with open(fn, 'wb') as fid:
+        fid.write(_block(header_lines))
+        fid.write(_block(schedule_lines))
+        fid.write(_block(metadata_lines))
+        fid.write(blocks.tobytes())
+
+    return fn
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK reading edi files and computing resistivity, phase and phase tensors
+"""
+import os
+
+import pytest
+
+import mtpy.analysis.pt as mtpt
+from benchmarks import synthetic
+from mtpy.core.edi import Edi
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(scope='module', params=[30, 300])
+def edi_fn(request, bench_dir):
+    save_dir = os.path.join(bench_dir, 'edi_{0}'.format(request.param))
+    os.mkdir(save_dir)
+    return synthetic.write_edi_files(save_dir, 1, request.param)[0]
+
+
+@pytest.mark.benchmark(group='Edi.read_edi_file')
+def test_read_edi_file(benchmark, edi_fn):
+    edi_obj = benchmark(Edi, edi_fn)
+    assert edi_obj.Z.z.shape[1:] == (2, 2)
+
+
+@pytest.mark.benchmark(group='Edi.read_edi_file')
+def test_read_example_edi_files(benchmark):
+    edi_list = sorted([os.path.join(synthetic.DATA_EDI_DIR, fn)
+                       for fn in os.listdir(synthetic.DATA_EDI_DIR)
+                       if fn.endswith('.edi')])
+    edi_obj_list = benchmark(lambda: [Edi(fn) for fn in edi_list])
+    assert len(edi_obj_list) == len(edi_list)
+
+
+@pytest.mark.benchmark(group='Z.compute_resistivity_phase')
+@pytest.mark.parametrize('n_periods', [100, 1000])
+def test_compute_resistivity_phase(benchmark, n_periods):
+    z_obj = synthetic.make_z(n_periods)
+    benchmark(z_obj.compute_resistivity_phase)
+    assert z_obj.resistivity.shape == (n_periods, 2, 2)
+
+
+@pytest.mark.benchmark(group='PhaseTensor')
+@pytest.mark.parametrize('n_periods', [100, 1000])
+def test_phase_tensor(benchmark, n_periods):
+    z_obj = synthetic.make_z(n_periods)
+    pt_obj = benchmark(mtpt.PhaseTensor, z_object=z_obj)
+    assert pt_obj.phimax.shape == (n_periods,)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK writing and reading ModEM data and model files
+"""
+import os
+
+import pytest
+
+import mtpy.modeling.modem as modem
+from benchmarks import synthetic
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(scope='module', params=[20, 100])
+def modem_data(request):
+    return synthetic.make_modem_data(request.param)
+
+
+@pytest.fixture(scope='module')
+def modem_data_fn(modem_data, bench_dir):
+    fn_basename = 'ModEM_Data_{0}.dat'.format(modem_data.data_array.size)
+    modem_data.write_data_file(save_path=bench_dir, fn_basename=fn_basename,
+                               compute_error=False, fill=False,
+                               elevation=True)
+    return os.path.join(bench_dir, fn_basename)
+
+
+@pytest.fixture(scope='module', params=[(40, 40, 30), (100, 100, 50)],
+                ids=lambda shape: 'x'.join(str(nn) for nn in shape))
+def modem_model_fn(request, bench_dir):
+    modem_model = synthetic.make_modem_model(*request.param)
+    fn_basename = 'ModEM_Model_{0}.rho'.format(request.param[0])
+    modem_model.write_model_file(save_path=bench_dir,
+                                 model_fn_basename=fn_basename)
+    return modem_model.model_fn
+
+
+def _read_data_file(data_fn):
+    modem_data = modem.Data()
+    modem_data.read_data_file(data_fn)
+    return modem_data
+
+
+def _read_model_file(model_fn):
+    modem_model = modem.Model()
+    modem_model.read_model_file(model_fn)
+    return modem_model
+
+
+@pytest.mark.benchmark(group='modem.Data.write_data_file')
+def test_write_data_file(benchmark, modem_data, bench_dir):
+    benchmark(modem_data.write_data_file, save_path=bench_dir,
+              fn_basename='ModEM_Data_write.dat', compute_error=False,
+              fill=False, elevation=True)
+
+
+@pytest.mark.benchmark(group='modem.Data.read_data_file')
+def test_read_data_file(benchmark, modem_data_fn):
+    modem_data = benchmark(_read_data_file, modem_data_fn)
+    assert len(modem_data.mt_dict) == modem_data.data_array.size
+
+
+@pytest.mark.benchmark(group='modem.Data.read_data_file')
+def test_read_example_data_file(benchmark):
+    benchmark(_read_data_file, synthetic.MODEM_DATA_FN)
+
+
+@pytest.mark.benchmark(group='modem.Model.read_model_file')
+def test_read_model_file(benchmark, modem_model_fn):
+    modem_model = benchmark(_read_model_file, modem_model_fn)
+    assert modem_model.res_model.ndim == 3
+
+
+@pytest.mark.benchmark(group='modem.Model.read_model_file')
+def test_read_example_model_file(benchmark):
+    benchmark(_read_model_file, synthetic.MODEM_MODEL_FN)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK reading Z3D files
+"""
+import os
+
+import pytest
+
+import mtpy.usgs.zen as zen
+from benchmarks import synthetic
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.fixture(scope='module', params=[64, 1024])
+def z3d_fn(request, bench_dir):
+    return synthetic.write_z3d_file(
+        os.path.join(bench_dir, 'syn_{0}_256_EX.Z3D'.format(request.param)),
+        request.param)
+
+
+def _read_z3d(z3d_fn):
+    z3d_obj = zen.Zen3D(z3d_fn)
+    z3d_obj.read_z3d()
+    return z3d_obj
+
+
+@pytest.mark.benchmark(group='zen.Zen3D.read_z3d')
+def test_read_z3d(benchmark, z3d_fn):
+    z3d_obj = benchmark(_read_z3d, z3d_fn)
+    assert z3d_obj.ts_obj.ts.data.size == z3d_obj.gps_stamps.size * 256
@@ -0,0 +1,72 @@
+#!/bin/env python
+"""
+Description:
+    Benchmark writing and reading a ModEM covariance file with a
+    300 x 300 x 120 mask (air, ocean and earth cells) against formatting the
+    mask one cell at a time, and check that the files are byte-identical.
+References:
+
+CreationDate:   18/10/26
+
+Revision History:
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from mtpy.modeling.modem import Covariance
+
+
+n_north, n_east, n_z = 300, 300, 120
+
+
+def write_mask_lines(mask_arr):
+    # mask lines formatted one cell at a time
+    clines = []
+    write_mask_arr = mask_arr[::-1, :, :].copy()
+    for zz in range(mask_arr.shape[2]):
+        clines.append(' {0:<8.0f}{0:<8.0f}\n'.format(zz + 1))
+        for nn in range(mask_arr.shape[0]):
+            cline = ''
+            for ee in range(mask_arr.shape[1]):
+                cline += '{0:^3.0f}'.format(write_mask_arr[nn, ee, zz])
+            clines.append(cline + '\n')
+    return ''.join(clines)
+
+
+if __name__ == '__main__':
+    # topography-like mask: air above a smooth surface, ocean in the west
+    east, north = np.meshgrid(np.linspace(-1, 1, n_east),
+                              np.linspace(-1, 1, n_north))
+    surface = (10 + 8 * np.sin(3 * east) * np.cos(2 * north)).astype(int)
+    mask_arr = np.ones((n_north, n_east, n_z))
+    mask_arr[np.arange(n_z) < surface[:, :, np.newaxis]] = 0
+    mask_arr[(east[:, :, np.newaxis] < -0.6) &
+             (np.arange(n_z) >= surface[:, :, np.newaxis]) &
+             (np.arange(n_z) < surface[:, :, np.newaxis] + 3)] = 9
+
+    cov_fn = os.path.join(tempfile.mkdtemp(), 'covariance.cov')
+    cov = Covariance(grid_dimensions=mask_arr.shape)
+    cov.mask_arr = mask_arr
+
+    st = time.time()
+    cov.write_covariance_file(cov_fn=cov_fn)
+    print('write_covariance_file: {0:.2f} s'.format(time.time() - st))
+
+    st = time.time()
+    reference = write_mask_lines(mask_arr)
+    print('cell by cell mask formatting: {0:.2f} s'.format(time.time() - st))
+
+    with open(cov_fn, 'r') as fid:
+        print('byte-identical mask: {0}'.format(
+            fid.read().endswith(reference)))
+
+    st = time.time()
+    cov_read = Covariance()
+    cov_read.read_cov_file(cov_fn)
+    print('read_cov_file: {0:.2f} s'.format(time.time() - st))
+    print('mask read back: {0}'.format(
+        np.all(cov_read.mask_arr == mask_arr[::-1])))
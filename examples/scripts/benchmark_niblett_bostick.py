@@ -0,0 +1,82 @@
+#!/bin/env python
+"""
+Description:
+    Benchmark the Niblett-Bostick depth transforms in
+    mtpy.analysis.niblettbostick for a survey.  The example edi files are
+    repeated to make a survey of n_stations on a common period axis and
+    the depths are computed station by station with calculate_depth_nb and
+    for the whole (n_stations, n_periods, 2, 2) stack with
+    calculate_depth_nb_array.  The rotation sweep of calculate_rho_minmax is
+    timed against rotating one tensor at a time for a few stations.
+References:
+
+CreationDate:   18/10/26
+
+Revision History:
+"""
+
+import glob
+import os
+import time
+
+import numpy as np
+
+import mtpy.analysis.niblettbostick as mtnb
+import mtpy.utils.calculator as mtcc
+from mtpy.core.mt import MT
+
+
+n_stations = 500
+n_loop_stations = 2
+
+
+def loop_rho_minmax(z_array, periods, rotsteps=360):
+    # rotate one tensor at a time for every angle
+    rotangles = np.arange(rotsteps) * 180. / rotsteps
+    for z_curr, per in zip(z_array, periods):
+        for angle in rotangles:
+            new_z = mtcc.rotatematrix_incl_errors(z_curr, angle)[0]
+            res = 0.2 * np.abs(new_z) ** 2 * per
+            phs = np.rad2deg(np.angle(new_z))
+            mtnb.rhophi2rhodepth(res[0, 1], phs[0, 1], per)
+            mtnb.rhophi2rhodepth(res[1, 0], phs[1, 0], per)
+
+
+if __name__ == '__main__':
+    edi_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', 'data', 'edi_files')
+    mt_list = [MT(fn) for fn in sorted(glob.glob(os.path.join(edi_path,
+                                                              '*.edi')))]
+    nf = min([mt_obj.Z.freq.size for mt_obj in mt_list])
+    periods = 1. / mt_list[0].Z.freq[:nf]
+
+    z_list = [mt_list[ii % len(mt_list)].Z.z[:nf] for ii in range(n_stations)]
+    z_array = np.array(z_list)
+
+    t0 = time.time()
+    for z in z_list:
+        mtnb.calculate_depth_nb(z_array=z, periods=periods)
+    t_station = time.time() - t0
+
+    t0 = time.time()
+    mtnb.calculate_depth_nb_array(z_array, periods)
+    t_survey = time.time() - t0
+
+    print('calculate_depth_nb for {0} stations x {1} periods'.format(
+        n_stations, nf))
+    print('    station by station : {0:.3f} s'.format(t_station))
+    print('    survey array       : {0:.3f} s'.format(t_survey))
+
+    t0 = time.time()
+    loop_rho_minmax(z_array[:n_loop_stations].reshape(-1, 2, 2),
+                    np.tile(periods, n_loop_stations))
+    t_loop = (time.time() - t0) / n_loop_stations
+
+    t0 = time.time()
+    mtnb.calculate_rho_minmax_array(z_array, periods)
+    t_survey = time.time() - t0
+
+    print('rotation sweep of calculate_rho_minmax, 360 angles')
+    print('    one rotation at a time : {0:.1f} s (estimated for {1} stations)'.format(
+        t_loop * n_stations, n_stations))
+    print('    survey array           : {0:.2f} s'.format(t_survey))
@@ -0,0 +1,110 @@
+#!/bin/env python
+"""
+Description:
+    Benchmark drawing phase tensor ellipses and induction arrows as one
+    PolyCollection and one quiver per axes against adding a
+    matplotlib.patches.Ellipse and an ax.arrow for each, as was done in
+    phase_tensor_maps and phase_tensor_pseudosection.  Also times a full
+    phase tensor pseudosection of the example edi files.
+References:
+
+CreationDate:   18/10/26
+
+Revision History:
+"""
+
+import glob
+import os
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.patches as patches
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mtpy.imaging.mtcolors as mtcl
+import mtpy.imaging.mtplottools as mtpl
+from mtpy.imaging.phase_tensor_pseudosection import PlotPhaseTensorPseudoSection
+
+
+n_ellipses = 10000
+
+
+def make_ellipses(n):
+    np.random.seed(0)
+    side = int(np.ceil(np.sqrt(n)))
+    x, y = np.meshgrid(np.arange(side), np.arange(side))
+    x = x.ravel()[:n].astype(float)
+    y = y.ravel()[:n].astype(float)
+    phimax = np.random.uniform(20, 80, n)
+    phimin = phimax * np.random.uniform(.3, 1, n)
+    azimuth = np.random.uniform(-90, 90, n)
+    tx = np.random.uniform(-.4, .4, n)
+    ty = np.random.uniform(-.4, .4, n)
+    return x, y, phimin, phimax, azimuth, tx, ty
+
+
+def render_patches(x, y, phimin, phimax, azimuth, tx, ty):
+    fig, ax = plt.subplots(figsize=(8, 8))
+    for ii in range(x.size):
+        ellipse = patches.Ellipse((x[ii], y[ii]),
+                                  width=.8,
+                                  height=.8 * phimin[ii] / phimax[ii],
+                                  angle=90 - azimuth[ii])
+        ellipse.set_facecolor(mtcl.get_plot_color(phimin[ii], 'phimin',
+                                                  'mt_bl2gr2rd', 0, 90))
+        ax.add_artist(ellipse)
+        ax.arrow(x[ii], y[ii], tx[ii], ty[ii], width=.02, head_width=.08,
+                 head_length=.1, facecolor='k', edgecolor='k',
+                 length_includes_head=False)
+    ax.set_xlim(-1, x.max() + 1)
+    ax.set_ylim(-1, y.max() + 1)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def render_collection(x, y, phimin, phimax, azimuth, tx, ty):
+    fig, ax = plt.subplots(figsize=(8, 8))
+    mtpl.plot_arrows(ax, x, y, tx, ty, width=.02, head_width=.08,
+                     head_length=.1, facecolor='k', edgecolor='k')
+    mtpl.plot_ellipse_collection(ax, x, y, .8, .8 * phimin / phimax,
+                                 90 - azimuth,
+                                 mtcl.get_plot_color(phimin, 'phimin',
+                                                     'mt_bl2gr2rd', 0, 90))
+    ax.set_xlim(-1, x.max() + 1)
+    ax.set_ylim(-1, y.max() + 1)
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    ellipses = make_ellipses(n_ellipses)
+
+    t0 = time.time()
+    render_patches(*ellipses)
+    t_patches = time.time() - t0
+
+    t0 = time.time()
+    render_collection(*ellipses)
+    t_collection = time.time() - t0
+
+    print('{0} ellipses and arrows'.format(n_ellipses))
+    print('    one patch each  : {0:.2f} s'.format(t_patches))
+    print('    one collection  : {0:.2f} s'.format(t_collection))
+
+    edi_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', '..', 'data', 'edifiles')
+    edi_list = sorted(glob.glob(os.path.join(edi_path, '*.edi')))
+    if edi_list:
+        pt_section = PlotPhaseTensorPseudoSection(fn_list=edi_list,
+                                                  plot_tipper='yri',
+                                                  plot_yn='n',
+                                                  xstretch=60,
+                                                  ellipse_size=.3)
+        t0 = time.time()
+        pt_section.plot(show=False)
+        pt_section.fig.canvas.draw()
+        print('phase tensor pseudosection of {0} stations: {1:.2f} s'.format(
+            len(edi_list), time.time() - t0))
@@ -0,0 +1,67 @@
+#!/bin/env python
+"""
+Description:
+    Benchmark the in-process robust transfer function estimator
+    (mtpy.processing.robust_tf) on synthetic time series made from a known
+    impedance.  Reports the run time for a set of stations processed in
+    series and in parallel, and the largest misfit to the known impedance.
+References:
+
+CreationDate:   18/10/26
+
+Revision History:
+"""
+
+import os
+import time
+
+import numpy as np
+
+import mtpy.processing.robust_tf as robust_tf
+
+
+n_stations = 16
+n_samples = 2 ** 20
+sampling_rate = 256.
+n_processes = max(2, min(4, os.cpu_count()))
+
+
+def z_function(freq):
+    # 2D response, 100 Ohm-m along strike and 10 Ohm-m across, Z in mV/km/nT
+    z = np.zeros((freq.size, 2, 2), dtype=complex)
+    z[:, 0, 1] = np.sqrt(5 * freq * 100) * np.exp(1j * np.pi / 4)
+    z[:, 1, 0] = -np.sqrt(5 * freq * 10) * np.exp(1j * np.pi / 3)
+    return z
+
+
+def tipper_function(freq):
+    t = np.zeros((freq.size, 1, 2), dtype=complex)
+    t[:, 0, 0] = 0.2 + 0.05j
+    return t
+
+
+if __name__ == '__main__':
+    station_dict = dict([('mt{0:03}'.format(ii),
+                          robust_tf.synthetic_time_series(n_samples,
+                                                          sampling_rate,
+                                                          z_function,
+                                                          tipper_function,
+                                                          noise=0.1,
+                                                          seed=ii))
+                         for ii in range(n_stations)])
+
+    for n_proc in [1, n_processes]:
+        st = time.time()
+        tf_dict = robust_tf.estimate_survey(station_dict,
+                                            n_processes=n_proc,
+                                            window_length=4096)
+        et = time.time()
+        print('{0} stations x {1} samples, {2} process(es): {3:.2f} s'.format(
+            n_stations, n_samples, n_proc, et - st))
+
+    misfit = 0
+    for station, (z_obj, t_obj) in tf_dict.items():
+        z_true = z_function(z_obj.freq)
+        misfit = max(misfit, np.max(np.abs(z_obj.z - z_true) /
+                                    np.abs(z_true[:, 0:1, 1:2])))
+    print('largest misfit relative to |Zxy|: {0:.3%}'.format(misfit))
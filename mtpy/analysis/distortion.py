@@ -37,14 +37,16 @@ Edited by JP, 2016
 
 """
 
-import copy
-
 import numpy as np
 
 import mtpy.analysis.geometry as MTge
+import mtpy.analysis.pt as MTpt
 import mtpy.core.z as MTz
 import mtpy.utils.calculator as MTcc
 import mtpy.utils.exceptions as MTex
+from mtpy.utils.mtpylog import MtPyLog
+
+_logger = MtPyLog.get_mtpy_logger(__name__)
 
 
 def find_distortion(z_object, g='det', num_freq=None, lo_dims=None):
@@ -95,170 +97,11 @@ def find_distortion(z_object, g='det', num_freq=None, lo_dims=None):
     if num_freq is not None:
         if num_freq > z_object.freq.size:
             num_freq = z_object.freq.size
-            print('Number of frequencies to sweep over is too high for z')
-            print('setting num_freq to {0}'.format(num_freq))
-    else:
-        num_freq = z_object.freq.size
-
-
-    z_obj = MTz.Z(z_object.z[0:num_freq],
-                  z_object.z_err[0:num_freq],
-                  z_object.freq[0:num_freq])
-
-    g = 'det'
-
-    dim_arr = MTge.dimensionality(z_object=z_obj)
-    st_arr = -1 * MTge.strike_angle(z_object=z_obj)[:, 0]
-
-    dis = np.zeros_like(z_obj.z, dtype=np.float)
-    dis_err = np.ones_like(z_obj.z, dtype=np.float)
-
-    #dictionary of values that should be no distortion in case distortion
-    #cannot be calculated for that component
-    rot_mat = np.matrix([[0, -1], [1, 0]])
-    for idx, dim in enumerate(dim_arr):
-        if np.any(z_obj.z[idx] == 0.0 + 0.0j) == True:
-            dis[idx] = np.identity(2)
-            print('Found a zero in z at {0}, skipping'.format(idx))
-            continue
-
-        if dim == 1:
-
-            if g in ['01', '10']:
-                gr = np.abs(z_obj.z.real[idx, int(g[0]), int(g[1])])
-                gi = np.abs(z_obj.z.imag[idx, int(g[0]), int(g[1])])
-            else:
-                gr = np.sqrt(np.linalg.det(z_obj.z.real[idx]))
-                gi = np.sqrt(np.linalg.det(z_obj.z.imag[idx]))
-
-            dis[idx] = np.mean(np.array([(1. / gr * np.dot(z_obj.z.real[idx],
-                                                           rot_mat)),
-                                         (1. / gi * np.dot(z_obj.z.imag[idx],
-                                                           rot_mat))]),
-                               axis=0)
-
-            if z_obj.z_err is not None:
-                # find errors of entries for calculating weights
-
-                gr_err = 1. / gr * np.abs(z_obj.z_err[idx])
-                gr_err[np.where(gr_err == 0.0)] = 1.0
-
-                gi_err = 1. / gi * np.abs(z_obj.z_err[idx])
-                gi_err[np.where(gi_err == 0.0)] = 1.0
-
-                dis_err[idx] = np.mean(np.array([gi_err, gr_err]),
-                                       axis=0)
-
-        elif dim == 2:
-            P = 1
-            strike_ang = st_arr[idx]
-            if np.isnan(strike_ang):
-                strike_ang = 0.0
-
-            if z_obj.z_err is not None:
-                err_arr = z_obj.z_err[idx]
-                err_arr[np.where(err_arr == 0.0)] = 1.0
-            else:
-                err_arr = None
-
-            tetm_arr, tetm_err = MTcc.rotatematrix_incl_errors(z_obj.z[idx],
-                                                               strike_ang,
-                                                               inmatrix_err=err_arr)
-
-            tetm_r = tetm_arr.real
-            tetm_i = tetm_arr.imag
-            t_arr_r = -4 * P * tetm_r[0, 1] * tetm_r[1, 0] / np.linalg.det(tetm_r)
-            t_arr_i = -4 * P * tetm_i[0, 1] * tetm_i[1, 0] / np.linalg.det(tetm_i)
-
-            try:
-                T = np.sqrt(max([t_arr_r, t_arr_i])) + .001
-            except ValueError:
-                T = 2
-
-            sr = np.sqrt(T ** 2 + 4 * P * tetm_r[0, 1] * tetm_r[1, 0] / np.linalg.det(tetm_r))
-            si = np.sqrt(T ** 2 + 4 * P * tetm_i[0, 1] * tetm_i[1, 0] / np.linalg.det(tetm_i))
-
-            par_r = 2 * tetm_r[0, 1] / (T - sr)
-            orth_r = 2 * tetm_r[1, 0] / (T + sr)
-            par_i = 2 * tetm_i[0, 1] / (T - si)
-            orth_i = 2 * tetm_i[1, 0] / (T + si)
-
-            mat2_r = np.matrix([[0, 1. / orth_r], [1. / par_r, 0]])
-            mat2_i = np.matrix([[0, 1. / orth_i], [1. / par_i, 0]])
-
-            avg_mat = np.mean(np.array([np.dot(tetm_r, mat2_r),
-                                        np.dot(tetm_i, mat2_i)]),
-                              axis=0)
-
-            dis[idx] = avg_mat
-
-            if err_arr is not None:
-                # find errors of entries for calculating weights
-                sigma_sr = np.sqrt((-(2 * P * tetm_r[0, 1] * tetm_r[1, 0] * \
-                                      tetm_r[1, 1] * err_arr[0, 0]) / \
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 + \
-                                   ((2 * P * tetm_r[0, 0] * tetm_r[1, 0] *
-                                     tetm_r[1, 1] * err_arr[0, 1]) /
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 + \
-                                   ((2 * P * tetm_r[0, 0] * tetm_r[0, 1] *
-                                     tetm_r[1, 1] * err_arr[1, 0]) / \
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2 + \
-                                   (-(2 * P * tetm_r[0, 1] * tetm_r[1, 0] * \
-                                      tetm_r[0, 0] * err_arr[1, 1]) / \
-                                    (np.linalg.det(tetm_r) ** 2 * sr)) ** 2)
-
-                sigma_dr_11 = 0.5 * sigma_sr
-                sigma_dr_22 = 0.5 * sigma_sr
-
-                sigma_dr_12 = np.sqrt((mat2_r[0, 1] / tetm_r[0, 0] * err_arr[0, 0]) ** 2 + \
-                                      (mat2_r[0, 1] / tetm_r[1, 0] * err_arr[1, 0]) ** 2 + \
-                                      (0.5 * tetm_r[0, 0] / tetm_r[1, 0] * sigma_sr) ** 2)
-                sigma_dr_21 = np.sqrt((mat2_r[1, 0] / tetm_r[1, 1] * err_arr[1, 1]) ** 2 + \
-                                      (mat2_r[1, 0] / tetm_r[0, 1] * err_arr[0, 1]) ** 2 + \
-                                      (0.5 * tetm_r[1, 1] / tetm_r[0, 1] * sigma_sr) ** 2)
-
-                dis_err_r = np.array([[sigma_dr_11, sigma_dr_12],
-                                      [sigma_dr_21, sigma_dr_22]])
-
-                sigma_si = np.sqrt((-(2 * P * tetm_i[0, 1] * tetm_i[1, 0] * \
-                                      tetm_i[1, 1] * err_arr[0, 0]) / \
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 + \
-                                   ((2 * P * tetm_i[0, 0] * tetm_i[1, 0] * \
-                                     tetm_i[1, 1] * err_arr[0, 1]) / \
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 + \
-                                   ((2 * P * tetm_i[0, 0] * tetm_i[0, 1] * \
-                                     tetm_i[1, 1] * err_arr[1, 0]) / \
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2 + \
-                                   (-(2 * P * tetm_i[0, 1] * tetm_i[1, 0] * \
-                                      tetm_i[0, 0] * err_arr[1, 1]) / \
-                                    (np.linalg.det(tetm_i) ** 2 * sr)) ** 2)
-
-                sigma_di_11 = 0.5 * sigma_si
-                sigma_di_22 = 0.5 * sigma_si
-                sigma_di_12 = np.sqrt((mat2_i[0, 1] / tetm_i[0, 0] * err_arr[0, 0]) ** 2 + \
-                                      (mat2_i[0, 1] / tetm_i[1, 0] * err_arr[1, 0]) ** 2 + \
-                                      (0.5 * tetm_i[0, 0] / tetm_i[1, 0] * sigma_si) ** 2)
-                sigma_di_21 = np.sqrt((mat2_i[1, 0] / tetm_i[1, 1] * err_arr[1, 1]) ** 2 + \
-                                      (mat2_i[1, 0] / tetm_i[0, 1] * err_arr[0, 1]) ** 2 + \
-                                      (0.5 * tetm_i[1, 1] / tetm_i[0, 1] * sigma_si) ** 2)
-
-                dis_err_i = np.array([[sigma_di_11, sigma_di_12],
-                                      [sigma_di_21, sigma_di_22]])
-
-                dis_err[idx] = np.mean(np.array([dis_err_r, dis_err_i]))
-        else:
-            dis[idx] = np.identity(2)
-
-    nonzero_idx = np.array(list(set(np.nonzero(dis)[0])))
-
-    dis_avg, weights_sum = np.average(dis[nonzero_idx],
-                                      axis=0,
-                                      weights=(1. / dis_err[nonzero_idx]) ** 2,
-                                      returned=True)
-
-    dis_avg_err = np.sqrt(1. / weights_sum)
+            _logger.debug('Number of frequencies to sweep over is too high '
+                          'for z, setting num_freq to %s', num_freq)
 
-    return dis_avg, dis_avg_err
+    return find_distortion_array(z_object.z, z_err_array=z_object.z_err,
+                                 g=g, num_freq=num_freq, lo_dims=lo_dims)
 
 
 def find_1d_distortion(z_object, include_non1d=False):
@@ -286,7 +129,7 @@ def find_1d_distortion(z_object, include_non1d=False):
         raise MTex.MTpyError_inputarguments('Z object does not have '
                                             'frequencies with spatial 1D characteristic')
 
-    print(lo_dims)
+    _logger.debug('dimensionality %s', lo_dims)
 
     return find_distortion(z_obj, lo_dims=lo_dims)
 
@@ -376,20 +219,354 @@ def remove_distortion(z_array=None, z_object=None, num_freq=None, g='det'):
 
     dis, dis_err = find_distortion(z_obj, num_freq=num_freq, g=g)
 
-    try:
-        # distortion_tensor, zd, zd_err = z_obj.no_distortion(dis, distortion_err_tensor=dis_err)
-        distortion_tensor, zd, zd_err = z_obj.remove_distortion(dis, distortion_err_tensor=dis_err)
+    if np.linalg.det(dis) == 0:
+        _logger.warning('Could not compute distortion tensor')
+
+        return np.identity(2), z_obj
 
-        zd_err = np.nan_to_num(zd_err)
-        zd_err[np.where(zd_err == 0.0)] = 1.0
-        distortion_z_obj = z_obj
-        distortion_z_obj.z = zd
-        distortion_z_obj.z[zero_idx] = 0.0 + 0.0j
-        distortion_z_obj.z_err = zd_err
+    zd, zd_err = remove_distortion_array(z_obj.z, z_obj.z_err, dis, dis_err)
 
-        return distortion_tensor, distortion_z_obj
+    zd_err = np.nan_to_num(zd_err)
+    zd_err[np.where(zd_err == 0.0)] = 1.0
+    distortion_z_obj = z_obj
+    distortion_z_obj.z = zd
+    distortion_z_obj.z[zero_idx] = 0.0 + 0.0j
+    distortion_z_obj.z_err = zd_err
 
-    except MTex.MTpyError_Z:
-        print('Could not compute distortion tensor')
+    return np.matrix(dis), distortion_z_obj
 
-        return np.identity(2), z_obj
+
+def _distortion_contributions(z_array, z_err_array=None, g='det',
+                              lo_dims=None):
+    """
+    distortion tensor and its error estimated from each frequency of a stack
+    of impedance tensors (..., nf, 2, 2), following Bibby et al. 2005.
+
+    1D frequencies are normalised by g, 2D frequencies are rotated to strike
+    and solved with P = 1, frequencies that are neither or have a zero in Z
+    give the identity with an error of 1.
+    """
+    z_array = np.asarray(z_array)
+    if z_err_array is None:
+        err_array = None
+    else:
+        z_err_array = np.real(np.asarray(z_err_array))
+        err_array = z_err_array.copy()
+        err_array[err_array == 0.0] = 1.0
+
+    pt_array = MTpt.z2pt_array(z_array)
+    if lo_dims is None:
+        dims = MTge._dimensionality_from_pt(pt_array)
+    else:
+        dims = np.broadcast_to(np.asarray(lo_dims), z_array.shape[:-2])
+    strike = -1 * MTge._strike_from_pt(pt_array, dims)[..., 0]
+
+    dis = np.zeros(z_array.shape, dtype=float)
+    dis_err = np.ones(z_array.shape, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # --> 1D: D = Z . R / g for the real and imaginary parts
+        rot_mat = np.array([[0, -1], [1, 0]])
+        if g in ['01', '10']:
+            gr = np.abs(z_array.real[..., int(g[0]), int(g[1])])
+            gi = np.abs(z_array.imag[..., int(g[0]), int(g[1])])
+        else:
+            gr = np.sqrt(np.linalg.det(z_array.real))
+            gi = np.sqrt(np.linalg.det(z_array.imag))
+        gr = gr[..., np.newaxis, np.newaxis]
+        gi = gi[..., np.newaxis, np.newaxis]
+
+        dis_1d = 0.5 * (np.matmul(z_array.real, rot_mat) / gr +
+                        np.matmul(z_array.imag, rot_mat) / gi)
+        if err_array is None:
+            dis_err_1d = np.ones(z_array.shape)
+        else:
+            gr_err = np.abs(z_err_array) / gr
+            gr_err[gr_err == 0.0] = 1.0
+            gi_err = np.abs(z_err_array) / gi
+            gi_err[gi_err == 0.0] = 1.0
+            dis_err_1d = 0.5 * (gr_err + gi_err)
+
+        # --> 2D: rotate to strike and solve for the distortion with P = 1
+        P = 1
+        tetm = MTcc.rotatematrix_array(z_array, strike)
+        dis_2d = np.zeros(z_array.shape)
+        dis_err_2d = np.zeros(z_array.shape[:-2])
+        tetm_parts = [tetm.real, tetm.imag]
+        t_arr = [-4 * P * tt[..., 0, 1] * tt[..., 1, 0] / np.linalg.det(tt)
+                 for tt in tetm_parts]
+        T = np.sqrt(np.maximum(t_arr[0], t_arr[1])) + .001
+        T[np.maximum(t_arr[0], t_arr[1]) < 0] = 2
+
+        s_list = [np.sqrt(T ** 2 - tt) for tt in t_arr]
+        for tt, s_tt in zip(tetm_parts, s_list):
+            par = 2 * tt[..., 0, 1] / (T - s_tt)
+            orth = 2 * tt[..., 1, 0] / (T + s_tt)
+
+            mat2 = np.zeros(z_array.shape)
+            mat2[..., 0, 1] = 1. / orth
+            mat2[..., 1, 0] = 1. / par
+            dis_2d += 0.5 * np.matmul(tt, mat2)
+
+            if err_array is None:
+                continue
+
+            # errors of the entries for calculating weights, as in the
+            # original formulation both parts are scaled by sr
+            det2_s = np.linalg.det(tt) ** 2 * s_list[0]
+            sigma_s = np.sqrt(
+                (2 * P * tt[..., 0, 1] * tt[..., 1, 0] * tt[..., 1, 1] *
+                 err_array[..., 0, 0] / det2_s) ** 2 +
+                (2 * P * tt[..., 0, 0] * tt[..., 1, 0] * tt[..., 1, 1] *
+                 err_array[..., 0, 1] / det2_s) ** 2 +
+                (2 * P * tt[..., 0, 0] * tt[..., 0, 1] * tt[..., 1, 1] *
+                 err_array[..., 1, 0] / det2_s) ** 2 +
+                (2 * P * tt[..., 0, 1] * tt[..., 1, 0] * tt[..., 0, 0] *
+                 err_array[..., 1, 1] / det2_s) ** 2)
+
+            sigma_12 = np.sqrt(
+                (mat2[..., 0, 1] / tt[..., 0, 0] * err_array[..., 0, 0]) ** 2 +
+                (mat2[..., 0, 1] / tt[..., 1, 0] * err_array[..., 1, 0]) ** 2 +
+                (0.5 * tt[..., 0, 0] / tt[..., 1, 0] * sigma_s) ** 2)
+            sigma_21 = np.sqrt(
+                (mat2[..., 1, 0] / tt[..., 1, 1] * err_array[..., 1, 1]) ** 2 +
+                (mat2[..., 1, 0] / tt[..., 0, 1] * err_array[..., 0, 1]) ** 2 +
+                (0.5 * tt[..., 1, 1] / tt[..., 0, 1] * sigma_s) ** 2)
+
+            # the error is the mean over the entries of both parts
+            dis_err_2d += (sigma_s + sigma_12 + sigma_21) / 8.
+
+    if err_array is None:
+        dis_err_2d = np.ones(z_array.shape)
+    else:
+        dis_err_2d = np.broadcast_to(dis_err_2d[..., np.newaxis, np.newaxis],
+                                     z_array.shape)
+
+    dis[dims == 1] = dis_1d[dims == 1]
+    dis_err[dims == 1] = dis_err_1d[dims == 1]
+    dis[dims == 2] = dis_2d[dims == 2]
+    dis_err[dims == 2] = dis_err_2d[dims == 2]
+
+    # zeros in z and other dimensions give no distortion
+    no_dis = np.any(z_array == 0, axis=(-2, -1)) | \
+        ((dims != 1) & (dims != 2))
+    dis[no_dis] = np.identity(2)
+    dis_err[no_dis] = 1.
+
+    return dis, dis_err
+
+
+def find_distortion_array(z_array, z_err_array=None, g='det', num_freq=None,
+                          lo_dims=None):
+    """
+    find optimal distortion tensors for a stack of impedance tensors at once,
+    e.g. (nf, 2, 2) for one station or (n_stations, nf, 2, 2) for a survey
+    with stations padded with nan to a common number of frequencies.
+
+    The distortion of each frequency is found as in find_distortion and
+    averaged over the frequencies weighted by the inverse squared errors.
+    Frequencies with a zero in Z count as no distortion, frequencies where
+    the distortion cannot be computed (nan) are left out of the average.  If
+    no frequency is left the distortion is the identity with an error of 1.
+
+    Parameters
+    ----------
+
+        **z_array** : np.ndarray(..., nf, 2, 2)
+                      impedance tensors
+
+        **z_err_array** : np.ndarray(..., nf, 2, 2)
+                          impedance tensor errors, *default* is None
+
+        **g** : [ 'det' | '01' | '10 ]
+                type of distortion correction
+                *default* is 'det'
+
+        **num_freq** : int
+                       number of frequencies to look for distortion from
+                       the index 0
+                       *default* is None, meaning all frequencies are used
+
+        **lo_dims** : np.ndarray(..., nf)
+                      dimensions for each frequency
+                      *default* is None, meaning calculated from data
+
+    Returns
+    -------
+
+        **distortion** : np.ndarray(..., 2, 2)
+                         distortion array all real values
+
+        **distortion_err** : np.ndarray(..., 2, 2)
+                             distortion error array
+
+    Examples
+    --------
+
+        :Estimate Distortion for a Survey: ::
+
+            >>> import mtpy.analysis.distortion as distortion
+            >>> z = np.array([mt_obj.Z.z for mt_obj in mt_list])
+            >>> z_err = np.array([mt_obj.Z.z_err for mt_obj in mt_list])
+            >>> dis, dis_err = distortion.find_distortion_array(z, z_err,
+            >>>                                                 num_freq=12)
+
+    """
+    z_array = np.asarray(z_array)[..., :num_freq, :, :]
+    if z_err_array is not None:
+        z_err_array = np.asarray(z_err_array)[..., :num_freq, :, :]
+    if lo_dims is not None:
+        lo_dims = np.asarray(lo_dims)[..., :num_freq]
+
+    dis, dis_err = _distortion_contributions(z_array, z_err_array, g=g,
+                                             lo_dims=lo_dims)
+
+    # mask frequencies where the distortion could not be computed
+    valid = np.all(np.isfinite(dis) & np.isfinite(dis_err) & (dis_err != 0),
+                   axis=(-2, -1))
+    weights = np.where(valid[..., np.newaxis, np.newaxis],
+                       1. / np.where(valid[..., np.newaxis, np.newaxis],
+                                     dis_err, 1.) ** 2,
+                       0.)
+    weights_sum = weights.sum(axis=-3)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dis_avg = np.sum(np.where(weights > 0, dis, 0.) * weights,
+                         axis=-3) / weights_sum
+        dis_avg_err = np.sqrt(1. / weights_sum)
+
+    no_data = ~np.any(valid, axis=-1)
+    dis_avg[no_data] = np.identity(2)
+    dis_avg_err[no_data] = 1.
+
+    return dis_avg, dis_avg_err
+
+
+def remove_distortion_array(z_array, z_err_array, distortion,
+                            distortion_err=None):
+    """
+    remove distortion D from a stack of impedance tensors Z = D * Z0 at once,
+    with the same propagation of errors as mtpy.core.z.Z.remove_distortion.
+
+    Parameters
+    -----------
+
+        **z_array** : np.ndarray(..., nf, 2, 2)
+                      impedance tensors
+
+        **z_err_array** : np.ndarray(..., nf, 2, 2)
+                          impedance tensor errors
+
+        **distortion** : np.ndarray(..., 2, 2)
+                         real distortion tensors, one for each station
+
+        **distortion_err** : np.ndarray(..., 2, 2)
+                             distortion errors, *default* is None for no
+                             errors
+
+    Returns
+    --------
+
+        **z_corrected** : np.ndarray(..., nf, 2, 2)
+                          impedance tensors with distortion removed, nan
+                          where the distortion is singular
+
+        **z_corrected_err** : np.ndarray(..., nf, 2, 2)
+                              errors of the corrected impedance tensors
+    """
+    z_array = np.asarray(z_array)
+    z_err_array = np.real(np.asarray(z_err_array))
+    distortion = np.real(np.asarray(distortion, dtype=float))
+    if distortion_err is None:
+        distortion_err = np.zeros_like(distortion)
+    distortion_err = np.real(np.asarray(distortion_err, dtype=float))
+
+    # inverse of D and its error, see MTcc.invertmatrix_incl_errors
+    singular = np.linalg.det(distortion) == 0
+    dis_inv = np.linalg.inv(np.where(singular[..., np.newaxis, np.newaxis],
+                                     np.identity(2), distortion))
+    dis_inv[singular] = np.nan
+    dis_inv_err = np.matmul(np.matmul(np.abs(dis_inv), np.abs(distortion_err)),
+                            np.abs(dis_inv))
+
+    dis_inv = dis_inv[..., np.newaxis, :, :]
+    dis_inv_err = dis_inv_err[..., np.newaxis, :, :]
+
+    z_corrected = np.matmul(dis_inv, z_array)
+    z_corrected_err = np.matmul(dis_inv_err, np.abs(z_array)) + \
+        np.matmul(np.abs(dis_inv), z_err_array)
+
+    return z_corrected, z_corrected_err
+
+
+def remove_distortion_survey(mt_obj_list, num_freq=None, g='det'):
+    """
+    remove distortion from every station of a survey at once using the
+    method outlined by Bibby et al., [2005], see remove_distortion.
+
+    Parameters
+    -----------
+
+        **mt_obj_list** : list
+                          list of mtpy.core.mt.MT objects
+
+        **num_freq** : int
+                       number of frequecies to look for distortion
+                       *default* is None, meaning look over all frequencies
+
+        **g** : [ 'det' | '01' | '10 ]
+                type of distortion to look for
+                *default* is 'det'
+
+    Returns
+    --------
+
+        **distortion** : np.ndarray (n_stations, 2, 2)
+                         distortion arrays
+
+        **z_obj_list** : list
+                         mtpy.core.z objects with distortion removed and
+                         error calculated, one for each station
+
+    Examples
+    -------------
+
+        :Remove Distortion from a Survey: ::
+
+            >>> import mtpy.analysis.distortion as distortion
+            >>> d, new_z_list = distortion.remove_distortion_survey(mt_list)
+    """
+    ns = len(mt_obj_list)
+    nf = max([mt_obj.Z.freq.size for mt_obj in mt_obj_list])
+
+    # stack the stations, padded with nan
+    z_array = np.full((ns, nf, 2, 2), np.nan, dtype=complex)
+    z_err_array = np.full((ns, nf, 2, 2), np.nan)
+    for ii, mt_obj in enumerate(mt_obj_list):
+        z_array[ii, :mt_obj.Z.freq.size] = mt_obj.Z.z
+        z_err_array[ii, :mt_obj.Z.freq.size] = mt_obj.Z.z_err
+
+    dis, dis_err = find_distortion_array(z_array, z_err_array, g=g,
+                                         num_freq=num_freq)
+
+    # stations with a singular distortion are left as they are
+    singular = np.linalg.det(dis) == 0
+    for ii in np.nonzero(singular)[0]:
+        _logger.warning('Could not compute distortion tensor for station '
+                        '%s', mt_obj_list[ii].station)
+    dis[singular] = np.identity(2)
+    dis_err[singular] = 0.
+
+    zd, zd_err = remove_distortion_array(z_array, z_err_array, dis, dis_err)
+    zd[z_array == 0] = 0.0 + 0.0j
+    zd_err = np.nan_to_num(zd_err)
+    zd_err[np.where(zd_err == 0.0)] = 1.0
+
+    z_obj_list = []
+    for ii, mt_obj in enumerate(mt_obj_list):
+        nf_ii = mt_obj.Z.freq.size
+        z_obj_list.append(MTz.Z(z_array=zd[ii, :nf_ii],
+                                z_err_array=zd_err[ii, :nf_ii],
+                                freq=mt_obj.Z.freq.copy()))
+
+    return dis, z_obj_list
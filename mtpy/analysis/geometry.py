@@ -18,9 +18,12 @@ Edited by JP, 2016
 """
 
 # =================================================================
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
 import mtpy.analysis.pt as MTpt
+from mtpy.analysis.zinvariants import compute_invariants
 import mtpy.core.z as MTz
 import mtpy.utils.exceptions as MTex
 
@@ -85,8 +88,6 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
 
     """
 
-    lo_dimensionality = []
-
     if z_array is not None:
         pt_obj = MTpt.PhaseTensor(z_array=z_array)
     elif z_object is not None:
@@ -103,22 +104,10 @@ def dimensionality(z_array=None, z_object=None, pt_array=None,
         pt_obj = pt_object
 
     # use criteria from Bibby et al. 2005 for determining the dimensionality
-    # for each frequency of the pt/z array:
-    for idx_f in range(len(pt_obj.pt)):
-        #1. determine skew value...
-        skew = pt_obj.beta[idx_f]
-            #compare with threshold for 3D
-        if np.abs(skew) > skew_threshold:
-            lo_dimensionality.append(3)
-        else:
-            # 2.check for eccentricity:
-            ecc = pt_obj._pi1()[0][idx_f] / pt_obj._pi2()[0][idx_f]
-            if ecc > eccentricity_threshold:
-                lo_dimensionality.append(2)
-            else:
-                lo_dimensionality.append(1)
-
-    return np.array(lo_dimensionality)
+    # for each frequency of the pt/z array
+    return _dimensionality_from_pt(pt_obj.pt,
+                                   skew_threshold=skew_threshold,
+                                   eccentricity_threshold=eccentricity_threshold)
 
 
 def strike_angle(z_array=None, z_object=None, pt_array=None,
@@ -196,33 +185,7 @@ def strike_angle(z_array=None, z_object=None, pt_array=None,
                              skew_threshold=skew_threshold,
                              eccentricity_threshold=eccentricity_threshold)
 
-    lo_strikes = []
-
-    for idx, dim in enumerate(lo_dims):
-        if dim == 1:
-            lo_strikes.append((np.nan, np.nan))
-#            continue
-        
-        elif dim == 3:
-            lo_strikes.append((np.nan, np.nan))
-
-        else:
-            a = pt_obj.alpha[idx]
-            b = pt_obj.beta[idx]
-    
-            strike1 = (a - b) % 180
-            
-            # change so that values range from -90 to +90
-            # add alternative strikes to account for ambiguity
-            if strike1 > 90:
-                strike1 -= 180
-                strike2 = strike1 + 90
-            else:
-                strike2 = strike1 - 90
-        
-            lo_strikes.append((strike1, strike2))
-
-    return np.array(lo_strikes)
+    return _strike_from_pt(pt_obj.pt, lo_dims)
 
 
 def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
@@ -283,21 +246,298 @@ def eccentricity(z_array=None, z_object=None, pt_array=None, pt_object=None):
                 'Input argument is not an instance of the PhaseTensor class')
         pt_obj = pt_object
 
-    lo_ecc = []
-    lo_eccerr = []
-
     if not isinstance(pt_obj, MTpt.PhaseTensor):
         raise MTex.MTpyError_PT(
             'Input argument is not an instance of the PhaseTensor class')
 
-    for idx_f in range(len(pt_obj.pt)):
-        lo_ecc.append(pt_obj._pi1()[0][idx_f] / pt_obj._pi2()[0][idx_f])
+    pi1, pi1_err = pt_obj._pi1()
+    pi2, pi2_err = pt_obj._pi2()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecc = pi1 / pi2
 
         ecc_err = None
-        if (pt_obj._pi1()[1] is not None) and (pt_obj._pi2()[1] is not None):
-            ecc_err = np.sqrt((pt_obj._pi1()[1][idx_f] / pt_obj._pi1()[0][idx_f]) ** 2 +\
-                              (pt_obj._pi2()[1][idx_f] / pt_obj._pi2()[0][idx_f]) ** 2)
+        if (pi1_err is not None) and (pi2_err is not None):
+            ecc_err = np.sqrt((pi1_err / pi1) ** 2 + (pi2_err / pi2) ** 2) * ecc
+
+    return ecc, ecc_err
+
+
+def _dimensionality_from_pt(pt_array, skew_threshold=5,
+                            eccentricity_threshold=0.1):
+    """
+    dimensionality [ 1 | 2 | 3 ] of a stack of phase tensors (..., 2, 2)
+    following Bibby et al. 2005, see dimensionality
+    """
+    pt_dict = MTpt.pt_parameters(pt_array)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ecc = pt_dict['pi1'] / pt_dict['pi2']
+        dims = np.ones(pt_dict['beta'].shape, dtype=int)
+        # 2. check for eccentricity
+        dims[ecc > eccentricity_threshold] = 2
+        # 1. compare the skew with the threshold for 3D
+        dims[np.abs(pt_dict['beta']) > skew_threshold] = 3
+
+    return dims
+
+
+def _strike_from_pt(pt_array, dims):
+    """
+    strike and its 90 degree alternative (..., 2) from the 2D parts of a
+    stack of phase tensors, see strike_angle
+    """
+    pt_dict = MTpt.pt_parameters(pt_array)
+
+    strike1 = (pt_dict['alpha'] - pt_dict['beta']) % 180
+
+    # change so that values range from -90 to +90
+    # add alternative strikes to account for ambiguity
+    with np.errstate(invalid='ignore'):
+        west = strike1 > 90
+    strike1 = np.where(west, strike1 - 180, strike1)
+    strike2 = np.where(west, strike1 + 90, strike1 - 90)
+
+    strikes = np.stack([strike1, strike2], axis=-1)
+    strikes[dims != 2] = np.nan
+
+    return strikes
+
+
+def _survey_strike_chunk(z_array, tipper_array, fold=True,
+                         pt_error_floor=None, skew_threshold=5,
+                         eccentricity_threshold=0.1):
+    """
+    strikes and dimensionality for a chunk of stations, see survey_strike
+    """
+    strike_dict = {}
+
+    #--> strike from the invariants of the impedance tensor
+    # add 90 degrees because invariants assume 0 is north, but plotting
+    # assumes that 90 is north and measures clockwise, thus the negative
+    # because the strike angle from invariants is measured counter-clockwise
+    zs = 90 - compute_invariants(z_array)['strike']
+
+    #--> strike from the phase tensor azimuth
+    pt_array = MTpt.z2pt_array(z_array)
+    pt_dict = MTpt.pt_parameters(pt_array)
+    az = 90 - pt_dict['azimuth']
+    az[pt_dict['phimax'] == 0] = np.nan
+
+    # put an error max on the estimation of strike angle
+    if pt_error_floor:
+        with np.errstate(invalid='ignore'):
+            az_err = np.sqrt(pt_dict['alpha'] + pt_dict['beta'])
+            az[az_err > pt_error_floor] = 0.0
+
+    #--> strike from the real induction arrow, negative because it
+    # measures clockwise
+    tipr = -np.rad2deg(np.arctan2(-tipper_array[..., 0, 1].real,
+                                  -tipper_array[..., 0, 0].real))
+    tipr[tipr == 180.] = 0.0
+
+    with np.errstate(invalid='ignore'):
+        for st_array in [zs, az, tipr]:
+            # fold so the angle goes from -90 to 90
+            if fold:
+                st_array[st_array > 90] -= 180
+                st_array[st_array < -90] += 180
+            # leave as the total unit circle 0 to 360
+            else:
+                st_array %= 360
+        if not fold:
+            tipr[tipr == 360.0] = 0.0
+
+    strike_dict['inv_strike'] = zs
+    strike_dict['pt_strike'] = az
+    strike_dict['tip_strike'] = tipr
+
+    # dimensionality, 0 where there is no data
+    dims = _dimensionality_from_pt(pt_array,
+                                   skew_threshold=skew_threshold,
+                                   eccentricity_threshold=eccentricity_threshold)
+    dims[pt_dict['phimax'] == 0] = 0
+    dims[np.isnan(pt_dict['phimax'])] = 0
+    strike_dict['dimensionality'] = dims
+
+    return strike_dict
+
+
+def strike_histograms(strike_array, period, bin_width=5, fold=True,
+                      band_edges=None):
+    """
+    Histograms of strike angles for each period band of a survey, computed
+    in one pass.
+
+    Arguments
+    ------------
+
+        **strike_array** : np.ndarray(n_stations, n_periods)
+                           strike angles in degrees, zeros and NaNs are
+                           treated as no data
+
+        **period** : np.ndarray(n_periods)
+                     periods in seconds
+
+        **bin_width** : float
+                        width of the angle bins in degrees
+                        *default* is 5
+
+        **fold** : [ True | False ]
+                   histogram from 0 to 180 if True, 0 to 360 otherwise
 
-        lo_eccerr.append(ecc_err)
+        **band_edges** : np.ndarray
+                         log10 of the period band edges, periods between
+                         10**band_edges[i] and 10**band_edges[i+1] are put
+                         into band i.  *default* is None, for decades
+                         covering the periods
 
-    return np.array(lo_ecc), np.array(lo_eccerr)*np.array(lo_ecc)
+    Returns
+    ----------
+
+        **hist** : np.ndarray(n_bands, n_bins, dtype=int)
+                   counts for each period band and angle bin
+
+        **band_edges** : np.ndarray(n_bands + 1)
+
+        **bin_edges** : np.ndarray(n_bins + 1)
+                        angle bin edges in degrees
+
+    """
+    period = np.asarray(period, dtype=float)
+    strike_array = np.atleast_2d(strike_array)
+
+    if band_edges is None:
+        band_edges = np.arange(np.floor(np.log10(period.min())),
+                               np.ceil(np.log10(period.max())) + 1, 1)
+    band_edges = np.asarray(band_edges, dtype=float)
+
+    if fold:
+        hist_max = 180
+    else:
+        hist_max = 360
+    bin_edges = np.linspace(0, hist_max, int(hist_max / bin_width) + 1)
+
+    log_period = np.broadcast_to(np.log10(period), strike_array.shape)
+    good = np.isfinite(strike_array) & (strike_array != 0)
+    hist = np.histogram2d(log_period[good],
+                          strike_array[good] % hist_max,
+                          bins=[band_edges, bin_edges])[0].astype(int)
+
+    return hist, band_edges, bin_edges
+
+
+def survey_strike(z_array, tipper_array=None, period=None, fold=True,
+                  pt_error_floor=None, skew_threshold=5,
+                  eccentricity_threshold=0.1, bin_width=5, n_processes=1,
+                  chunk_size=None):
+    """
+    Estimate strike angles and dimensionality for a whole survey at once
+    from impedance tensors on a common period axis.
+
+    The strike angles are in the convention plotted by
+    mtpy.imaging.plotstrike.PlotStrike: invariant and phase tensor strikes
+    are measured counter-clockwise from East, the tipper strike is the
+    negative angle of the real induction arrow.
+
+    Arguments
+    ------------
+
+        **z_array** : np.ndarray(n_stations, n_periods, 2, 2)
+                      impedance tensors, zeros where there is no data
+
+        **tipper_array** : np.ndarray(n_stations, n_periods, 1, 2)
+                           tipper, *default* is None for no tipper
+
+        **period** : np.ndarray(n_periods)
+                     periods in seconds, needed for the histograms
+                     *default* is None for no histograms
+
+        **fold** : [ True | False ]
+                   fold the angles to -90 to 90 if True, 0 to 360 otherwise
+
+        **pt_error_floor** : float
+                             maximum error in degrees allowed for the phase
+                             tensor strike, *default* is None
+
+        **skew_threshold** : float
+                             see dimensionality, *default* is 5 degrees
+
+        **eccentricity_threshold** : float
+                                     see dimensionality, *default* is 0.1
+
+        **bin_width** : float
+                        width of the histogram bins in degrees
+
+        **n_processes** : int
+                          number of processes to compute chunks of stations
+                          on, *default* is 1 to compute in this process
+
+        **chunk_size** : int
+                         number of stations per chunk, *default* is None
+                         to split the stations evenly over the processes
+
+    Returns
+    ----------
+
+        **strike_dict** : dictionary
+            * inv_strike, pt_strike, tip_strike: np.ndarray(n_stations,
+              n_periods) of strike angles in degrees
+            * dimensionality: np.ndarray(n_stations, n_periods, dtype=int)
+              of [ 0 | 1 | 2 | 3 ], 0 for no data
+            * inv_hist, pt_hist, tip_hist: np.ndarray(n_bands, n_bins) of
+              counts per decade of period, only if period is given
+            * band_edges, bin_edges: log10 period band edges and angle bin
+              edges of the histograms, only if period is given
+
+    Examples
+    ----------
+        :Survey Strike: ::
+
+            >>> import mtpy.analysis.geometry as geometry
+            >>> z = np.array([mt_obj.Z.z for mt_obj in mt_list])
+            >>> s_dict = geometry.survey_strike(z, period=1./freq,
+            >>>                                 n_processes=4)
+
+    """
+    z_array = np.asarray(z_array)
+    if z_array.ndim == 3:
+        z_array = z_array[np.newaxis]
+    if tipper_array is None:
+        tipper_array = np.zeros(z_array.shape[:2] + (1, 2), dtype=complex)
+    tipper_array = np.asarray(tipper_array).reshape(z_array.shape[:2] + (1, 2))
+
+    kwargs = {'fold': fold,
+              'pt_error_floor': pt_error_floor,
+              'skew_threshold': skew_threshold,
+              'eccentricity_threshold': eccentricity_threshold}
+
+    n_stations = z_array.shape[0]
+    if n_processes is None or n_processes <= 1 or n_stations < 2:
+        strike_dict = _survey_strike_chunk(z_array, tipper_array, **kwargs)
+    else:
+        if chunk_size is None:
+            chunk_size = int(np.ceil(n_stations / float(n_processes)))
+        chunk_size = max(int(chunk_size), 1)
+        starts = range(0, n_stations, chunk_size)
+        with ProcessPoolExecutor(max_workers=n_processes) as executor:
+            futures = [executor.submit(_survey_strike_chunk,
+                                       z_array[ii:ii + chunk_size],
+                                       tipper_array[ii:ii + chunk_size],
+                                       **kwargs)
+                       for ii in starts]
+            chunk_list = [future.result() for future in futures]
+        strike_dict = dict([(key, np.concatenate([chunk[key] for chunk
+                                                  in chunk_list]))
+                            for key in chunk_list[0].keys()])
+
+    if period is not None:
+        for key in ['inv', 'pt', 'tip']:
+            hist, band_edges, bin_edges = strike_histograms(
+                strike_dict['{0}_strike'.format(key)], period,
+                bin_width=bin_width, fold=fold)
+            strike_dict['{0}_hist'.format(key)] = hist
+        strike_dict['band_edges'] = band_edges
+        strike_dict['bin_edges'] = bin_edges
+
+    return strike_dict
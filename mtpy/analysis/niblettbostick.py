@@ -19,17 +19,12 @@ Niblett-Bostick transformations are possible in 1D and 2D.
 """
 
 # =================================================================
-import copy
-
 import numpy as np
-import scipy.interpolate as spi
 
 import mtpy.analysis.geometry as MTge
-import mtpy.core.z as MTz
+import mtpy.analysis.pt as MTpt
 import mtpy.utils.calculator as MTcc
 
-#reload(MTz)
-
 
 def rhophi2rhodepth(rho, phase, period):
     """
@@ -59,6 +54,143 @@ def rhophi2rhodepth(rho, phase, period):
     return rho_nb, depth
 
 
+def _z2resphi(z_array, periods):
+    """
+    apparent resistivity (Ohm meters) and phase (degrees) of a stack of
+    impedance tensors (..., 2, 2) at periods (...), as for the Z object
+    """
+    z_array = np.asarray(z_array)
+    periods = np.asarray(periods)[..., None, None]
+
+    return 0.2 * np.abs(z_array) ** 2 * periods, \
+        np.rad2deg(np.angle(z_array))
+
+
+def _interpolate_along_periods(values, periods, valid, fill_value=0.):
+    """
+    linear interpolation (w.r.t. the periods) of values along the last axis
+    from the valid entries, fill_value where there is no valid entry on
+    either side
+    """
+    values = np.asarray(values, dtype=float)
+    periods = np.broadcast_to(periods, values.shape)
+    valid = np.broadcast_to(valid, values.shape)
+    n = values.shape[-1]
+
+    # sort ascending by periods
+    order = np.argsort(periods, axis=-1, kind='mergesort')
+    per = np.take_along_axis(periods, order, axis=-1)
+    val = np.take_along_axis(values, order, axis=-1)
+    ok = np.take_along_axis(valid, order, axis=-1)
+
+    # index of the valid entry before and after each entry
+    index = np.arange(n)
+    prev = np.maximum.accumulate(np.where(ok, index, -1), axis=-1)
+    after = np.flip(np.minimum.accumulate(np.flip(np.where(ok, index, n), -1),
+                                          axis=-1), -1)
+    inside = (prev >= 0) & (after < n)
+    prev = np.clip(prev, 0, n - 1)
+    after = np.clip(after, 0, n - 1)
+
+    per1 = np.take_along_axis(per, prev, axis=-1)
+    per2 = np.take_along_axis(per, after, axis=-1)
+    val1 = np.take_along_axis(val, prev, axis=-1)
+    val2 = np.take_along_axis(val, after, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step = np.where(per2 == per1, 0., (per - per1) / (per2 - per1))
+    new_val = np.where(inside, val1 + (val2 - val1) * step, fill_value)
+
+    # back to the input order
+    new_values = np.empty_like(new_val)
+    np.put_along_axis(new_values, order, new_val, axis=-1)
+
+    return new_values
+
+
+def _interpolate_strike(angles, periods, include):
+    """
+    interpolate strike angles over 1D (nan) entries along the last axis,
+    entries where include is False are skipped.  Undefined angles at the
+    shortest and longest included period are set to 0.
+    """
+    angles = np.array(angles, dtype=float)
+    periods = np.broadcast_to(periods, angles.shape)
+    include = np.broadcast_to(include, angles.shape)
+    valid = include & ~np.isnan(angles)
+
+    # first and last included entry in order of period
+    first = np.argmin(np.where(include, periods, np.inf), axis=-1)[..., None]
+    last = np.argmax(np.where(include, periods, -np.inf), axis=-1)[..., None]
+    for end in [first, last]:
+        end_ok = np.take_along_axis(include, end, axis=-1)
+        end_angle = np.take_along_axis(angles, end, axis=-1)
+        np.put_along_axis(angles, end,
+                          np.where(end_ok, np.nan_to_num(end_angle), end_angle),
+                          axis=-1)
+        valid = valid.copy()
+        np.put_along_axis(valid, end, end_ok, axis=-1)
+
+    return _interpolate_along_periods(angles, periods, valid)
+
+
+def calculate_znb_array(z_array, periods):
+    """
+    Niblett-Bostick transformed TE and TM modes for a stack of impedance
+    tensors, e.g. (n_stations, n_periods, 2, 2) for a survey.
+
+    Each Z(T) is rotated into its strike direction (interpolated over 1D
+    periods, see interpolate_strike_angles) and the off-diagonal elements
+    are transformed by rhophi2rhodepth.  The mode with the larger resistivity
+    is returned as the maximum.
+
+    Arguments
+    -------------
+        *z_array* : np.ndarray(..., num_periods, 2, 2)
+
+        *periods* : np.ndarray(num_periods) or np.ndarray(..., num_periods)
+
+    Returns
+    ------------------
+        *nb_max* : np.ndarray(..., num_periods, 2)
+                   depth (m) and resistivity (Ohm-m) of the larger mode
+
+        *nb_min* : np.ndarray(..., num_periods, 2)
+                   depth (m) and resistivity (Ohm-m) of the smaller mode
+
+        3D parts of Z are nan.
+    """
+    z_array = np.asarray(z_array)
+    periods = np.broadcast_to(np.asarray(periods, dtype=float),
+                              z_array.shape[:-2])
+
+    pt_array = MTpt.z2pt_array(z_array)
+    dimensions = MTge._dimensionality_from_pt(pt_array)
+    angles = MTge._strike_from_pt(pt_array, dimensions)[..., 0]
+    angles_incl1D = _interpolate_strike(angles, periods, dimensions != 3)
+
+    z_rot = MTcc.rotatematrix_array(z_array, -angles_incl1D)
+    app_res, phase = _z2resphi(z_rot, periods)
+
+    # at this point we assume that the two modes are the off-diagonal elements!!
+    # TE is element (1,2), TM at (2,1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        te_rho, te_depth = rhophi2rhodepth(app_res[..., 0, 1],
+                                           phase[..., 0, 1], periods)
+        tm_rho, tm_depth = rhophi2rhodepth(app_res[..., 1, 0],
+                                           phase[..., 1, 0], periods)
+
+    te_max = (te_rho > tm_rho)[..., None]
+    te = np.stack([te_depth, te_rho], axis=-1)
+    tm = np.stack([tm_depth, tm_rho], axis=-1)
+    nb_max = np.where(te_max, te, tm)
+    nb_min = np.where(te_max, tm, te)
+
+    nb_max[dimensions == 3] = np.nan
+    nb_min[dimensions == 3] = np.nan
+
+    return nb_max, nb_min
+
+
 def calculate_znb(z_object=None, z_array=None, periods=None):
     """
     Determine an array of Z_nb (depth dependent Niblett-Bostick transformed Z)
@@ -94,52 +226,82 @@ def calculate_znb(z_object=None, z_array=None, periods=None):
     """
 
     # deal with inputs
-    # if zobject:
-    # z = z_object.z
-    # periods = 1./z_object.freq
-    # else:
-    z = z_array
-    periods = periods
+    if z_object is not None:
+        z = z_object.z
+        periods = 1. / z_object.freq
+    else:
+        z = np.asarray(z_array)
+        periods = np.asarray(periods)
 
-    dimensions = MTge.dimensionality(z)
-    angles = MTge.strike_angle(z)
+    nb_max, nb_min = calculate_znb_array(z, periods)
 
     # reduce actual Z by the 3D layers:
-    z2 = z[np.where(dimensions != 3)[0]]
-    angles2 = angles[np.where(dimensions != 3)[0]]
-    periods2 = periods[np.where(dimensions != 3)[0]]
+    dimensions = MTge._dimensionality_from_pt(MTpt.z2pt_array(z))
 
-    angles_incl1D = interpolate_strike_angles(angles2[:, 0], periods2)
+    return nb_max[dimensions != 3], nb_min[dimensions != 3]
 
-    z3 = MTz.rotate_z(z2, -angles_incl1D)[0]
 
-    # at this point we assume that the two modes are the off-diagonal elements!!
-    # TE is element (1,2), TM at (2,1)
-    lo_nb_max = []
-    lo_nb_min = []
+def calculate_depth_nb_array(z_array, periods):
+    """
+    Niblett-Bostick depth and resistivity estimates for a stack of impedance
+    tensors, e.g. (n_stations, n_periods, 2, 2) for a survey, see
+    calculate_depth_nb.
+
+    The strike angle of the 1D and 2D parts of Z is interpolated onto all
+    periods of each station (0 outside the 1D/2D period range), Z is rotated
+    to strike and the off-diagonal elements are transformed by
+    rhophi2rhodepth.
 
-    app_res = MTz.z2resphi(z3, periods2)[0]
-    phase = MTz.z2resphi(z3, periods2)[1]
+    Arguments
+    -------------
+        *z_array* : np.ndarray(..., num_periods, 2, 2)
 
-    for i, per in enumerate(periods):
+        *periods* : np.ndarray(num_periods) or np.ndarray(..., num_periods)
 
-        te_rho, te_depth = rhophi2rhodepth(
-            app_res[i][
-                0, 1], phase[i][
-                0, 1], per)
-        tm_rho, tm_depth = rhophi2rhodepth(
-            app_res[i][
-                1, 0], phase[i][
-                1, 0], per)
+    Returns
+    ------------------
+        *depth_array* : np.ndarray(..., num_periods,
+                                   dtype=['period', 'depth_min', 'depth_max',
+                                          'rho_min', 'rho_max'])
+    """
+    z_array = np.asarray(z_array)
+    periods = np.broadcast_to(np.asarray(periods, dtype=float),
+                              z_array.shape[:-2])
 
-        if te_rho > tm_rho:
-            lo_nb_max.append([te_depth, te_rho])
-            lo_nb_min.append([tm_depth, tm_rho])
-        else:
-            lo_nb_min.append([te_depth, te_rho])
-            lo_nb_max.append([tm_depth, tm_rho])
+    pt_array = MTpt.z2pt_array(z_array)
+    dimensions = MTge._dimensionality_from_pt(pt_array)
+    angles = MTge._strike_from_pt(pt_array, dimensions)[..., 0]
 
-    return np.array(lo_nb_max), np.array(lo_nb_min)
+    # interpolate the strike angles of the 1D and 2D parts onto all periods
+    strike_angles = _interpolate_along_periods(np.nan_to_num(angles),
+                                               periods, dimensions != 3,
+                                               fill_value=0)
+
+    # rotate z to be along the interpolated strike angles
+    z_rot = MTcc.rotatematrix_array(z_array, strike_angles)
+    app_res, phase = _z2resphi(z_rot, periods)
+
+    # at this point we assume that the two modes are the off-diagonal elements!!
+    # TE is element (1,2), TM at (2,1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        te_rho, te_depth = rhophi2rhodepth(app_res[..., 0, 1],
+                                           phase[..., 0, 1], periods)
+        tm_rho, tm_depth = rhophi2rhodepth(app_res[..., 1, 0],
+                                           phase[..., 1, 0], periods)
+
+    depth_array = np.zeros(periods.shape,
+                           dtype=[('period', np.float),
+                                  ('depth_min', np.float),
+                                  ('depth_max', np.float),
+                                  ('rho_min', np.float),
+                                  ('rho_max', np.float)])
+    depth_array['period'] = periods
+    depth_array['depth_min'] = np.minimum(te_depth, tm_depth)
+    depth_array['depth_max'] = np.maximum(te_depth, tm_depth)
+    depth_array['rho_min'] = np.minimum(te_rho, tm_rho)
+    depth_array['rho_max'] = np.maximum(te_rho, tm_rho)
+
+    return depth_array
 
 
 def calculate_depth_nb(z_object=None, z_array=None, periods=None):
@@ -205,76 +367,102 @@ def calculate_depth_nb(z_object=None, z_array=None, periods=None):
 
     # deal with inputs
     if z_object is not None:
-        z_obj = z_object
-        periods = 1./z_object.freq
-    else:
-        z_obj = MTz.Z(z_array=z_array, freq=1./periods)
-        periods = periods
+        z_array = z_object.z
+        periods = 1. / z_object.freq
 
-    dimensions = MTge.dimensionality(z_array=z_obj.z)
-    angles = MTge.strike_angle(z_array=z_obj.z)
+    return calculate_depth_nb_array(z_array, periods)
 
-    # reduce actual Z by the 3D layers:
-    #    z_2d = z[np.where(dimensions != 3)[0]]
-    angles_2d = np.nan_to_num(angles[np.where(dimensions != 3)][:, 0])
-    periods_2d = periods[np.where(dimensions != 3)]
 
-    # interperpolate strike angle onto all periods
-    # make a function for strike using only 2d angles
-    strike_interp = spi.interp1d(periods_2d, angles_2d,
-                                 bounds_error=False,
-                                 fill_value=0)
-    strike_angles = strike_interp(periods)
+def calculate_rho_minmax_array(z_array, periods, rotsteps=360):
+    """
+    Niblett-Bostick transformed maximum and minimum apparent resistivities of
+    a stack of impedance tensors, e.g. (n_stations, n_periods, 2, 2), from a
+    sweep of rotation angles over 0 - 180 degrees, see calculate_rho_minmax.
 
-    # rotate z to be along the interpolated strike angles
-    z_obj.rotate(strike_angles)
-    
-#    angles_incl1D = interpolate_strike_angles(angles_2d, periods_2d)
-	
-#    z3 = MTz.rotate_z(z_2d, -angles_incl1D)[0]
+    The sweep is a broadcast over the rotation angles, done in chunks of
+    impedance tensors to limit the memory used.
 
-    # at this point we assume that the two modes are the off-diagonal elements!!
-    # TE is element (1,2), TM at (2,1)
-    #    lo_nb_max = []
-    #    lo_nb_min = []
+    Arguments
+    -------------
+        *z_array* : np.ndarray(..., num_periods, 2, 2)
 
-    depth_array = np.zeros(periods.shape[0],
-                           dtype=[('period', np.float),
-                                  ('depth_min', np.float),
-                                  ('depth_max', np.float),
-                                  ('rho_min', np.float),
-                                  ('rho_max', np.float)])
+        *periods* : np.ndarray(num_periods) or np.ndarray(..., num_periods)
 
-##    app_res, app_res_err, phase, phase_err = MTz.z2resphi(z3, periods_2d)
-#    app_res, app_res_err, phase, phase_err = MTz.z2resphi(z_rot, periods)
-
-    for ii, per in enumerate(periods):
-        te_rho, te_depth = rhophi2rhodepth(z_obj.resistivity[ii, 0, 1],
-                                           z_obj.phase[ii, 0, 1],
-                                           per)
-        tm_rho, tm_depth = rhophi2rhodepth(z_obj.resistivity[ii, 1, 0],
-                                           z_obj.phase[ii, 1, 0],
-                                           per)
-        depth_array[ii]['period'] = per
-        depth_array[ii]['depth_min'] = min([te_depth, tm_depth])
-        depth_array[ii]['depth_max'] = max([te_depth, tm_depth])
-        depth_array[ii]['rho_min'] = min([te_rho, tm_rho])
-        depth_array[ii]['rho_max'] = max([te_rho, tm_rho])
+        *rotsteps* : int
+                     number of rotation angles
 
-    return depth_array
+    Returns
+    ------------------
+        *nb_max* : np.ndarray(..., num_periods, 3)
+                   depth (m), resistivity (Ohm-m) and rotation angle (deg)
+                   of the maximum
+
+        *nb_min* : np.ndarray(..., num_periods, 2)
+                   depth (m) and resistivity (Ohm-m) of the minimum
+
+        3D parts of Z are nan.
+    """
+    z_array = np.asarray(z_array)
+    periods = np.broadcast_to(np.asarray(periods, dtype=float),
+                              z_array.shape[:-2])
+    shape = periods.shape
 
+    dimensions = MTge._dimensionality_from_pt(MTpt.z2pt_array(z_array))
 
-#        if te_rho > tm_rho:
-#            lo_nb_max.append([te_depth, te_rho])
-#            lo_nb_min.append([tm_depth, tm_rho])
-#
-#        else:
-#            lo_nb_min.append([te_depth, te_rho])
-#            lo_nb_max.append([tm_depth, tm_rho])
+    z_flat = z_array.reshape(-1, 2, 2)
+    per_flat = periods.reshape(-1)
+    nz = per_flat.size
 
-# return arrays of the min and max depths
+    nb_max = np.full((nz, 3), np.nan)
+    nb_min = np.full((nz, 2), np.nan)
 
-#    return np.array(lo_nb_max), np.array(lo_nb_min)
+    rotangles = np.arange(rotsteps) * 180. / rotsteps
+    phi = np.radians(rotangles % 360)
+    cc = np.cos(phi) ** 2
+    ss = np.sin(phi) ** 2
+    cs = np.cos(phi) * np.sin(phi)
+
+    chunk_size = max(1, 2 ** 22 // rotsteps)
+    for start in range(0, nz, chunk_size):
+        zz = z_flat[start:start + chunk_size, :, :, None]
+        per = per_flat[start:start + chunk_size, None]
+
+        # off-diagonal elements of R Z R^T for all rotation angles
+        z_xy = -cs * zz[:, 0, 0] + cc * zz[:, 0, 1] - ss * zz[:, 1, 0] + \
+            cs * zz[:, 1, 1]
+        z_yx = -cs * zz[:, 0, 0] - ss * zz[:, 0, 1] + cc * zz[:, 1, 0] + \
+            cs * zz[:, 1, 1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            te_rho, te_depth = rhophi2rhodepth(0.2 * np.abs(z_xy) ** 2 * per,
+                                               np.rad2deg(np.angle(z_xy)),
+                                               per)
+            tm_rho, tm_depth = rhophi2rhodepth(0.2 * np.abs(z_yx) ** 2 * per,
+                                               np.rad2deg(np.angle(z_yx)),
+                                               per)
+
+        # maximum over all rotation angles of both modes, TE and TM swap
+        # for a rotation of 90 degrees so the first one found is used
+        rho_all = np.concatenate([te_rho, tm_rho], axis=1)
+        depth_all = np.concatenate([te_depth, tm_depth], axis=1)
+        maxidx = np.argmax(rho_all, axis=1)
+        rows = np.arange(maxidx.size)
+        nb_max[start:start + chunk_size, 0] = depth_all[rows, maxidx]
+        nb_max[start:start + chunk_size, 1] = rho_all[rows, maxidx]
+        nb_max[start:start + chunk_size, 2] = rotangles[maxidx % rotsteps]
+
+        # minimum is the other mode at the same angle, which is the same as
+        # the mode of the maximum rotated by 90 degrees
+        minidx = (maxidx + rotsteps) % (2 * rotsteps)
+        nb_min[start:start + chunk_size, 0] = depth_all[rows, minidx]
+        nb_min[start:start + chunk_size, 1] = rho_all[rows, minidx]
+
+    nb_max = nb_max.reshape(shape + (3,))
+    nb_min = nb_min.reshape(shape + (2,))
+    nb_max[dimensions == 3] = np.nan
+    nb_min[dimensions == 3] = np.nan
+
+    return nb_max, nb_min
 
 
 def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
@@ -290,15 +478,16 @@ def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
 
     output:
     - n x 3 array, depth/rho_nb/angle for rho_nb max
-    - n x 3 array, depth/rho_nb/angle for rho_nb min
+    - n x 2 array, depth/rho_nb for rho_nb min
 
     The calculation is carried out by :
 
     1) Determine the dimensionality of the Z(T), discard all 3D parts
-    2) loop over periods
-       * rotate Z and calculate app_res_NB for off-diagonal elements
-       * find maximum and minimum values
-       * write out respective depths and rho values
+    2) rotate Z over 0 - 180 degrees and calculate app_res_NB for
+       off-diagonal elements
+    3) find the maximum value over all angles and both modes, the minimum
+       is the other mode at the angle of the maximum
+    4) write out respective depths and rho values
 
 
     Note:
@@ -307,70 +496,19 @@ def calculate_rho_minmax(z_object=None, z_array=None, periods=None):
     """
 
     # deal with inputs
-    # if zobject:
-    # z = z_object.z
-    # periods = 1./z_object.freq
-    # else:
-    z = z_array
-    periods = periods
+    if z_object is not None:
+        z = z_object.z
+        periods = 1. / z_object.freq
+    else:
+        z = np.asarray(z_array)
+        periods = np.asarray(periods)
 
-    dimensions = MTge.dimensionality(z)
-    angles = MTge.strike_angle(z)
+    nb_max, nb_min = calculate_rho_minmax_array(z, periods)
 
     # reduce actual Z by the 3D layers:
-    z2 = z[np.where(dimensions != 3)[0]]
-    angles2 = angles[np.where(dimensions != 3)[0]]
-    periods2 = periods[np.where(dimensions != 3)[0]]
-
-    lo_nb_max = []
-    lo_nb_min = []
-
-    rotsteps = 360
-    rotangles = np.arange(rotsteps) * 180. / rotsteps
+    dimensions = MTge._dimensionality_from_pt(MTpt.z2pt_array(z))
 
-    for i, per in enumerate(periods2):
-        z_curr = z2[i]
-        temp_vals = np.zeros((rotsteps, 4))
-
-        for jj, d in enumerate(rotangles):
-            new_z = MTcc.rotatematrix_incl_errors(z_curr, d)[0]
-            # print i,per,jj,d
-
-            res = MTz.z2resphi(new_z, per)[0]
-            phs = MTz.z2resphi(new_z, per)[1]
-
-            te_rho, te_depth = rhophi2rhodepth(res[0, 1], phs[0, 1], per)
-            tm_rho, tm_depth = rhophi2rhodepth(res[1, 0], phs[1, 0], per)
-
-            temp_vals[jj, 0] = te_depth
-            temp_vals[jj, 1] = te_rho
-            temp_vals[jj, 2] = tm_depth
-            temp_vals[jj, 3] = tm_rho
-
-        column = (np.argmax([np.max(temp_vals[:, 1]),
-                             np.max(temp_vals[:, 3])])) * 2 + 1
-
-        maxidx = np.argmax(temp_vals[:, column])
-        max_rho = temp_vals[maxidx, column]
-        max_depth = temp_vals[maxidx, column - 1]
-        max_ang = rotangles[maxidx]
-
-        # alternative 1
-        min_column = (np.argmin([np.max(temp_vals[:, 1]),
-                                 np.max(temp_vals[:, 3])])) * 2 + 1
-        if max_ang <= 90:
-            min_ang = max_ang + 90
-        else:
-            min_ang = max_ang - 90
-        minidx = np.argmin(np.abs(rotangles - min_ang))
-
-        min_rho = temp_vals[minidx, min_column]
-        min_depth = temp_vals[minidx, min_column - 1]
-
-        lo_nb_max.append([max_depth, max_rho, max_ang])
-        lo_nb_min.append([min_depth, min_rho])
-
-    return np.array(lo_nb_max), np.array(lo_nb_min)
+    return nb_max[dimensions != 3], nb_min[dimensions != 3]
 
 
 def interpolate_strike_angles(angles, in_periods):
@@ -378,55 +516,12 @@ def interpolate_strike_angles(angles, in_periods):
     expect 2 arrays
 
     1. sort ascending by periods
-    2. loop over angles to find 'nan' values (i.e. 1D layers)
+    2. find 'nan' values (i.e. 1D layers)
     3. determine linear interpolation between bounding 2D strike angles
     4. if 1D on top or bottom, set to 0 degrees
+
+    The angles can be a stack (..., num_periods) with periods along the
+    last axis.
     """
 
-    new_angles = copy.copy(angles)
-
-    # sort in ascending order:
-    orig_sorting = np.argsort(in_periods)
-    back_sorting = np.argsort(orig_sorting)
-    angles = angles[orig_sorting]
-    periods = in_periods[orig_sorting]
-
-    in_line = 0
-    while in_line < len(angles):
-        curr_per = periods[in_line]
-        curr_ang = angles[in_line]
-        if np.isnan(curr_ang):
-            if in_line in [0, len(angles) - 1]:
-                new_angles[in_line] = 0.
-                in_line += 1
-                continue
-
-            # otherwise:
-            # use value before current one:
-            ang1 = new_angles[in_line - 1]
-            per1 = periods[in_line - 1]
-            # check for next non-nan:
-            ang2 = None
-
-            jj = in_line
-            print(in_line)
-            while jj < len(angles):
-                jj += 1
-                if not np.isnan(angles[jj]):
-                    per2 = periods[jj]
-                    ang2 = angles[jj]
-                    break
-            # catch case of all nan:
-            if ang2 is None:
-                ang2 = 0.
-
-            delta_per = per2 - per1
-            delta_ang = ang2 - ang1
-            per_step = periods[in_line] - per1
-            new_angles[in_line] = ang1 + delta_ang / delta_per * per_step
-            print(jj)
-
-        in_line += 1
-
-    # asserting correct order (same as input) of the angles:
-    return new_angles[back_sorting]
+    return _interpolate_strike(angles, in_periods, True)
@@ -1309,6 +1309,90 @@ def z2pt(z_array, z_err_array=None):
     return pt_array, pt_err_array
 
 
+def z2pt_array(z_array):
+    """
+        Calculate the phase tensor for a stack of impedance tensors at once,
+        e.g. (nf, 2, 2) for one station or (n_stations, nf, 2, 2) for a
+        survey on a common period axis.
+
+        Where the real part of Z is singular the phase tensor is set to
+        zeros, as for the PhaseTensor object, without printing a warning.
+
+        Input:
+        - Z : (..., 2, 2) complex valued Numpy array
+
+        Return:
+        - PT : (..., 2, 2) real valued Numpy array
+
+    """
+    z_array = np.asarray(z_array)
+    realz = np.real(z_array)
+    imagz = np.imag(z_array)
+    detreal = realz[..., 0, 0] * realz[..., 1, 1] - \
+              realz[..., 0, 1] * realz[..., 1, 0]
+
+    pt_array = np.zeros(z_array.shape, dtype=float)
+    pt_array[..., 0, 0] = realz[..., 1, 1] * imagz[..., 0, 0] - \
+                          realz[..., 0, 1] * imagz[..., 1, 0]
+    pt_array[..., 0, 1] = realz[..., 1, 1] * imagz[..., 0, 1] - \
+                          realz[..., 0, 1] * imagz[..., 1, 1]
+    pt_array[..., 1, 0] = realz[..., 0, 0] * imagz[..., 1, 0] - \
+                          realz[..., 1, 0] * imagz[..., 0, 0]
+    pt_array[..., 1, 1] = realz[..., 0, 0] * imagz[..., 1, 1] - \
+                          realz[..., 1, 0] * imagz[..., 0, 1]
+
+    singular = detreal == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pt_array /= np.where(singular, 1., detreal)[..., None, None]
+    pt_array[singular] = 0
+
+    return pt_array
+
+
+def pt_parameters(pt_array):
+    """
+        Calculate the phase tensor parameters for a stack of phase tensors,
+        with the same definitions as the PhaseTensor properties.
+
+        Input:
+        - PT : (..., 2, 2) real valued Numpy array
+
+        Return:
+        - dictionary with keys alpha, beta, azimuth, skew, phimin, phimax,
+          ellipticity, pi1 and pi2, each a Numpy array of shape
+          pt_array.shape[:-2], angles in degrees
+
+    """
+    pt_array = np.asarray(pt_array)
+    pt_dict = {}
+    pt_dict['alpha'] = np.degrees(0.5 * np.arctan2(
+        pt_array[..., 0, 1] + pt_array[..., 1, 0],
+        pt_array[..., 0, 0] - pt_array[..., 1, 1]))
+    pt_dict['beta'] = np.degrees(0.5 * np.arctan2(
+        pt_array[..., 0, 1] - pt_array[..., 1, 0],
+        pt_array[..., 0, 0] + pt_array[..., 1, 1]))
+    pt_dict['azimuth'] = pt_dict['alpha'] - pt_dict['beta']
+    pt_dict['skew'] = pt_array[..., 0, 1] - pt_array[..., 1, 0]
+
+    # after bibby et al. 2005
+    pt_dict['pi1'] = 0.5 * np.sqrt((pt_array[..., 0, 0] -
+                                    pt_array[..., 1, 1]) ** 2 +
+                                   (pt_array[..., 0, 1] +
+                                    pt_array[..., 1, 0]) ** 2)
+    pt_dict['pi2'] = 0.5 * np.sqrt((pt_array[..., 0, 0] +
+                                    pt_array[..., 1, 1]) ** 2 +
+                                   (pt_array[..., 0, 1] -
+                                    pt_array[..., 1, 0]) ** 2)
+    pt_dict['phimin'] = np.degrees(np.arctan(pt_dict['pi2'] - pt_dict['pi1']))
+    pt_dict['phimax'] = np.degrees(np.arctan(pt_dict['pi2'] + pt_dict['pi1']))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pt_dict['ellipticity'] = (pt_dict['phimax'] - pt_dict['phimin']) / \
+                                 (pt_dict['phimax'] + pt_dict['phimin'])
+
+    return pt_dict
+
+
 def z_object2pt(z_object):
     """
         Calculate Phase Tensor from Z object (incl. uncertainties)
@@ -13,11 +13,15 @@ Created on Mon Aug 19 10:06:21 2013
 
 # ==============================================================================
 import os
+import warnings
 
 import numpy as np
+from scipy.spatial import cKDTree
 
 import mtpy.core.mt as mt
 import mtpy.imaging.mtplot as mtplot
+from mtpy.utils.calculator import interpolate_rows
+import mtpy.utils.gis_tools as gis_tools
 
 
 # ==============================================================================
@@ -32,6 +36,9 @@ def estimate_static_spatial_median(edi_fn, radius=1000., num_freq=20,
     it is larger than the shift tolerance away from 1.  A new edi file will
     be written in a new folder called SS.
 
+    Every edi file in the directory is read for each call, use
+    estimate_static_shift_survey to correct a whole survey.
+
     Arguments
     -----------------
         **edi_fn** : string
@@ -202,24 +209,268 @@ def remove_static_shift_spatial_filter(edi_fn, radius=1000, num_freq=20,
                                                 radius=radius,
                                                 num_freq=num_freq,
                                                 freq_skip=freq_skip,
-                                                shift_tol=.15)
+                                                shift_tol=shift_tol)
     mt_obj = mt.MT(edi_fn)
 
-    s, z_ss = mt_obj.Z.no_ss(reduce_res_factor_x=ss_x,
-                             reduce_res_factor_y=ss_y)
-    edi_path = os.path.dirname(edi_fn)
-
-    mt_obj.Z.z = z_ss
-    new_edi_fn = os.path.join(
-        edi_path, 'SS', '{0}_ss.edi'.format(
-            mt_obj.station))
-    if not os.path.exists(os.path.dirname(new_edi_fn)):
-        os.mkdir(os.path.dirname(new_edi_fn))
-    mt_obj.write_edi_file(new_fn=new_edi_fn)
+    new_edi_fn = _write_static_shift_edi(
+        mt_obj, ss_x, ss_y,
+        os.path.join(os.path.dirname(edi_fn), 'SS',
+                     '{0}_ss.edi'.format(mt_obj.station)))
+    s = np.sqrt(np.array([[ss_x, 0], [0, ss_y]]))
 
     if plot == True:
         rpm = mtplot.plot_multiple_mt_responses(fn_list=[edi_fn, new_edi_fn],
                                                 plot_style='compare')
-        return new_edi_fn, s[0], rpm
+        return new_edi_fn, s, rpm
     else:
-        return new_edi_fn, s[0], None
+        return new_edi_fn, s, None
+
+
+def _write_static_shift_edi(mt_obj, ss_x, ss_y, new_edi_fn):
+    """
+    write a copy of mt_obj with the static shift factors removed to new_edi_fn
+    """
+    new_z_obj = mt_obj.remove_static_shift(ss_x=ss_x, ss_y=ss_y)
+    if not os.path.exists(os.path.dirname(new_edi_fn)):
+        os.makedirs(os.path.dirname(new_edi_fn))
+
+    return mt_obj.write_mt_file(save_dir=os.path.dirname(new_edi_fn),
+                                fn_basename=os.path.basename(new_edi_fn),
+                                new_Z_obj=new_z_obj,
+                                new_Tipper_obj=mt_obj.Tipper)
+
+
+def get_station_neighbours(east, north, radius):
+    """
+    find the stations within radius of each station with a KD-tree.
+
+    :param east: np.ndarray(n_stations) of easting in meters
+    :param north: np.ndarray(n_stations) of northing in meters
+    :param radius: search radius in meters
+    :returns: (station_index, neighbour_index, distance) np.ndarrays with one
+              entry for each pair of stations closer than radius, the station
+              itself is not counted as a neighbour.
+    """
+    xy = np.array([east, north], dtype=float).T
+    tree = cKDTree(xy)
+    neighbour_list = tree.query_ball_point(xy, r=radius)
+
+    station_index = np.repeat(np.arange(len(neighbour_list)),
+                              [len(nb) for nb in neighbour_list])
+    neighbour_index = np.array([jj for nb in neighbour_list for jj in nb],
+                               dtype=int)
+    keep = station_index != neighbour_index
+    station_index = station_index[keep]
+    neighbour_index = neighbour_index[keep]
+
+    distance = np.sqrt(((xy[station_index] - xy[neighbour_index]) ** 2).sum(axis=1))
+
+    return station_index, neighbour_index, distance
+
+
+def estimate_static_shift_survey(edi_list=None, mt_obj_list=None,
+                                 radius=1000., num_freq=20, freq_skip=4,
+                                 shift_tol=.15, datum='WGS84', epsg=None):
+    """
+    Estimate the static shift of every station in a survey with a spatial
+    median filter in one go.
+
+    This does the same as estimate_static_spatial_median for each station,
+    but every edi file is read only once, the stations within radius are
+    found with a KD-tree on the projected station locations and the
+    resistivities of the neighbours of all stations are interpolated onto
+    the target frequencies of each station at once.  Frequencies where a
+    neighbour has no data are left out of the median.
+
+    Arguments
+    -----------------
+        **edi_list** : list
+                       list of full paths to the edi files of the survey
+
+        **mt_obj_list** : list
+                          list of mtpy.core.mt.MT objects, used instead of
+                          edi_list if given
+
+        **radius** : float
+                     radius to look for nearby stations, in meters.
+                     *default* is 1000 m
+
+        **num_freq** : int
+                       number of frequencies calculate the median static
+                       shift, see estimate_static_spatial_median.
+                       *default* is 20
+
+        **freq_skip** : int
+                        number of frequencies to skip from the highest
+                        frequency. *default* is 4
+
+        **shift_tol** : float
+                        If 1-tol < correction < 1+tol then the correction
+                        factor is set to 1.  *default* is 0.15
+
+        **datum** : string
+                    datum of the station locations, *default* is 'WGS84'
+
+        **epsg** : int
+                   EPSG number of the projection to compute distances in,
+                   *default* is None for the UTM zone of the survey centre
+
+    Returns
+    ----------------
+
+        **ss_dict** : dictionary
+            * station, fn: np.ndarray(n_stations) of station names and files
+            * ss_x, ss_y: np.ndarray(n_stations) static shift corrections
+              for the x and y modes
+            * n_neighbours: np.ndarray(n_stations) number of stations within
+              radius
+
+    :Example: ::
+
+        >>> import glob
+        >>> import mtpy.analysis.staticshift as ss
+        >>> edi_list = glob.glob(r"/home/mt/edi_files/*.edi")
+        >>> ss_dict = ss.estimate_static_shift_survey(edi_list, radius=2000)
+
+    """
+    if mt_obj_list is None:
+        mt_obj_list = [mt.MT(edi_fn) for edi_fn in edi_list]
+    ns = len(mt_obj_list)
+
+    # stack the off-diagonal impedances, nan where there is no data
+    nf = max([max(mt_obj.Z.freq.size for mt_obj in mt_obj_list),
+              freq_skip + num_freq])
+    freq = np.full((ns, nf), np.nan)
+    z = np.full((ns, nf, 2), np.nan, dtype=complex)
+    for ii, mt_obj in enumerate(mt_obj_list):
+        nf_ii = mt_obj.Z.freq.size
+        freq[ii, :nf_ii] = mt_obj.Z.freq
+        z[ii, :nf_ii, 0] = mt_obj.Z.z[:, 0, 1]
+        z[ii, :nf_ii, 1] = mt_obj.Z.z[:, 1, 0]
+    z[z == 0] = np.nan
+
+    ss_dict = {'station': np.array([mt_obj.station for mt_obj in mt_obj_list]),
+               'fn': np.array([mt_obj.fn for mt_obj in mt_obj_list]),
+               'ss_x': np.ones(ns),
+               'ss_y': np.ones(ns),
+               'n_neighbours': np.zeros(ns, dtype=int)}
+    if ns < 2:
+        return ss_dict
+
+    # find neighbours in projected coordinates
+    lat = np.array([mt_obj.lat for mt_obj in mt_obj_list], dtype=float)
+    lon = np.array([mt_obj.lon for mt_obj in mt_obj_list], dtype=float)
+    utm_points = gis_tools.project_point_ll2utm(lat, lon, datum=datum,
+                                                epsg=epsg)
+    station_index, neighbour_index, distance = \
+        get_station_neighbours(utm_points['easting'], utm_points['northing'],
+                               radius)
+    ss_dict['n_neighbours'] = np.bincount(station_index, minlength=ns)
+    if station_index.size == 0:
+        return ss_dict
+
+    # resistivity of each station at its own target frequencies
+    target_freq = freq[:, freq_skip:freq_skip + num_freq]
+    target_res = 0.2 / target_freq[:, :, np.newaxis] * \
+        np.abs(z[:, freq_skip:freq_skip + num_freq]) ** 2
+
+    # interpolate the x and y modes of each neighbour onto the target
+    # frequencies of the station it is a neighbour of, one row per station,
+    # neighbour and mode
+    pair_freq = np.repeat(target_freq[station_index], 2, axis=0)
+    z_interp = interpolate_rows(
+        np.repeat(freq[neighbour_index], 2, axis=0),
+        z[neighbour_index].transpose(0, 2, 1).reshape(-1, nf),
+        pair_freq)
+    neighbour_res = (0.2 / pair_freq * np.abs(z_interp) ** 2).reshape(
+        -1, 2, num_freq).transpose(0, 2, 1)
+
+    # median over the neighbours of each station
+    rank = np.arange(station_index.size) - \
+        np.searchsorted(station_index, station_index)
+    res_array = np.full((ns, rank.max() + 1, num_freq, 2), np.nan)
+    res_array[station_index, rank] = neighbour_res
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        static_shift = np.nanmedian(target_res / np.nanmedian(res_array, axis=1),
+                                    axis=1)
+    static_shift[np.isnan(static_shift)] = 1.0
+
+    # check to see if the estimated static shift is within given tolerance
+    static_shift[np.abs(static_shift - 1) < shift_tol] = 1.0
+
+    ss_dict['ss_x'] = static_shift[:, 0]
+    ss_dict['ss_y'] = static_shift[:, 1]
+
+    return ss_dict
+
+
+def remove_static_shift_survey(edi_list=None, mt_obj_list=None, save_path=None,
+                               radius=1000., num_freq=20, freq_skip=4,
+                               shift_tol=.15, datum='WGS84', epsg=None,
+                               n_processes=1):
+    """
+    Remove static shift from every station in a survey using a spatial median
+    filter, see estimate_static_shift_survey.  New edi files are written to
+    save_path with the name station_ss.edi.
+
+    Arguments
+    -----------------
+        **edi_list**, **mt_obj_list**, **radius**, **num_freq**,
+        **freq_skip**, **shift_tol**, **datum**, **epsg** :
+                        see estimate_static_shift_survey
+
+        **save_path** : string
+                        directory to save the new edi files to, *default* is
+                        None for a folder called SS in the directory of the
+                        first station
+
+        **n_processes** : int
+                          number of processes to write the edi files with,
+                          *default* is 1 to write them in this process
+
+    Returns
+    ----------------
+        **new_edi_list** : list
+                           paths to the edi files with static shift removed
+
+        **ss_dict** : dictionary
+                      see estimate_static_shift_survey
+
+    :Example: ::
+
+        >>> import glob
+        >>> import mtpy.analysis.staticshift as ss
+        >>> edi_list = glob.glob(r"/home/mt/edi_files/*.edi")
+        >>> new_edi_list, ss_dict = ss.remove_static_shift_survey(
+        >>> ...     edi_list, radius=2000, n_processes=4)
+
+    """
+    if mt_obj_list is None:
+        mt_obj_list = [mt.MT(edi_fn) for edi_fn in edi_list]
+
+    ss_dict = estimate_static_shift_survey(mt_obj_list=mt_obj_list,
+                                           radius=radius,
+                                           num_freq=num_freq,
+                                           freq_skip=freq_skip,
+                                           shift_tol=shift_tol,
+                                           datum=datum,
+                                           epsg=epsg)
+
+    if save_path is None:
+        save_path = os.path.join(os.path.dirname(mt_obj_list[0].fn), 'SS')
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    new_z_obj_list = [mt_obj.remove_static_shift(ss_x=ss_x, ss_y=ss_y)
+                      for mt_obj, ss_x, ss_y in zip(mt_obj_list,
+                                                    ss_dict['ss_x'],
+                                                    ss_dict['ss_y'])]
+    new_edi_list = mt.write_mt_files(
+        mt_obj_list, save_dir=save_path, new_Z_obj_list=new_z_obj_list,
+        new_Tipper_obj_list=[mt_obj.Tipper for mt_obj in mt_obj_list],
+        fn_basename_list=['{0}_ss.edi'.format(station)
+                          for station in ss_dict['station']],
+        file_type='edi', n_processes=n_processes)
+
+    return new_edi_list, ss_dict
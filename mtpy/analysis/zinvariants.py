@@ -10,6 +10,83 @@ Interpreted from matlab code written by Stephan Thiel 2005
 import numpy as np
 
 
+def compute_invariants(z_array):
+    """
+    Computes the invariants according to Weaver et al., [2000, 2003] for a
+    stack of impedance tensors, e.g. (nf, 2, 2) for one station or
+    (n_stations, nf, 2, 2) for a survey interpolated onto common periods.
+
+    Where an invariant cannot be computed (the tensor is zero or NaN) the
+    value is NaN; an array that is all zeros gives all zeros.
+
+    :param z_array: impedance tensors
+    :type z_array: np.ndarray((..., 2, 2), dtype=complex)
+
+    :returns: dictionary with keys inv1, inv2, inv3, inv4, inv5, inv6, inv7,
+              q, strike and strike_err, each an array of shape
+              z_array.shape[:-2]; see Zinvariants for a description.
+    :rtype: dictionary
+    """
+    z_array = np.asarray(z_array)
+    shape = z_array.shape[:-2]
+    keys = ['inv1', 'inv2', 'inv3', 'inv4', 'inv5', 'inv6', 'inv7', 'q',
+            'strike', 'strike_err']
+
+    if np.all(z_array == 0.0):
+        return dict([(key, np.zeros(shape)) for key in keys])
+
+    # compute the mathematical invariants
+    x1 = .5 * (z_array[..., 0, 0].real + z_array[..., 1, 1].real)  # trace
+    x2 = .5 * (z_array[..., 0, 1].real + z_array[..., 1, 0].real)
+    x3 = .5 * (z_array[..., 0, 0].real - z_array[..., 1, 1].real)
+    x4 = .5 * (z_array[..., 0, 1].real - z_array[..., 1, 0].real)  # berd
+    e1 = .5 * (z_array[..., 0, 0].imag + z_array[..., 1, 1].imag)  # trace
+    e2 = .5 * (z_array[..., 0, 1].imag + z_array[..., 1, 0].imag)
+    e3 = .5 * (z_array[..., 0, 0].imag - z_array[..., 1, 1].imag)
+    e4 = .5 * (z_array[..., 0, 1].imag - z_array[..., 1, 0].imag)  # berd
+    ex = x1 * e1 - x2 * e2 - x3 * e3 + x4 * e4
+
+    # mask of tensors the invariants cannot be computed for
+    ex = np.where(ex == 0.0, np.nan, ex)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d12 = (x1 * e2 - x2 * e1) / ex
+        d34 = (x3 * e4 - x4 * e3) / ex
+        d13 = (x1 * e3 - x3 * e1) / ex
+        d24 = (x2 * e4 - x4 * e2) / ex
+        d41 = (x4 * e1 - x1 * e4) / ex
+        d23 = (x2 * e3 - x3 * e2) / ex
+
+        inv_dict = {}
+        inv_dict['inv1'] = np.sqrt(x4 ** 2 + x1 ** 2)
+        inv_dict['inv2'] = np.sqrt(e4 ** 2 + e1 ** 2)
+        inv_dict['inv3'] = np.sqrt(x2 ** 2 + x3 ** 2) / inv_dict['inv1']
+        inv_dict['inv4'] = np.sqrt(e2 ** 2 + e3 ** 2) / inv_dict['inv2']
+
+        s41 = (x4 * e1 + x1 * e4) / ex
+
+        inv12 = inv_dict['inv1'] * inv_dict['inv2']
+        inv_dict['inv5'] = s41 * ex / inv12
+        inv_dict['inv6'] = d41 * ex / inv12
+
+        q = np.sqrt((d12 - d34) ** 2 + (d13 + d24) ** 2)
+        inv_dict['q'] = q
+
+        inv_dict['inv7'] = (d41 - d23) / q
+
+        inv_dict['strike'] = .5 * np.arctan2(d12 - d34, d13 + d24) * \
+            (180 / np.pi)
+        inv_dict['strike_err'] = abs(.5 * np.arcsin(inv_dict['inv7'])) * \
+            (180 / np.pi)
+
+    # make sure everything is NaN where the invariants are not defined
+    undefined = np.isnan(ex)
+    for key in keys:
+        inv_dict[key] = np.where(undefined, np.nan, inv_dict[key])
+
+    return inv_dict
+
+
 class Zinvariants:
     """
     calculates invariants from Weaver et al. [2000, 2003].  At the moment it 
@@ -151,89 +228,11 @@ class Zinvariants:
             **q**          : dependent variable suggesting dimensionality
             
         """
-        print("computing invariants")
-        # get the length of z to initialize some empty arrays           
-        nz = self.z.shape[0]
-
-        # set some empty arrays to put stuff into
-        self.inv1 = np.zeros(nz)
-        self.inv2 = np.zeros(nz)
-        self.inv3 = np.zeros(nz)
-        self.inv4 = np.zeros(nz)
-        self.inv5 = np.zeros(nz)
-        self.inv6 = np.zeros(nz)
-        self.inv7 = np.zeros(nz)
-        self.q = np.zeros(nz)
-        self.strike = np.zeros(nz)
-        self.strike_err = np.zeros(nz)
-
-        c_tf = np.all(self.z == 0.0)
-        if c_tf == True:
-            return
-        # loop over each freq
-        for ii in range(nz):
-            # compute the mathematical invariants
-            x1 = .5 * (self.z[ii, 0, 0].real + self.z[ii, 1, 1].real)  # trace
-            x2 = .5 * (self.z[ii, 0, 1].real + self.z[ii, 1, 0].real)
-            x3 = .5 * (self.z[ii, 0, 0].real - self.z[ii, 1, 1].real)
-            x4 = .5 * (self.z[ii, 0, 1].real - self.z[ii, 1, 0].real)  # berd
-            e1 = .5 * (self.z[ii, 0, 0].imag + self.z[ii, 1, 1].imag)  # trace
-            e2 = .5 * (self.z[ii, 0, 1].imag + self.z[ii, 1, 0].imag)
-            e3 = .5 * (self.z[ii, 0, 0].imag - self.z[ii, 1, 1].imag)
-            e4 = .5 * (self.z[ii, 0, 1].imag - self.z[ii, 1, 0].imag)  # berd
-            ex = x1 * e1 - x2 * e2 - x3 * e3 + x4 * e4
-
-            if ex == 0.0:
-                print('Could not compute invariants for {0:5e} Hz'.format(
-                       self.freq[ii]))
-                self.inv1[ii] = np.nan
-                self.inv2[ii] = np.nan
-                self.inv3[ii] = np.nan
-                self.inv4[ii] = np.nan
-                self.inv5[ii] = np.nan
-                self.inv6[ii] = np.nan
-                self.inv7[ii] = np.nan
-                self.q[ii] = np.nan
-                self.strike[ii] = np.nan
-                self.strike_err[ii] = np.nan
-            else:
-
-                d12 = (x1 * e2 - x2 * e1) / ex
-                d34 = (x3 * e4 - x4 * e3) / ex
-                d13 = (x1 * e3 - x3 * e1) / ex
-                d24 = (x2 * e4 - x4 * e2) / ex
-                d41 = (x4 * e1 - x1 * e4) / ex
-                d23 = (x2 * e3 - x3 * e2) / ex
-
-                inv1 = np.sqrt(x4 ** 2 + x1 ** 2)
-                inv2 = np.sqrt(e4 ** 2 + e1 ** 2)
-                inv3 = np.sqrt(x2 ** 2 + x3 ** 2) / inv1
-                inv4 = np.sqrt(e2 ** 2 + e3 ** 2) / inv2
-
-                s41 = (x4 * e1 + x1 * e4) / ex
-
-                inv5 = s41 * ex / (inv1 * inv2)
-                inv6 = d41 * ex / (inv1 * inv2)
-
-                q = np.sqrt((d12 - d34) ** 2 + (d13 + d24) ** 2)
-
-                inv7 = (d41 - d23) / q
-
-                # if abs(inv7)>1.0:
-                #     print("debug value inv7=", inv7)
-                strikeang = .5 * np.arctan2(d12 - d34, d13 + d24) * (180 / np.pi)
-                strikeangerr = abs(.5 * np.arcsin(inv7)) * (180 / np.pi)
-
-                self.inv1[ii] = inv1
-                self.inv2[ii] = inv2
-                self.inv3[ii] = inv3
-                self.inv4[ii] = inv4
-                self.inv5[ii] = inv5
-                self.inv6[ii] = inv6
-                self.inv7[ii] = inv7
-                self.q[ii] = q
-                self.strike[ii] = strikeang
-                self.strike_err[ii] = strikeangerr
+        inv_dict = compute_invariants(self.z)
+
+        for key in ['inv1', 'inv2', 'inv3', 'inv4', 'inv5', 'inv6', 'inv7',
+                    'q', 'strike', 'strike_err']:
+            setattr(self, key, inv_dict[key])
 
     def rotate(self, rot_z):
         """
@@ -21,15 +21,7 @@ import mtpy.utils.exceptions as MTex
 import mtpy.utils.filehandling as MTfh
 import mtpy.core.z as MTz
 from mtpy.utils.mtpylog import MtPyLog
-
-try:
-    import scipy.stats.distributions as ssd
-
-    ssd_test = True
-except ImportError:
-    print('Need scipy.stats.distributions to compute spectra errors')
-    print('Could not find scipy.stats.distributions, check distribution')
-    ssd_test = False
+from mtpy.utils.mtpy_decorator import timed
 
 tab = ' ' * 4
 # ==============================================================================
@@ -135,6 +127,7 @@ class Edi(object):
         if self.edi_fn is not None:
             self.read_edi_file()
 
+    @timed()
     def read_edi_file(self, edi_fn=None):
         """
         Read in an edi file and fill attributes of each section's classes.
@@ -364,6 +357,15 @@ class Edi(object):
                           of the spectra data.
         :type comp_list: list
         """
+        # scipy.stats is slow to import, only needed for spectra errors
+        try:
+            import scipy.stats.distributions as ssd
+
+            ssd_test = True
+        except ImportError:
+            print('Need scipy.stats.distributions to compute spectra errors')
+            print('Could not find scipy.stats.distributions, check distribution')
+            ssd_test = False
 
         data_dict = {}
         avgt_dict = {}
@@ -539,6 +541,7 @@ class Edi(object):
         self.Tipper.compute_amp_phase()
         self.Tipper.compute_mag_direction()
 
+    @timed()
     def write_edi_file(self, new_edi_fn=None,longitude_format='LON', 
                        latlon_format='dms'):
         """
@@ -700,20 +703,21 @@ class Edi(object):
             raise MTex.MTpyError_EDI(
                 'Cannot write block for {0}'.format(data_key))
 
-        for d_index, d_comp in enumerate(data_comp_arr, 1):
-            if d_comp == 0.0 and data_key.lower() not in ['zrot', 'trot']:
-                d_comp = float(self.Header.empty)
-            # write the string in the specified format
-            num_str = '{0:{1}}'.format(d_comp, self._num_format)
-
-            # check to see if a new line is needed
-            if d_index % self._block_len == 0:
-                num_str += '\n'
-            # at the end of the block add a return
-            if d_index == data_comp_arr.size:
-                num_str += '\n'
-
-            block_lines.append(num_str)
+        if data_comp_arr.size == 0:
+            return block_lines
+
+        data_comp_arr = np.array(data_comp_arr, dtype=float).flatten()
+        zeros = data_comp_arr == 0.0
+        if zeros.any() and data_key.lower() not in ['zrot', 'trot']:
+            data_comp_arr[zeros] = float(self.Header.empty)
+
+        # format the whole block in one go, _block_len numbers on each line
+        # and a return at the end of the block
+        num_fmt = '{{:{0}}}'.format(self._num_format)
+        n_lines, n_last = divmod(data_comp_arr.size, self._block_len)
+        block_fmt = (num_fmt * self._block_len + '\n') * n_lines + \
+                    num_fmt * n_last + '\n'
+        block_lines.append(block_fmt.format(*data_comp_arr.tolist()))
 
         return block_lines
 
@@ -22,13 +22,31 @@ import pandas as pd
 from shapely.geometry import Point  # , Polygon, LineString, LinearRing
 
 import mtpy.core.mt as mt
-import mtpy.imaging.mtplottools as mtplottools
 from mtpy.utils.mtpy_decorator import deprecated
 from mtpy.utils.matplotlib_utils import gen_hist_bins
 from mtpy.utils.mtpylog import MtPyLog
 import mtpy.analysis.pt as MTpt
 import mtpy.imaging.penetration
 
+# columns of the survey table written by EdiCollection.export_survey_table
+SURVEY_TABLE_COLUMNS = [
+    ('FREQ', 'float64'), ('STATION', 'str'), ('LON', 'float64'),
+    ('LAT', 'float64'),
+    ('ZXXre', 'float64'), ('ZXXim', 'float64'), ('ZXYre', 'float64'),
+    ('ZXYim', 'float64'), ('ZYXre', 'float64'), ('ZYXim', 'float64'),
+    ('ZYYre', 'float64'), ('ZYYim', 'float64'),
+    ('TXre', 'float64'), ('TXim', 'float64'), ('TYre', 'float64'),
+    ('TYim', 'float64'),
+    ('RHOxx', 'float64'), ('RHOxy', 'float64'), ('RHOyx', 'float64'),
+    ('RHOyy', 'float64'),
+    ('PHSxx', 'float64'), ('PHSxy', 'float64'), ('PHSyx', 'float64'),
+    ('PHSyy', 'float64'),
+    ('phi_min', 'float64'), ('phi_max', 'float64'), ('azimuth', 'float64'),
+    ('skew', 'float64'), ('n_skew', 'float64'), ('elliptic', 'float64'),
+    ('tip_mag_re', 'float64'), ('tip_mag_im', 'float64'),
+    ('tip_ang_re', 'float64'), ('tip_ang_im', 'float64')]
+
+
 def is_num_in_seq(anum, aseq, atol=0.0001):
     """
     check if anum is in a sequence by a small tolerance
@@ -416,6 +434,176 @@ class EdiCollection(object):
         return pt_dict_list
 
 
+    def _get_freq_list(self, period_list=None):
+        """
+        frequencies to export, all available frequencies if period_list is None
+        """
+        if period_list is None:
+            return np.array(self.all_frequencies)
+        return 1. / np.array(period_list)
+
+    def get_survey_table(self, period_list=None, interpolate=True):
+        """
+        Impedance, tipper, apparent resistivity and phase, phase tensor and
+        induction arrow properties of all stations at the given periods as
+        one long table with a row for each frequency and station.
+
+        Each station is interpolated once onto all the periods, or matched
+        to its frequencies within ptol, and the derived quantities are
+        computed on the stacked arrays of the whole survey.
+
+        :param period_list: list of periods; default=None, in which data for
+                            all available frequencies are output
+        :param interpolate: Boolean to indicate whether to interpolate data
+                            onto given period_list
+
+        :return: pandas.DataFrame with the columns of SURVEY_TABLE_COLUMNS,
+                 ordered by frequency and then station
+        """
+        freq_list = self._get_freq_list(period_list)
+        nt = freq_list.size
+        ns = len(self.mt_obj_list)
+
+        z = np.zeros((nt, ns, 2, 2), dtype=complex)
+        tipper = np.zeros((nt, ns, 2), dtype=complex)
+        target_freq = np.repeat(freq_list[:, np.newaxis], ns, axis=1)
+        data_freq = target_freq.copy()
+        valid = np.ones((nt, ns), dtype=bool)
+        # mean phase of the yx mode to put it into the first quadrant
+        phase_yx_mean = np.zeros((nt, ns))
+
+        for ii, mt_obj in enumerate(self.mt_obj_list):
+            if interpolate:
+                new_z, new_tipper = mt_obj.interpolate(freq_list,
+                                                       bounds_error=False)
+                z[:, ii] = new_z.z
+                if new_tipper.tipper is not None:
+                    tipper[:, ii] = new_tipper.tipper[:, 0, :]
+                phase_yx_mean[:, ii] = np.rad2deg(np.angle(new_z.z[:, 1, 0]))
+            else:
+                freq_match = (mt_obj.Z.freq[np.newaxis, :] >
+                              freq_list[:, np.newaxis] * (1 - self.ptol)) & \
+                             (mt_obj.Z.freq[np.newaxis, :] <
+                              freq_list[:, np.newaxis] * (1 + self.ptol))
+                f_index = np.argmax(freq_match, axis=1)
+                valid[:, ii] = freq_match.any(axis=1)
+                if np.any(freq_match.sum(axis=1) > 1):
+                    self._logger.warn("more than one freq found for station %s",
+                                      mt_obj.station)
+                if not valid[:, ii].all():
+                    self._logger.warn("%s of %s freqs NOT found for this station %s",
+                                      np.sum(~valid[:, ii]), nt, mt_obj.station)
+
+                z[:, ii] = mt_obj.Z.z[f_index]
+                if mt_obj.Tipper.tipper is not None:
+                    tipper[:, ii] = mt_obj.Tipper.tipper[f_index, 0, :]
+                data_freq[:, ii] = mt_obj.Z.freq[f_index]
+                phase_yx_mean[:, ii] = np.rad2deg(
+                    np.angle(mt_obj.Z.z[:, 1, 0])).mean()
+
+        # apparent resistivity and phase, as mtplottools.ResPhase
+        res = 0.2 / data_freq[:, :, np.newaxis, np.newaxis] * np.abs(z) ** 2
+        phase = np.rad2deg(np.angle(z))
+        phase[:, :, 1, 0] += np.where(phase_yx_mean > 180, -180, 180)
+
+        pt_dict = MTpt.pt_parameters(MTpt.z2pt_array(z))
+
+        table = [('FREQ', target_freq),
+                 ('STATION', np.array([[mt_obj.station for mt_obj in
+                                        self.mt_obj_list]] * nt)),
+                 ('LON', np.array([[mt_obj.lon for mt_obj in
+                                    self.mt_obj_list]] * nt)),
+                 ('LAT', np.array([[mt_obj.lat for mt_obj in
+                                    self.mt_obj_list]] * nt))]
+        for ii, comp_ii in enumerate(['X', 'Y']):
+            for jj, comp_jj in enumerate(['X', 'Y']):
+                table += [('Z{0}{1}re'.format(comp_ii, comp_jj), z[:, :, ii, jj].real),
+                          ('Z{0}{1}im'.format(comp_ii, comp_jj), z[:, :, ii, jj].imag)]
+        for jj, comp in enumerate(['X', 'Y']):
+            table += [('T{0}re'.format(comp), tipper[:, :, jj].real),
+                      ('T{0}im'.format(comp), tipper[:, :, jj].imag)]
+        for key, values in [('RHO', res), ('PHS', phase)]:
+            for ii, comp_ii in enumerate(['x', 'y']):
+                for jj, comp_jj in enumerate(['x', 'y']):
+                    table.append(('{0}{1}{2}'.format(key, comp_ii, comp_jj),
+                                  values[:, :, ii, jj]))
+        table += [('phi_min', pt_dict['phimin']),
+                  ('phi_max', pt_dict['phimax']),
+                  ('azimuth', pt_dict['azimuth']),
+                  ('skew', pt_dict['beta']),
+                  ('n_skew', 2 * pt_dict['beta']),
+                  ('elliptic', pt_dict['ellipticity']),
+                  ('tip_mag_re', np.sqrt(tipper[:, :, 0].real ** 2 +
+                                         tipper[:, :, 1].real ** 2)),
+                  ('tip_mag_im', np.sqrt(tipper[:, :, 0].imag ** 2 +
+                                         tipper[:, :, 1].imag ** 2)),
+                  ('tip_ang_re', np.rad2deg(np.arctan2(-tipper[:, :, 1].real,
+                                                       -tipper[:, :, 0].real))),
+                  ('tip_ang_im', np.rad2deg(np.arctan2(-tipper[:, :, 1].imag,
+                                                       -tipper[:, :, 0].imag)))]
+
+        # one row for each frequency and station with data
+        survey_df = pd.DataFrame(dict([(key, values[valid])
+                                       for key, values in table]))
+
+        return survey_df.astype(dict(SURVEY_TABLE_COLUMNS))[
+            [key for key, dtype in SURVEY_TABLE_COLUMNS]]
+
+    def export_survey_table(self, dest_file, period_list=None,
+                            interpolate=True, columns=None,
+                            file_format=None):
+        """
+        write the survey table, see get_survey_table, to a single csv or
+        parquet file.
+
+        :param dest_file: output file name
+        :param period_list: list of periods; default=None, in which data for
+                            all available frequencies are output
+        :param interpolate: Boolean to indicate whether to interpolate data
+                            onto given period_list
+        :param columns: list of columns to write; default=None for all
+        :param file_format: [ 'csv' | 'parquet' ]; default=None to use the
+                            extension of dest_file.  Parquet needs pyarrow or
+                            fastparquet.
+
+        :return: dest_file
+        """
+        if file_format is None:
+            file_format = os.path.splitext(dest_file)[1][1:].lower()
+        if file_format not in ['csv', 'parquet']:
+            raise ValueError("file_format %s is not supported, use 'csv' or "
+                             "'parquet'" % file_format)
+
+        survey_df = self.get_survey_table(period_list=period_list,
+                                          interpolate=interpolate)
+        if columns is not None:
+            survey_df = survey_df[list(columns)]
+
+        if file_format == 'csv':
+            survey_df.to_csv(dest_file, index=False)
+        else:
+            survey_df.to_parquet(dest_file, index=False)
+
+        return dest_file
+
+    def _write_survey_table_csv(self, survey_df, freq_list, csvfname,
+                                freq_file_fmt, freq_column='FREQ'):
+        """
+        write survey_df to a summary csv file and a csv file for each
+        frequency in freq_column, named freq_file_fmt.format(freq=str(freq))
+
+        :return: dictionary of the rows for each frequency
+        """
+        survey_df.to_csv(csvfname, index=False)
+
+        row_dict = {}
+        for freq in freq_list:
+            freq_df = survey_df[survey_df[freq_column] == freq]
+            freq_df.to_csv(freq_file_fmt.format(freq=str(freq)), index=False)
+            row_dict[freq] = freq_df.values.tolist()
+
+        return row_dict
+
     def create_phase_tensor_csv(self, dest_dir, period_list=None,
                                 interpolate=True,
                                 file_name="phase_tensor.csv"):
@@ -433,85 +621,23 @@ class EdiCollection(object):
         """
         csvfname = os.path.join(dest_dir, file_name)
 
-        pt_dict = {}
-
         csv_header = ['station', 'freq', 'lon', 'lat', 'phi_min', 'phi_max', 'azimuth', 'skew',
                       'n_skew', 'elliptic', 'tip_mag_re', 'tip_mag_im', 'tip_ang_re', 'tip_ang_im']
 
-        freq_list = None
-        if(period_list is None):
-            freq_list = self.all_frequencies
-        else:
-            freq_list = 1./np.array(period_list)
-        # end if
-
-        #with open(csvfname, "wb") as csvf:
-        with open(csvfname, "w",newline="") as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(csv_header)
+        freq_list = self._get_freq_list(period_list)
 
-            for freq in freq_list:
-                ptlist = []
-                for mt_obj in self.mt_obj_list:
-                    f_index_list = None
-                    pt = None
-                    ti = None
-
-                    if(interpolate):
-                        f_index_list = [0]
-
-                        newZ = None
-                        newTipper = None
-                        newZ, newTipper = mt_obj.interpolate([freq], bounds_error=False)
-
-                        pt = MTpt.PhaseTensor(z_object=newZ)
-                        ti = newTipper
-                    else:
-                        freq_min = freq * (1 - self.ptol)
-                        freq_max = freq * (1 + self.ptol)
-
-                        f_index_list = [ff for ff, f2 in enumerate(mt_obj.Z.freq)
-                                        if (f2 > freq_min) and (f2 < freq_max)]
-                        pt = mt_obj.pt
-                        ti = mt_obj.Tipper
-                    #end if
-
-                    if len(f_index_list) > 1:
-                        self._logger.warn("more than one freq found %s", f_index_list)
-                    if len(f_index_list) >= 1:
-                        p_index = f_index_list[0]
-                        # geographic coord lat long and elevation
-                        # long, lat, elev = (mt_obj.lon, mt_obj.lat, 0)
-                        station, lon, lat = (mt_obj.station, mt_obj.lon, mt_obj.lat)
-
-                        pt_stat = [station, freq, lon, lat,
-                                   pt.phimin[p_index],
-                                   pt.phimax[p_index],
-                                   pt.azimuth[p_index],
-                                   pt.beta[p_index],
-                                   2 * pt.beta[p_index],
-                                   pt.ellipticity[p_index],  # FZ: get ellipticity begin here
-                                   ti.mag_real[p_index],
-                                   ti.mag_imag[p_index],
-                                   ti.angle_real[p_index],
-                                   ti.angle_imag[p_index]]
-
-                        ptlist.append(pt_stat)
-                    else:
-                        self._logger.warn("Freq %s NOT found for this station %s", freq, mt_obj.station)
+        survey_df = self.get_survey_table(period_list=period_list,
+                                          interpolate=interpolate)
+        survey_df = survey_df.rename(columns={'STATION': 'station',
+                                              'FREQ': 'freq',
+                                              'LON': 'lon',
+                                              'LAT': 'lat'})[csv_header]
 
-                csv_freq_file = os.path.join(dest_dir,
-                                             '{name[0]}_{freq}Hz{name[1]}'.format(
-                                                 freq=str(freq), name=os.path.splitext(file_name)))
-                #with open(csv_freq_file, "wb") as freq_csvf:
-                with open(csv_freq_file, "w",newline="") as freq_csvf:
-                    writer_freq = csv.writer(freq_csvf)
-                    writer_freq.writerow(csv_header)
-                    writer_freq.writerows(ptlist)
-
-                writer.writerows(ptlist)
-
-                pt_dict[freq] = ptlist
+        pt_dict = self._write_survey_table_csv(
+            survey_df, freq_list, csvfname,
+            os.path.join(dest_dir, '{name[0]}_{{freq}}Hz{name[1]}'.format(
+                name=os.path.splitext(file_name))),
+            freq_column='freq')
 
         return pt_dict
 
@@ -546,14 +672,19 @@ class EdiCollection(object):
             writer = csv.writer(csvf)
             writer.writerow(csv_header)
 
-            for freq in freq_list:
-                pdlist = []
-
-                stations, periods, pen_depth_det, latlons = mtpy.imaging.penetration.get_penetration_depth_by_period( self.mt_obj_list, 1.0/freq)  # whichrho='det')
-                stations, periods, pen_depth_zxy, latlons = mtpy.imaging.penetration.get_penetration_depth_by_period( self.mt_obj_list, 1.0/freq,whichrho='zxy')
-                stations, periods, pen_depth_zyx, latlons = mtpy.imaging.penetration.get_penetration_depth_by_period( self.mt_obj_list, 1.0/freq,whichrho='zyx')
+            # penetration depths of all stations at all periods at once
+            depth_dict = mtpy.imaging.penetration.get_penetration_depths(
+                self.mt_obj_list, 1.0 / np.array(freq_list),
+                rholist=['det', 'zxy', 'zyx'])
+            stations = depth_dict['station']
+            latlons = depth_dict['latlons']
 
+            for ff, freq in enumerate(freq_list):
+                pen_depth_det = depth_dict['det'][ff]
+                pen_depth_zxy = depth_dict['zxy'][ff]
+                pen_depth_zyx = depth_dict['zyx'][ff]
 
+                pdlist = []
                 for iter in range(len(stations)):
                     pdlist.append([freq, stations[iter], latlons[iter][1], latlons[iter][0], pen_depth_det[iter], pen_depth_zxy[iter], pen_depth_zyx[iter]])
 
@@ -609,113 +740,26 @@ class EdiCollection(object):
         csv_basename = "edi_measurement"
         csvfname = os.path.join(dest_dir, "%s.csv" % csv_basename)
 
-        pt_dict = {}
-
         csv_header = [
             'FREQ', 'STATION',  'LON', 'LAT','ZXXre', 'ZXXim',
             'ZXYre', 'ZXYim', 'ZYXre', 'ZYXim', 'ZYYre', 'ZYYim', 'TXre', 'TXim', 'TYre', 'TYim',
             'RHOxx', 'RHOxy', 'RHOyx', 'RHOyy', 'PHSxx', 'PHSxy', 'PHSyx', 'PHSyy'
         ]
 
-        freq_list = None
-        if(period_list is None):
-            freq_list = self.all_frequencies
-        else:
-            freq_list = 1./np.array(period_list)
-        # end if
-
-        with open(csvfname, "w",newline="") as csvf:
-            writer = csv.writer(csvf)
-            writer.writerow(csv_header)
-
+        freq_list = self._get_freq_list(period_list)
 
-        for freq in freq_list:
-            mtlist = []
-            for mt_obj in self.mt_obj_list:
-                f_index_list = None
-                pt = None
-                ti = None
-                zobj = None
-                if (interpolate):
-                    f_index_list = [0]
-
-                    newZ = None
-                    newTipper = None
-                    self._logger.debug("Interpolating frequency ....%s", freq)
-                    newZ, newTipper = mt_obj.interpolate([freq], bounds_error=False)
-
-                    pt = MTpt.PhaseTensor(z_object=newZ)
-                    ti = newTipper
-                    zobj = newZ
-                else:  # interpolate is False
-                    freq_max = freq * (1 + self.ptol)
-                    freq_min = freq * (1 - self.ptol)
-                    f_index_list = np.where((mt_obj.Z.freq < freq_max) & (mt_obj.Z.freq > freq_min))
-                    f_index_list = f_index_list[0]  # reduce from 3d [f,2,2] to 1d [f]
-
-                    pt = mt_obj.pt
-                    ti = mt_obj.Tipper
-                    zobj = mt_obj.Z
-                # end if
-
-                if len(f_index_list) > 1:
-                    self._logger.warn("more than one freq found %s", f_index_list)
-
-                if len(f_index_list) >= 1:
-                    the_index = f_index_list[0]  # a single value
-
-                    self._logger.debug("The freqs index %s", the_index)
-                    # geographic coord lat long and elevation
-                    # long, lat, elev = (mt_obj.lon, mt_obj.lat, 0)
-                    station, lat, lon = (
-                        mt_obj.station, mt_obj.lat, mt_obj.lon)
-
-                    resist_phase = mtplottools.ResPhase(z_object=zobj)
-                    # resist_phase.compute_res_phase()
-
-                    mt_stat = [freq, station, lon, lat,
-                               zobj.z[the_index, 0, 0].real,
-                               zobj.z[the_index, 0, 0].imag,
-                               zobj.z[the_index, 0, 1].real,
-                               zobj.z[the_index, 0, 1].imag,
-                               zobj.z[the_index, 1, 0].real,
-                               zobj.z[the_index, 1, 0].imag,
-                               zobj.z[the_index, 1, 1].real,
-                               zobj.z[the_index, 1, 1].imag,
-                               ti.tipper[the_index, 0, 0].real,
-                               ti.tipper[the_index, 0, 0].imag,
-                               ti.tipper[the_index, 0, 1].real,
-                               ti.tipper[the_index, 0, 1].imag,
-                               resist_phase.resxx[the_index], resist_phase.resxy[the_index],
-                               resist_phase.resyx[the_index], resist_phase.resyy[the_index],
-                               resist_phase.phasexx[the_index], resist_phase.phasexy[the_index],
-                               resist_phase.phaseyx[the_index], resist_phase.phaseyy[the_index]
-                               ]
-                    mtlist.append(mt_stat)
-
-                else:
-                    self._logger.warn(
-                        'Freq %s NOT found for this station %s *** Skipping it in CSV file', freq, mt_obj.station)
-
-            with open(csvfname, "a",newline="") as csvf:  # summary csv for all freqs
-                writer = csv.writer(csvf)
-                writer.writerows(mtlist)
-
-            csv_basename2 = "%s_%sHz.csv" % (csv_basename, str(freq))
-            csvfile2 = os.path.join(dest_dir, csv_basename2)
+        survey_df = self.get_survey_table(period_list=period_list,
+                                          interpolate=interpolate)
 
-            with open(csvfile2, "w", newline="") as csvf:  # individual csvfile for each freq
-                writer = csv.writer(csvf)
-
-                writer.writerow(csv_header)
-                writer.writerows(mtlist)
-
-            pt_dict[freq] = mtlist
+        self._write_survey_table_csv(
+            survey_df[csv_header], freq_list, csvfname,
+            os.path.join(dest_dir, "%s_{freq}Hz.csv" % csv_basename))
 
         return csvfname
 
     def export_edi_files(self, dest_dir, period_list=None,
-                                interpolate=True,period_buffer=None,longitude_format='LON'):
+                                interpolate=True,period_buffer=None,longitude_format='LON',
+                                n_processes=1):
         """
         export edi files.
         :param dest_dir: output directory
@@ -729,14 +773,17 @@ class EdiCollection(object):
                               greater than which interpolation will not stretch.
                               e.g. 1.5 means only interpolate to a maximum of
                               1.5 times each side of each frequency value
+        :param n_processes: number of processes to write the edi files with,
+                            default 1 writes them in this process
 
-        :return:
+        :return: list of edi files written
         """
 
         if period_list is None:
             period_list = np.array(self.get_periods_by_stats())
         # end if
 
+        write_list = []
         for mt_obj in self.mt_obj_list:
             # interpolate each station onto the period list
             # check bounds of period list
@@ -768,21 +815,21 @@ class EdiCollection(object):
 
             if len(interp_periods) > 0:  # not empty
                 interp_z, interp_t = mt_obj.interpolate(1. / interp_periods)
-
-                if dest_dir is not None and os.path.isdir(dest_dir):
-                    mt_obj.write_mt_file(
-                        save_dir=dest_dir,
-                        fn_basename=mt_obj.station,
-                        file_type='edi',
-                        new_Z_obj=interp_z,
-                        new_Tipper_obj=interp_t,
-                        longitude_format=longitude_format)
+                write_list.append((mt_obj, interp_z, interp_t))
             else:
                 pass
         # end for
-    # end func
 
-        return
+        if dest_dir is None or not os.path.isdir(dest_dir) or len(write_list) == 0:
+            return []
+
+        mt_list, z_list, t_list = zip(*write_list)
+        return mt.write_mt_files(
+            list(mt_list), save_dir=dest_dir,
+            new_Z_obj_list=list(z_list), new_Tipper_obj_list=list(t_list),
+            fn_basename_list=[mt_obj.station for mt_obj in mt_list],
+            file_type='edi', longitude_format=longitude_format,
+            n_processes=n_processes)
 
     def get_bounding_box(self, epsgcode=None):
         """ compute bounding box
@@ -11,6 +11,7 @@ import numpy as np
 import os
 import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dateutil import parser as dt_parser
 from pathlib import Path
 
@@ -19,35 +20,39 @@ import mtpy.core.z as MTz
 import mtpy.utils.gis_tools as gis_tools
 import mtpy.analysis.pt as MTpt
 import mtpy.analysis.distortion as MTdistortion
-import mtpy.core.jfile as MTj
-import mtpy.core.mt_xml as MTxml
-import mtpy.core.zmm as MTzmm
 
 from mtpy.utils.mtpylog import MtPyLog
+from mtpy.utils.mtpy_decorator import timed
 
 _logger = MtPyLog.get_mtpy_logger(__name__)
 # _logger.setLevel(logging.DEBUG)
 
-try:
-    import scipy
 
-    scipy_version = [int(ss) for ss in scipy.__version__.split('.')]
-    if scipy_version[0] == 0:
-        if scipy_version[1] < 14:
-            warnings.warn('Note: need scipy version 0.14.0 or higher or interpolation '
-                          'might not work.', ImportWarning)
-            _logger.warning('Note: need scipy version 0.14.0 or higher or interpolation '
-                            'might not work.')
-    import scipy.interpolate as spi
+def _import_interpolate():
+    """
+    import scipy.interpolate the first time MT.interpolate is called,
+    returns None if it cannot be imported
+    """
+    try:
+        import scipy
 
-    interp_import = True
+        scipy_version = [int(ss) for ss in scipy.__version__.split('.')[0:2]]
+        if scipy_version[0] == 0:
+            if scipy_version[1] < 14:
+                warnings.warn('Note: need scipy version 0.14.0 or higher or interpolation '
+                              'might not work.', ImportWarning)
+                _logger.warning('Note: need scipy version 0.14.0 or higher or interpolation '
+                                'might not work.')
+        import scipy.interpolate as spi
 
-except ImportError:  # pragma: no cover
-    warnings.warn('Could not find scipy.interpolate, cannot use method interpolate'
-                  'check installation you can get scipy from scipy.org.')
-    _logger.warning('Could not find scipy.interpolate, cannot use method interpolate'
-                    'check installation you can get scipy from scipy.org.')
-    interp_import = False
+    except ImportError:  # pragma: no cover
+        warnings.warn('Could not find scipy.interpolate, cannot use method interpolate'
+                      'check installation you can get scipy from scipy.org.')
+        _logger.warning('Could not find scipy.interpolate, cannot use method interpolate'
+                        'check installation you can get scipy from scipy.org.')
+        spi = None
+
+    return spi
 
 
 # =============================================================================
@@ -929,6 +934,8 @@ class MT(object):
         read j file
         """
 
+        import mtpy.core.jfile as MTj
+
         j_obj = MTj.JFile(j_fn)
 
         self.save_dir = os.path.dirname(j_fn)
@@ -952,6 +959,8 @@ class MT(object):
         if not isinstance(zmm_fn, Path):
             zmm_fn = Path(zmm_fn)
             
+        import mtpy.core.zmm as MTzmm
+
         zmm_obj = MTzmm.ZMM(zmm_fn)
         zmm_obj.read_zmm_file()
         
@@ -978,6 +987,8 @@ class MT(object):
 
         self.save_dir = os.path.dirname(xml_fn)
 
+        import mtpy.core.mt_xml as MTxml
+
         xml_obj = MTxml.MT_XML()
         xml_obj.read_xml_file(xml_fn)
 
@@ -1306,6 +1317,8 @@ class MT(object):
         if new_Tipper is not None:
             self.Tipper = new_Tipper
 
+        import mtpy.core.mt_xml as MTxml
+
         xml_obj = MTxml.MT_XML()
         xml_obj.Attachment.Filename.value = os.path.basename(self.fn)
         xml_obj.PrimaryData.Filename.value = os.path.basename(self.fn)[:-4]+'.png'
@@ -1782,6 +1795,7 @@ class MT(object):
 
         return new_z_obj
 
+    @timed()
     def interpolate(self, new_freq_array, interp_type='slinear', bounds_error=True, period_buffer=None):
         """
         Interpolate the impedance tensor onto different frequencies
@@ -1817,8 +1831,9 @@ class MT(object):
             >>> ...                   new_Tipper_obj=new_tipper_object)
 
         """
-        # if the interpolation module has not been loaded return
-        if interp_import is False:
+        # if the interpolation module cannot be loaded return
+        spi = _import_interpolate()
+        if spi is None:
             raise ImportError('could not interpolate, need to install scipy')
 
         # make sure the input is a numpy array
@@ -1980,6 +1995,100 @@ class MT(object):
         # raise NotImplementedError
 
 
+# ==============================================================================
+# write many stations
+# ==============================================================================
+def _write_mt_file(mt_obj, kwargs):
+    """
+    write one mt file, module level so it can be sent to a worker process
+    """
+    return mt_obj.write_mt_file(**kwargs)
+
+
+def write_mt_files(mt_obj_list, save_dir=None, new_Z_obj_list=None,
+                   new_Tipper_obj_list=None, fn_basename_list=None,
+                   file_type='edi', longitude_format='LON',
+                   latlon_format='dms', n_processes=1):
+    """
+    Write mt files for many stations, see MT.write_mt_file.  The files are
+    written by a pool of n_processes worker processes, which is useful when
+    exporting thousands of rotated or interpolated stations.
+
+    :param mt_obj_list: list of MT objects
+    :type mt_obj_list: list
+
+    :param save_dir: full path save directory, *default* is the save_dir
+                     of each MT object
+    :type save_dir: string
+
+    :param new_Z_obj_list: new Z object for each station, or None to write
+                           the Z of the MT object
+    :type new_Z_obj_list: list
+
+    :param new_Tipper_obj_list: new Tipper object for each station, or None
+                                to write the Tipper of the MT object
+    :type new_Tipper_obj_list: list
+
+    :param fn_basename_list: file name for each station, *default* is the
+                             station name
+    :type fn_basename_list: list
+
+    :param file_type: [ 'edi' | 'xml' ]
+    :type file_type: string
+
+    :param n_processes: number of processes to write the files with,
+                        *default* is 1 to write them in this process
+    :type n_processes: int
+
+    :returns: full path to each file written
+    :rtype: list
+
+    :Example: ::
+
+        >>> import mtpy.core.mt as mt
+        >>> mt_obj_list = [mt.MT(fn) for fn in edi_list]
+        >>> interp_list = [mt_obj.interpolate(new_freq) for mt_obj in mt_obj_list]
+        >>> fn_list = mt.write_mt_files(mt_obj_list, save_dir=r"/home/mt/interp",
+        >>> ...                         new_Z_obj_list=[zt[0] for zt in interp_list],
+        >>> ...                         new_Tipper_obj_list=[zt[1] for zt in interp_list],
+        >>> ...                         n_processes=4)
+    """
+    ns = len(mt_obj_list)
+    if new_Z_obj_list is None:
+        new_Z_obj_list = [None] * ns
+    if new_Tipper_obj_list is None:
+        new_Tipper_obj_list = [None] * ns
+    if fn_basename_list is None:
+        fn_basename_list = [None] * ns
+    if not len(new_Z_obj_list) == len(new_Tipper_obj_list) == \
+            len(fn_basename_list) == ns:
+        raise MTError('Need the same number of Z, Tipper and file names as '
+                      'MT objects')
+
+    arg_list = [(mt_obj, {'save_dir': save_dir,
+                          'fn_basename': fn_basename,
+                          'file_type': file_type,
+                          'new_Z_obj': new_z_obj,
+                          'new_Tipper_obj': new_tipper_obj,
+                          'longitude_format': longitude_format,
+                          'latlon_format': latlon_format})
+                for mt_obj, new_z_obj, new_tipper_obj, fn_basename in
+                zip(mt_obj_list, new_Z_obj_list, new_Tipper_obj_list,
+                    fn_basename_list)]
+
+    if n_processes is None or n_processes <= 1 or ns < 2:
+        fn_list = [_write_mt_file(*args) for args in arg_list]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processes) as executor:
+            futures = [executor.submit(_write_mt_file, *args)
+                       for args in arg_list]
+            fn_list = [future.result() for future in futures]
+
+    _logger.info('Wrote {0} {1} files'.format(len(fn_list), file_type))
+
+    return fn_list
+
+
 # ==============================================================================
 # Site details
 # ==============================================================================
@@ -19,6 +19,7 @@ import scipy.signal as signal
 
 import mtpy.utils.gis_tools as gis_tools
 import mtpy.processing.filter as mtfilter
+from mtpy.utils.mtpy_decorator import timed
 
 import matplotlib.pyplot as plt
 
@@ -552,6 +553,7 @@ class MTTS(object):
 
         hdf5_store.close()
 
+    @timed()
     def write_ascii_file(self, fn_ascii, chunk_size=4096):
         """
         Write an ascii format file with metadata
@@ -568,8 +570,6 @@ class MTTS(object):
 
         """
 
-        st = datetime.datetime.utcnow()
-
         # get the number of chunks to write
         chunks = int(self.ts.shape[0]/chunk_size)
 
@@ -603,13 +603,7 @@ class MTTS(object):
             fid.write('\n'.join(list(np.array(self.ts.data[(cc+1)*chunk_size:],
                                               dtype='U22'))))
 
-
-        # get an estimation of how long it took to write the file
-        et = datetime.datetime.utcnow()
-        time_diff = et-st
-
         print('--> Wrote {0}'.format(fn_ascii))
-        print('    Took {0:.2f} seconds'.format(time_diff.seconds+time_diff.microseconds*1E-6))
 
     def read_ascii_header(self, fn_ascii):
         """
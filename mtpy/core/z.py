@@ -18,6 +18,7 @@ import numpy as np
 import mtpy.utils.calculator as MTcc
 import mtpy.utils.exceptions as MTex
 from mtpy.utils.mtpylog import MtPyLog
+from mtpy.utils.mtpy_decorator import timed
 
 
 # get a logger object for this module, using the utility class MtPyLog to
@@ -82,6 +83,7 @@ class ResPhase(object):
     def phase_err(self, phase_err_array):
         self._phase_err = phase_err_array
 
+    @timed()
     def compute_resistivity_phase(self, z_array=None, z_err_array=None,
                                   freq=None):
         """
@@ -37,6 +37,10 @@ import mtpy.utils.exceptions as mtex
 
 import mtpy.imaging.mtcolors as mtcl
 import mtpy.analysis.niblettbostick as mtnb
+from mtpy.gui.task_pool_qt5 import get_progress, get_task_pool
+from mtpy.utils.mtpylog import MtPyLog
+
+_logger = MtPyLog.get_mtpy_logger(__name__)
 
 try:
     _fromUtf8 = QtCore.QString.fromUtf8
@@ -129,6 +133,10 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
 
         self.dir_path = os.getcwd()
         
+        # files are read in the background so the window stays responsive
+        self.task_pool = get_task_pool()
+        self._file_tasks = {}
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -287,11 +295,17 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         fn_dialog = QtWidgets.QFileDialog()
         fn = str(fn_dialog.getOpenFileName(caption='Choose ModEM data file',
                                        filter='(*.dat);; (*.data)')[0])
+        if fn == '':
+            return
         
-        fn = os.path.abspath(fn)
-                                       
-        self.modem_data = modem.Data()
-        self.modem_data.read_data_file(fn)
+        self._read_file('data', _read_data_file, os.path.abspath(fn),
+                        self.set_data)
+        
+    def set_data(self, fn_data):
+        """
+        set the data read in the background and fill the period list
+        """
+        fn, self.modem_data = fn_data
         self.modem_data_fn = fn
         
         self.dir_path = os.path.dirname(fn)
@@ -311,6 +325,7 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         self._get_pt()
         
         self.get_depth_array()
+        self.statusbar.showMessage('Read {0}'.format(fn))
             
     def get_model_fn(self):
         """
@@ -322,11 +337,19 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         fn = str(fn_dialog.getOpenFileName(caption='Choose ModEM model file',
                                            filter='(*.rho);; (*.ws)',
                                            directory=self.dir_path)[0])
-        fn = os.path.abspath(fn)
-        self.modem_model = modem.Model()
-        self.modem_model.read_model_file(fn)
-        self.modem_model_fn = fn
+        if fn == '':
+            return
+        
+        self._read_file('model', _read_model_file, os.path.abspath(fn),
+                        self.set_model)
+        
+    def set_model(self, fn_model):
+        """
+        set the model read in the background
+        """
+        self.modem_model_fn, self.modem_model = fn_model
         self.get_depth_array()
+        self.statusbar.showMessage('Read {0}'.format(self.modem_model_fn))
         self.plot()
         
         
@@ -346,13 +369,52 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         fn = str(fn_dialog.getOpenFileName(caption='Choose ModEM response file',
                                            filter='*.dat', 
                                            directory=self.dir_path)[0])
+        if fn == '':
+            return
                                        
-        self.modem_resp = modem.Data()
-        self.modem_resp.read_data_file(fn)
-        self.modem_resp_fn = fn
+        self._read_file('resp', _read_data_file, os.path.abspath(fn),
+                        self.set_resp)
+        
+    def set_resp(self, fn_resp):
+        """
+        set the response read in the background
+        """
+        self.modem_resp_fn, self.modem_resp = fn_resp
         self._get_pt()
+        self.statusbar.showMessage('Read {0}'.format(self.modem_resp_fn))
         self.plot()
         
+    def _read_file(self, key, read_func, fn, on_result):
+        """
+        read a file in the task pool, a file of the same kind that is still
+        being read is dropped
+        """
+        if key in self._file_tasks:
+            self.task_pool.cancel(self._file_tasks[key])
+        self.statusbar.showMessage('Reading {0}'.format(fn))
+        self._file_tasks[key] = self.task_pool.run_task(
+            read_func, 
+            args=(fn,),
+            on_result=on_result,
+            on_error=self._read_error,
+            on_progress=self._read_progress,
+            pass_task=True)
+        
+    def _read_error(self, message):
+        _logger.error(message)
+        self.statusbar.showMessage(message.strip().split('\n')[-1])
+        
+    def _read_progress(self, percent, message):
+        self.statusbar.showMessage('{0} ({1}%)'.format(message, percent))
+        
+    def closeEvent(self, event):
+        """
+        stop reading files when the window is closed
+        """
+        for task in self._file_tasks.values():
+            self.task_pool.cancel(task)
+        super(ModEMPlotPTMap, self).closeEvent(event)
+        
     def show_settings(self):
         """
         show setting window
@@ -511,17 +573,16 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         if self.modem_data.mt_dict is None:
             return
             
-        d_arr_min = np.zeros((self.modem_data.period_list.shape[0],
-                              len(list(self.modem_data.mt_dict.keys()))))
-        d_arr_max = np.zeros((self.modem_data.period_list.shape[0],
-                              len(list(self.modem_data.mt_dict.keys()))))
-#        print self.modem_data.mt_dict[self.modem_data.mt_dict.keys()[0]].Z.z                      
-        for ii, mt_key in enumerate(sorted(self.modem_data.mt_dict.keys())):
-            mt_obj = self.modem_data.mt_dict[mt_key]
-            d_arr = mtnb.calculate_depth_nb(z_object=mt_obj.Z)
-            
-            d_arr_min[:, ii] = d_arr['depth_min']
-            d_arr_max[:, ii] = d_arr['depth_max']
+        # all stations are on the period list of the data file, so the
+        # depths can be estimated for the whole survey at once
+        mt_keys = sorted(self.modem_data.mt_dict.keys())
+        z_array = np.array([self.modem_data.mt_dict[mt_key].Z.z
+                            for mt_key in mt_keys])
+        periods = 1. / self.modem_data.mt_dict[mt_keys[0]].Z.freq
+        d_arr = mtnb.calculate_depth_nb_array(z_array, periods)
+
+        d_arr_min = d_arr['depth_min'].T
+        d_arr_max = d_arr['depth_max'].T
         
         # average only the non zero terms
         d_avg_min = np.array([d_arr_min[kk, np.nonzero(d_arr_min[kk, :])].mean()
@@ -1033,6 +1094,32 @@ class ModEMPlotPTMap(QtWidgets.QMainWindow, mtplottools.MTArrows,
         # draw plot
         self.mpl_widget.draw()
         
+#==============================================================================
+# read files, these run in the task pool
+#==============================================================================
+def _read_data_file(data_fn, task=None):
+    """
+    read a data or response file
+    """
+    modem_data = modem.Data()
+    modem_data.read_data_file(data_fn, progress=get_progress(task))
+    
+    return data_fn, modem_data
+    
+def _read_model_file(model_fn, task=None):
+    """
+    read a model file, the model is read in one go so the task can only be
+    cancelled before and after reading
+    """
+    if task is not None:
+        task.report_progress(0, 'Reading {0}'.format(model_fn))
+    modem_model = modem.Model()
+    modem_model.read_model_file(model_fn)
+    if task is not None:
+        task.report_progress(100, 'Read {0}'.format(model_fn))
+    
+    return model_fn, modem_model
+        
 class PlotSettings(QtWidgets.QWidget):
     settings_updated = QtCore.pyqtSignal()
     def __init__(self, parent, **kwargs):
@@ -14,6 +14,7 @@ JP 2016
 # Imports
 #==============================================================================
 # standard imports
+import copy
 import os
 import sys
 
@@ -31,6 +32,10 @@ import matplotlib.gridspec as gridspec
 
 import mtpy.imaging.mtplottools as mtplottools
 import mtpy.modeling.modem as modem
+from mtpy.gui.task_pool_qt5 import get_progress, get_task_pool
+from mtpy.utils.mtpylog import MtPyLog
+
+_logger = MtPyLog.get_mtpy_logger(__name__)
 
 #==============================================================================
 class ModEMPlotResponse(QtWidgets.QMainWindow):
@@ -141,6 +146,11 @@ class ModEMPlotResponse(QtWidgets.QMainWindow):
         self.plot_response = PlotResponses(self.data_fn, self.resp_fn)
         self.setCentralWidget(self.plot_response)
         
+        # files are read and written in the background, show the progress
+        self.statusbar = QtWidgets.QStatusBar(self)
+        self.setStatusBar(self.statusbar)
+        self.plot_response.status_updated.connect(self.statusbar.showMessage)
+        
     
         #self.retranslateUi(MainWindow)
         QtCore.QMetaObject.connectSlotsByName(self)
@@ -184,9 +194,10 @@ class ModEMPlotResponse(QtWidgets.QMainWindow):
         fn_dialog = QtWidgets.QFileDialog()
         fn = str(fn_dialog.getOpenFileName(caption='Choose ModEM data file',
                                            filter='(*.dat);; (*.data)')[0])
-        
+        if fn == '':
+            return
                                        
-        self.plot_response.data_fn = os.path.abspath(fn)
+        self.plot_response.load_data_file(os.path.abspath(fn))
         self.dir_path = os.path.dirname(fn)
                                        
         
@@ -197,12 +208,10 @@ class ModEMPlotResponse(QtWidgets.QMainWindow):
         fn_dialog = QtWidgets.QFileDialog()
         save_fn = str(fn_dialog.getSaveFileName(caption='Choose File to save',
                                                 filter='*.dat')[0])
+        if save_fn == '':
+            return
         
-        self.plot_response.modem_data.write_data_file(save_path=os.path.dirname(save_fn),
-                                                      fn_basename=os.path.basename(save_fn),
-                                                      compute_error=False,
-                                                      fill=False,
-                                                      elevation=True)
+        self.plot_response.save_data_file(os.path.abspath(save_fn))
         
     def get_resp_fn(self):
         """
@@ -212,8 +221,17 @@ class ModEMPlotResponse(QtWidgets.QMainWindow):
         fn_dialog = QtWidgets.QFileDialog(directory=self.dir_path)
         fn = str(fn_dialog.getOpenFileName(caption='Choose ModEM response file',
                                        filter='(*.dat);; (*.data)')[0])
+        if fn == '':
+            return
                                        
-        self.plot_response.resp_fn = os.path.abspath(fn)
+        self.plot_response.load_resp_file(os.path.abspath(fn))
+        
+    def closeEvent(self, event):
+        """
+        stop reading or writing files when the window is closed
+        """
+        self.plot_response.cancel_tasks()
+        super(ModEMPlotResponse, self).closeEvent(event)
         
     def show_settings(self):
         self.settings_window = PlotSettings(**self.__dict__)
@@ -255,7 +273,13 @@ class ModEMPlotResponse(QtWidgets.QMainWindow):
 class PlotResponses(QtWidgets.QWidget):
     """
     the plot and list of stations
+    
+    Data and response files are read and written in the background with
+    load_data_file, load_resp_file and save_data_file so that the gui stays
+    responsive for large surveys, setting data_fn or resp_fn reads the file
+    straight away.  Messages about the progress are sent with status_updated.
     """
+    status_updated = QtCore.pyqtSignal(str)
     
     def __init__(self, data_fn=None, resp_fn=None):
         super(PlotResponses, self).__init__()
@@ -280,6 +304,21 @@ class PlotResponses(QtWidgets.QWidget):
         self._ax_index = 0
         self.ax_list = None
         
+        # cached arrays of each station and index maps for editing
+        self._data_cache = {}
+        self._resp_cache = {}
+        self._station_index = {}
+        self._period_index = {}
+        self._plot_layout = None
+        self._mask_lines = None
+        self._background = None
+        
+        # background tasks for reading and writing files
+        self.task_pool = get_task_pool()
+        self._data_task = None
+        self._resp_task = None
+        self._save_task = None
+        
         self.setup_ui()
         
         self._data_fn = data_fn
@@ -296,29 +335,7 @@ class PlotResponses(QtWidgets.QWidget):
     @data_fn.setter
     def data_fn(self, data_fn):
         self._data_fn = os.path.abspath(data_fn)
-        self.file_watcher_dfn.addPath(self._data_fn)
-        
-        # create new modem data object
-        self.modem_data = modem.Data()
-        self.modem_data.read_data_file(self._data_fn)
-        
-        # make a back up copy that will be unchanged
-        # that way we can revert back
-        self._modem_data_copy = modem.Data()
-        self._modem_data_copy.read_data_file(self._data_fn)
-        
-        self.dirpath = os.path.dirname(self._data_fn)
-        
-        # fill list of stations
-        station_list = np.array(sorted(self.modem_data.mt_dict.keys()))
-        self.list_widget.clear()
-        for station in station_list:
-            self.list_widget.addItem(station)
-            
-        if self.station is None:
-            self.station = station_list[0]
-            
-        self.plot()
+        self._set_data(_read_data_file(self._data_fn))
         
     @property
     def resp_fn(self):
@@ -327,10 +344,7 @@ class PlotResponses(QtWidgets.QWidget):
     @resp_fn.setter
     def resp_fn(self, resp_fn):
         self._resp_fn = os.path.abspath(resp_fn)
-        self.modem_resp = modem.Data()
-
-        self.modem_resp.read_data_file(self._resp_fn)
-        self.plot() 
+        self._set_resp(_read_resp_file(self._resp_fn))
         
     @property
     def plot_z(self):
@@ -339,8 +353,111 @@ class PlotResponses(QtWidgets.QWidget):
     @plot_z.setter
     def plot_z(self, value):
         self._plot_z = value
+        self._data_cache = {}
+        self._resp_cache = {}
+        self.plot()
+        
+    #------------------------------------------------
+    # read and write files in the background
+    def load_data_file(self, data_fn):
+        """
+        read a data file in the background and plot it when it is read,
+        a data file that is still being read is dropped.
+        """
+        self._cancel_task(self._data_task)
+        self.status_updated.emit('Reading {0}'.format(data_fn))
+        self._data_task = self.task_pool.run_task(
+            _read_data_file,
+            args=(os.path.abspath(data_fn),),
+            on_result=self._set_data,
+            on_error=self._task_error,
+            on_progress=self._task_progress,
+            pass_task=True)
+        
+    def load_resp_file(self, resp_fn):
+        """
+        read a response file in the background and plot it when it is read
+        """
+        self._cancel_task(self._resp_task)
+        self.status_updated.emit('Reading {0}'.format(resp_fn))
+        self._resp_task = self.task_pool.run_task(
+            _read_resp_file,
+            args=(os.path.abspath(resp_fn),),
+            on_result=self._set_resp,
+            on_error=self._task_error,
+            on_progress=self._task_progress,
+            pass_task=True)
+        
+    def save_data_file(self, save_fn):
+        """
+        write the edited data to save_fn in the background, a copy of the
+        data is written so editing can go on while the file is written.
+        """
+        self.status_updated.emit('Writing {0}'.format(save_fn))
+        self._save_task = self.task_pool.run_task(
+            _write_data_file,
+            args=(copy.deepcopy(self.modem_data), save_fn),
+            on_result=self._data_file_saved,
+            on_error=self._task_error,
+            on_progress=self._task_progress,
+            pass_task=True)
+        
+    def cancel_tasks(self):
+        """
+        cancel reading files, a file that is being written is finished
+        """
+        for task in [self._data_task, self._resp_task]:
+            self._cancel_task(task)
+        
+    def _cancel_task(self, task):
+        if task is not None:
+            self.task_pool.cancel(task)
+            
+    def _task_error(self, message):
+        _logger.error(message)
+        self.status_updated.emit(message.strip().split('\n')[-1])
+        
+    def _task_progress(self, percent, message):
+        self.status_updated.emit('{0} ({1}%)'.format(message, percent))
+        
+    def _data_file_saved(self, save_fn):
+        self.status_updated.emit('Saved edits to {0}'.format(save_fn))
+        
+    def _set_data(self, data_tuple):
+        """
+        set the data read by _read_data_file and fill the station list
+        """
+        data_fn, self.modem_data, self._modem_data_copy = data_tuple
+        self._data_fn = data_fn
+        if data_fn not in self.file_watcher_dfn.files():
+            self.file_watcher_dfn.addPath(data_fn)
+        
+        self._reset_cache()
+        
+        self.dirpath = os.path.dirname(self._data_fn)
+        
+        # fill list of stations
+        station_list = np.array(sorted(self.modem_data.mt_dict.keys()))
+        self.list_widget.clear()
+        for station in station_list:
+            self.list_widget.addItem(station)
+            
+        if self.station is None:
+            self.station = station_list[0]
+            
+        self.status_updated.emit('Read {0}'.format(data_fn))
         self.plot()
         
+    def _set_resp(self, resp_tuple):
+        """
+        set the response read by _read_resp_file
+        """
+        self._resp_fn, self.modem_resp = resp_tuple
+        self._resp_cache = {}
+        self._plot_layout = None
+        self.status_updated.emit('Read {0}'.format(self._resp_fn))
+        self.plot() 
+        
     #----------------------------
     def setup_ui(self):
         """
@@ -376,6 +493,7 @@ class PlotResponses(QtWidgets.QWidget):
         # be able to edit the data
         self.mpl_widget.mpl_connect('pick_event', self.on_pick)
         self.mpl_widget.mpl_connect('axes_enter_event', self.in_axes)
+        self.mpl_widget.mpl_connect('draw_event', self.on_draw)
         
         #make sure the figure takes up the entire plottable space
         self.mpl_widget.setSizePolicy(QtWidgets.QSizePolicy.Expanding,
@@ -419,7 +537,7 @@ class PlotResponses(QtWidgets.QWidget):
         """
         
         print('{0} changed'.format(self.data_fn))
-        self.data_fn = os.path.abspath(self._data_fn)
+        self.load_data_file(self._data_fn)
         
     def save_edits(self):
         """
@@ -428,31 +546,198 @@ class PlotResponses(QtWidgets.QWidget):
         fn_dialog = QtWidgets.QFileDialog()
         save_fn = str(fn_dialog.getSaveFileName(caption='Choose File to save',
                                                 filter='*.dat')[0])
+        if save_fn == '':
+            return
         
-        self.modem_data.write_data_file(save_path=os.path.dirname(save_fn),
-                                        fn_basename=os.path.basename(save_fn),
-                                        compute_error=False,
-                                        fill=False,
-                                        elevation=True)
+        self.save_data_file(os.path.abspath(save_fn))
         
     def apply_edits(self):
         self.plot()
         
+    def _reset_cache(self):
+        """
+        reset the cached station arrays and build the station and period
+        index maps used when editing the data
+        """
+        self._data_cache = {}
+        self._resp_cache = {}
+        self._plot_layout = None
+
+        if self.modem_data is None:
+            self._station_index = {}
+            self._period_index = {}
+            return
+
+        self._station_index = dict([(station, s_index) for s_index, station in
+                                    enumerate(self.modem_data.data_array['station'])])
+        self._period_index = dict([(period, p_index) for p_index, period in
+                                   enumerate(self.modem_data.period_list)])
+
+    def _get_station_arrays(self, station, response=False):
+        """
+        get the arrays to plot for a station.  These are computed once and
+        kept until the station is edited or the plot type is changed.
+        """
+        if response:
+            modem_obj, cache = self.modem_resp, self._resp_cache
+        else:
+            modem_obj, cache = self.modem_data, self._data_cache
+
+        try:
+            return cache[station]
+        except KeyError:
+            pass
+
+        z_obj = modem_obj.mt_dict[station].Z
+        t_obj = modem_obj.mt_dict[station].Tipper
+
+        # need to make sure that resistivity and phase is computed
+        z_obj.compute_resistivity_phase()
+
+        if response:
+            try:
+                period = 1./z_obj.freq
+            except TypeError:
+                period = 1./t_obj.freq
+        else:
+            period = self.modem_data.period_list
+
+        #convert to apparent resistivity and phase
+        if self.plot_z == True:
+            scaling = 1./np.sqrt(z_obj.freq)[:, np.newaxis, np.newaxis]
+            plot_res = abs(z_obj.z.real*scaling)
+            plot_phase = abs(z_obj.z.imag*scaling)
+            if response:
+                plot_res_err = None
+            else:
+                plot_res_err = abs(z_obj.z_err*scaling)
+            plot_phase_err = plot_res_err
+
+        elif self.plot_z == False:
+            plot_res = z_obj.resistivity
+            plot_phase = z_obj.phase
+            if response:
+                plot_res_err = None
+                plot_phase_err = None
+            else:
+                plot_res_err = z_obj.resistivity_err
+                plot_phase_err = z_obj.phase_err
+
+        arrays = {'period':period,
+                  'z':z_obj.z,
+                  'z_err':z_obj.z_err,
+                  'res':plot_res,
+                  'res_err':plot_res_err,
+                  'phase':plot_phase,
+                  'phase_err':plot_phase_err,
+                  'tipper':t_obj.tipper,
+                  'tipper_err':None if response else t_obj.tipper_err,
+                  'plot_tipper':not np.all(t_obj.tipper == 0.0),
+                  #find locations where points have been masked
+                  'nz':[np.nonzero(z_obj.z[:, 0, 0])[0],
+                        np.nonzero(z_obj.z[:, 0, 1])[0],
+                        np.nonzero(z_obj.z[:, 1, 0])[0],
+                        np.nonzero(z_obj.z[:, 1, 1])[0],
+                        np.nonzero(t_obj.tipper[:, 0, 0])[0],
+                        np.nonzero(t_obj.tipper[:, 0, 1])[0]]}
+
+        cache[station] = arrays
+        return arrays
+
+    def _get_errorbar_arrays(self, arrays):
+        """
+        get (period, value, error) of the error bar in each axes in the
+        order of ax_list
+        """
+        eb_list = []
+        for key in ['res', 'phase']:
+            for kk, (ii, jj) in enumerate([(0, 0), (0, 1), (1, 0), (1, 1)]):
+                nz = arrays['nz'][kk]
+                if arrays[key+'_err'] is None:
+                    err = None
+                else:
+                    err = arrays[key+'_err'][nz, ii, jj]
+                eb_list.append((arrays['period'][nz], arrays[key][nz, ii, jj],
+                                err))
+
+        for jj in range(2):
+            nz = arrays['nz'][4+jj]
+            if arrays['tipper_err'] is None:
+                err = None
+            else:
+                err = arrays['tipper_err'][nz, 0, jj]
+            eb_list.append((arrays['period'][nz],
+                            arrays['tipper'][nz, 0, jj].real, err))
+            eb_list.append((arrays['period'][nz],
+                            arrays['tipper'][nz, 0, jj].imag, err))
+
+        return eb_list
+
+    def _get_rms_labels(self, arrays, resp_arrays):
+        """
+        get the legend labels of the model response with the rms of each
+        component
+        """
+        resp_z_err = np.nan_to_num((arrays['z']-resp_arrays['z'])/arrays['z_err'])
+        resp_t_err = np.nan_to_num((arrays['tipper']-resp_arrays['tipper'])/
+                                   arrays['tipper_err'])
+
+        rms_list = [resp_z_err[resp_arrays['nz'][kk], ii, jj].std()
+                    for kk, (ii, jj) in enumerate([(0, 0), (0, 1),
+                                                   (1, 0), (1, 1)])]
+        rms_list += [resp_t_err[arrays['nz'][4], 0, 0].std(),
+                     resp_t_err[arrays['nz'][5], 0, 1].std()]
+
+        label_list = ['$Z^m_{xx}$ ', '$Z^m_{xy}$ ', '$Z^m_{yx}$ ',
+                      '$Z^m_{yy}$ ', '$T^m_{x}$ ', '$T^m_{y}$']
+        return [label+'rms={0:.2f}'.format(rms)
+                for label, rms in zip(label_list, rms_list)]
+
+    def _set_y_tick_labels(self, ax):
+        """
+        blank out the first and last y tick labels so they do not overlap
+        with the axes above and below
+        """
+        ylabels = ax.get_yticks().tolist()
+        ylabels[-1] = ''
+        ylabels[0] = ''
+        ax.set_yticklabels(ylabels)
+
     def plot(self):
         """
         plot the data
+
+        The axes and error bars are only made when the layout of the plot
+        changes, otherwise they are updated in place with the cached
+        arrays of the station.
         """
 
         if self.station is None:
             return
-            
-        z_obj = self.modem_data.mt_dict[self.station].Z
-        t_obj = self.modem_data.mt_dict[self.station].Tipper
-        period = self.modem_data.period_list
-        
-        # need to make sure that resistivity and phase is computed
-        z_obj.compute_resistivity_phase()
 
+        arrays = self._get_station_arrays(self.station)
+        resp_arrays = None
+        if self.modem_resp is not None:
+            try:
+                resp_arrays = self._get_station_arrays(self.station,
+                                                       response=True)
+            except KeyError:
+                print('Could not find {0} in .resp file'.format(self.station))
+
+        layout = (self.plot_z, arrays['plot_tipper'], resp_arrays is not None,
+                  tuple([nz.size > 0 for nz in arrays['nz']]))
+        if layout != self._plot_layout:
+            self._setup_axes(arrays, resp_arrays)
+            self._plot_layout = layout
+        else:
+            self._update_axes(arrays, resp_arrays)
+
+        self.mpl_widget.draw()
+
+    def _setup_axes(self, arrays, resp_arrays=None):
+        """
+        make the axes and error bars for the current layout
+        """
         plt.rcParams['font.size'] = self.plot_settings.fs
         fontdict = {'size':self.plot_settings.fs+2, 'weight':'bold'} 
 
@@ -475,42 +760,17 @@ class PlotResponses(QtWidgets.QWidget):
                  'e_capthick':self.plot_settings.e_capthick,
                  'picker':3} 
 
-        #convert to apparent resistivity and phase
         if self.plot_z == True:
-            scaling = np.zeros_like(z_obj.z)
-            for ii in range(2):
-                for jj in range(2):
-                    scaling[:, ii, jj] = 1./np.sqrt(z_obj.freq)
-            plot_res = abs(z_obj.z.real*scaling)
-            plot_res_err = abs(z_obj.z_err*scaling)
-            plot_phase = abs(z_obj.z.imag*scaling)
-            plot_phase_err = abs(z_obj.z_err*scaling)
             h_ratio = [1, 1, .5]
-            
         elif self.plot_z == False:
-            plot_res = z_obj.resistivity
-            plot_res_err = z_obj.resistivity_err
-            plot_phase = z_obj.phase
-            plot_phase_err = z_obj.phase_err
             h_ratio = [1.5, 1, .5]
-        
-        #find locations where points have been masked
-        nzxx = np.nonzero(z_obj.z[:, 0, 0])[0]
-        nzxy = np.nonzero(z_obj.z[:, 0, 1])[0]
-        nzyx = np.nonzero(z_obj.z[:, 1, 0])[0]
-        nzyy = np.nonzero(z_obj.z[:, 1, 1])[0]
-        ntx = np.nonzero(t_obj.tipper[:, 0, 0])[0]
-        nty = np.nonzero(t_obj.tipper[:, 0, 1])[0]
-        
 
         self.figure.clf()
-        self.figure.suptitle(str(self.station), fontdict=fontdict)
+        self._suptitle = self.figure.suptitle(str(self.station),
+                                              fontdict=fontdict)
         
         #set the grid of subplots
-        if np.all(t_obj.tipper == 0.0) == True:
-            self.plot_tipper = False
-        else:
-            self.plot_tipper = True
+        self.plot_tipper = arrays['plot_tipper']
             
         gs = gridspec.GridSpec(3, 4, height_ratios=h_ratio)
         gs.update(wspace=self.plot_settings.subplot_wspace,
@@ -538,154 +798,43 @@ class PlotResponses(QtWidgets.QWidget):
         self.ax_list = [axrxx, axrxy, axryx, axryy,
                         axpxx, axpxy, axpyx, axpyy,
                         axtxr, axtxi, axtyr, axtyi]
-        
 
-        # plot data response
-        erxx = mtplottools.plot_errorbar(axrxx, 
-                                         period[nzxx], 
-                                         plot_res[nzxx, 0, 0], 
-                                         plot_res_err[nzxx, 0, 0],
-                                         **kw_xx)
-        erxy = mtplottools.plot_errorbar(axrxy, 
-                                         period[nzxy], 
-                                         plot_res[nzxy, 0, 1], 
-                                         plot_res_err[nzxy, 0, 1],
-                                         **kw_xx)
-        eryx = mtplottools.plot_errorbar(axryx, 
-                                         period[nzyx], 
-                                         plot_res[nzyx, 1, 0], 
-                                         plot_res_err[nzyx, 1, 0],
-                                         **kw_yy)
-        eryy = mtplottools.plot_errorbar(axryy, 
-                                         period[nzyy], 
-                                         plot_res[nzyy, 1, 1], 
-                                         plot_res_err[nzyy, 1, 1],
-                                         **kw_yy)
-        #plot phase                         
-        epxx = mtplottools.plot_errorbar(axpxx, 
-                                         period[nzxx], 
-                                         plot_phase[nzxx, 0, 0], 
-                                         plot_phase_err[nzxx, 0, 0],
-                                         **kw_xx)
-        epxy = mtplottools.plot_errorbar(axpxy, 
-                                         period[nzxy], 
-                                         plot_phase[nzxy, 0, 1], 
-                                         plot_phase_err[nzxy, 0, 1],
-                                         **kw_xx)
-        epyx = mtplottools.plot_errorbar(axpyx, 
-                                         period[nzyx], 
-                                         plot_phase[nzyx, 1, 0], 
-                                         plot_phase_err[nzyx, 1, 0],
-                                         **kw_yy)
-        epyy = mtplottools.plot_errorbar(axpyy, 
-                                         period[nzyy], 
-                                         plot_phase[nzyy, 1, 1], 
-                                         plot_phase_err[nzyy, 1, 1],
-                                         **kw_yy)
-                                      
-        #plot tipper
-        if self.plot_tipper == True:
-            ertx = mtplottools.plot_errorbar(axtxr, 
-                                             period[ntx],
-                                             t_obj.tipper[ntx, 0, 0].real,
-                                             t_obj.tipper_err[ntx, 0, 0],
-                                             **kw_xx)
-            erty = mtplottools.plot_errorbar(axtyr, 
-                                             period[nty],
-                                             t_obj.tipper[nty, 0, 1].real,
-                                             t_obj.tipper_err[nty, 0, 1],
-                                             **kw_yy)
-                                     
-            eptx = mtplottools.plot_errorbar(axtxi, 
-                                             period[ntx],
-                                             t_obj.tipper[ntx, 0, 0].imag,
-                                             t_obj.tipper_err[ntx, 0, 0],
-                                             **kw_xx)
-            epty = mtplottools.plot_errorbar(axtyi, 
-                                             period[nty],
-                                             t_obj.tipper[nty, 0, 1].imag,
-                                             t_obj.tipper_err[nty, 0, 1],
-                                             **kw_yy)
+        # plot data response, xx and xy components are in the first two
+        # columns, yx and yy in the last two
+        self._data_eb_list = []
+        for aa, eb_arrays in enumerate(self._get_errorbar_arrays(arrays)):
+            if aa > 7 and self.plot_tipper == False:
+                self._data_eb_list.append(None)
+                continue
+            kw = kw_xx if aa % 4 < 2 else kw_yy
+            self._data_eb_list.append(mtplottools.plot_errorbar(
+                self.ax_list[aa], *eb_arrays, **kw))
         
         #----------------------------------------------
         # get error bar list for editing later        
-        if self.plot_tipper == False: 
-            try:                   
-                self._err_list = [[erxx[1][0], erxx[1][1], erxx[2][0]],
-                                  [erxy[1][0], erxy[1][1], erxy[2][0]],
-                                  [eryx[1][0], eryx[1][1], eryx[2][0]],
-                                  [eryy[1][0], eryy[1][1], eryy[2][0]], 
-                                  [epxx[1][0], epxx[1][1], epxx[2][0]],
-                                  [epxy[1][0], epxy[1][1], epxy[2][0]],
-                                  [epyx[1][0], epyx[1][1], epyx[2][0]],
-                                  [epyy[1][0], epyy[1][1], epyy[2][0]]]
-                line_list = [[erxx[0]], [erxy[0]], [eryx[0]], [eryy[0]]]
-            except IndexError:
-                print('Found no Z components for {0}'.format(self.station))
-                line_list = [[None], [None], 
-                             [None], [None]]
-                                     
-                self._err_list = [[None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None]]
-
-        else:
-            try:                    
-                line_list = [[erxx[0]], [erxy[0]], 
-                             [eryx[0]], [eryy[0]],
-                             [ertx[0]], [erty[0]]]
-                                     
-                self._err_list = [[erxx[1][0], erxx[1][1], erxx[2][0]],
-                                  [erxy[1][0], erxy[1][1], erxy[2][0]],
-                                  [eryx[1][0], eryx[1][1], eryx[2][0]],
-                                  [eryy[1][0], eryy[1][1], eryy[2][0]],
-                                  [epxx[1][0], epxx[1][1], epxx[2][0]],
-                                  [epxy[1][0], epxy[1][1], epxy[2][0]],
-                                  [epyx[1][0], epyx[1][1], epyx[2][0]],
-                                  [epyy[1][0], epyy[1][1], epyy[2][0]],
-                                  [ertx[1][0], ertx[1][1], ertx[2][0]],
-                                  [eptx[1][0], eptx[1][1], eptx[2][0]],
-                                  [erty[1][0], erty[1][1], erty[2][0]],
-                                  [epty[1][0], epty[1][1], epty[2][0]]]
-            except IndexError:
-                print('Found no Z components for {0}'.format(self.station))
-                line_list = [[None], [None], 
-                             [None], [None],
-                             [None], [None]]
-                                     
-                self._err_list = [[None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None],
-                                  [None, None, None]]
+        self._err_list = []
+        for eb in self._data_eb_list:
+            try:
+                self._err_list.append([eb[1][0], eb[1][1], eb[2][0]])
+            except (IndexError, TypeError):
+                self._err_list.append([None, None, None])
+        if [None, None, None] in self._err_list[0:4]:
+            print('Found no Z components for {0}'.format(self.station))
         
         #------------------------------------------
         # make things look nice        
         # set titles of the Z components
-        label_list = [['$Z_{xx}$'], ['$Z_{xy}$'], 
-                       ['$Z_{yx}$'], ['$Z_{yy}$']] 
+        label_list = ['$Z_{xx}$', '$Z_{xy}$', '$Z_{yx}$', '$Z_{yy}$'] 
         for ax, label in zip(self.ax_list[0:4], label_list):
-            ax.set_title(label[0],fontdict={'size':self.plot_settings.fs+2, 
-                                          'weight':'bold'}) 
+            ax.set_title(label,fontdict={'size':self.plot_settings.fs+2, 
+                                         'weight':'bold'}) 
                                           
         # set legends for tipper components
         # fake a line
         l1 = plt.Line2D([0], [0], linewidth=0, color='w', linestyle='None', 
                         marker='.')
         t_label_list = ['Re{$T_x$}', 'Im{$T_x$}', 'Re{$T_y$}', 'Im{$T_y$}']
-        label_list += [['$T_{x}$'], ['$T_{y}$']]
+        label_list += ['$T_{x}$', '$T_{y}$']
         for ax, label in zip(self.ax_list[-4:], t_label_list):
             ax.legend([l1], [label], loc='upper left',
                       markerscale=.01,
@@ -715,13 +864,11 @@ class PlotResponses(QtWidgets.QWidget):
             axpyy.set_ylim(self.plot_settings.phase_yy_limits) 
     
         #set axis properties
+        period = self.modem_data.period_list
         for aa, ax in enumerate(self.ax_list):
             ax.tick_params(axis='y', pad=self.plot_settings.ylabel_pad)
-            ylabels = ax.get_yticks().tolist()
             if aa < 8:
-                ylabels[-1] = ''
-                ylabels[0] = ''
-                ax.set_yticklabels(ylabels)
+                self._set_y_tick_labels(ax)
                 plt.setp(ax.get_xticklabels(), visible=False)
                 if self.plot_z == True:
                     ax.set_yscale('log', nonposy='clip')
@@ -761,205 +908,156 @@ class PlotResponses(QtWidgets.QWidget):
             ax.set_xlim(xmin=10**(np.floor(np.log10(period[0])))*1.01,
                      xmax=10**(np.ceil(np.log10(period[-1])))*.99)
             ax.grid(True, alpha=.25)
+
+        # masked points are drawn on top of the plot with blitting, they
+        # are animated so a full draw leaves them out of the background
+        self._mask_lines = [ax.plot([], [], color=(0, 0, 0),
+                                    marker='x', 
+                                    ls='None',
+                                    ms=self.plot_settings.ms*2,
+                                    mew=4,
+                                    animated=True)[0]
+                            for ax in self.ax_list]
+        self._background = None
             
         ##----------------------------------------------
         #plot model response
-        if self.modem_resp is not None:
-            try:
-                resp_z_obj = self.modem_resp.mt_dict[self.station].Z
-                resp_z_err = np.nan_to_num((z_obj.z-resp_z_obj.z)/z_obj.z_err)
-                resp_z_obj.compute_resistivity_phase()
-                
-                resp_t_obj = self.modem_resp.mt_dict[self.station].Tipper
-                resp_t_err = np.nan_to_num((t_obj.tipper-resp_t_obj.tipper)/t_obj.tipper_err)
-            except KeyError:
-                print('Could not find {0} in .resp file'.format(self.station))
-                self.mpl_widget.draw()
-                return
-            
-            try:
-                resp_period = 1./resp_z_obj.freq
-            except TypeError:
-                resp_period = 1./resp_t_obj.freq
-                
-            #convert to apparent resistivity and phase
-            if self.plot_z == True:
-                scaling = np.zeros_like(resp_z_obj.z)
-                for ii in range(2):
-                    for jj in range(2):
-                        scaling[:, ii, jj] = 1./np.sqrt(resp_z_obj.freq)
-                r_plot_res = abs(resp_z_obj.z.real*scaling)
-                r_plot_phase = abs(resp_z_obj.z.imag*scaling)
-                
-            elif self.plot_z == False:
-                r_plot_res = resp_z_obj.resistivity
-                r_plot_phase = resp_z_obj.phase
+        self._resp_eb_list = [None] * len(self.ax_list)
+        if resp_arrays is None:
+            return
+
+        #--> make key word dictionaries for plotting
+        kw_xx = {'color':self.plot_settings.ctem,
+                 'marker':self.plot_settings.mtem,
+                 'ms':self.plot_settings.ms,
+                 'ls':':',
+                 'lw':self.plot_settings.lw,
+                 'e_capsize':self.plot_settings.e_capsize,
+                 'e_capthick':self.plot_settings.e_capthick}        
+       
+        kw_yy = {'color':self.plot_settings.ctmm,
+                 'marker':self.plot_settings.mtmm,
+                 'ms':self.plot_settings.ms,
+                 'ls':':',
+                 'lw':self.plot_settings.lw,
+                 'e_capsize':self.plot_settings.e_capsize,
+                 'e_capthick':self.plot_settings.e_capthick}
+        
+        # plot model response
+        for aa, eb_arrays in enumerate(self._get_errorbar_arrays(resp_arrays)):
+            if aa > 7 and self.plot_tipper == False:
+                continue
+            kw = kw_xx if aa % 4 < 2 else kw_yy
+            self._resp_eb_list[aa] = mtplottools.plot_errorbar(
+                self.ax_list[aa], *eb_arrays, **kw)
+
+        # legends with the rms of each component, the tipper legends go
+        # in the real tipper axes
+        legend_ax_index = [0, 1, 2, 3]
+        if self.plot_tipper == True:
+            legend_ax_index += [8, 10]
+        rms_label_list = self._get_rms_labels(arrays, resp_arrays)
                 
-            #find locations where points have been masked
-            nzxx_r = np.nonzero(resp_z_obj.z[:, 0, 0])[0]
-            nzxy_r = np.nonzero(resp_z_obj.z[:, 0, 1])[0]
-            nzyx_r = np.nonzero(resp_z_obj.z[:, 1, 0])[0]
-            nzyy_r = np.nonzero(resp_z_obj.z[:, 1, 1])[0]
-            ntx_r = np.nonzero(resp_t_obj.tipper[:, 0, 0])[0]
-            nty_r = np.nonzero(resp_t_obj.tipper[:, 0, 1])[0]
-
-            rms_xx = resp_z_err[nzxx_r, 0, 0].std()
-            rms_xy = resp_z_err[nzxy_r, 0, 1].std()
-            rms_yx = resp_z_err[nzyx_r, 1, 0].std()
-            rms_yy = resp_z_err[nzyy_r, 1, 1].std()
-            
-            #--> make key word dictionaries for plotting
-            kw_xx = {'color':self.plot_settings.ctem,
-                     'marker':self.plot_settings.mtem,
-                     'ms':self.plot_settings.ms,
-                     'ls':':',
-                     'lw':self.plot_settings.lw,
-                     'e_capsize':self.plot_settings.e_capsize,
-                     'e_capthick':self.plot_settings.e_capthick}        
-           
-            kw_yy = {'color':self.plot_settings.ctmm,
-                     'marker':self.plot_settings.mtmm,
-                     'ms':self.plot_settings.ms,
-                     'ls':':',
-                     'lw':self.plot_settings.lw,
-                     'e_capsize':self.plot_settings.e_capsize,
-                     'e_capthick':self.plot_settings.e_capthick}
-            
-            # plot data response
-            rerxx = mtplottools.plot_errorbar(axrxx, 
-                                             resp_period[nzxx_r], 
-                                             r_plot_res[nzxx_r, 0, 0], 
-                                             None,
-                                             **kw_xx)
-            rerxy = mtplottools.plot_errorbar(axrxy, 
-                                             resp_period[nzxy_r], 
-                                             r_plot_res[nzxy_r, 0, 1], 
-                                             None,
-                                             **kw_xx)
-            reryx = mtplottools.plot_errorbar(axryx, 
-                                             resp_period[nzyx_r], 
-                                             r_plot_res[nzyx_r, 1, 0], 
-                                             None,
-                                             **kw_yy)
-            reryy = mtplottools.plot_errorbar(axryy, 
-                                             resp_period[nzyy_r], 
-                                             r_plot_res[nzyy_r, 1, 1], 
-                                             None,
-                                             **kw_yy)
-            #plot phase                         
-            repxx = mtplottools.plot_errorbar(axpxx, 
-                                             resp_period[nzxx_r], 
-                                             r_plot_phase[nzxx_r, 0, 0], 
-                                             None,
-                                             **kw_xx)
-            repxy = mtplottools.plot_errorbar(axpxy, 
-                                             resp_period[nzxy_r], 
-                                             r_plot_phase[nzxy_r, 0, 1], 
-                                             None,
-                                             **kw_xx)
-            repyx = mtplottools.plot_errorbar(axpyx, 
-                                             resp_period[nzyx_r], 
-                                             r_plot_phase[nzyx_r, 1, 0], 
-                                             None,
-                                             **kw_yy)
-            repyy = mtplottools.plot_errorbar(axpyy, 
-                                             resp_period[nzyy_r], 
-                                             r_plot_phase[nzyy_r, 1, 1], 
-                                             None,
-                                             **kw_yy)
-                                          
-            #plot tipper
-            if self.plot_tipper == True:
-                rertx = mtplottools.plot_errorbar(axtxr, 
-                                                 resp_period[ntx_r],
-                                                 resp_t_obj.tipper[ntx_r, 0, 0].real,
-                                                 None,
-                                                 **kw_xx)
-                rerty = mtplottools.plot_errorbar(axtyr, 
-                                                 resp_period[nty_r],
-                                                 resp_t_obj.tipper[nty_r, 0, 1].real,
-                                                 None,
-                                                 **kw_yy)
-                                         
-                reptx = mtplottools.plot_errorbar(axtxi, 
-                                                 resp_period[ntx_r],
-                                                 resp_t_obj.tipper[ntx_r, 0, 0].imag,
-                                                 None,
-                                                 **kw_xx)
-                repty = mtplottools.plot_errorbar(axtyi, 
-                                                 resp_period[nty_r],
-                                                 resp_t_obj.tipper[nty_r, 0, 1].imag,
-                                                 None,
-                                                 **kw_yy)
-                             
-            if self.plot_tipper == False:
-                line_list[0] += [rerxx[0]]
-                line_list[1] += [rerxy[0]]
-                line_list[2] += [reryx[0]]
-                line_list[3] += [reryy[0]]
-                label_list[0] += ['$Z^m_{xx}$ '+
-                                   'rms={0:.2f}'.format(rms_xx)]
-                label_list[1] += ['$Z^m_{xy}$ '+
-                               'rms={0:.2f}'.format(rms_xy)]
-                label_list[2] += ['$Z^m_{yx}$ '+
-                               'rms={0:.2f}'.format(rms_yx)]
-                label_list[3] += ['$Z^m_{yy}$ '+
-                               'rms={0:.2f}'.format(rms_yy)]
-            else:
-                line_list[0] += [rerxx[0]]
-                line_list[1] += [rerxy[0]]
-                line_list[2] += [reryx[0]]
-                line_list[3] += [reryy[0]]
-                line_list[4] += [rertx[0]]
-                line_list[5] += [rerty[0]]
-                label_list[0] += ['$Z^m_{xx}$ '+
-                                   'rms={0:.2f}'.format(rms_xx)]
-                label_list[1] += ['$Z^m_{xy}$ '+
-                               'rms={0:.2f}'.format(rms_xy)]
-                label_list[2] += ['$Z^m_{yx}$ '+
-                               'rms={0:.2f}'.format(rms_yx)]
-                label_list[3] += ['$Z^m_{yy}$ '+
-                               'rms={0:.2f}'.format(rms_yy)]
-                label_list[4] += ['$T^m_{x}$ '+
-                                'rms={0:.2f}'.format(resp_t_err[ntx, 0, 0].std())]
-                label_list[5] += ['$T^m_{y}$'+
-                                'rms={0:.2f}'.format(resp_t_err[nty, 0, 1].std())]
-            
-            legend_ax_list = self.ax_list[0:4]
+        for aa, ax_index in enumerate(legend_ax_index):
+            self.ax_list[ax_index].legend(
+                [self._data_eb_list[ax_index][0],
+                 self._resp_eb_list[ax_index][0]],
+                [label_list[aa], rms_label_list[aa]],
+                loc=self.plot_settings.legend_loc,
+                bbox_to_anchor=self.plot_settings.legend_pos,
+                markerscale=self.plot_settings.legend_marker_scale,
+                borderaxespad=self.plot_settings.legend_border_axes_pad,
+                labelspacing=self.plot_settings.legend_label_spacing,
+                handletextpad=self.plot_settings.legend_handle_text_pad,
+                borderpad=self.plot_settings.legend_border_pad,
+                prop={'size':max([self.plot_settings.fs, 5])})
+
+    def _update_axes(self, arrays, resp_arrays=None):
+        """
+        update the error bars in place with the arrays of a new station
+        """
+        self._suptitle.set_text(str(self.station))
+
+        # clear the masked points of the last station
+        for mask_line in self._mask_lines:
+            mask_line.set_data([], [])
+
+        for eb, eb_arrays in zip(self._data_eb_list,
+                                 self._get_errorbar_arrays(arrays)):
+            if eb is not None:
+                mtplottools.update_errorbar(eb, *eb_arrays)
+
+        if resp_arrays is not None:
+            for eb, eb_arrays in zip(self._resp_eb_list,
+                                     self._get_errorbar_arrays(resp_arrays)):
+                if eb is not None:
+                    mtplottools.update_errorbar(eb, *eb_arrays)
+
+            legend_ax_index = [0, 1, 2, 3]
             if self.plot_tipper == True:
-                legend_ax_list += [self.ax_list[-4], self.ax_list[-2]]
-                
-            for aa, ax in enumerate(legend_ax_list):
-                ax.legend(line_list[aa],
-                          label_list[aa],
-                          loc=self.plot_settings.legend_loc,
-                          bbox_to_anchor=self.plot_settings.legend_pos,
-                          markerscale=self.plot_settings.legend_marker_scale,
-                          borderaxespad=self.plot_settings.legend_border_axes_pad,
-                          labelspacing=self.plot_settings.legend_label_spacing,
-                          handletextpad=self.plot_settings.legend_handle_text_pad,
-                          borderpad=self.plot_settings.legend_border_pad,
-                          prop={'size':max([self.plot_settings.fs, 5])})
-        
-        self.mpl_widget.draw()
+                legend_ax_index += [8, 10]
+            rms_label_list = self._get_rms_labels(arrays, resp_arrays)
+            for aa, ax_index in enumerate(legend_ax_index):
+                legend = self.ax_list[ax_index].get_legend()
+                legend.get_texts()[1].set_text(rms_label_list[aa])
+
+        # rescale to the new data including the error bars, axes with
+        # limits set in the plot settings are left alone
+        for aa, ax in enumerate(self.ax_list):
+            ax.relim()
+            for eb in [self._data_eb_list[aa], self._resp_eb_list[aa]]:
+                if eb is None:
+                    continue
+                for bar_lines in eb[2]:
+                    segments = bar_lines.get_segments()
+                    if len(segments) > 0:
+                        ax.update_datalim(np.concatenate(segments))
+            ax.autoscale_view(scalex=False)
+            if 3 < aa < 8 and self.plot_z == False:
+                self._set_y_tick_labels(ax)
+
+    def on_draw(self, event):
+        """
+        keep a copy of the plot without the masked points for blitting
+        and draw the masked points on top
+        """
+        if self.ax_list is None or self._mask_lines is None:
+            return
+        self._background = self.mpl_widget.copy_from_bbox(self.figure.bbox)
+        self._draw_mask_lines()
+
+    def _draw_mask_lines(self):
+        """
+        draw the masked points on top of the saved background
+        """
+        if self._background is None:
+            self.mpl_widget.draw_idle()
+            return
+        self.mpl_widget.restore_region(self._background)
+        for ax, mask_line in zip(self.ax_list, self._mask_lines):
+            ax.draw_artist(mask_line)
+        self.mpl_widget.blit(self.figure.bbox)
         
     def on_pick(self, event):
         """
         mask a data point when it is clicked on.  
         """         
         data_point = event.artist
-        data_period = data_point.get_xdata()[event.ind]
-        data_value = data_point.get_ydata()[event.ind]
+        e_index = event.ind[0]
+        data_period = data_point.get_xdata()[e_index]
+        data_value = data_point.get_ydata()[e_index]
         
         # get the indicies where the data point has been edited
         try:
-            p_index = np.where(self.modem_data.period_list==data_period)[0][0]
-            s_index = np.where(self.modem_data.data_array['station']==self.station)[0][0]
-        except IndexError:
+            p_index = self._period_index[data_period]
+            s_index = self._station_index[self.station]
+        except KeyError:
             return
 
+        # value in the paired axes from the plotted arrays
+        arrays = self._get_station_arrays(self.station)
         if self._key == 'tip':
-            data_value_2 = self.modem_data.mt_dict[self.station].Tipper.tipper[p_index,
+            data_value_2 = arrays['tipper'][p_index,
                                 self._comp_index_x, self._comp_index_y]
             if self._ax_index%2 == 0:
                 data_value_2 = data_value_2.imag
@@ -967,19 +1065,11 @@ class PlotResponses(QtWidgets.QWidget):
                 data_value_2 = data_value_2.real
                 
         elif self._key == 'z':
-            if self.plot_z == True:
-                data_value_2 = self.modem_data.mt_dict[self.station].Z.z[p_index,
-                                self._comp_index_x, self._comp_index_y]
-                                
-                if self._ax_index % 2 == 0:
-                    data_value_2 = data_value_2.imag
-                else:
-                    data_value_2 = data_value_2.real
-            elif self.plot_z == False and self._ax_index < 4:
-                data_value_2 = self.modem_data.mt_dict[self.station].Z.phase[p_index,
+            if self._ax_index < 4:
+                data_value_2 = arrays['phase'][p_index,
                                 self._comp_index_x, self._comp_index_y]
-            elif self.plot_z == False and self._ax_index >= 4:
-                data_value_2 = self.modem_data.mt_dict[self.station].Z.resistivity[p_index,
+            else:
+                data_value_2 = arrays['res'][p_index,
                                 self._comp_index_x, self._comp_index_y]
                         
         if event.mouseevent.button == 1:
@@ -994,20 +1084,17 @@ class PlotResponses(QtWidgets.QWidget):
             elif self._key == 'z':
                 self.modem_data.mt_dict[self.station].Z.z[p_index, 
                             self._comp_index_x, self._comp_index_y] = 0+0j
+            self._data_cache.pop(self.station, None)
             
             # plot the points as masked
-            self._ax.plot(data_period, data_value, color=(0, 0, 0),
-                          marker='x', 
-                          ms=self.plot_settings.ms*2,
-                          mew=4)
+            ax2_index = self.ax_list.index(self._ax2)
+            for ax_index, value in [(self._ax_index, data_value),
+                                    (ax2_index, data_value_2)]:
+                mask_line = self._mask_lines[ax_index]
+                mask_line.set_data(np.append(mask_line.get_xdata(), data_period),
+                                   np.append(mask_line.get_ydata(), value))
                           
-            self._ax2.plot(data_period, data_value_2, color=(0, 0, 0),
-                          marker='x', 
-                          ms=self.plot_settings.ms*2,
-                          mew=4)
-                          
-            self._ax.figure.canvas.draw()
-            self._ax2.figure.canvas.draw()
+            self._draw_mask_lines()
         
         # Increase error bars
         if event.mouseevent.button == 3:
@@ -1032,12 +1119,12 @@ class PlotResponses(QtWidgets.QWidget):
                     
             self.modem_data.data_array[s_index][self._key+'_err'][p_index, 
                         self._comp_index_x, self._comp_index_y] = err
+            self._data_cache.pop(self.station, None)
 
             # make error bar array
             try:
-                e_index = event.ind[0]
                 eb = self._err_list[self._ax_index][2].get_paths()[e_index].vertices
-            except IndexError:
+            except (IndexError, AttributeError):
                 return
             
             # make ecap array
@@ -1072,7 +1159,7 @@ class PlotResponses(QtWidgets.QWidget):
             self._err_list[self._ax_index][2].get_paths()[e_index].vertices = eb
                                        
             # need to redraw the figure
-            self._ax.figure.canvas.draw()
+            self.mpl_widget.draw_idle()
                           
     def in_axes(self, event):
         """
@@ -1177,6 +1264,45 @@ class PlotSettings(object):
 
         self.ylabel_pad = 1.25
 #==============================================================================
+# read and write files, these run in the task pool
+#==============================================================================
+def _read_data_file(data_fn, task=None):
+    """
+    read a data file and make a back up copy that will be unchanged, that way
+    the edits can be reverted
+    """
+    modem_data = modem.Data()
+    modem_data.read_data_file(data_fn, progress=get_progress(task))
+    
+    # no need to copy the data if it is dropped
+    if task is not None and task.is_cancelled():
+        return None
+    
+    return data_fn, modem_data, copy.deepcopy(modem_data)
+    
+def _read_resp_file(resp_fn, task=None):
+    """
+    read a response file
+    """
+    modem_resp = modem.Data()
+    modem_resp.read_data_file(resp_fn, progress=get_progress(task))
+    
+    return resp_fn, modem_resp
+    
+def _write_data_file(modem_data, save_fn, task=None):
+    """
+    write the edited data without changing the errors
+    """
+    modem_data.write_data_file(save_path=os.path.dirname(save_fn),
+                               fn_basename=os.path.basename(save_fn),
+                               compute_error=False,
+                               fill=False,
+                               elevation=True,
+                               progress=get_progress(task))
+    
+    return save_fn
+    
+#==============================================================================
 # Def Main
 #==============================================================================
 def main():
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Run long file reading, writing and computations of the Qt5 tools in a
+thread pool so the windows stay responsive.
+
+A function is wrapped in a Task, a QRunnable whose signals report the
+progress, result or error back to the gui thread.  Tasks that are asked
+to cancel are taken off the queue if they have not started yet, a running
+task stops the next time it reports progress and its result is dropped.
+
+:Example: ::
+
+    >>> from mtpy.gui.task_pool_qt5 import get_task_pool
+    >>> import mtpy.modeling.modem as modem
+    >>> def read_data(data_fn, task=None):
+    >>> ...     modem_data = modem.Data()
+    >>> ...     modem_data.read_data_file(data_fn,
+    >>> ...                               progress=task.report_progress)
+    >>> ...     return modem_data
+    >>> task = get_task_pool().run_task(read_data, args=(data_fn,),
+    >>> ...                                 on_result=self.set_data,
+    >>> ...                                 on_progress=self.show_progress,
+    >>> ...                                 pass_task=True)
+"""
+#==============================================================================
+# Imports
+#==============================================================================
+import threading
+import traceback
+
+try:
+    from PyQt5 import QtCore
+except ImportError:
+    raise ImportError("This version needs PyQt5")
+
+#==============================================================================
+class TaskCancelled(Exception):
+    """
+    raised in a running task when it has been asked to cancel
+    """
+    pass
+
+#==============================================================================
+class TaskSignals(QtCore.QObject):
+    """
+    signals of a task, a QRunnable can not emit signals itself
+
+    ============ ==============================================================
+    Signal       Description
+    ============ ==============================================================
+    started      emitted when the task starts running
+    progress     (percent, message) emitted by Task.report_progress
+    result       return value of the function
+    error        traceback if the function raised an error
+    finished     emitted when the task is done, cancelled or not
+    ============ ==============================================================
+    """
+    started = QtCore.pyqtSignal()
+    progress = QtCore.pyqtSignal(int, str)
+    result = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+#==============================================================================
+class Task(QtCore.QRunnable):
+    """
+    run func(*args, **kwargs) in a thread pool
+
+    If pass_task is True the task is given to the function as the keyword
+    argument task, so that it can call task.report_progress, which also
+    stops the function if the task has been cancelled, or check
+    task.is_cancelled() itself.
+    """
+
+    def __init__(self, func, args=(), kwargs=None, pass_task=False):
+        super(Task, self).__init__()
+
+        self.func = func
+        self.args = args
+        self.kwargs = {} if kwargs is None else dict(kwargs)
+        if pass_task:
+            self.kwargs['task'] = self
+
+        self.signals = TaskSignals()
+        self._cancel_event = threading.Event()
+
+    def is_cancelled(self):
+        """
+        True if the task has been asked to cancel
+        """
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """
+        ask the task to stop, its result will not be emitted
+        """
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """
+        raise TaskCancelled if the task has been cancelled
+        """
+        if self.is_cancelled():
+            raise TaskCancelled()
+
+    def report_progress(self, percent, message=''):
+        """
+        emit the progress of the task, stops the task if it is cancelled
+        """
+        self.check_cancelled()
+        self.signals.progress.emit(int(percent), str(message))
+
+    def run(self):
+        """
+        run the function and emit the outcome
+        """
+        try:
+            if self.is_cancelled():
+                return
+            self.signals.started.emit()
+            result = self.func(*self.args, **self.kwargs)
+        except TaskCancelled:
+            pass
+        except Exception:
+            if not self.is_cancelled():
+                self.signals.error.emit(traceback.format_exc())
+        else:
+            if not self.is_cancelled():
+                self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+#==============================================================================
+class TaskPool(QtCore.QObject):
+    """
+    start tasks in a QThreadPool and keep track of them until they are done
+    """
+
+    def __init__(self, thread_pool=None, parent=None):
+        super(TaskPool, self).__init__(parent)
+
+        if thread_pool is None:
+            thread_pool = QtCore.QThreadPool.globalInstance()
+        self.thread_pool = thread_pool
+        self._tasks = []
+
+    @property
+    def active_count(self):
+        """
+        number of tasks queued or running
+        """
+        return len(self._tasks)
+
+    def start(self, task, priority=0):
+        """
+        start a Task in the thread pool
+        """
+        # the pool must not delete the task before its signals are handled
+        task.setAutoDelete(False)
+        self._tasks.append(task)
+        task.signals.finished.connect(lambda: self._remove(task))
+        self.thread_pool.start(task, priority)
+
+        return task
+
+    def run_task(self, func, args=(), kwargs=None, on_result=None,
+                 on_error=None, on_progress=None, on_finished=None,
+                 pass_task=False, priority=0):
+        """
+        run func(*args, **kwargs) in the thread pool and connect the
+        callbacks to the signals of the task, they are called in the gui
+        thread.
+
+        :returns: the started Task, call task.cancel() to stop it
+        """
+        task = Task(func, args=args, kwargs=kwargs, pass_task=pass_task)
+        for signal, slot in [(task.signals.result, on_result),
+                             (task.signals.error, on_error),
+                             (task.signals.progress, on_progress),
+                             (task.signals.finished, on_finished)]:
+            if slot is not None:
+                signal.connect(slot)
+
+        return self.start(task, priority=priority)
+
+    def cancel(self, task):
+        """
+        cancel a task, taking it off the queue if it has not started
+        """
+        task.cancel()
+        if self.thread_pool.tryTake(task):
+            # never started so finished will not be emitted by the task
+            task.signals.finished.emit()
+
+    def cancel_all(self):
+        """
+        cancel all queued and running tasks
+        """
+        for task in list(self._tasks):
+            self.cancel(task)
+
+    def wait_for_done(self, msecs=-1):
+        """
+        block until all tasks in the thread pool are done
+        """
+        return self.thread_pool.waitForDone(msecs)
+
+    def _remove(self, task):
+        if task in self._tasks:
+            self._tasks.remove(task)
+
+#==============================================================================
+def get_progress(task):
+    """
+    get the progress function to give to a file reader or writer, the
+    reader stops the next time it reports progress if the task is cancelled
+
+    :returns: task.report_progress or None if task is None
+    """
+    if task is None:
+        return None
+    return task.report_progress
+
+#==============================================================================
+_TASK_POOL = None
+
+def get_task_pool():
+    """
+    get the task pool shared by all the gui tools
+    """
+    global _TASK_POOL
+    if _TASK_POOL is None:
+        _TASK_POOL = TaskPool()
+    return _TASK_POOL
@@ -469,6 +469,10 @@ def get_plot_color(colorx, comp, cmap, ckmin=None, ckmax=None, bounds=None):
     """
     gets the color for the given compnent, color array and cmap
 
+    colorx can be a single value, giving an RGBA tuple, or an array of
+    values, giving an array of RGBA colors, e.g. for the face colors of a
+    collection of ellipses
+
     Note: we now use the linearSegmentedColorMap objects, instead of the get_color function
     """
 
@@ -528,14 +532,15 @@ def get_plot_color(colorx, comp, cmap, ckmin=None, ckmax=None, bounds=None):
         step = abs(bounds[1] - bounds[0])
         ### need to get the color into a bin so as to not smear the colors.
         
-        if colorx > max(bounds):
-            colorx = max(bounds)
-        elif colorx < min(bounds):
-            colorx = min(bounds)
-        elif abs(colorx) <= step:
-            colorx = 0
-        else:
-            colorx = int(step * round(float(colorx - np.sign(colorx) * (abs(colorx) % step))/ step))
+        colorx = np.asarray(colorx, dtype=float)
+        with np.errstate(invalid='ignore'):
+            colorx = np.where(colorx > max(bounds), max(bounds),
+                     np.where(colorx < min(bounds), min(bounds),
+                     np.where(abs(colorx) <= step, 0,
+                              np.trunc(step * np.round((colorx - np.sign(colorx) *
+                                                        (abs(colorx) % step)) / step)))))
+        if colorx.ndim == 0:
+            colorx = float(colorx)
 
         if (cmap in list(cmapdict.keys())):
             return cmapdict[cmap](norm(colorx))
@@ -19,6 +19,8 @@ import mtpy.core.z as mtz
 import mtpy.utils.exceptions as mtex
 import mtpy.utils.gis_tools as gis_tools
 import matplotlib.mlab as mlab
+from matplotlib import rcParams
+from matplotlib.collections import PolyCollection
 
 # ==============================================================================
 
@@ -1419,6 +1421,147 @@ def grid_data(data_array, x, y, nx=None, ny=None):
     return grid_array, xg, yg
 
 
+# ==============================================================================
+# match station periods to plot periods
+# ==============================================================================
+def get_period_index(period_list, plot_period, ftol=.1):
+    """
+    find the period of each station that matches each plot period, the
+    first period (in the order of the station) within
+    plot_period * (1 -/+ ftol) is used.  The periods are matched with
+    np.searchsorted so long profiles with many periods stay fast.
+    
+    Arguments:
+    ----------
+        **period_list**: list of np.ndarray
+                         periods of each station, can be of different length
+                         
+        **plot_period**: np.ndarray(nt)
+                         array of periods in seconds to get data for.
+                         
+        **ftol**: float
+                  tolerance to match periods in period_list with plot_period
+                  
+    Returns:
+    --------
+        **period_index**: np.ndarray(nt, ns)
+                          index into the periods of each station, -1 where
+                          no period of the station matches
+    """
+    plot_period = np.asarray(plot_period, dtype=float)
+    lower = plot_period * (1 - ftol)
+    upper = plot_period * (1 + ftol)
+
+    period_index = np.full((plot_period.size, len(period_list)), -1,
+                           dtype=int)
+    for ii, period in enumerate(period_list):
+        period = np.asarray(period, dtype=float)
+        if period.size == 0:
+            continue
+        order = np.argsort(period, kind='mergesort')
+        sort_period = period[order]
+        lo = np.searchsorted(sort_period, lower, side='left')
+        hi = np.searchsorted(sort_period, upper, side='right')
+        found = np.nonzero(hi > lo)[0]
+        if found.size == 0:
+            continue
+
+        if np.all(order[1:] > order[:-1]):
+            # increasing periods, the first one is the smallest
+            period_index[found, ii] = order[lo[found]]
+        elif np.all(order[1:] < order[:-1]):
+            # decreasing periods, the first one is the largest
+            period_index[found, ii] = order[hi[found] - 1]
+        else:
+            period_index[found, ii] = [order[lo[rr]:hi[rr]].min()
+                                       for rr in found]
+
+    return period_index
+
+
+def get_pseudosection_grid(value_list, period_index, fill_value=0.):
+    """
+    put values of each station into a (period, station) grid for plotting
+    
+    Arguments:
+    ----------
+        **value_list**: list of np.ndarray(nf, ...)
+                        values of each station for each of its periods,
+                        e.g. resistivity (nf, 2, 2)
+                        
+        **period_index**: np.ndarray(nt, ns)
+                          from get_period_index
+                          
+        **fill_value**: float
+                        value where there is no matching period
+                        
+    Returns:
+    --------
+        **grid**: np.ndarray(nt, ns, ...)
+    """
+    nt, ns = period_index.shape
+    value_list = [np.asarray(value) for value in value_list]
+    shape = value_list[0].shape[1:]
+    nf = max([value.shape[0] for value in value_list])
+
+    # stack all the stations into one array, padded to the longest
+    stack = np.zeros((ns, max(nf, 1)) + shape, dtype=value_list[0].dtype)
+    for ii, value in enumerate(value_list):
+        stack[ii, :value.shape[0]] = value
+
+    station_index = np.broadcast_to(np.arange(ns), (nt, ns))
+    grid = stack[station_index, np.maximum(period_index, 0)]
+    grid[period_index < 0] = fill_value
+
+    return grid
+
+
+def _print_missing_periods(period_index, plot_period, station_list):
+    """
+    print the plot periods that were not found for a station
+    """
+    for rr, ii in zip(*np.nonzero(period_index < 0)):
+        print('did not find period {0:.6g} (s) for {1}'.format(
+            plot_period[rr], station_list[ii]))
+
+
+def _get_rp_grids(mt_list, plot_period, ftol):
+    """
+    get log10 resistivity and phase grids of shape (nt, ns, 2, 2), zero
+    where there is no matching period
+    """
+    period_index = get_period_index([mt.period for mt in mt_list],
+                                    plot_period, ftol=ftol)
+    res = get_pseudosection_grid([mt.Z.resistivity for mt in mt_list],
+                                 period_index, fill_value=1.)
+    phase = get_pseudosection_grid([mt.Z.phase for mt in mt_list],
+                                   period_index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        res = np.log10(res)
+    _print_missing_periods(period_index, plot_period,
+                           [mt.station for mt in mt_list])
+
+    return res, phase
+
+
+def _get_pt_grids(mt_list, plot_period, ftol):
+    """
+    get phimin, phimax, skew, azimuth and ellipticity grids of shape
+    (nt, ns), zero where there is no matching period
+    """
+    period_index = get_period_index([mt.period for mt in mt_list],
+                                    plot_period, ftol=ftol)
+    pt_list = [mt.pt for mt in mt_list]
+    grids = [get_pseudosection_grid([getattr(pt, attr) for pt in pt_list],
+                                    period_index)
+             for attr in ['phimin', 'phimax', 'beta', 'azimuth',
+                          'ellipticity']]
+    _print_missing_periods(period_index, plot_period,
+                           [mt.station for mt in mt_list])
+
+    return grids
+
+
 # ==============================================================================
 # get resistivity and phase arrays for plotting
 # ==============================================================================
@@ -1458,7 +1601,6 @@ def get_rp_arrays(mt_list, plot_period, sort_by='line', line_direction='ew',
         * If sort_by == 'line', the returned shape is (num_periods, 
                                                        num_stations)
         * If sort_by == 'map', the returned shape is (num_periods, 
-                                                      num_stations, 
                                                       num_stations)
                                                        
     
@@ -1485,135 +1627,26 @@ def get_rp_arrays(mt_list, plot_period, sort_by='line', line_direction='ew',
         raise mtex.MTpyError_inputarguments('Need to input an array of ' + \
                                             'periods')
 
-    ns = len(mt_list)
-    nt = len(plot_period)
-
-    # make a dictionary of the periods to plot for a reference
-    period_dict = dict([(key, vv)
-                        for vv, key in enumerate(plot_period)])
-
     # get arrays in pseudosection format
     if sort_by == 'line':
         # sort the data by offset
         mt_list_sort, station_list, offset_list = sort_by_offsets(mt_list,
                                                                   line_direction=line_direction)
+        res, phase = _get_rp_grids(mt_list_sort, plot_period, ftol)
 
-        # create empty arrays to put data into
-        resxx = np.zeros((nt, ns))
-        resxy = np.zeros((nt, ns))
-        resyx = np.zeros((nt, ns))
-        resyy = np.zeros((nt, ns))
-
-        phasexx = np.zeros((nt, ns))
-        phasexy = np.zeros((nt, ns))
-        phaseyx = np.zeros((nt, ns))
-        phaseyy = np.zeros((nt, ns))
-
-        for ii, mt in enumerate(mt_list_sort):
-            # get resisitivity and phase in a dictionary and append to a list
-            rp = mt.Z
-
-            for rr, rper in enumerate(plot_period):
-                jj = None
-                for kk, iper in enumerate(mt.period):
-                    if iper == rper:
-                        jj = period_dict[rper]
-                        resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                        resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                        resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                        resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                        phasexx[jj, ii] = rp.phase_xx[kk]
-                        phasexy[jj, ii] = rp.phase_xy[kk]
-                        phaseyx[jj, ii] = rp.phase_yx[kk]
-                        phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                        break
-
-                    elif rper * (1 - ftol) <= iper and \
-                                    iper <= rper * (1 + ftol):
-                        jj = period_dict[rper]
-                        resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                        resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                        resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                        resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                        phasexx[jj, ii] = rp.phase_xx[kk]
-                        phasexy[jj, ii] = rp.phase_xy[kk]
-                        phaseyx[jj, ii] = rp.phase_yx[kk]
-                        phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                        break
-                    else:
-                        pass
-
-                if jj is None:
-                    print('did not find period {0:.6g} (s) for {1}'.format(
-                        rper, mt.station))
-        return resxx, resxy, resyx, resyy, phasexx, phasexy, phaseyx, phaseyy, \
-               station_list, offset_list
+        return res[:, :, 0, 0], res[:, :, 0, 1], res[:, :, 1, 0], \
+            res[:, :, 1, 1], phase[:, :, 0, 0], phase[:, :, 0, 1], \
+            phase[:, :, 1, 0], phase[:, :, 1, 1], station_list, offset_list
 
     elif sort_by == 'map':
         map_dict, x, y = get_station_locations(mt_list,
                                                map_scale=map_scale,
                                                ref_point=ref_point)
+        res, phase = _get_rp_grids(mt_list, plot_period, ftol)
 
-        resxx = np.zeros((nt, ns))
-        resxy = np.zeros((nt, ns))
-        resyx = np.zeros((nt, ns, ns))
-        resyy = np.zeros((nt, ns, ns))
-
-        phasexx = np.zeros((nt, ns))
-        phasexy = np.zeros((nt, ns))
-        phaseyx = np.zeros((nt, ns))
-        phaseyy = np.zeros((nt, ns))
-
-        for ii, mt in enumerate(mt_list):
-            # get resisitivity and phase in a dictionary and append to a list
-            rp = mt.get_ResPhase()
-            #            rp = mt.Z
-
-            for rr, rper in enumerate(plot_period):
-                jj = None
-                for kk, iper in enumerate(mt.period):
-                    if iper == rper:
-                        jj = period_dict[rper]
-
-                        resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                        resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                        resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                        resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                        phasexx[jj, ii] = rp.phase_xx[kk]
-                        phasexy[jj, ii] = rp.phase_xy[kk]
-                        phaseyx[jj, ii] = rp.phase_yx[kk]
-                        phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                        break
-
-                    elif rper * (1 - ftol) <= iper and \
-                                    iper <= rper * (1 + ftol):
-                        jj = period_dict[rper]
-
-                        resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                        resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                        resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                        resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                        phasexx[jj, ii] = rp.phase_xx[kk]
-                        phasexy[jj, ii] = rp.phase_xy[kk]
-                        phaseyx[jj, ii] = rp.phase_yx[kk]
-                        phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                        break
-                    else:
-                        pass
-
-                if jj is None:
-                    print('did not find period {0:.6g} (s) for {1}'.format(
-                        rper, mt.station))
-        return resxx, resxy, resyx, resyy, + \
-            phasexx, phasexy, phaseyx, phaseyy, x, y, map_dict
+        return res[:, :, 0, 0], res[:, :, 0, 1], res[:, :, 1, 0], \
+            res[:, :, 1, 1], phase[:, :, 0, 0], phase[:, :, 0, 1], \
+            phase[:, :, 1, 0], phase[:, :, 1, 1], x, y, map_dict
 
 
 # ==============================================================================
@@ -1654,7 +1687,6 @@ def get_pt_arrays(mt_list, plot_period, sort_by='line', line_direction='ew',
         * If sort_by == 'line', the returned shape is (num_periods, 
                                                        num_stations)
         * If sort_by == 'map', the returned shape is (num_periods, 
-                                                      num_stations, 
                                                       num_stations)
                                                        
     
@@ -1679,109 +1711,25 @@ def get_pt_arrays(mt_list, plot_period, sort_by='line', line_direction='ew',
         raise mtex.MTpyError_inputarguments('Need to input an array of ' + \
                                             'periods')
 
-    ns = len(mt_list)
-    nt = len(plot_period)
-
-    # make a dictionary of the periods to plot for a reference
-    period_dict = dict([(key, vv)
-                        for vv, key in enumerate(plot_period)])
-
     # get arrays in pseudosection format
     if sort_by == 'line':
 
         mt_list_sort, slist, olist = sort_by_offsets(mt_list,
                                                      line_direction=line_direction)
+        phimin, phimax, skew, azimuth, ellipticity = _get_pt_grids(mt_list_sort,
+                                                                   plot_period,
+                                                                   ftol)
 
-        # create empty arrays to put data into need to reset to zero in case
-        # something has changed
-
-
-        phimin = np.zeros((nt, ns))
-        phimax = np.zeros((nt, ns))
-        skew = np.zeros((nt, ns))
-        azimuth = np.zeros((nt, ns))
-        ellipticity = np.zeros((nt, ns))
-
-        for ii, mt in enumerate(mt_list_sort):
-            # get resisitivity and phase in a dictionary and append to a list
-            pt = mt.pt
-
-            for rr, rper in enumerate(plot_period):
-                jj = None
-                for kk, iper in enumerate(mt.period):
-                    if iper == rper:
-                        jj = period_dict[rper]
-                        phimin[jj, ii] = pt.phimin[kk]
-                        phimax[jj, ii] = pt.phimax[kk]
-                        skew[jj, ii] = pt.beta[kk]
-                        azimuth[jj, ii] = pt.azimuth[kk]
-                        ellipticity[jj, ii] = pt.ellipticity[kk]
-
-                        break
-
-                    elif rper * (1 - ftol) <= iper and \
-                                    iper <= rper * (1 + ftol):
-                        jj = period_dict[rper]
-                        phimin[jj, ii] = pt.phimin[kk]
-                        phimax[jj, ii] = pt.phimax[kk]
-                        skew[jj, ii] = pt.beta[kk]
-                        azimuth[jj, ii] = pt.azimuth[kk]
-                        ellipticity[jj, ii] = pt.ellipticity[kk]
-
-                        break
-                    else:
-                        pass
-
-                if jj is None:
-                    print('did not find period {0:.6g} (s) for {1}'.format(
-                        rper, mt.station))
         return phimin, phimax, skew, azimuth, ellipticity, slist, olist
 
     elif sort_by == 'map':
         map_dict, x, y = get_station_locations(mt_list,
                                                map_scale=map_scale,
                                                ref_point=ref_point)
+        phimin, phimax, skew, azimuth, ellipticity = _get_pt_grids(mt_list,
+                                                                   plot_period,
+                                                                   ftol)
 
-        phimin = np.zeros((nt, ns))
-        phimax = np.zeros((nt, ns))
-        skew = np.zeros((nt, ns))
-        azimuth = np.zeros((nt, ns))
-        ellipticity = np.zeros((nt, ns))
-
-        for ii, mt in enumerate(mt_list):
-            # get resisitivity and phase in a dictionary and append to a list
-            pt = mt.pt
-
-            for rr, rper in enumerate(plot_period):
-                jj = None
-                for kk, iper in enumerate(mt.period):
-                    if iper == rper:
-                        jj = period_dict[rper]
-
-                        phimin[jj, ii] = pt.phimin[0][kk]
-                        phimax[jj, ii] = pt.phimax[0][kk]
-                        skew[jj, ii] = pt.beta[0][kk]
-                        azimuth[jj, ii] = pt.azimuth[0][kk]
-                        ellipticity[jj, ii] = pt.ellipticity[0][kk]
-
-                        break
-
-                    elif rper * (1 - ftol) <= iper and \
-                                    iper <= rper * (1 + ftol):
-                        jj = period_dict[rper]
-                        phimin[jj, ii] = pt.phimin[0][kk]
-                        phimax[jj, ii] = pt.phimax[0][kk]
-                        skew[jj, ii] = pt.beta[0][kk]
-                        azimuth[jj, ii] = pt.azimuth[0][kk]
-                        ellipticity[jj, ii] = pt.ellipticity[0][kk]
-
-                        break
-                    else:
-                        pass
-
-                if jj is None:
-                    print('did not find period {0:.6g} (s) for {1}'.format(
-                        rper, mt.station))
         return phimin, phimax, skew, azimuth, ellipticity, x, y, map_dict
 
 
@@ -1933,3 +1881,247 @@ def plot_errorbar(ax, x_array, y_array, y_error=None, x_error=None,
                                   #                                  capthick=e_capthick
                                   )
     return errorbar_object
+
+
+def update_errorbar(errorbar_object, x_array, y_array, y_error=None):
+    """
+    update the data of an error bar instance made with plot_errorbar in
+    place, much faster than removing it and plotting a new one
+    
+    Arguments:
+    ------------
+        **errorbar_object** : matplotlib.Axes.errorbar 
+                              error bar object returned by plot_errorbar
+                              
+        **x_array** : np.ndarray(nx)
+                      array of x values to plot
+                      
+        **y_array** : np.ndarray(nx)
+                      array of y values to plot
+                      
+        **y_error** : np.ndarray(nx)
+                      array of errors in y-direction to plot
+                      
+    Returns:
+    ---------
+        **errorbar_object** : matplotlib.Axes.errorbar 
+                              the updated error bar object
+    """
+    data_line, cap_lines, bar_lines = errorbar_object
+    data_line.set_data(x_array, y_array)
+    if y_error is None:
+        return errorbar_object
+
+    x_array = np.asarray(x_array)
+    y_low = np.asarray(y_array) - y_error
+    y_high = np.asarray(y_array) + y_error
+    if len(cap_lines) == 2:
+        cap_lines[0].set_data(x_array, y_low)
+        cap_lines[1].set_data(x_array, y_high)
+    if len(bar_lines) > 0:
+        bar_lines[0].set_segments(
+            np.stack([np.column_stack([x_array, y_low]),
+                      np.column_stack([x_array, y_high])], axis=1))
+
+    return errorbar_object
+
+
+def get_ellipse_vertices(x, y, width, height, angle, n_points=64):
+    """
+    get the vertices of many ellipses at once, same geometry as
+    matplotlib.patches.Ellipse
+    
+    Arguments:
+    ------------
+        **x**, **y** : np.ndarray(ne)
+                       centers of the ellipses in data coordinates
+                       
+        **width** : np.ndarray(ne)
+                    full length of the ellipse axes along x before rotation
+                    
+        **height** : np.ndarray(ne)
+                     full length of the ellipse axes along y before rotation
+                     
+        **angle** : np.ndarray(ne)
+                    rotation in degrees anti-clockwise from x
+                    
+        **n_points** : int
+                       number of vertices per ellipse
+                       
+    Returns:
+    ----------
+        **vertices** : np.ndarray(ne, n_points, 2)
+    """
+    x, y, width, height, angle = np.broadcast_arrays(*[np.asarray(vv, dtype=float)
+                                                      for vv in (x, y, width,
+                                                                 height, angle)])
+    t = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+    ex = .5 * width[:, None] * np.cos(t)
+    ey = .5 * height[:, None] * np.sin(t)
+    ca = np.cos(np.deg2rad(angle))[:, None]
+    sa = np.sin(np.deg2rad(angle))[:, None]
+
+    vertices = np.empty((x.size, n_points, 2))
+    vertices[:, :, 0] = x[:, None] + ex * ca - ey * sa
+    vertices[:, :, 1] = y[:, None] + ex * sa + ey * ca
+
+    return vertices
+
+
+def plot_ellipse_collection(ax, x, y, width, height, angle, facecolors,
+                            n_points=64, **kwargs):
+    """
+    draw many ellipses on an axes as one PolyCollection, which is a lot
+    faster to draw than adding a matplotlib.patches.Ellipse for each.
+    
+    The ellipses are in data coordinates so they look the same as
+    patches.Ellipse with the same parameters.
+    
+    Arguments:
+    ------------
+        **ax** : matplotlib.axes instance
+        
+        **x**, **y**, **width**, **height**, **angle** : np.ndarray(ne)
+                            ellipse parameters, see get_ellipse_vertices
+                            
+        **facecolors** : np.ndarray(ne, 4) or color
+                         face color of each ellipse
+                         
+        **kwargs** : keywords passed to PolyCollection, e.g. edgecolors, lw
+        
+    Returns:
+    ----------
+        **collection** : matplotlib.collections.PolyCollection
+    """
+    kwargs.setdefault('edgecolors', 'none')
+    collection = PolyCollection(get_ellipse_vertices(x, y, width, height,
+                                                     angle, n_points=n_points),
+                                facecolors=facecolors,
+                                **kwargs)
+    ax.add_collection(collection, autolim=False)
+
+    return collection
+
+
+def get_arrow_uv(dx, dy, head_length, length_includes_head=False):
+    """
+    get the quiver vectors that give arrows like ax.arrow, zero length
+    and nan arrows are masked as ax.arrow draws nothing for them.
+    
+    Arguments:
+    ------------
+        **dx**, **dy** : np.ndarray(na)
+                         length of the arrows in data coordinates
+                         
+        **head_length** : float
+                          length of the arrow head in data coordinates
+                          
+        **length_includes_head** : [ True | False ]
+                                   if False the head is added on the end of
+                                   dx, dy like ax.arrow
+                                   
+    Returns:
+    ----------
+        **u**, **v** : np.ma.MaskedArray(na)
+    """
+    dx, dy = [np.asarray(vv, dtype=float).ravel() for vv in (dx, dy)]
+    length = np.hypot(dx, dy)
+    bad = ~(np.isfinite(length) & (length > 0))
+    length[bad] = 1.
+    if length_includes_head:
+        stretch = 1.
+    else:
+        stretch = (length + head_length) / length
+
+    return (np.ma.masked_where(bad, np.nan_to_num(dx * stretch)),
+            np.ma.masked_where(bad, np.nan_to_num(dy * stretch)))
+
+
+def plot_arrows(ax, x, y, dx, dy, width=.001, head_width=None,
+                head_length=None, length_includes_head=False, **kwargs):
+    """
+    draw many arrows in one quiver call that look like the ones made with
+    ax.arrow, for example induction arrows.
+    
+    Arguments:
+    ------------
+        **ax** : matplotlib.axes instance
+        
+        **x**, **y** : np.ndarray(na)
+                       start of the arrows in data coordinates
+                       
+        **dx**, **dy** : np.ndarray(na)
+                         length of the arrows in data coordinates, arrows
+                         with zero or nan length are not drawn
+                         
+        **width** : float
+                    width of the arrow tail in data coordinates
+                    
+        **head_width** : float
+                         width of the arrow head, *default* is 3 * width
+                         
+        **head_length** : float
+                          length of the arrow head, *default* is
+                          1.5 * head_width
+                          
+        **length_includes_head** : [ True | False ]
+                                   same as for ax.arrow, if False the
+                                   head is added on the end of dx, dy
+                                   
+        **kwargs** : keywords passed to quiver, e.g. color, lw
+        
+    Returns:
+    ----------
+        **quiver** : matplotlib.quiver.Quiver, the arrows can be changed
+                     with update_arrows
+    """
+    if head_width is None:
+        head_width = 3 * width
+    if head_length is None:
+        head_length = 1.5 * head_width
+
+    # arrow patches have an edge line, quiver does not by default
+    linewidths = rcParams['patch.linewidth']
+    for key in ('lw', 'linewidth', 'linewidths'):
+        if key in kwargs:
+            linewidths = kwargs.pop(key)
+
+    u, v = get_arrow_uv(dx, dy, head_length,
+                        length_includes_head=length_includes_head)
+    quiver = ax.quiver(np.asarray(x, dtype=float).ravel(),
+                       np.asarray(y, dtype=float).ravel(),
+                       u, v,
+                       angles='xy',
+                       scale_units='xy',
+                       scale=1,
+                       units='xy',
+                       width=width,
+                       headwidth=head_width / width,
+                       headlength=head_length / width,
+                       headaxislength=head_length / width,
+                       minshaft=1,
+                       minlength=0,
+                       pivot='tail',
+                       linewidths=linewidths,
+                       **kwargs)
+    quiver.arrow_head_length = head_length
+    quiver.arrow_length_includes_head = length_includes_head
+
+    return quiver
+
+
+def update_arrows(quiver, dx, dy):
+    """
+    change the length and direction of arrows made with plot_arrows, the
+    arrows stay at the same place.
+    
+    Arguments:
+    ------------
+        **quiver** : matplotlib.quiver.Quiver made by plot_arrows
+        
+        **dx**, **dy** : np.ndarray(na)
+                         new length of the arrows in data coordinates
+    """
+    u, v = get_arrow_uv(dx, dy, quiver.arrow_head_length,
+                        length_includes_head=quiver.arrow_length_includes_head)
+    quiver.set_UVC(u, v)
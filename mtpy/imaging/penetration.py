@@ -16,14 +16,17 @@ Revision History:
           period to specified periods
 """
 
+import copy
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 from mpl_toolkits.axes_grid1 import make_axes_locatable
-from scipy.interpolate import griddata
+from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import Delaunay
 
 import mtpy
 import mtpy.modeling.occam2d_rewrite as occam2d
@@ -82,18 +85,17 @@ class Depth1D(ImagingBase):
         self._fig.set_tight_layout(True)
         plt.grid(True)
 
-        zeta = self._data.Z  # the attribute Z represent the impedance tensor 2X2 matrix
-        freqs = zeta.freq  # frequencies
-        scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
+        # penetration depths of all periods of the station
+        depth_dict = get_penetration_depths([self._data],
+                                            rholist=self._rholist & DEFAULT_RHOLIST)
 
         # The periods array
-        periods = 1.0 / freqs
+        periods = depth_dict['period'][:, 0]
         legendh = []
 
         if 'zxy' in self._rholist:
             # One of the 4-components: XY
-            penetration_depth = scale_param * \
-                np.sqrt(zeta.resistivity[:, 0, 1] * periods)
+            penetration_depth = depth_dict['zxy'][:, 0]
             periods[penetration_depth==0] = np.nan
                 
 
@@ -106,8 +108,7 @@ class Depth1D(ImagingBase):
             legendh.append(pen_zxy)
 
         if 'zyx' in self._rholist:
-            penetration_depth = scale_param * \
-                np.sqrt(zeta.resistivity[:, 1, 0] * periods)
+            penetration_depth = depth_dict['zyx'][:, 0]
 
             pen_zyx, = plt.loglog(
                 periods, penetration_depth*1e-3, color='g', marker='o', label='Zyx')
@@ -115,8 +116,7 @@ class Depth1D(ImagingBase):
 
         if 'det' in self._rholist:
             # determinant array
-            det2 = np.abs(zeta.det)
-            det_penetration_depth = scale_param * np.sqrt(0.2 * periods * det2 * periods)
+            det_penetration_depth = depth_dict['det'][:, 0]
 
             # pen_det, = plt.semilogx(periods, -det_penetration_depth, '-^', label='Determinant')
             pen_det, = plt.loglog(
@@ -175,19 +175,31 @@ class Depth2D(ImagingBase):
 
         self._fig = plt.figure(figsize=(8, 6), dpi=80)
         self._fig.set_tight_layout(True)
-        for selected_period in self._selected_periods:
-            if period_by_index:
-                (stations, periods, pen, _) = get_penetration_depth_by_index(
-                    pr.edi_list, selected_period, whichrho=self._rho)
-            else:
-                (stations, periods, pen, _) = get_penetration_depth_by_period(
-                    pr.edi_list, selected_period, whichrho=self._rho, ptol=self._ptol)
 
+        # penetration depths of all stations at all selected periods
+        if period_by_index:
+            depth_dict = get_penetration_depths(pr.edi_list,
+                                                self._selected_periods,
+                                                rholist=[self._rho],
+                                                by_index=True)
+            if np.any(depth_dict['index'] < 0):
+                raise Exception(
+                    "Index out_of_range Error: period index must be less than number of periods in zeta.freq")
+            depth_dict[self._rho] = -depth_dict[self._rho]
+        else:
+            depth_dict = get_penetration_depths(pr.edi_list,
+                                                self._selected_periods,
+                                                ptol=self._ptol,
+                                                rholist=[self._rho])
+        stations = depth_dict['station']
+
+        for selected_period, pen in zip(self._selected_periods,
+                                        depth_dict[self._rho]):
             line_label = "Period=%.2e s" % selected_period
 
             plt.plot(
                 pr.station_locations,
-                np.array(pen)*1e-3,
+                pen*1e-3,
                 "--",
                 #                marker="o",
                 #                markersize=12,
@@ -312,87 +324,23 @@ class Depth3D(ImagingBase):
             period0 = periods[0]
             print(("plotting for period %s" % period0))
 
-            if period0 < 1.0:
-                # kept 4 signifiant digits - nonzero digits
-                self._period_fmt = str(mtpy.utils.calculator.roundsf(period0, 4))
-            else:
-                self._period_fmt = "%.2f" % period0
+            self._period_fmt = _format_period(period0)
 
             # create figure
             self._fig = plt.figure(figsize=(8, 6), dpi=200)
             self._fig.set_tight_layout(True)
 
-            bbox = get_bounding_box(latlons)
-
-            self._logger.debug("Bounding Box %s", bbox)
-
-            xgrids = bbox[0][1] - bbox[0][0]
-            ygrids = bbox[1][1] - bbox[1][0]
-
-            self._logger.debug("xy grids: %s %s", xgrids, ygrids)
-
-            minlat = bbox[1][0]
-            minlon = bbox[0][0]
-
-            # Pixel size in Degree:  0.001=100meters, 0.01=1KM 1deg=100KM
-            pixelsize = 0.002  # Degree 0.002=200meters, 0.01=1KM 1deg=100KM
-
-            nx = int(np.ceil(xgrids / pixelsize))
-            ny = int(np.ceil(ygrids / pixelsize))
-
-            self._logger.debug("number of grids xy: %s %s", nx, ny)
-
-            # make the image slightly bigger than the (nx, ny) to contain all points
-            # avoid index out of bound
-            pad = 1  # pad = 1 affect the top and right of the plot. it is linked to get_index offset?
-            # todo change this part to use xy bound offset? (0.5 gride on each side?)
-            nx_padded = nx + pad
-            ny_padded = ny + pad
-
-            # fast initialization
-            zdep = np.empty((ny_padded, nx_padded))
-            zdep.fill(np.nan)  # initialize all pixel value as np.nan
-
-            points = np.zeros((len(latlons), 2))
-            values = np.zeros(len(latlons))
-
-            station_points = np.zeros((len(latlons), 2))
-
-            self._logger.debug("zdep shape %s", zdep.shape)
+            # the pixel grid and the triangulation of the stations do not
+            # change with period, keep them to update the image
+            self._depth_grid = get_depth_grid(latlons)
+            bbox = self._depth_grid['bbox']
+            pixelsize = self._depth_grid['pixelsize']
+            nx = self._depth_grid['nx']
+            ny = self._depth_grid['ny']
+            station_points = self._depth_grid['station_points']
 
-            for iter, (lat, lon) in enumerate(latlons):
-                # self._logger.debug(iter, pair)
-                (xi, yi) = get_index(lat, lon, minlat, minlon, pixelsize)
-                zdep[ny_padded - yi - 1, xi] = np.abs(pendep[iter])
-                # print pair
-                points[iter, 0] = ny_padded - yi - 1
-                points[iter, 1] = xi
-                values[iter] = np.abs(pendep[iter])
-                station_points[iter, 0] = ny_padded - yi - 1
-                station_points[iter, 1] = xi
-
-            # plt.imshow(zdep, interpolation='none') #OR plt.imshow(zdep,  interpolation='spline36')
-            # plt.colorbar()
-            # plt.show() # without this show(), the 2 figure will be plotted in one
-            # canvas, overlay and compare
-
-            # griddata interpolation of the zdep sample MT points.
-            # self._logger.debug(zdep.shape)
-
-            # grid_x, grid_y = np.mgrid[0:95:96j, 0:83:84j]  # this syntax with
-            # complex step 96j has different meaning
-            # this is more straight forward.
-            grid_x, grid_y = np.mgrid[0:ny_padded:1, 0:nx_padded:1]
-
-            # grid_z0 = griddata(points, values, (grid_x, grid_y), method='nearest')
-            grid_z = griddata(points, values, (grid_x, grid_y), method='linear')
-            # grid_z = griddata(points, values, (grid_x, grid_y), method='cubic')
-
-            # method='cubic' may cause negative interp values; set them nan to make
-            # empty
-            grid_z[grid_z < 0] = np.nan
-            if z_unit == 'km':  # change to km
-                grid_z = grid_z / 1000.0
+            grid_z = grid_penetration_depth(self._depth_grid, pendep,
+                                            z_unit=z_unit)
 
             # use reverse color map in imshow and the colorbar
             my_cmap = matplotlib.cm.jet_r
@@ -403,6 +351,7 @@ class Depth3D(ImagingBase):
             # since matplotlib v2.0 the default interpolation is changed to nearest, use "bilinear" to restore the default behaviour in 1.5.3
             # imgplot = plt.imshow(grid_z, origin='upper', cmap=my_cmap, interpolation='bilinear', resample=False)
             imgplot = plt.imshow(grid_z, origin='upper', cmap=my_cmap)
+            self._depth_image = imgplot
 
             # the stations sample point 1-lon-j, 0-lat-i
             plt.plot(station_points[:, 1], station_points[:, 0], 'kv', markersize=6, )
@@ -431,10 +380,10 @@ class Depth3D(ImagingBase):
             plt.gcf().set_size_inches(6, 6)
 
             numticks = 5  # number of ticks to draw 5,10?
-            stepx = int(zdep.shape[1] / numticks)
-            stepy = int(zdep.shape[0] / numticks)
-            xticks = np.arange(0, zdep.shape[1], stepx)  # 10, 100
-            yticks = np.arange(0, zdep.shape[0], stepy)
+            stepx = int(grid_z.shape[1] / numticks)
+            stepy = int(grid_z.shape[0] / numticks)
+            xticks = np.arange(0, grid_z.shape[1], stepx)  # 10, 100
+            yticks = np.arange(0, grid_z.shape[0], stepy)
 
             xticks_label = ['%.2f' % (bbox[0][0] + pixelsize * xtick)
                             for xtick in xticks]  # formatted float numbers
@@ -479,6 +428,85 @@ class Depth3D(ImagingBase):
 
         return
 
+    def _set_period_depth(self, period0, pendep, z_unit='km'):
+        """
+        update the image made by plot with the penetration depths pendep of
+        the stations at another period, keeping the figure, axes, colorbar
+        and stations
+        """
+        self._period_fmt = _format_period(period0)
+        self._depth_image.set_data(
+            grid_penetration_depth(self._depth_grid, pendep, z_unit=z_unit))
+        # scale the colours to the new depths, as a new image would be
+        self._depth_image.autoscale()
+
+        title = "Penetration Depth at the Period=%s seconds \n" % self._period_fmt
+        self._depth_image.axes.set_title(title)
+        self._fig.canvas.set_window_title(title)
+
+    def save_period_series(self, period_list, save_path, file_format='png',
+                           fig_dpi=400, n_processes=1, **kwargs):
+        """
+        save a penetration depth map for each period in period_list.
+
+        The penetration depths of all stations are computed at once for all
+        periods, then the figure is made once and only the image, colorbar
+        and title are updated for each period.  The periods can be split
+        over n_processes worker processes, each drawing on its own figure
+        with the Agg backend.
+
+        :param period_list: list of periods in seconds
+        :param save_path: directory to save the figures to, files are named
+                          P3Depth_Period<period>.<file_format>
+        :param file_format: [ png | jpg | pdf | svg ... ]
+        :param fig_dpi: resolution of the saved figures
+        :param n_processes: number of worker processes, 1 or None draws in
+                            this process with the current backend
+        :param kwargs: fontsize, plot_station_id and z_unit, see plot
+        :return: list of saved file names
+        """
+        if self._rho is None:
+            raise ZComponentError
+        if not os.path.exists(save_path):
+            os.makedirs(save_path)
+
+        period_list = np.atleast_1d(np.asarray(period_list, dtype=float))
+        depth_dict = get_penetration_depths(self._data, period_list,
+                                            ptol=self._ptol,
+                                            rholist=[self._rho])
+        # plot uses the period of the first station
+        period0_list = depth_dict['period'][:, 0]
+        pendep_list = depth_dict[self._rho]
+        save_fn_list = [os.path.join(save_path, 'P3Depth_Period%s.%s' % (
+                        _format_period(period0), file_format))
+                        for period0 in period0_list]
+
+        plot_obj = copy.copy(self)
+        plot_obj._fig = None
+        if n_processes in [None, 1]:
+            _save_period_series_chunk(plot_obj, period_list, period0_list,
+                                      pendep_list, save_fn_list, fig_dpi,
+                                      kwargs)
+        else:
+            index_chunks = [index for index in
+                            np.array_split(np.arange(len(save_fn_list)),
+                                           n_processes) if index.size > 0]
+            with ProcessPoolExecutor(max_workers=n_processes) as executor:
+                futures = [executor.submit(_save_period_series_chunk,
+                                           plot_obj,
+                                           period_list[index],
+                                           period0_list[index],
+                                           pendep_list[index],
+                                           [save_fn_list[ii] for ii in index],
+                                           fig_dpi,
+                                           kwargs,
+                                           True)
+                           for index in index_chunks]
+                for future in futures:
+                    future.result()
+
+        return save_fn_list
+
     def set_data(self, data):
         # this plot need a list of edi files
         self._set_edis(data)
@@ -506,6 +534,169 @@ class Depth3D(ImagingBase):
 
 # Utility functions (may need to move to utility module
 
+def _get_mt_obj(mt_obj):
+    """
+    get an MT object from either an MT object or the path to an edi file
+    """
+    if isinstance(mt_obj, str) and os.path.isfile(mt_obj):
+        mt_obj = mt.MT(mt_obj)
+    elif not isinstance(mt_obj, mt.MT):
+        raise Exception("Unsupported list of objects %s" % type(mt_obj))
+    return mt_obj
+
+
+def get_stacked_impedance(mt_obj_list):
+    """
+    stack the impedance tensors of a list of stations into one array, so the
+    penetration depth of all stations and periods can be computed at once.
+    Stations with fewer frequencies are padded with nan.
+
+    :param mt_obj_list: list of MT objects or edi files
+    :return: dictionary with keys
+             station: list of station names (ns)
+             latlons: list of (lat, lon) pairs (ns)
+             freq: np.ndarray(ns, nf) frequencies
+             z: np.ndarray(ns, nf, 2, 2) complex impedance tensors
+    """
+    mt_obj_list = [_get_mt_obj(mt_obj) for mt_obj in mt_obj_list]
+
+    ns = len(mt_obj_list)
+    nf = max([len(mt_obj.Z.freq) for mt_obj in mt_obj_list] + [0])
+
+    freq = np.full((ns, nf), np.nan)
+    z = np.full((ns, nf, 2, 2), np.nan, dtype=complex)
+    for ii, mt_obj in enumerate(mt_obj_list):
+        nfreq = len(mt_obj.Z.freq)
+        freq[ii, :nfreq] = mt_obj.Z.freq
+        z[ii, :nfreq] = mt_obj.Z.z
+
+    return {'station': [mt_obj.station for mt_obj in mt_obj_list],
+            'latlons': [(mt_obj.lat, mt_obj.lon) for mt_obj in mt_obj_list],
+            'freq': freq,
+            'z': z}
+
+
+def compute_penetration_depth(z, period, whichrho='det'):
+    """
+    Niblett-Bostick / skin depth estimate of the penetration depth in meters
+    from impedance tensors, element wise over any leading shape.
+
+    :param z: np.ndarray(..., 2, 2) complex impedance tensor
+    :param period: np.ndarray(...) periods in seconds
+    :param whichrho: 'det', 'zxy' or 'zyx'
+    :return: np.ndarray(...) penetration depth
+    """
+    scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
+
+    z = np.asarray(z)
+    period = np.asarray(period)
+
+    if whichrho == 'zxy':
+        rho = 0.2 * np.abs(z[..., 0, 1]) ** 2 * period
+    elif whichrho == 'zyx':
+        rho = 0.2 * np.abs(z[..., 1, 0]) ** 2 * period
+    elif whichrho == 'det':  # the 2X2 complex Z-matrix's determinant abs value
+        det2 = np.abs(z[..., 0, 0] * z[..., 1, 1] - z[..., 0, 1] * z[..., 1, 0])
+        rho = 0.2 * period * det2
+    else:
+        _logger.critical(
+            "unsupported method to compute penetration depth: %s",
+            whichrho)
+        raise Exception("unsupported method to compute penetratoin depth: %s" % whichrho)
+
+    return scale_param * np.sqrt(rho * period)
+
+
+def get_penetration_depths(mt_obj_list, selected_periods=None, ptol=0.1,
+                           rholist=DEFAULT_RHOLIST, by_index=False):
+    """
+    Compute the penetration depths of all stations at all selected periods at
+    once from the stacked impedance tensors.
+
+    For each station the nearest period to each selected period is used, if
+    abs(selected_period - nearest_period) is greater than
+    ptol * selected_period the depth is nan and the period is set to the
+    selected period.
+
+    :param mt_obj_list: list of MT objects or edi files
+    :param selected_periods: list of periods in seconds, or of period indices
+                             if by_index is True.  If None all periods of
+                             each station are used (by index).
+    :param ptol: tolerance to find the nearest period to the selected period
+    :param rholist: components to compute, any of 'det', 'zxy' and 'zyx'
+    :param by_index: if True selected_periods are indices into the periods of
+                     each station, indices beyond the periods of a station
+                     give nan
+    :return: dictionary with keys
+             station: list of station names (ns)
+             latlons: list of (lat, lon) pairs (ns)
+             period: np.ndarray(np, ns) period of each depth
+             index: np.ndarray(np, ns) index of the period of each station,
+                    -1 where it is beyond the tolerance
+             and one np.ndarray(np, ns) of penetration depths per component
+             in rholist
+    """
+    for whichrho in rholist:
+        if whichrho not in DEFAULT_RHOLIST:
+            _logger.critical(
+                "unsupported method to compute penetration depth: %s",
+                whichrho)
+            raise Exception("unsupported method to compute penetratoin depth: %s" % whichrho)
+
+    stack = get_stacked_impedance(mt_obj_list)
+    freq = stack['freq']
+    ns, nf = freq.shape
+    nfreq = np.sum(np.isfinite(freq), axis=1)
+
+    if selected_periods is None:
+        by_index = True
+        selected_periods = np.arange(nf)
+    selected_periods = np.atleast_1d(np.asarray(selected_periods))
+
+    if by_index:
+        index = np.broadcast_to(selected_periods.astype(int)[:, None],
+                                (selected_periods.size, ns)).copy()
+        index[index >= nfreq] = -1
+        station_index = np.broadcast_to(np.arange(ns), index.shape)
+        with np.errstate(divide='ignore'):
+            period = 1.0 / freq[station_index, np.maximum(index, 0)]
+        period[index < 0] = np.nan
+    else:
+        selected_periods = selected_periods.astype(float)
+        # nearest frequency of each station to each selected period, the
+        # padding is never the nearest
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff = np.abs(freq[None, :, :] - 1.0 / selected_periods[:, None, None])
+        diff[np.isnan(diff)] = np.inf
+        index = np.argmin(diff, axis=2)
+        station_index = np.broadcast_to(np.arange(ns), index.shape)
+        with np.errstate(divide='ignore'):
+            period = 1.0 / freq[station_index, index]
+
+        beyond = ~(np.abs(selected_periods[:, None] - period) <=
+                   selected_periods[:, None] * ptol)
+        for pp, ii in zip(*np.nonzero(beyond)):
+            _logger.warning("Nearest preiod {} on station {} was beyond tolerance of {} ".format(
+                period[pp, ii], stack['station'][ii], ptol))
+        index[beyond] = -1
+        period[beyond] = np.broadcast_to(selected_periods[:, None],
+                                         period.shape)[beyond]
+
+    z = stack['z'][station_index, np.maximum(index, 0)]
+    z[index < 0] = np.nan
+
+    depth_dict = {'station': stack['station'],
+                  'latlons': stack['latlons'],
+                  'period': period,
+                  'index': index}
+    with np.errstate(invalid='ignore'):
+        for whichrho in rholist:
+            depth_dict[whichrho] = compute_penetration_depth(z, period,
+                                                             whichrho=whichrho)
+
+    return depth_dict
+
+
 def get_penetration_depth_by_index(mt_obj_list, per_index, whichrho='det'):
     """
     Compute the penetration depth of mt_obj at the given period_index, and using whichrho option.
@@ -514,65 +705,23 @@ def get_penetration_depth_by_index(mt_obj_list, per_index, whichrho='det'):
     ----------
     mt_obj_list : list of MT
         List of stations as MT objects.
-    selected_period : float
-        The period in seconds to plot depth for.
-    ptol : float
-        Tolerance to use when finding nearest period to selected period.
-        If abs(selected_period - nearest_period) is greater than
-        ptol * selected_period, then the period is discarded and will
-        appear as a gap in the plot.
+    per_index : int
+        The index of the period to plot depth for.
     whichrho : str
         'det', 'zxy' or 'zyx'. The component to plot.
     """
-    scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
-
-    # per_index=0,1,2,....
-    periods = []
-    pen_depth = []
-    stations = []
-    latlons = []
-    for mt_obj in mt_obj_list:
-        if isinstance(mt_obj, str) and os.path.isfile(mt_obj):
-            mt_obj = mt.MT(mt_obj)
-        elif not isinstance(mt_obj, mt.MT):
-            raise Exception("Unsupported list of objects %s" % type(mt_obj))
-        # station id
-        stations.append(mt_obj.station)
-        # latlons
-        latlons.append((mt_obj.lat, mt_obj.lon))
-        # the attribute Z
-        zeta = mt_obj.Z
-
-        if per_index >= len(zeta.freq):
-            _logger.debug(
-                "Number of frequecies (Max per_index)= %s", len(
-                    zeta.freq))
-            raise Exception(
-                "Index out_of_range Error: period index must be less than number of periods in zeta.freq")
-
-        per = 1.0 / zeta.freq[per_index]
-        periods.append(per)
-
-        if whichrho == 'zxy':
-            penetration_depth = - scale_param * \
-                np.sqrt(zeta.resistivity[per_index, 0, 1] * per)
-        elif whichrho == 'zyx':
-            penetration_depth = - scale_param * \
-                np.sqrt(zeta.resistivity[per_index, 1, 0] * per)
-        elif whichrho == 'det':  # the 2X2 complex Z-matrix's determinant abs value
-            # determinant value at the given period index
-            det2 = np.abs(zeta.det[per_index])
-            penetration_depth = -scale_param * np.sqrt(0.2 * per * det2 * per)
-        else:
-            _logger.critical(
-                "unsupported method to compute penetration depth: %s",
-                whichrho)
-            # sys.exit(100)
-            raise Exception("unsupported method to compute penetratoin depth: %s" % whichrho)
+    depth_dict = get_penetration_depths(mt_obj_list, [per_index],
+                                        rholist=[whichrho], by_index=True)
 
-        pen_depth.append(penetration_depth)
+    if np.any(depth_dict['index'][0] < 0):
+        _logger.debug(
+            "Station periods beyond per_index: %s",
+            np.array(depth_dict['station'])[depth_dict['index'][0] < 0])
+        raise Exception(
+            "Index out_of_range Error: period index must be less than number of periods in zeta.freq")
 
-    return stations, periods, pen_depth, latlons
+    return depth_dict['station'], list(depth_dict['period'][0]), \
+        list(-depth_dict[whichrho][0]), depth_dict['latlons']
 
 
 def load_edi_files(edi_path, file_list=None):
@@ -598,68 +747,13 @@ def get_penetration_depth_by_period(mt_obj_list, selected_period, ptol=0.1, whic
     :param whichrho:
     :return: tuple of (stations, periods, penetrationdepth, lat-lons-pairs)
     """
-    scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
-
-    # per_index=0,1,2,....
-    periods = []
-    pen_depth = []
-    stations = []
-    latlons = []
-
     _logger.info("Getting nearest period to {} for all stations".format(selected_period))
-    for mt_obj in mt_obj_list:
-        if isinstance(mt_obj, str) and os.path.isfile(mt_obj):
-            mt_obj = mt.MT(mt_obj)
-        elif not isinstance(mt_obj, mt.MT):
-            raise Exception("Unsupported list of objects %s" % type(mt_obj))
-
-        # station id
-        stations.append(mt_obj.station)
-        # latlons
-        latlons.append((mt_obj.lat, mt_obj.lon))
-
-        # the attribute Z
-        zeta = mt_obj.Z
-        per_index = np.argmin(np.fabs(zeta.freq - 1.0/selected_period))
-        per = 1.0 / zeta.freq[per_index]
-
-        print("********* The period-index=%s coressponding to the selected_period %s"%(per_index, selected_period))
-
-        if abs(selected_period - per) > (selected_period) * ptol:
-            print("************** Different the selected period =", selected_period, per)
-            #periods.append(np.nan)
-            periods.append(selected_period)
-            pen_depth.append(np.nan)
-            _logger.warning("Nearest preiod {} on station {} was beyond tolerance of {} ".format(per, mt_obj.Site.id, ptol))
-            pass
-        else:      # Otherwise do this block to compute the edi's pen-depth correspond to the selected_period
-
-            print("********* Include this period at the index ", per,  per_index)
-            periods.append(per)
-
-            if whichrho == 'zxy':
-                penetration_depth = scale_param * \
-                    np.sqrt(zeta.resistivity[per_index, 0, 1] * per)
-            elif whichrho == 'zyx':
-                penetration_depth = scale_param * \
-                    np.sqrt(zeta.resistivity[per_index, 1, 0] * per)
-            elif whichrho == 'det':  # the 2X2 complex Z-matrix's determinant abs value
-                # determinant value at the given period index
-                det2 = np.abs(zeta.det[per_index])
-                penetration_depth = scale_param * np.sqrt(0.2 * per * det2 * per)
-            else:
-                _logger.critical(
-                    "unsupported method to compute penetration depth: %s",
-                    whichrho)
-                # sys.exit(100)
-                raise Exception("unsupported method to compute penetratoin depth: %s" % whichrho)
 
-            pen_depth.append(penetration_depth)
+    depth_dict = get_penetration_depths(mt_obj_list, [selected_period],
+                                        ptol=ptol, rholist=[whichrho])
 
-    # The returned 4 lists should have equal length!!!
-    _logger.debug("The length of stations, periods, pen_depth, latlons: %s,%s,%s,%s ", len(stations), len(periods), len(pen_depth), len(latlons) )
-
-    return stations, periods, pen_depth, latlons
+    return depth_dict['station'], list(depth_dict['period'][0]), \
+        list(depth_dict[whichrho][0]), depth_dict['latlons']
 
 
 class ZComponentError(ParameterError):
@@ -756,3 +850,127 @@ def get_index(lat, lon, minlat, minlon, pixelsize, offset=0):
     _logger.debug("Grid index: (%s, %s)", ix, iy)
 
     return ix + offset, iy + offset
+
+
+def _format_period(period0):
+    """
+    format a period for the title and file names of Depth3D
+    """
+    if period0 < 1.0:
+        # kept 4 signifiant digits - nonzero digits
+        return str(mtpy.utils.calculator.roundsf(period0, 4))
+    else:
+        return "%.2f" % period0
+
+
+def get_depth_grid(latlons, pixelsize=0.002):
+    """
+    pixel grid of the penetration depth map of Depth3D and the
+    triangulation of the stations on it, neither depend on the period.
+
+    :param latlons: list of (lat, lon) pairs of the stations
+    :param pixelsize: pixel size in degrees, 0.002=200meters, 0.01=1KM
+    :return: dictionary with keys
+             bbox: bounding box ((minlon, maxlon), (minlat, maxlat))
+             pixelsize: pixel size in degrees
+             nx, ny: number of pixels covering the stations
+             station_points: np.ndarray(ns, 2) (row, column) of the stations
+             triangulation: scipy.spatial.Delaunay of station_points
+             grid_x, grid_y: row and column of every pixel
+    """
+    bbox = get_bounding_box(latlons)
+
+    _logger.debug("Bounding Box %s", bbox)
+
+    xgrids = bbox[0][1] - bbox[0][0]
+    ygrids = bbox[1][1] - bbox[1][0]
+
+    _logger.debug("xy grids: %s %s", xgrids, ygrids)
+
+    minlat = bbox[1][0]
+    minlon = bbox[0][0]
+
+    nx = int(np.ceil(xgrids / pixelsize))
+    ny = int(np.ceil(ygrids / pixelsize))
+
+    _logger.debug("number of grids xy: %s %s", nx, ny)
+
+    # make the image slightly bigger than the (nx, ny) to contain all points
+    # avoid index out of bound
+    pad = 1  # pad = 1 affect the top and right of the plot. it is linked to get_index offset?
+    # todo change this part to use xy bound offset? (0.5 gride on each side?)
+    nx_padded = nx + pad
+    ny_padded = ny + pad
+
+    station_points = np.zeros((len(latlons), 2))
+    for iter, (lat, lon) in enumerate(latlons):
+        (xi, yi) = get_index(lat, lon, minlat, minlon, pixelsize)
+        station_points[iter, 0] = ny_padded - yi - 1
+        station_points[iter, 1] = xi
+
+    # grid_x, grid_y = np.mgrid[0:95:96j, 0:83:84j]  # this syntax with
+    # complex step 96j has different meaning
+    # this is more straight forward.
+    grid_x, grid_y = np.mgrid[0:ny_padded:1, 0:nx_padded:1]
+
+    return {'bbox': bbox,
+            'pixelsize': pixelsize,
+            'nx': nx,
+            'ny': ny,
+            'station_points': station_points,
+            'triangulation': Delaunay(station_points),
+            'grid_x': grid_x,
+            'grid_y': grid_y}
+
+
+def grid_penetration_depth(depth_grid, pendep, z_unit='km'):
+    """
+    linear interpolation of the penetration depths of the stations onto the
+    pixel grid from get_depth_grid, the same as griddata but reusing the
+    triangulation of the stations.
+
+    :param depth_grid: dictionary from get_depth_grid
+    :param pendep: penetration depth of each station in meters
+    :param z_unit: 'm' or 'km'
+    :return: np.ndarray(ny + 1, nx + 1), nan outside the stations
+    """
+    interpolator = LinearNDInterpolator(depth_grid['triangulation'],
+                                        np.abs(np.asarray(pendep, dtype=float)))
+    grid_z = interpolator((depth_grid['grid_x'], depth_grid['grid_y']))
+
+    # method='cubic' may cause negative interp values; set them nan to make
+    # empty
+    with np.errstate(invalid='ignore'):
+        grid_z[grid_z < 0] = np.nan
+    if z_unit == 'km':  # change to km
+        grid_z = grid_z / 1000.0
+
+    return grid_z
+
+
+def _save_period_series_chunk(plot_obj, period_list, period0_list,
+                              pendep_list, save_fn_list, fig_dpi, plot_kwargs,
+                              use_agg=False):
+    """
+    make the map for the first period and save a figure for each period by
+    updating the image, used by Depth3D.save_period_series
+    """
+    if use_agg:
+        plt.switch_backend('Agg')
+
+    plot_obj.set_period(period_list[0])
+    plot_obj.plot(**plot_kwargs)
+    # the tight layout is applied again at every draw starting from the
+    # current layout, start each map from the layout of a new figure
+    subplot_params = dict([(key, getattr(plot_obj._fig.subplotpars, key))
+                           for key in ['left', 'right', 'bottom', 'top',
+                                       'wspace', 'hspace']])
+    for kk, save_fn in enumerate(save_fn_list):
+        if kk > 0:
+            plot_obj._set_period_depth(period0_list[kk], pendep_list[kk],
+                                       z_unit=plot_kwargs.get('z_unit', 'km'))
+            plot_obj._fig.subplots_adjust(**subplot_params)
+        plot_obj.export_image(save_fn, dpi=fig_dpi, bbox_inches='tight')
+    plt.close(plot_obj._fig)
+
+    return save_fn_list
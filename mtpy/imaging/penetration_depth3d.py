@@ -19,8 +19,8 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 
-import mtpy.core.mt as mt
-from mtpy.imaging.penetration import get_index, load_edi_files, Depth3D
+from mtpy.imaging.penetration import get_index, load_edi_files, Depth3D, \
+    get_penetration_depth_by_index, get_penetration_depths
 from mtpy.utils.mtpy_decorator import deprecated
 from mtpy.utils.mtpylog import MtPyLog
 import logging
@@ -52,7 +52,7 @@ def plot_latlon_depth_profile(edi_dir, period, zcomponent='det', showfig=True,
     MT penetration depth profile in lat-lon coordinates with pixelsize = 0.002
     :param savefig:
     :param showfig:
-    :param edi_dir:
+    :param edi_dir: path to edi files or list of MT objects
     :param period:
     :param zcomponent:
     :return:
@@ -67,7 +67,11 @@ def plot_latlon_depth_profile(edi_dir, period, zcomponent='det', showfig=True,
 
     # logger.debug("edi files: %s", edifiles)
 
-    edis = load_edi_files(edi_dir)
+    if isinstance(edi_dir, str):
+        edis = load_edi_files(edi_dir)
+    else:
+        # a list of MT objects already read in
+        edis = edi_dir
 
     image = Depth3D(edis=edis, period=period, rho=zcomponent, ptol=ptol)
     if isinstance(period, int):  # period is considered as an index
@@ -161,45 +165,8 @@ def plot_bar3d_depth(edifiles, per_index, whichrho='det'):
         # Assume edifiles is [a list of files]
         pass
 
-    scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
-
-    _logger.debug("The scaling parameter=%.6f" % scale_param)
-
-    # per_index=0,1,2,....
-    periods = []
-    pen_depth = []
-    stations = []
-    latlons = []
-
-    for afile in edifiles:
-        mt_obj = mt.MT(afile)
-
-        latlons.append((mt_obj.lat, mt_obj.lon))
-
-        # the attribute Z
-        zeta = mt_obj.Z
-
-        if per_index >= len(zeta.freq):
-            raise Exception(
-                "Error: input period index must be less than the number of freqs in zeta.freq=%s", len(
-                    zeta.freq))
-        per = 1.0 / zeta.freq[per_index]
-        periods.append(per)
-
-        if whichrho == 'det':  # the 2X2 complex Z-matrix's determinant abs value
-            # determinant value at the given period index
-            det2 = np.abs(zeta.det[per_index])
-            penetration_depth = -scale_param * np.sqrt(0.2 * per * det2 * per)
-        elif whichrho == 'zxy':
-            penetration_depth = - scale_param * \
-                                np.sqrt(zeta.resistivity[per_index, 0, 1] * per)
-        elif whichrho == 'zyx':
-            penetration_depth = - scale_param * \
-                                np.sqrt(zeta.resistivity[per_index, 1, 0] * per)
-
-        pen_depth.append(penetration_depth)
-
-        stations.append(mt_obj.station)
+    stations, periods, pen_depth, latlons = get_penetration_depth_by_index(
+        edifiles, per_index, whichrho=whichrho)
 
     # return (stations, periods, pen_depth, latlons)
 
@@ -290,33 +257,15 @@ def get_penetration_depths_from_edi_file(edifile, rholist=['det']):
     """
     _logger.debug("processing the edi file %s", edifile)
 
-    mt_obj = mt.MT(edifile)
-    zeta = mt_obj.Z  # the attribute Z represent the impedance tensor 2X2 matrix
-    freqs = zeta.freq  # frequencies
-
-    scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
-
-    _logger.debug("the scale parameter should be 355.88127 =?= %s", scale_param)
-
-    # The periods array
-    periods = 1.0 / freqs
+    # the last of zxy, zyx, det in rholist is used
+    whichrho = [rho for rho in ['zxy', 'zyx', 'det'] if rho in rholist][-1]
+    depth_dict = get_penetration_depths([edifile], rholist=[whichrho])
 
-    if 'zxy' in rholist:
-        # One of the 4-components: XY
-        penetration_depth = scale_param * \
-                            np.sqrt(zeta.resistivity[:, 0, 1] * periods)
+    periods = depth_dict['period'][:, 0]
+    penetration_depth = depth_dict[whichrho][:, 0]
+    (lat, lon), = depth_dict['latlons']
 
-    if 'zyx' in rholist:
-        penetration_depth = scale_param * \
-                            np.sqrt(zeta.resistivity[:, 1, 0] * periods)
-
-    if 'det' in rholist:
-        # determinant is |Zeta|**2
-        det2 = np.abs(zeta.det[0])
-        penetration_depth = scale_param * \
-                            np.sqrt(0.2 * periods * det2 * periods)
-
-    latlong_d = (mt_obj.lat, mt_obj.lon, periods, penetration_depth)
+    latlong_d = (lat, lon, periods, penetration_depth)
     return latlong_d
 
 def create_penetration_depth_csv(edi_dir, outputcsv, zcomponent='det'):
@@ -343,31 +292,26 @@ def create_penetration_depth_csv(edi_dir, outputcsv, zcomponent='det'):
 
     _logger.debug(edi_files)
 
-    # the first period list as a reference for checking other stations period
-    periods_list0 = None
-    latlon_dep = []  # CSV to be returned
-    for afile in edi_files:
-        # for efile in edi_files[:2]:
-        _logger.debug("processing %s", afile)
-        lat, lon, periods, depths = get_penetration_depths_from_edi_file(afile)
-        if periods_list0 is None:
-            periods_list0 = periods  # initial value assignment
-            #depth_string = ','.join(['%.2f' % num for num in depths])
-            #latlon_dep.append((lat, lon, depth_string))
-            latlon_dep.append(["Lat","Lon"] + list(periods)) #The first line header
-            latlon_dep.append([lat, lon] + list(depths))
+    # penetration depths of all stations at all of their periods
+    depth_dict = get_penetration_depths(edi_files, rholist=[zcomponent])
+    all_periods = depth_dict['period']
+    all_depths = depth_dict[zcomponent]
 
+    # the first period list as a reference for checking other stations period
+    periods_list0 = all_periods[:, 0][np.isfinite(all_periods[:, 0])]
+    latlon_dep = [["Lat", "Lon"] + list(periods_list0)]  # The first line header
+    for ii, (lat, lon) in enumerate(depth_dict['latlons']):
+        _logger.debug("processing %s", edi_files[ii])
+        valid = np.isfinite(all_periods[:, ii])
+        periods = all_periods[valid, ii]
 
         # same length and same values.
-        elif len(periods) == len(periods_list0) and (periods == periods_list0).all():
-            # depth_string = ','.join(['%.2f' % num for num in depths])
-            # latlon_dep.append((lat, lon, depth_string))
-            latlon_dep.append([lat, lon] + list(depths))
+        if len(periods) == len(periods_list0) and (periods == periods_list0).all():
+            latlon_dep.append([lat, lon] + list(all_depths[valid, ii]))
         else:
             _logger.error(
                 "MT Periods Not Equal !! %s %s VS %s %s",
                 len(periods), periods,  len(periods_list0), periods_list0)
-            # raise Exception ("MTPy Exception: Periods Not Equal")
             # pass this edi, let's continue
 
     # logger.debug(latlon_dep)
@@ -407,7 +351,8 @@ def plot_many_periods(edidir, n_periods=5):
         try:
             # This will enable the loop continue even though for some freq,
             #  cannot interpolate due to not enough data points
-            plot_latlon_depth_profile(edidir, period_sec, zcomponent='det', showfig=False)
+            plot_latlon_depth_profile(ediset.mt_obj_list, period_sec,
+                                      zcomponent='det', showfig=False)
         except Exception as exwhy:
             print(str(exwhy))
 
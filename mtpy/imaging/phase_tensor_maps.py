@@ -10,8 +10,10 @@ Revision History:
     brenainn.moushall 26-03-2020 15:07:14 AEDT:
         Add plotting of geotiff as basemap background.
 """
+import copy
 import os
 import glob
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 from matplotlib.ticker import FormatStrFormatter
@@ -358,6 +360,10 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
         -save_figure          saves figure to a file of given format
         -update_plot          updates the plot while still active
         -export_params_to_file  writes parameters of the phase tensor and tipper to text files.
+        -get_period_series_data gets the impedance and tipper of all stations
+                                for a list of frequencies
+        -save_period_series   saves a map for each frequency in a list,
+                              updating one figure per worker process
 
     """
 
@@ -602,6 +608,7 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
         # end if
 
         lpax = lpfig.add_subplot(1, 1, 1, aspect='equal')
+        self.ax = lpax
 
         # plt.locator_params(axis='x', nbins=3)  # control number of ticks in axis (nbins ticks)
         plt.xticks(rotation='vertical')  # FZ: control tick rotation=30 not that good
@@ -696,184 +703,128 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
             self.tickstrfmt = '%.0f'
 
         # make some empty arrays
-        elliplist = []
-        latlist = np.zeros(len(self.mt_list))
-        lonlist = np.zeros(len(self.mt_list))
-        self.plot_xarr = np.zeros(len(self.mt_list))
-        self.plot_yarr = np.zeros(len(self.mt_list))
+        ns = len(self.mt_list)
+        latlist = np.zeros(ns)
+        lonlist = np.zeros(ns)
+        self.plot_xarr = np.zeros(ns)
+        self.plot_yarr = np.zeros(ns)
+
+        # location of every station, also the ones without data at plot_freq,
+        # so the ellipses and arrows can be updated for another period
+        station_xarr = np.zeros(ns)
+        station_yarr = np.zeros(ns)
+
+        # collect the impedance and tipper of each station at the plot
+        # frequency, the ellipses and arrows are then computed and drawn for
+        # all stations at once, which is much faster than a patch each
+        z_array = np.zeros((ns, 2, 2), dtype='complex')
+        tipper_array = np.zeros((ns, 4))
+        valid = np.zeros(ns, dtype=bool)
+        self.station_text_list = []
 
         for ii, mt in enumerate(self.mt_list):
 
+            # if map scale is lat lon set parameters
+            if self.mapscale == 'deg':
+                latlist[ii] = mt.lat
+                lonlist[ii] = mt.lon
+                plotx = mt.lon - refpoint[0]
+                ploty = mt.lat - refpoint[1]
+
+            # if map scale is in meters easting and northing
+            elif self.mapscale == 'm':
+                east, north, zone = gis_tools.project_point_ll2utm(mt.lat,
+                                                                   mt.lon)
+
+                # set the first point read in as a refernce other points
+                if ii == 0:
+                    zone1 = zone
+                    plotx = east - refpoint[0]
+                    ploty = north - refpoint[1]
+
+                # read in all the other point
+                else:
+                    # check to make sure the zone is the same this needs
+                    # to be more rigorously done
+                    if zone1 != zone:
+                        print('Zone change at station ' + mt.station)
+                        if zone1[0:2] == zone[0:2]:
+                            pass
+                        elif int(zone1[0:2]) < int(zone[0:2]):
+                            east += 500000
+                        else:
+                            east -= -500000
+                        latlist[ii] = north - refpoint[1]
+                        lonlist[ii] = east - refpoint[0]
+                        plotx = east - refpoint[0]
+                        ploty = north - refpoint[1]
+                    else:
+                        latlist[ii] = north - refpoint[1]
+                        lonlist[ii] = east - refpoint[0]
+                        plotx = east - refpoint[0]
+                        ploty = north - refpoint[1]
+
+            # if mapscale is in km easting and northing
+            elif self.mapscale == 'km':
+                east, north, zone = gis_tools.project_point_ll2utm(mt.lat,
+                                                                   mt.lon)
+                if ii == 0:
+                    zone1 = zone
+                    plotx = (east - refpoint[0]) / 1000.
+                    ploty = (north - refpoint[1]) / 1000.
+
+                else:
+                    if zone1 != zone:
+                        print('Zone change at station ' + mt.station)
+                        if zone1[0:2] == zone[0:2]:
+                            pass
+                        elif int(zone1[0:2]) < int(zone[0:2]):
+                            east += 500000
+                        else:
+                            east -= 500000
+                        latlist[ii] = (north - refpoint[1]) / 1000.
+                        lonlist[ii] = (east - refpoint[0]) / 1000.
+                        plotx = (east - refpoint[0]) / 1000.
+                        ploty = (north - refpoint[1]) / 1000.
+                    else:
+                        latlist[ii] = (north - refpoint[1]) / 1000.
+                        lonlist[ii] = (east - refpoint[0]) / 1000.
+                        plotx = (east - refpoint[0]) / 1000.
+                        ploty = (north - refpoint[1]) / 1000.
+            else:
+                raise NameError('mapscale not recognized')
+
+            station_xarr[ii] = plotx
+            station_yarr[ii] = ploty
+
             newZ = None
             newTipper = None
             fidx = 0
             if(self.interpolate):
                 newZ, newTipper = mt.interpolate([self.plot_freq], bounds_error=False)
+                # interpolation leaves zeros outside the station frequencies
+                has_data = np.any(newZ.z[0] != 0)
             else:
                 fidx = np.argmin(np.fabs(mt.Z.freq - self.plot_freq))
+                has_data = np.fabs(mt.Z.freq[fidx] - self.plot_freq) < self.ftol
 
-            if((not self.interpolate and np.fabs(mt.Z.freq[fidx] - self.plot_freq) < self.ftol) or
-                    (self.interpolate)):
+            if has_data:
 
                 self.jj = fidx
                 jj = fidx
+                valid[ii] = True
 
-                # get phase tensor
+                # get impedance tensor to compute the phase tensor from
                 if(not self.interpolate):
-                    pt = mt.pt
+                    z_array[ii] = mt.Z.z[jj]
                 else:
-                    newZ.compute_resistivity_phase()
-                    pt = MTpt.PhaseTensor(z_object=newZ)
-
-                # if map scale is lat lon set parameters
-                if self.mapscale == 'deg':
-                    latlist[ii] = mt.lat
-                    lonlist[ii] = mt.lon
-                    plotx = mt.lon - refpoint[0]
-                    ploty = mt.lat - refpoint[1]
-
-                # if map scale is in meters easting and northing
-                elif self.mapscale == 'm':
-                    east, north, zone = gis_tools.project_point_ll2utm(mt.lat,
-                                                                       mt.lon)
-
-                    # set the first point read in as a refernce other points
-                    if ii == 0:
-                        zone1 = zone
-                        plotx = east - refpoint[0]
-                        ploty = north - refpoint[1]
-
-                    # read in all the other point
-                    else:
-                        # check to make sure the zone is the same this needs
-                        # to be more rigorously done
-                        if zone1 != zone:
-                            print('Zone change at station ' + mt.station)
-                            if zone1[0:2] == zone[0:2]:
-                                pass
-                            elif int(zone1[0:2]) < int(zone[0:2]):
-                                east += 500000
-                            else:
-                                east -= -500000
-                            latlist[ii] = north - refpoint[1]
-                            lonlist[ii] = east - refpoint[0]
-                            plotx = east - refpoint[0]
-                            ploty = north - refpoint[1]
-                        else:
-                            latlist[ii] = north - refpoint[1]
-                            lonlist[ii] = east - refpoint[0]
-                            plotx = east - refpoint[0]
-                            ploty = north - refpoint[1]
-
-                # if mapscale is in km easting and northing
-                elif self.mapscale == 'km':
-                    east, north, zone = gis_tools.project_point_ll2utm(mt.lat,
-                                                                       mt.lon)
-                    if ii == 0:
-                        zone1 = zone
-                        plotx = (east - refpoint[0]) / 1000.
-                        ploty = (north - refpoint[1]) / 1000.
-
-                    else:
-                        if zone1 != zone:
-                            print('Zone change at station ' + mt.station)
-                            if zone1[0:2] == zone[0:2]:
-                                pass
-                            elif int(zone1[0:2]) < int(zone[0:2]):
-                                east += 500000
-                            else:
-                                east -= 500000
-                            latlist[ii] = (north - refpoint[1]) / 1000.
-                            lonlist[ii] = (east - refpoint[0]) / 1000.
-                            plotx = (east - refpoint[0]) / 1000.
-                            ploty = (north - refpoint[1]) / 1000.
-                        else:
-                            latlist[ii] = (north - refpoint[1]) / 1000.
-                            lonlist[ii] = (east - refpoint[0]) / 1000.
-                            plotx = (east - refpoint[0]) / 1000.
-                            ploty = (north - refpoint[1]) / 1000.
-                else:
-                    raise NameError('mapscale not recognized')
+                    z_array[ii] = newZ.z[jj]
 
                 # put the location of each ellipse into an array in x and y
                 self.plot_xarr[ii] = plotx
                 self.plot_yarr[ii] = ploty
 
-                # --> set local variables
-                phimin = np.nan_to_num(pt.phimin[jj])
-                phimax = np.nan_to_num(pt.phimax[jj])
-                eangle = np.nan_to_num(pt.azimuth[jj])
-
-                # output to csv file:
-                # print('OUTCSV', mt.station, plotx, ploty, phimin, phimax, eangle)
-
-                if cmap == 'mt_seg_bl2wh2rd':
-                    bounds = np.arange(ckmin, ckmax + ckstep, ckstep)
-                    nseg = float((ckmax - ckmin) / (2 * ckstep))
-
-                # get the properties to color the ellipses by
-                if self.ellipse_colorby == 'phiminang' or \
-                        self.ellipse_colorby == 'phimin':
-                    colorarray = pt.phimin[jj]
-
-                elif self.ellipse_colorby == 'phimax':
-                    colorarray = pt.phimax[jj]
-
-                elif self.ellipse_colorby == 'phidet':
-                    colorarray = np.sqrt(abs(pt.det[jj])) * (180 / np.pi)
-
-                elif self.ellipse_colorby == 'skew' or \
-                        self.ellipse_colorby == 'skew_seg':
-                    colorarray = pt.beta[jj]
-
-                elif self.ellipse_colorby == 'normalized_skew' or \
-                        self.ellipse_colorby == 'normalized_skew_seg':
-                    colorarray = 2 * pt.beta[jj]
-
-                elif self.ellipse_colorby == 'ellipticity':
-                    colorarray = pt.ellipticity[jj]
-
-                else:
-                    raise NameError(self.ellipse_colorby + ' is not supported')
-
-                # --> get ellipse properties
-                # if the ellipse size is not physically correct make it a dot
-                if phimax == 0 or phimax > 100 or phimin == 0 or phimin > 100:
-                    eheight = .0000001 * es
-                    ewidth = .0000001 * es
-                else:
-                    scaling = es / phimax
-                    eheight = phimin * scaling
-                    ewidth = phimax * scaling
-
-                # make an ellipse
-                ellipd = patches.Ellipse((plotx, ploty),
-                                         width=ewidth,
-                                         height=eheight,
-                                         angle=90 - eangle,
-                                         lw=self.lw,
-                                         **self.kwargs)
-
-                # get ellipse color
-                if cmap.find('seg') > 0:
-                    ellipd.set_facecolor(mtcl.get_plot_color(colorarray,
-                                                             self.ellipse_colorby,
-                                                             cmap,
-                                                             ckmin,
-                                                             ckmax,
-                                                             bounds=bounds))
-                else:
-                    ellipd.set_facecolor(mtcl.get_plot_color(colorarray,
-                                                             self.ellipse_colorby,
-                                                             cmap,
-                                                             ckmin,
-                                                             ckmax))
-
-                # ==> add ellipse to the plot
-                elliplist.append(ellipd)
-                lpax.add_artist(ellipd)
-
-                # -----------Plot Induction Arrows---------------------------
+                # -----------Get Induction Arrows---------------------------
                 if self.plot_tipper.find('y') == 0:
 
                     # get tipper
@@ -882,11 +833,6 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
                         mt.Tipper.tipper = np.zeros((len(mt.period), 1, 2),
                                                     dtype='complex')
 
-                    # make some local parameters for easier typing
-                    ascale = self.arrow_size
-                    adir = self.arrow_direction * np.pi
-
-                    # plot real tipper
                     ti = None
                     if(not self.interpolate):
                         ti = mt.Tipper
@@ -894,59 +840,30 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
                         ti = newTipper
                     # end if
 
-                    if self.plot_tipper == 'yri' or self.plot_tipper == 'yr':
-                        if ti.mag_real[jj] <= self.arrow_threshold:
-                            txr = ti.mag_real[jj] * ascale * \
-                                np.sin((ti.angle_real[jj]) * np.pi / 180 + adir)
-                            tyr = ti.mag_real[jj] * ascale * \
-                                np.cos((ti.angle_real[jj]) * np.pi / 180 + adir)
-
-                            lpax.arrow(plotx,
-                                       ploty,
-                                       txr,
-                                       tyr,
-                                       width=self.arrow_lw,
-                                       facecolor=self.arrow_color_real,
-                                       edgecolor=self.arrow_color_real,
-                                       length_includes_head=False,
-                                       head_width=self.arrow_head_width,
-                                       head_length=self.arrow_head_length)
-                        else:
-                            pass
+                    tipper_array[ii] = (ti.mag_real[jj], ti.angle_real[jj],
+                                        ti.mag_imag[jj], ti.angle_imag[jj])
 
-                    # plot imaginary tipper
-                    if self.plot_tipper == 'yri' or self.plot_tipper == 'yi':
-                        if ti.mag_imag[jj] <= self.arrow_threshold:
-                            txi = ti.mag_imag[jj] * ascale * \
-                                np.sin((ti.angle_imag[jj]) * np.pi / 180 + adir)
-                            tyi = ti.mag_imag[jj] * ascale * \
-                                np.cos((ti.angle_imag[jj]) * np.pi / 180 + adir)
-
-                            lpax.arrow(plotx,
-                                       ploty,
-                                       txi,
-                                       tyi,
-                                       width=self.arrow_lw,
-                                       facecolor=self.arrow_color_imag,
-                                       edgecolor=self.arrow_color_imag,
-                                       length_includes_head=False,
-                                       head_width=self.arrow_head_width,
-                                       head_length=self.arrow_head_length)
-
-                # ------------Plot station name------------------------------
-                try:
+            # ==> print a message if couldn't find the freq
+            else:
+                _logger.warn('Did not find {0:.5g} Hz for station {1}'.format(self.plot_freq, mt.station))
+
+            # ------------Plot station name------------------------------
+            # stations without data at this frequency are hidden
+            try:
+                self.station_text_list.append(
                     lpax.text(plotx,
                               ploty + self.station_pad,
                               mt.station[self.station_id[0]:self.station_id[1]],
                               horizontalalignment='center',
                               verticalalignment='baseline',
-                              fontdict=self.station_font_dict)
-                except AttributeError:
-                    pass
+                              fontdict=self.station_font_dict,
+                              visible=bool(valid[ii])))
+            except AttributeError:
+                self.station_text_list.append(None)
 
-            # ==> print a message if couldn't find the freq
-            else:
-                _logger.warn('Did not find {0:.5g} Hz for station {1}'.format(self.plot_freq, mt.station))
+        # ==> add ellipses and induction arrows for all stations
+        self._plot_period_data(lpax, station_xarr, station_yarr, z_array,
+                               tipper_array, valid)
 
         # --> set axes properties depending on map scale------------------------
         if self.mapscale == 'deg':
@@ -995,17 +912,7 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
         plt.setp(lpax.get_xticklabels(), rotation=45)
 
         # --> set title in period or freq
-        if self.tscale == 'period':
-            titlefreq = '{0:.5g} (s)'.format(1. / self.plot_freq)
-        else:
-            titlefreq = '{0:.5g} (Hz)'.format(self.plot_freq)
-
-        if not self.plot_title:
-            lpax.set_title('Phase Tensor Map for ' + titlefreq,
-                           fontsize=self.font_size + 2, fontweight='bold')
-        else:
-            lpax.set_title(self.plot_title + titlefreq,
-                           fontsize=self.font_size + 2, fontweight='bold')
+        self._set_title(lpax)
 
         # --> plot induction arrow scale bar -----------------------------------
         if self.plot_tipper.find('y') == 0:
@@ -1193,6 +1100,313 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
 
         return figfile
 
+    def _set_title(self, ax):
+        """
+        set the title of the map in period or frequency
+        """
+        if self.tscale == 'period':
+            titlefreq = '{0:.5g} (s)'.format(1. / self.plot_freq)
+        else:
+            titlefreq = '{0:.5g} (Hz)'.format(self.plot_freq)
+
+        if not self.plot_title:
+            ax.set_title('Phase Tensor Map for ' + titlefreq,
+                         fontsize=self.font_size + 2, fontweight='bold')
+        else:
+            ax.set_title(self.plot_title + titlefreq,
+                         fontsize=self.font_size + 2, fontweight='bold')
+
+    def _get_ellipse_properties(self, z_array, valid):
+        """
+        get width, height, angle and face color of the phase tensor
+        ellipses for an array of impedance tensors (ns, 2, 2).  Ellipses of
+        stations that are not valid are nan so they are not drawn.
+        """
+        es = float(self.ellipse_size)
+        cmap = self.ellipse_cmap
+        ckmin = float(self.ellipse_range[0])
+        ckmax = float(self.ellipse_range[1])
+        try:
+            ckstep = float(self.ellipse_range[2])
+        except IndexError:
+            ckstep = 3
+
+        # get phase tensor
+        pt_array = MTpt.z2pt_array(z_array)
+        pt_dict = MTpt.pt_parameters(pt_array)
+
+        # --> set local variables
+        phimin = np.nan_to_num(pt_dict['phimin'])
+        phimax = np.nan_to_num(pt_dict['phimax'])
+        eangle = np.nan_to_num(pt_dict['azimuth'])
+
+        # get the properties to color the ellipses by
+        if self.ellipse_colorby == 'phiminang' or \
+                self.ellipse_colorby == 'phimin':
+            colorarray = pt_dict['phimin']
+
+        elif self.ellipse_colorby == 'phimax':
+            colorarray = pt_dict['phimax']
+
+        elif self.ellipse_colorby == 'phidet':
+            pt_det = pt_array[:, 0, 0] * pt_array[:, 1, 1] - \
+                pt_array[:, 0, 1] * pt_array[:, 1, 0]
+            colorarray = np.sqrt(abs(pt_det)) * (180 / np.pi)
+
+        elif self.ellipse_colorby == 'skew' or \
+                self.ellipse_colorby == 'skew_seg':
+            colorarray = pt_dict['beta']
+
+        elif self.ellipse_colorby == 'normalized_skew' or \
+                self.ellipse_colorby == 'normalized_skew_seg':
+            colorarray = 2 * pt_dict['beta']
+
+        elif self.ellipse_colorby == 'ellipticity':
+            colorarray = pt_dict['ellipticity']
+
+        else:
+            raise NameError(self.ellipse_colorby + ' is not supported')
+
+        # --> get ellipse properties
+        # if the ellipse size is not physically correct make it a dot
+        dots = (phimax == 0) | (phimax > 100) | (phimin == 0) | (phimin > 100)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scaling = es / phimax
+            eheight = np.where(dots, .0000001 * es, phimin * scaling)
+            ewidth = np.where(dots, .0000001 * es, phimax * scaling)
+        eheight[~valid] = np.nan
+        ewidth[~valid] = np.nan
+
+        # get ellipse color
+        if cmap.find('seg') > 0:
+            ecolors = mtcl.get_plot_color(colorarray,
+                                          self.ellipse_colorby,
+                                          cmap,
+                                          ckmin,
+                                          ckmax,
+                                          bounds=np.arange(ckmin,
+                                                           ckmax + ckstep,
+                                                           ckstep))
+        else:
+            ecolors = mtcl.get_plot_color(colorarray,
+                                          self.ellipse_colorby,
+                                          cmap,
+                                          ckmin,
+                                          ckmax)
+
+        return ewidth, eheight, 90 - eangle, ecolors
+
+    def _get_arrow_properties(self, tipper_array, valid):
+        """
+        get the x and y length and color of the real and imaginary
+        induction arrows from an array of (mag_real, angle_real, mag_imag,
+        angle_imag) for each station.  Arrows above the threshold or of
+        stations that are not valid are nan so they are not drawn.
+        """
+        # make some local parameters for easier typing
+        ascale = self.arrow_size
+        adir = self.arrow_direction * np.pi
+
+        tmag_real, tangle_real, tmag_imag, tangle_imag = \
+            np.asarray(tipper_array, dtype=float).T
+
+        arrow_list = []
+        # plot real tipper
+        if self.plot_tipper == 'yri' or self.plot_tipper == 'yr':
+            arrow_list.append((tmag_real, tangle_real,
+                               self.arrow_color_real))
+        # plot imaginary tipper
+        if self.plot_tipper == 'yri' or self.plot_tipper == 'yi':
+            arrow_list.append((tmag_imag, tangle_imag,
+                               self.arrow_color_imag))
+
+        arrow_properties = []
+        for tmag, tangle, acolor in arrow_list:
+            with np.errstate(invalid='ignore'):
+                tmag = np.where(valid & (tmag <= self.arrow_threshold),
+                                tmag, np.nan)
+            tx = tmag * ascale * np.sin(tangle * np.pi / 180 + adir)
+            ty = tmag * ascale * np.cos(tangle * np.pi / 180 + adir)
+            arrow_properties.append((tx, ty, acolor))
+
+        return arrow_properties
+
+    def _plot_period_data(self, ax, plotx, ploty, z_array, tipper_array,
+                          valid):
+        """
+        draw the phase tensor ellipses and induction arrows of all stations
+        at once, stations that are not valid are not drawn but are kept
+        so the plot can be updated with _set_period_data.
+        """
+        self._station_xarr = plotx
+        self._station_yarr = ploty
+
+        # -----------Plot Induction Arrows---------------------------
+        # the arrows go under the ellipses
+        self.arrow_list = []
+        if self.plot_tipper.find('y') == 0:
+            for tx, ty, acolor in self._get_arrow_properties(tipper_array,
+                                                             valid):
+                self.arrow_list.append(
+                    mtpl.plot_arrows(ax,
+                                     plotx,
+                                     ploty,
+                                     tx,
+                                     ty,
+                                     width=self.arrow_lw,
+                                     facecolor=acolor,
+                                     edgecolor=acolor,
+                                     length_includes_head=False,
+                                     head_width=self.arrow_head_width,
+                                     head_length=self.arrow_head_length))
+
+        # ==> add ellipses to the plot as one collection
+        ewidth, eheight, eangle, ecolors = self._get_ellipse_properties(z_array,
+                                                                        valid)
+        self.ellipse_collection = mtpl.plot_ellipse_collection(
+            ax, plotx, ploty, ewidth, eheight, eangle, ecolors,
+            lw=self.lw, **self.kwargs)
+
+    def _set_period_data(self, plot_freq, z_array, tipper_array, valid):
+        """
+        update the ellipses, arrows, station names and title of the plot
+        for a new frequency without making the figure again.
+        """
+        self.plot_freq = plot_freq
+
+        ewidth, eheight, eangle, ecolors = self._get_ellipse_properties(z_array,
+                                                                        valid)
+        self.ellipse_collection.set_verts(
+            mtpl.get_ellipse_vertices(self._station_xarr, self._station_yarr,
+                                      ewidth, eheight, eangle))
+        self.ellipse_collection.set_facecolor(ecolors)
+
+        if self.plot_tipper.find('y') == 0:
+            for quiver, (tx, ty, acolor) in zip(
+                    self.arrow_list,
+                    self._get_arrow_properties(tipper_array, valid)):
+                mtpl.update_arrows(quiver, tx, ty)
+
+        for station_text, station_valid in zip(self.station_text_list, valid):
+            if station_text is not None:
+                station_text.set_visible(bool(station_valid))
+
+        self._set_title(self.ax)
+
+    def get_period_series_data(self, plot_freq_list):
+        """
+        get the impedance tensor and induction arrows of all stations for
+        a list of frequencies at once, interpolating each station only once.
+
+        :param plot_freq_list: list of frequencies in Hz
+        :returns: dictionary with
+
+                  * 'freq' --> np.ndarray(nf) frequencies
+                  * 'z' --> np.ndarray(nf, ns, 2, 2) impedance tensors
+                  * 'tipper' --> np.ndarray(nf, ns, 4) of
+                    (mag_real, angle_real, mag_imag, angle_imag)
+                  * 'valid' --> np.ndarray(nf, ns) True where the station
+                    has data at the frequency
+        """
+        plot_freq_list = np.atleast_1d(np.asarray(plot_freq_list, dtype=float))
+        nf = plot_freq_list.size
+        ns = len(self.mt_list)
+
+        z_array = np.zeros((nf, ns, 2, 2), dtype='complex')
+        tipper_array = np.zeros((nf, ns, 4))
+        valid = np.zeros((nf, ns), dtype=bool)
+
+        for ii, mt in enumerate(self.mt_list):
+            if self.plot_tipper.find('y') == 0 and mt.Tipper.tipper is None:
+                mt.Tipper.tipper = np.zeros((len(mt.period), 1, 2),
+                                            dtype='complex')
+
+            if self.interpolate:
+                newZ, ti = mt.interpolate(plot_freq_list, bounds_error=False)
+                fidx = np.arange(nf)
+                z_array[:, ii] = newZ.z
+                # interpolation leaves zeros outside the station frequencies
+                valid[:, ii] = np.any(newZ.z != 0, axis=(1, 2))
+            else:
+                fidx = np.argmin(np.fabs(mt.Z.freq[None, :] -
+                                         plot_freq_list[:, None]), axis=1)
+                z_array[:, ii] = mt.Z.z[fidx]
+                valid[:, ii] = np.fabs(mt.Z.freq[fidx] - plot_freq_list) < self.ftol
+                ti = mt.Tipper
+
+            if self.plot_tipper.find('y') == 0:
+                tipper_array[:, ii] = np.array([ti.mag_real[fidx],
+                                                ti.angle_real[fidx],
+                                                ti.mag_imag[fidx],
+                                                ti.angle_imag[fidx]]).T
+
+        return {'freq': plot_freq_list,
+                'z': z_array,
+                'tipper': tipper_array,
+                'valid': valid}
+
+    def save_period_series(self, plot_freq_list, save_path, file_format='png',
+                           fig_dpi=None, n_processes=1):
+        """
+        save a phase tensor map for each frequency in plot_freq_list.
+
+        The impedance tensor and tipper of all stations are collected once
+        for all frequencies, then the figure is made once and only the
+        ellipses, arrows, station names and title are updated for each
+        frequency.  The frequencies can be split over n_processes worker
+        processes, each drawing on its own figure with the Agg backend.
+
+        :param plot_freq_list: list of frequencies in Hz
+        :param save_path: directory to save the figures to, files are named
+                          PTmap_<ellipse_colorby>_<freq>Hz.<file_format>
+        :param file_format: [ png | jpg | pdf | svg ... ]
+        :param fig_dpi: resolution of the saved figures, *default* is
+                        fig_dpi of the object
+        :param n_processes: number of worker processes, 1 or None draws in
+                            this process with the current backend
+        :returns: list of saved file names
+        """
+        if not os.path.exists(save_path):
+            os.makedirs(save_path)
+        if fig_dpi is None:
+            fig_dpi = self.fig_dpi
+
+        period_data = self.get_period_series_data(plot_freq_list)
+        save_fn_list = [os.path.join(save_path,
+                                     'PTmap_{0}_{1:.6g}Hz.{2}'.format(
+                                         self.ellipse_colorby, ff, file_format))
+                        for ff in period_data['freq']]
+
+        # the figure is made for the frequency with the most stations so
+        # the map extent is the same for all frequencies and processes
+        plot_obj = copy.copy(self)
+        plot_obj.fig = None
+        plot_obj.plot_freq = period_data['freq'][
+            np.argmax(period_data['valid'].sum(axis=1))]
+
+        if n_processes in [None, 1]:
+            _save_period_series_chunk(plot_obj, period_data, save_fn_list,
+                                      file_format, fig_dpi)
+        else:
+            index_chunks = [index for index in
+                            np.array_split(np.arange(len(save_fn_list)),
+                                           n_processes) if index.size > 0]
+            with ProcessPoolExecutor(max_workers=n_processes) as executor:
+                futures = [executor.submit(_save_period_series_chunk,
+                                           plot_obj,
+                                           dict([(key, value[index])
+                                                 for key, value in
+                                                 period_data.items()]),
+                                           [save_fn_list[ii] for ii in index],
+                                           file_format,
+                                           fig_dpi,
+                                           True)
+                           for index in index_chunks]
+                for future in futures:
+                    future.result()
+
+        return save_fn_list
+
     def save_figure(self, save_fn, file_format='pdf',
                     orientation='portrait', fig_dpi=None, close_plot='y'):
         """
@@ -1522,6 +1736,29 @@ class PlotPhaseTensorMaps(mtpl.PlotSettings):
         return "Plots phase tensor maps for one freq"
 
 
+def _save_period_series_chunk(plot_obj, period_data, save_fn_list,
+                              file_format, fig_dpi, use_agg=False):
+    """
+    make the phase tensor map for plot_obj.plot_freq and save a figure for
+    each frequency of period_data by updating the plot, used by
+    PlotPhaseTensorMaps.save_period_series
+    """
+    if use_agg:
+        plt.switch_backend('Agg')
+
+    plot_obj.plot(show=False)
+    for kk, save_fn in enumerate(save_fn_list):
+        plot_obj._set_period_data(period_data['freq'][kk],
+                                  period_data['z'][kk],
+                                  period_data['tipper'][kk],
+                                  period_data['valid'][kk])
+        plot_obj.fig.savefig(save_fn, dpi=fig_dpi, format=file_format,
+                             bbox_inches='tight')
+    plt.close(plot_obj.fig)
+
+    return save_fn_list
+
+
 # ====================================================================
 # How to test use this module
 # User modify scripts below to provide three things, 1) edidir the path to an edi folder, 2) plot_freq 3) output_dir
@@ -1571,3 +1808,4 @@ if __name__ == "__main__":
                               'cbar_title': 'Arbitrary Units'})
 
     ptm_obj.export_params_to_file(save_path=savedir)
+
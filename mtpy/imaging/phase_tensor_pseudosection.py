@@ -470,6 +470,18 @@ class PlotPhaseTensorPseudoSection(mtpl.PlotSettings):
         maxlist = []
         plot_periodlist = None
 
+        # ellipse and arrow properties of all stations, these are drawn
+        # at once after the loop
+        x_list = []
+        y_list = []
+        width_list = []
+        height_list = []
+        angle_list = []
+        color_list = []
+        tipper_list = []
+        real_list = []
+        imag_list = []
+
         # set local parameters with shorter names
         es = self.ellipse_size
         ck = self.ellipse_colorby
@@ -588,96 +600,103 @@ class PlotPhaseTensorPseudoSection(mtpl.PlotSettings):
             minlist.append(min(colorarray))
             maxlist.append(max(colorarray))
 
-            for jj, ff in enumerate(periodlist):
-
-                # make sure the ellipses will be visable
-                eheight = phimin[jj] / phimax[jj] * es
-                ewidth = phimax[jj] / phimax[jj] * es
-
-                # create an ellipse scaled by phimin and phimax and orient
-                # the ellipse so that north is up and east is right
-                # need to add 90 to do so instead of subtracting
-                ellipd = patches.Ellipse((offset * self.xstretch,
-                                          np.log10(ff) * self.ystretch),
-                                         width=ewidth,
-                                         height=eheight,
-                                         edgecolor='k',
-                                         lw=0.5,
-                                         angle=azimuth[jj] + 90)
-
-                # get ellipse color
-                if cmap.find('seg') > 0:
-                    ellipd.set_facecolor(mtcl.get_plot_color(colorarray[jj],
-                                                             self.ellipse_colorby,
-                                                             cmap,
-                                                             ckmin,
-                                                             ckmax,
-                                                             bounds=bounds))
-                else:
-                    ellipd.set_facecolor(mtcl.get_plot_color(colorarray[jj],
-                                                             self.ellipse_colorby,
-                                                             cmap,
-                                                             ckmin,
-                                                             ckmax))
-
-                # == =add the ellipse to the plot == ========
-                self.ax.add_artist(ellipd)
-
-                # --------- Add induction arrows if desired -------------------
-                if self.plot_tipper.find('y') == 0:
-
-                    # --> plot real tipper
-                    if self.plot_tipper == 'yri' or self.plot_tipper == 'yr':
-                        txr = tmr[jj] * np.sin(tar[jj] * np.pi / 180 +
-                                               np.pi * self.arrow_direction) * \
-                            self.arrow_size
-                        tyr = -tmr[jj] * np.cos(tar[jj] * np.pi / 180 +
-                                                np.pi * self.arrow_direction) * \
-                            self.arrow_size
-
-                        maxlength = np.sqrt((txr / self.arrow_size) ** 2 +
-                                            (tyr / self.arrow_size) ** 2)
-
-                        if maxlength > self.arrow_threshold:
-                            pass
-                        elif ((txr > 0) or (tyr>0)):
-#                        else:
-                            self.ax.arrow(offset * self.xstretch,
-                                          np.log10(ff) * self.ystretch,
-                                          txr,
-                                          tyr,
-                                          lw=alw,
-                                          facecolor=self.arrow_color_real,
-                                          edgecolor=self.arrow_color_real,
-                                          length_includes_head=False,
-                                          head_width=awidth,
-                                          head_length=aheight)
-
-                    # --> plot imaginary tipper
-                    if self.plot_tipper == 'yri' or self.plot_tipper == 'yi':
-                        txi = tmi[jj] * np.sin(tai[jj] * np.pi / 180 +
-                                               np.pi * self.arrow_direction) * \
-                            self.arrow_size
-                        tyi = -tmi[jj] * np.cos(tai[jj] * np.pi / 180 +
-                                                np.pi * self.arrow_direction) * \
-                            self.arrow_size
-
-                        maxlength = np.sqrt((txi / self.arrow_size) ** 2 +
-                                            (tyi / self.arrow_size) ** 2)
-                        if maxlength > self.arrow_threshold:
-                            pass
-#                        else:
-                        elif ((txr > 0) or (tyr>0)):
-                            self.ax.arrow(offset * self.xstretch,
-                                          np.log10(ff) * self.ystretch,
-                                          txi,
-                                          tyi,
-                                          lw=alw,
-                                          facecolor=self.arrow_color_imag,
-                                          edgecolor=self.arrow_color_imag,
-                                          length_includes_head=False,
-                                          head_width=awidth,
-                                          head_length=aheight)
+            # make sure the ellipses will be visable
+            with np.errstate(divide='ignore', invalid='ignore'):
+                height_list.append(phimin / phimax * es)
+                width_list.append(phimax / phimax * es)
+
+            # orient the ellipse so that north is up and east is right
+            # need to add 90 to do so instead of subtracting
+            x_list.append(np.repeat(offset * self.xstretch, n))
+            y_list.append(np.log10(periodlist) * self.ystretch)
+            angle_list.append(azimuth + 90)
+            color_list.append(colorarray)
+
+            # --------- Add induction arrows if desired -------------------
+            if self.plot_tipper.find('y') == 0:
+                txr = tmr * np.sin(tar * np.pi / 180 +
+                                   np.pi * self.arrow_direction) * \
+                    self.arrow_size
+                tyr = -tmr * np.cos(tar * np.pi / 180 +
+                                    np.pi * self.arrow_direction) * \
+                    self.arrow_size
+                txi = tmi * np.sin(tai * np.pi / 180 +
+                                   np.pi * self.arrow_direction) * \
+                    self.arrow_size
+                tyi = -tmi * np.cos(tai * np.pi / 180 +
+                                    np.pi * self.arrow_direction) * \
+                    self.arrow_size
+
+                # arrows are only drawn if they are shorter than the
+                # threshold and the real arrow has a positive x or y component
+                with np.errstate(invalid='ignore'):
+                    plot_real = (txr > 0) | (tyr > 0)
+                    real_list.append(
+                        ~(np.sqrt((txr / self.arrow_size) ** 2 +
+                                   (tyr / self.arrow_size) ** 2) >
+                           self.arrow_threshold) &
+                        plot_real)
+                    imag_list.append(
+                        ~(np.sqrt((txi / self.arrow_size) ** 2 +
+                                   (tyi / self.arrow_size) ** 2) >
+                           self.arrow_threshold) &
+                        plot_real)
+                tipper_list.append(np.array([txr, tyr, txi, tyi]))
+
+        if len(x_list) > 0:
+            plotx = np.concatenate(x_list)
+            ploty = np.concatenate(y_list)
+            colorarray = np.concatenate(color_list)
+
+            # get ellipse color
+            if cmap.find('seg') > 0:
+                ecolors = mtcl.get_plot_color(colorarray,
+                                              self.ellipse_colorby,
+                                              cmap,
+                                              ckmin,
+                                              ckmax,
+                                              bounds=bounds)
+            else:
+                ecolors = mtcl.get_plot_color(colorarray,
+                                              self.ellipse_colorby,
+                                              cmap,
+                                              ckmin,
+                                              ckmax)
+
+            # --------- Add induction arrows if desired -------------------
+            # the arrows go under the ellipses
+            if self.plot_tipper.find('y') == 0:
+                txr, tyr, txi, tyi = np.concatenate(tipper_list, axis=1)
+                arrow_list = []
+
+                # --> plot real tipper
+                if self.plot_tipper == 'yri' or self.plot_tipper == 'yr':
+                    arrow_list.append((np.concatenate(real_list), txr, tyr,
+                                       self.arrow_color_real))
+
+                # --> plot imaginary tipper
+                if self.plot_tipper == 'yri' or self.plot_tipper == 'yi':
+                    arrow_list.append((np.concatenate(imag_list), txi, tyi,
+                                       self.arrow_color_imag))
+
+                for tfind, tx, ty, acolor in arrow_list:
+                    mtpl.plot_arrows(self.ax,
+                                     plotx[tfind],
+                                     ploty[tfind],
+                                     tx[tfind],
+                                     ty[tfind],
+                                     lw=alw,
+                                     facecolor=acolor,
+                                     edgecolor=acolor,
+                                     length_includes_head=False,
+                                     head_width=awidth,
+                                     head_length=aheight)
+
+            # == =add the ellipses to the plot as one collection == ========
+            self.ellipse_collection = mtpl.plot_ellipse_collection(
+                self.ax, plotx, ploty, np.concatenate(width_list),
+                np.concatenate(height_list), np.concatenate(angle_list),
+                ecolors, edgecolors='k', lw=0.5)
 
         # --> Set plot parameters
         self._plot_periodlist = plot_periodlist
@@ -968,279 +987,64 @@ class PlotPhaseTensorPseudoSection(mtpl.PlotSettings):
         slist = [mt for ss in self.stationlist for mt in self.mt_list
                  if os.path.basename(mt.fn).find(ss) >= 0]
 
-        ns = len(slist) + 1
-        nt = len(plist) + 1
-
-        # set some empty lists to put things into
-        sklist = np.zeros((nt, ns), dtype='|S8')
-        phiminlist = np.zeros((nt, ns), dtype='|S8')
-        phimaxlist = np.zeros((nt, ns), dtype='|S8')
-        elliplist = np.zeros((nt, ns), dtype='|S8')
-        azimlist = np.zeros((nt, ns), dtype='|S8')
-        tiplistr = np.zeros((nt, ns), dtype='|S8')
-        tiplisti = np.zeros((nt, ns), dtype='|S8')
-        tiplistraz = np.zeros((nt, ns), dtype='|S8')
-        tiplistiaz = np.zeros((nt, ns), dtype='|S8')
-
-        sklist[0, 0] = '{0:>8} '.format(self.tscale)
-        phiminlist[0, 0] = '{0:>8} '.format(self.tscale)
-        phimaxlist[0, 0] = '{0:>8} '.format(self.tscale)
-        elliplist[0, 0] = '{0:>8} '.format(self.tscale)
-        azimlist[0, 0] = '{0:>8} '.format(self.tscale)
-        tiplistr[0, 0] = '{0:>8} '.format(self.tscale)
-        tiplistraz[0, 0] = '{0:>8} '.format(self.tscale)
-        tiplisti[0, 0] = '{0:>8} '.format(self.tscale)
-        tiplistiaz[0, 0] = '{0:>8} '.format(self.tscale)
-
-        # get the period as the first column
-        for tt, t1 in enumerate(plist, 1):
-            sklist[tt, 0] = t1
-            phiminlist[tt, 0] = t1
-            phimaxlist[tt, 0] = t1
-            elliplist[tt, 0] = t1
-            azimlist[tt, 0] = t1
-            tiplistr[tt, 0] = t1
-            tiplistraz[tt, 0] = t1
-            tiplisti[tt, 0] = t1
-            tiplistiaz[tt, 0] = t1
-
-        # fill out the rest of the values
-        for kk, mt in enumerate(slist, 1):
-
-            pt = mt.get_PhaseTensor()
-            tip = mt.Tipper
-
-            if self.tscale == 'period':
-                tlist = mt.period
-
-            elif self.tscale == 'frequency':
-                tlist = mt.frequency
-
+        if self.tscale == 'period':
+            tlist = [mt.period for mt in slist]
+        elif self.tscale == 'frequency':
+            tlist = [mt.frequency for mt in slist]
+
+        # find the index of the matching period of each station, zero is
+        # written where a station does not have a period within ptol
+        period_index = mtpl.get_period_index(tlist, plist, ftol=ptol)
+
+        value_dict = {}
+        for key in ['beta', 'phimin', 'phimax', 'ellipticity', 'azimuth']:
+            value_dict[key] = mtpl.get_pseudosection_grid(
+                [getattr(mt.pt, key) for mt in slist], period_index)
+
+        for key in ['mag_real', 'angle_real', 'mag_imag', 'angle_imag']:
+            value_list = []
+            for mt in slist:
+                value = getattr(mt.Tipper, key)
+                if value is None:
+                    value = np.zeros(mt.period.size)
+                value_list.append(value)
+            value_dict[key] = mtpl.get_pseudosection_grid(value_list,
+                                                          period_index)
+
+        station_list = []
+        for mt in slist:
             try:
-                stationstr = '{0:^8}'.format(mt.station[self.station_id[0]:
-                                                        self.station_id[1]])
-            except AttributeError:
-                stationstr = '{0:^8}'.format(mt.station)
-
-            # -->  get station name as header in each file
-            sklist[0, kk] = stationstr
-            phiminlist[0, kk] = stationstr
-            phimaxlist[0, kk] = stationstr
-            elliplist[0, kk] = stationstr
-            azimlist[0, kk] = stationstr
-            tiplistr[0, kk] = stationstr
-            tiplistraz[0, kk] = stationstr
-            tiplisti[0, kk] = stationstr
-            tiplistiaz[0, kk] = stationstr
-
-            # If the all periods match for the station and the plotting period
-            if tlist.all() == plist.all():
-                if pt.pt is not None:
-                    sklist[1:, kk] = pt.beta[0]
-                    phiminlist[1:, kk] = pt.phimin[0]
-                    phimaxlist[1:, kk] = pt.phimax[0]
-                    elliplist[1:, kk] = pt.ellipticity[0]
-                    azimlist[1:, kk] = pt.azimuth[0]
-                if tip.mag_real is not None:
-                    tiplistr[1:, kk] = tip.mag_real
-                    tiplistraz[1:, kk] = tip.angle_real
-                    tiplisti[1:, kk] = tip.mag_imag
-                    tiplistiaz[1:, kk] = tip.angle_imag
-
-            # otherwise search the period list to find a cooresponding period
-            else:
-                for mm, t1 in enumerate(plist):
-                    # check to see if the periods match or are at least close in
-                    # case there are frequency missing
-                    t1_yn = False
-                    if t1 == tlist[mm]:
-                        t1_yn = True
-                    elif tlist[mm] > t1 * (1 - ptol) and tlist[mm] < t1 * (1 + ptol):
-                        t1_yn = True
-
-                    if t1_yn == True:
-                        # add on the value to the present row
-                        if pt.beta[0] is not None:
-                            sklist[mm + 1, kk] = pt.beta[0][mm]
-                            phiminlist[mm + 1, kk] = pt.phimin[0][mm]
-                            phimaxlist[mm + 1, kk] = pt.phimax[0][mm]
-                            elliplist[mm + 1, kk] = pt.ellipticity[0][mm]
-                            azimlist[mm + 1, kk] = pt.azimuth[0][mm]
-
-                        # add on the value to the present row
-                        if tip.mag_real is not None:
-                            tiplistr[mm + 1, kk] = tip.mag_real[mm]
-                            tiplistraz[mm + 1, kk] = tip.angle_real[mm]
-                            tiplisti[mm + 1, kk] = tip.mag_imag[mm]
-                            tiplistiaz[mm + 1, kk] = tip.angle_imag[mm]
-
-                    elif t1_yn == False:
-                        for ff, t2 in enumerate(tlist):
-                            if t2 > t1 * (1 - ptol) and t2 < t1 * (1 + ptol):
-                                # add on the value to the present row
-                                if pt.beta[0] is not None:
-                                    sklist[mm + 1, kk] = pt.beta[0][ff]
-                                    phiminlist[mm + 1, kk] = pt.phimin[0][ff]
-                                    phimaxlist[mm + 1, kk] = pt.phimax[0][ff]
-                                    elliplist[
-                                        mm + 1, kk] = pt.ellipticity[0][ff]
-                                    azimlist[mm + 1, kk] = pt.azimuth[0][ff]
-
-                                # add on the value to the present row
-                                if tip.mag_real is not None:
-                                    tiplistr[mm + 1, kk] = tip.mag_real[ff]
-                                    tiplistraz[mm + 1, kk] = tip.angle_real[ff]
-                                    tiplisti[mm + 1, kk] = tip.mag_imag[ff]
-                                    tiplistiaz[mm + 1, kk] = tip.angle_imag[ff]
-                                t1_yn = True
-                                break
-                            else:
-                                t1_yn = False
+                station_list.append(mt.station[self.station_id[0]:
+                                               self.station_id[1]])
+            except (AttributeError, TypeError):
+                station_list.append(mt.station)
 
         # write the arrays into lines properly formatted
         t1_kwargs = {'spacing': '{0:^8} ', 'value_format': '{0:.2e}',
                      'append': False, 'add': False}
         t2_kwargs = {'spacing': '{0:^8}', 'value_format': '{0: .2f}',
                      'append': False, 'add': False}
-        # create empty lists to put the concatenated strings into
-        sklines = []
-        phiminlines = []
-        phimaxlines = []
-        elliplines = []
-        azimlines = []
-        tprlines = []
-        tprazlines = []
-        tpilines = []
-        tpiazlines = []
-
-        # if there are any blank strings set them as 0
-        sklist[np.where(sklist == '')] = '0.0'
-        phiminlist[np.where(phiminlist == '')] = '0.0'
-        phimaxlist[np.where(phimaxlist == '')] = '0.0'
-        elliplist[np.where(elliplist == '')] = '0.0'
-        azimlist[np.where(azimlist == '')] = '0.0'
-        tiplistr[np.where(tiplistr == '')] = '0.0'
-        tiplistraz[np.where(tiplistraz == '')] = '0.0'
-        tiplisti[np.where(tiplisti == '')] = '0.0'
-        tiplistiaz[np.where(tiplistiaz == '')] = '0.0'
-
-        for tt in range(nt):
-            if tt == 0:
-                skline = sklist[tt, 0] + ' '
-                pminline = phiminlist[tt, 0] + ' '
-                pmaxline = phimaxlist[tt, 0] + ' '
-                elliline = elliplist[tt, 0] + ' '
-                azline = azimlist[tt, 0] + ' '
-                tprline = tiplistr[tt, 0] + ' '
-                tprazline = tiplistraz[tt, 0] + ' '
-                tpiline = tiplisti[tt, 0] + ' '
-                tpiazline = tiplistiaz[tt, 0] + ' '
-                for ss in range(1, ns):
-                    skline += sklist[tt, ss]
-                    pminline += phiminlist[tt, ss]
-                    pmaxline += phimaxlist[tt, ss]
-                    elliline += elliplist[tt, ss]
-                    azline += azimlist[tt, ss]
-                    tprline += tiplistr[tt, ss]
-                    tprazline += tiplistraz[tt, ss]
-                    tpiline += tiplisti[tt, ss]
-                    tpiazline += tiplistiaz[tt, ss]
-            else:
-                # get period or frequency
-                skline = mtpl.make_value_str(float(sklist[tt, 0]),
-                                             **t1_kwargs)
-                pminline = mtpl.make_value_str(float(phiminlist[tt, 0]),
-                                               **t1_kwargs)
-                pmaxline = mtpl.make_value_str(float(phimaxlist[tt, 0]),
-                                               **t1_kwargs)
-                elliline = mtpl.make_value_str(float(elliplist[tt, 0]),
-                                               **t1_kwargs)
-                azline = mtpl.make_value_str(float(azimlist[tt, 0]),
-                                             **t1_kwargs)
-                tprline = mtpl.make_value_str(float(tiplistr[tt, 0]),
-                                              **t1_kwargs)
-                tprazline = mtpl.make_value_str(float(tiplistraz[tt, 0]),
-                                                **t1_kwargs)
-                tpiline = mtpl.make_value_str(float(tiplisti[tt, 0]),
-                                              **t1_kwargs)
-                tpiazline = mtpl.make_value_str(float(tiplistiaz[tt, 0]),
-                                                **t1_kwargs)
-
-                # get parameter values
-                for ss in range(1, ns):
-                    skline += mtpl.make_value_str(float(sklist[tt, ss]),
-                                                  **t2_kwargs)
-                    pminline += mtpl.make_value_str(float(phiminlist[tt, ss]),
-                                                    **t2_kwargs)
-                    pmaxline += mtpl.make_value_str(float(phimaxlist[tt, ss]),
-                                                    **t2_kwargs)
-                    elliline += mtpl.make_value_str(float(elliplist[tt, ss]),
-                                                    **t2_kwargs)
-                    azline += mtpl.make_value_str(float(azimlist[tt, ss]),
-                                                  **t2_kwargs)
-                    tprline += mtpl.make_value_str(float(tiplistr[tt, ss]),
-                                                   **t2_kwargs)
-                    tprazline += mtpl.make_value_str(float(tiplistraz[tt, ss]),
-                                                     **t2_kwargs)
-                    tpiline += mtpl.make_value_str(float(tiplisti[tt, ss]),
-                                                   **t2_kwargs)
-                    tpiazline += mtpl.make_value_str(float(tiplistiaz[tt, ss]),
-                                                     **t2_kwargs)
-
-            # be sure to end the line after each period
-            sklines.append(skline + '\n')
-            phiminlines.append(pminline + '\n')
-            phimaxlines.append(pmaxline + '\n')
-            elliplines.append(elliline + '\n')
-            azimlines.append(azline + '\n')
-            tprlines.append(tprline + '\n')
-            tprazlines.append(tprazline + '\n')
-            tpilines.append(tpiline + '\n')
-            tpiazlines.append(tpiazline + '\n')
-
-        # write files
-        skfid = file(os.path.join(svpath, 'PseudoSection.skew'), 'w')
-        skfid.writelines(sklines)
-        skfid.close()
-
-        phiminfid = file(os.path.join(svpath, 'PseudoSection.phimin'), 'w')
-        phiminfid.writelines(phiminlines)
-        phiminfid.close()
-
-        phimaxfid = file(os.path.join(svpath, 'PseudoSection.phimax'),
-                         'w')
-        phimaxfid.writelines(phimaxlines)
-        phimaxfid.close()
-
-        ellipfid = file(os.path.join(svpath, 'PseudoSection.ellipticity'),
-                        'w')
-        ellipfid.writelines(elliplines)
-        ellipfid.close()
-
-        azfid = file(os.path.join(svpath, 'PseudoSection.azimuth'),
-                     'w')
-        azfid.writelines(azimlines)
-        azfid.close()
-
-        tprfid = file(os.path.join(svpath, 'PseudoSection.tipper_mag_real'),
-                      'w')
-        tprfid.writelines(tprlines)
-        tprfid.close()
-
-        tprazfid = file(os.path.join(svpath, 'PseudoSection.tipper_ang_real'),
-                        'w')
-        tprazfid.writelines(tprazlines)
-        tprazfid.close()
-
-        tpifid = file(os.path.join(svpath, 'PseudoSection.tipper_mag_imag'),
-                      'w')
-        tpifid.writelines(tpilines)
-        tpifid.close()
-
-        tpiazfid = file(os.path.join(svpath, 'PseudoSection.tipper_ang_imag'),
-                        'w')
-        tpiazfid.writelines(tpiazlines)
-        tpiazfid.close()
+
+        header = '{0:>8}  '.format(self.tscale) + \
+                 ''.join(['{0:^8}'.format(ss) for ss in station_list]) + '\n'
+
+        for key, ext in [('beta', 'skew'),
+                         ('phimin', 'phimin'),
+                         ('phimax', 'phimax'),
+                         ('ellipticity', 'ellipticity'),
+                         ('azimuth', 'azimuth'),
+                         ('mag_real', 'tipper_mag_real'),
+                         ('angle_real', 'tipper_ang_real'),
+                         ('mag_imag', 'tipper_mag_imag'),
+                         ('angle_imag', 'tipper_ang_imag')]:
+            lines = [header]
+            for t1, values in zip(plist, value_dict[key]):
+                lines.append(mtpl.make_value_str(t1, **t1_kwargs) +
+                             ''.join([mtpl.make_value_str(vv, **t2_kwargs)
+                                      for vv in values]) + '\n')
+
+            with open(os.path.join(svpath, 'PseudoSection.' + ext), 'w') as fid:
+                fid.writelines(lines)
 
     def update_plot(self):
         """
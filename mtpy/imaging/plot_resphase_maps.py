@@ -13,9 +13,11 @@ Revision History:
 
 """
 
+import copy
 import matplotlib.pyplot as plt
 import numpy as np
 import os, glob
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib.ticker import FormatStrFormatter
 import mtpy.utils.gis_tools as gis_tools
 import matplotlib.colors as colors
@@ -119,6 +121,175 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
         self.axesList = []
     # end func
 
+    def _get_station_values(self, freq_list, type):
+        """
+        interpolate every station once onto all the frequencies
+
+        :param freq_list: list of frequencies
+        :param type: 'res' or 'phase'
+        :return: values np.ndarray(nf, ns, 2, 2), lon and lat of the stations
+        """
+        values, lat, lon = [], [], []
+        for mt_obj in self.mt_list:
+            z_obj_i, tipper_obj_i = mt_obj.interpolate(freq_list, bounds_error=False)
+            z_obj_i.compute_resistivity_phase()
+            if type == 'res':
+                values.append(z_obj_i.resistivity)
+            else:
+                values.append(z_obj_i.phase)
+            lat.append(mt_obj.lat)
+            lon.append(mt_obj.lon)
+        # end for
+
+        values = np.array(values).swapaxes(0, 1)
+        if type == 'phase':
+            values[:, :, 1, 0] += 180
+
+        return values, np.array(lon, dtype=float), np.array(lat, dtype=float)
+    # end func
+
+    def _get_grid(self, lon, lat, extrapolation_buffer_degrees,
+                  regular_grid_nx, regular_grid_ny, nn):
+        """
+        project the stations, triangulate the regular grid around them and
+        find the nearest stations of each grid point, none of which changes
+        with frequency.
+
+        :return: dictionary of arrays, so it can be sent to worker processes
+        """
+        elon = np.array(lon)
+        elat = np.array(lat)
+
+        elon[np.argmin(elon)] -= extrapolation_buffer_degrees
+        elon[np.argmax(elon)] += extrapolation_buffer_degrees
+        elat[np.argmin(elat)] -= extrapolation_buffer_degrees
+        elat[np.argmax(elat)] += extrapolation_buffer_degrees
+
+        x = np.zeros(lon.shape)
+        y = np.zeros(lon.shape)
+        ex = np.zeros(lon.shape)
+        ey = np.zeros(lon.shape)
+
+        # transform coordinates if necessary
+        if (self.mapscale == 'm' or self.mapscale=='km'):
+            zl = []
+            zle = []
+            for k in range(len(lon)):
+                east, north, zone = gis_tools.project_point_ll2utm(lat[k],
+                                                                   lon[k])
+                x[k] = east / self.dscale
+                y[k] = north / self.dscale
+                zl.append(zone)
+
+                east, north, zone = gis_tools.project_point_ll2utm(elat[k],
+                                                                   elon[k])
+                ex[k] = east / self.dscale
+                ey[k] = north / self.dscale
+                zle.append(zone)
+            # end for
+
+            if (len(set(zl)) > 1 or len(set(zle)) > 1):
+                print('Warning: multiple UTM zones detected. ' \
+                      'Using geographical coordinates instead')
+                x = lon
+                y = lat
+                ex = elon
+                ey = elat
+            # end if
+        else:
+            x = lon
+            y = lat
+            ex = elon
+            ey = elat
+        # end if
+
+        rx = np.linspace(ex.min(), ex.max(), regular_grid_nx)
+        ry = np.linspace(ey.min(), ey.max(), regular_grid_ny)
+        rx, ry = np.meshgrid(rx, ry)
+        rx = rx.flatten()
+        ry = ry.flatten()
+
+        triangulation = tri.Triangulation(rx, ry)
+
+        mx = rx[triangulation.triangles].mean(axis=1)
+        my = ry[triangulation.triangles].mean(axis=1)
+
+        mxmy = np.array([mx, my]).T
+        exey = np.array([ex, ey]).T
+
+        insideIndices = np.bool_(_in_hull(mxmy, exey))
+
+        tree = cKDTree(np.array([x, y]).T)
+        d, l = tree.query(np.array([rx, ry]).T, k=nn)
+
+        return {'x': x, 'y': y, 'lon': lon, 'lat': lat,
+                'rx': rx, 'ry': ry,
+                'triangles': triangulation.triangles,
+                'inside': insideIndices,
+                'd': d, 'l': l}
+    # end func
+
+    @staticmethod
+    def _interpolate_grid(grid, vals, nn, p):
+        """
+        inverse distance weighted interpolation of the station values onto
+        the regular grid
+        """
+        d = grid['d']
+        l = grid['l']
+        if (nn == 1):
+            # extract nearest neighbour values
+            return vals[l]
+
+        img = np.zeros((d.shape[0]))
+
+        # field values are directly assigned for coincident locations
+        coincidentValIndices = d[:, 0] == 0
+        img[coincidentValIndices] = vals[l[coincidentValIndices, 0]]
+
+        # perform idw interpolation for non-coincident locations
+        idwIndices = d[:, 0] != 0
+        w = np.zeros(d.shape)
+        w[idwIndices, :] = 1. / np.power(d[idwIndices, :], p)
+
+        img[idwIndices] = np.sum(w[idwIndices, :] * vals[l[idwIndices, :]], axis=1) / \
+                          np.sum(w[idwIndices, :], axis=1)
+
+        return img
+    # end func
+
+    @staticmethod
+    def _contour_map(ax, triangulation, insideIndices, img, type, vmin, vmax,
+                     cmap, **kwargs):
+        """
+        filled contours of one component on ax
+        """
+        if (type == 'res'):
+            # Log-normalized contour plots do not support the 'extend' keyword which
+            # can be used to clip data values above/below the given range to their
+            # corresponding colors. We do the following to get around this issue.
+            return ax.tricontourf(triangulation, np.log10(img), mask=insideIndices,
+                                  levels=np.linspace(np.log10(vmin), np.log10(vmax), 50),
+                                  extend='both',
+                                  cmap=cmap, **kwargs)
+        else:
+            return ax.tricontourf(triangulation, img, mask=insideIndices,
+                                  levels=np.linspace(vmin, vmax, 50),
+                                  norm=colors.Normalize(vmin=vmin, vmax=vmax),
+                                  extend='both',
+                                  cmap=cmap, **kwargs)
+        # end if
+    # end func
+
+    @staticmethod
+    def _get_title(freq, type):
+        suffix = ' %0.2f Hz'%(freq) if (freq>=1) else ' %0.2f s'%(1./freq)
+        if(type=='res'):
+            return 'Apparent Resistivity Maps for'+suffix
+        else:
+            return 'Phase Maps for'+suffix
+    # end func
+
     # -----------------------------------------------
     # The main plot method for this module
     # -------------------------------------------------
@@ -152,45 +323,27 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
         if(type not in ['res', 'phase']): raise NameError("type must be 'res' or 'phase'")
         if(not os.path.isdir(save_path)): raise NameError("Invalid save_path")
 
-        def in_hull(p, hull):
-            """
-            Test if points in p are within the convex hull
-            """
+        # interpolate data
+        vs, lon, lat = self._get_station_values([freq], type)
+        grid = self._get_grid(lon, lat, extrapolation_buffer_degrees,
+                              regular_grid_nx, regular_grid_ny, nn)
 
-            try:
-                if not isinstance(hull, Delaunay):
-                    hull = Delaunay(hull)
-
-                return hull.find_simplex(p)>=0
-            except:
-                from scipy.optimize import linprog
-
-                # Delaunay triangulation will fail if there are collinear points; in those instances
-                # use linear programming (much slower) to define a convex hull.
-                def in_hull_lp(points, x):
-                    """
-                    :param points:
-                    :param x:
-                    :return:
-                    """
-                    n_points = len(points)
-                    n_dim = len(x)
-                    c = np.zeros(n_points)
-                    A = np.r_[points.T, np.ones((1, n_points))]
-                    b = np.r_[x, np.ones(1)]
-                    lp = linprog(c, A_eq=A, b_eq=b)
-                    return not lp.success
-                # end func
-
-                result = []
-                for cp in p:
-                    result.append(in_hull_lp(hull, cp))
-                # end for
-
-                return np.array(result)
-            # end try
-        # end func
-        
+        self._make_figure(freq, type, vmin, vmax, vs[0], grid, nn, p,
+                          show_stations, show_station_names, cmap)
+        if (show): plt.show()
+
+        fn = os.path.join(save_path, '%s.%0.2f.%s'%(type, freq, file_ext))
+        self.fig.savefig(fn, dpi=self.fig_dpi)
+
+        return self.fig
+    # end func
+
+    def _make_figure(self, freq, type, vmin, vmax, vs, grid, nn, p,
+                     show_stations, show_station_names, cmap):
+        """
+        make the figure of the four components from the station values vs
+        (ns, 2, 2) and the grid from _get_grid
+        """
         # change vmin, vmax to 2x2 array
         if not np.iterable(vmin):
             vmin = np.ones((2,2))*vmin
@@ -213,148 +366,42 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
         # clear the figure if there is already one up
         plt.clf()
 
-        # interpolate data
-        res, phase, lat, lon = [], [], [], []
-        for mt_obj in self.mt_list:
-            z_obj_i, tipper_obj_i = mt_obj.interpolate([freq], bounds_error=False)
-            z_obj_i.compute_resistivity_phase()
-            res.append(z_obj_i.resistivity[0])
-            phase.append(z_obj_i.phase[0])
-            lat = np.append(lat, mt_obj.lat)
-            lon = np.append(lon, mt_obj.lon)
-        # end for
-
-        lon = np.array(lon)
-        lat = np.array(lat)
-        res = np.array(res)
-        phase = np.array(phase)
-        phase[:,1,0] += 180
-
-        elon = np.array(lon)
-        elat = np.array(lat)
+        x = grid['x']
+        y = grid['y']
+        insideIndices = grid['inside']
+        triangulation = tri.Triangulation(grid['rx'], grid['ry'],
+                                          triangles=grid['triangles'])
+        triangulation.set_mask(~insideIndices)
 
-        elon[np.argmin(elon)] -= extrapolation_buffer_degrees
-        elon[np.argmax(elon)] += extrapolation_buffer_degrees
-        elat[np.argmin(elat)] -= extrapolation_buffer_degrees
-        elat[np.argmax(elat)] += extrapolation_buffer_degrees
-
-        x = np.zeros(lon.shape)
-        y = np.zeros(lon.shape)
-        ex = np.zeros(lon.shape)
-        ey = np.zeros(lon.shape)
+        # keep what is needed to update the maps for another frequency
+        self._map_settings = {'type': type, 'vmin': vmin, 'vmax': vmax,
+                              'nn': nn, 'p': p, 'cmap': cmap}
+        self._map_triangulation = triangulation
+        self._map_contours = []
 
         # plot results
-        insideIndices = []
-        tree = None
-        triangulation = None
-        foundCoordinates = False
         plotIdx = 1
         for i in range(2):
             for j in range(2):
                 ax = self.fig.add_subplot(2, 2, plotIdx)
                 self.axesList.append(ax)
 
-                nx = regular_grid_nx
-                ny = regular_grid_ny
-                if (not foundCoordinates):
-                    # transform coordinates if necessary
-                    if (self.mapscale == 'm' or self.mapscale=='km'):
-                        zl = []
-                        zle = []
-                        for k in range(len(lon)):
-                            east, north, zone = gis_tools.project_point_ll2utm(lat[k],
-                                                                               lon[k])
-                            x[k] = east / self.dscale
-                            y[k] = north / self.dscale
-                            zl.append(zone)
-
-                            east, north, zone = gis_tools.project_point_ll2utm(elat[k],
-                                                                               elon[k])
-                            ex[k] = east / self.dscale
-                            ey[k] = north / self.dscale
-                            zle.append(zone)
-                        # end for
-
-                        if (len(set(zl)) > 1 or len(set(zle)) > 1):
-                            print('Warning: multiple UTM zones detected. ' \
-                                  'Using geographical coordinates instead')
-                            x = lon
-                            y = lat
-                            ex = elon
-                            ey = elat
-                        # end if
-                    else:
-                        x = lon
-                        y = lat
-                        ex = elon
-                        ey = elat
-                    # end if
-
-                    rx = np.linspace(ex.min(), ex.max(), nx)
-                    ry = np.linspace(ey.min(), ey.max(), ny)
-                    rx, ry = np.meshgrid(rx, ry)
-                    rx = rx.flatten()
-                    ry = ry.flatten()
-
-                    triangulation = tri.Triangulation(rx, ry)
-
-                    mx = rx[triangulation.triangles].mean(axis=1)
-                    my = ry[triangulation.triangles].mean(axis=1)
-
-                    mxmy = np.array([mx, my]).T
-                    exey = np.array([ex, ey]).T
-
-                    insideIndices = in_hull(mxmy, exey)
-                    insideIndices = np.bool_(insideIndices)
-                    triangulation.set_mask(~insideIndices)
-
-                    foundCoordinates = True
-
-                    tree = cKDTree(np.array([x, y]).T)
-                # end if
-
-                xy = np.array([rx, ry]).T
-                d, l = tree.query(xy, k=nn)
-
-                img = None
-                vs = res if type == 'res' else phase
-
-                if (nn == 1):
-                    # extract nearest neighbour values
-                    img = vs[:, i, j][l]
-                else:
-                    vals = vs[:, i, j]
-                    img = np.zeros((xy.shape[0]))
-
-                    # field values are directly assigned for coincident locations
-                    coincidentValIndices = d[:, 0] == 0
-                    img[coincidentValIndices] = vals[l[coincidentValIndices, 0]]
-
-                    # perform idw interpolation for non-coincident locations
-                    idwIndices = d[:, 0] != 0
-                    w = np.zeros(d.shape)
-                    w[idwIndices, :] = 1. / np.power(d[idwIndices, :], p)
-
-                    img[idwIndices] = np.sum(w[idwIndices, :] * vals[l[idwIndices, :]], axis=1) / \
-                                      np.sum(w[idwIndices, :], axis=1)
-                # end if
+                img = self._interpolate_grid(grid, vs[:, i, j], nn, p)
 
                 if(isinstance(cmap, str)):
                     cmap = plt.get_cmap(cmap)
+                    self._map_settings['cmap'] = cmap
                 # set cmap values for over and under
                 norm = colors.Normalize(vmin=vmin[i,j], vmax=vmax[i,j])
                 cmap.set_over(cmap(norm(vmax[i,j])))
                 cmap.set_under(cmap(norm(vmin[i,j])))
 
-                if (type == 'res'):
-                    # Log-normalized contour plots do not support the 'extend' keyword which
-                    # can be used to clip data values above/below the given range to their
-                    # corresponding colors. We do the following to get around this issue.
-                    cbinfo = ax.tricontourf(triangulation, np.log10(img), mask=insideIndices,
-                                            levels=np.linspace(np.log10(vmin[i,j]), np.log10(vmax[i,j]), 50),
-                                            extend='both',
-                                            cmap=cmap)
+                cbinfo = self._contour_map(ax, triangulation, insideIndices,
+                                           img, type, vmin[i,j], vmax[i,j],
+                                           cmap)
+                self._map_contours.append(cbinfo)
 
+                if (type == 'res'):
                     cb = self.fig.colorbar(cbinfo,
                                            ticks=ticker.FixedLocator(
                                                np.arange(int(np.round(np.log10(vmin[i,j]))),
@@ -364,12 +411,6 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
                               np.arange(int(np.round(np.log10(vmin[i,j]))), int(np.round(np.log10(vmax[i,j])))+1)]
                     cb.ax.yaxis.set_major_formatter(ticker.FixedFormatter(labels))
                 elif (type == 'phase'):
-                    cbinfo = ax.tricontourf(triangulation, img, mask=insideIndices,
-                                             levels=np.linspace(vmin[i,j], vmax[i,j], 50),
-                                             norm=colors.Normalize(vmin=vmin[i,j], vmax=vmax[i,j]),
-                                             extend='both',
-                                             cmap=cmap)
-
                     cb = self.fig.colorbar(cbinfo, ticks=np.linspace(vmin[i,j], vmax[i,j], 12))
                 # end if
 
@@ -384,7 +425,7 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
                     ax.scatter(x, y, 2, marker='v', c='k', edgecolor='none')
                     if show_station_names:
                         for isn, mt_obj in enumerate(self.mt_list):
-                            plt.text(lon[isn],lat[isn],mt_obj.station,fontsize=self.font_size-2)
+                            plt.text(grid['lon'][isn],grid['lat'][isn],mt_obj.station,fontsize=self.font_size-2)
 
                 # Label plots
                 label = ''
@@ -417,23 +458,166 @@ class PlotResPhaseMaps(mtpl.PlotSettings):
         # end for
 
         # Plot title
-        suffix = ' %0.2f Hz'%(freq) if (freq>=1) else ' %0.2f s'%(1./freq)
-        if(type=='res'):
-            self.fig.suptitle('Apparent Resistivity Maps for'+suffix, y=0.985)
-        else:
-            self.fig.suptitle('Phase Maps for'+suffix, y=0.985)
+        self._map_title = self.fig.suptitle(self._get_title(freq, type), y=0.985)
 
         plt.tight_layout(rect=[0, 0.025, 1, 0.975])
-        if (show): plt.show()
+    # end func
 
-        fn = os.path.join(save_path, '%s.%0.2f.%s'%(type, freq, file_ext))
-        self.fig.savefig(fn, dpi=self.fig_dpi)
+    def _set_frequency_data(self, freq, vs, grid):
+        """
+        redraw the filled contours and the title for the station values vs
+        (ns, 2, 2) of another frequency, keeping the axes, colorbars and
+        stations of the figure
+        """
+        settings = self._map_settings
+        for idx, ax in enumerate(self.axesList[-4:]):
+            i, j = divmod(idx, 2)
+            for collection in self._map_contours[idx].collections:
+                collection.remove()
+
+            img = self._interpolate_grid(grid, vs[:, i, j], settings['nn'],
+                                         settings['p'])
+            # drawn below the stations, as the contours of the first map
+            self._map_contours[idx] = self._contour_map(
+                ax, self._map_triangulation, grid['inside'], img,
+                settings['type'], settings['vmin'][i, j],
+                settings['vmax'][i, j], settings['cmap'], zorder=0.5)
+        # end for
 
-        return self.fig
+        self._map_title.set_text(self._get_title(freq, settings['type']))
+    # end func
+
+    def save_period_series(self, freq_list, type, vmin, vmax,
+                           extrapolation_buffer_degrees=1,
+                           regular_grid_nx=100, regular_grid_ny=100,
+                           nn=7,
+                           p=4,
+                           show_stations=True,
+                           show_station_names=False,
+                           save_path=os.getcwd(),
+                           file_ext='png',
+                           cmap='rainbow',
+                           n_processes=1):
+        """
+        save a resistivity or phase map for each frequency in freq_list.
+
+        The stations are interpolated once onto all frequencies and the
+        grid, its triangulation and the nearest stations of every grid point
+        are computed once.  The figure is made once, for each frequency only
+        the filled contours and the title are drawn again.  The frequencies
+        can be split over n_processes worker processes, each drawing on its
+        own figure with the Agg backend.
+
+        :param freq_list: list of frequencies
+        :param n_processes: number of worker processes, 1 or None draws in
+                            this process with the current backend
+        :return: list of saved file names, named as in plot
+
+        see plot for the other parameters
+        """
+
+        if(type not in ['res', 'phase']): raise NameError("type must be 'res' or 'phase'")
+        if(not os.path.isdir(save_path)): raise NameError("Invalid save_path")
+
+        freq_list = np.atleast_1d(np.asarray(freq_list, dtype=float))
+        vs, lon, lat = self._get_station_values(freq_list, type)
+        grid = self._get_grid(lon, lat, extrapolation_buffer_degrees,
+                              regular_grid_nx, regular_grid_ny, nn)
+
+        save_fn_list = [os.path.join(save_path, '%s.%0.2f.%s'%(type, freq, file_ext))
+                        for freq in freq_list]
+        plot_kwargs = dict(type=type, vmin=vmin, vmax=vmax, nn=nn, p=p,
+                           show_stations=show_stations,
+                           show_station_names=show_station_names,
+                           cmap=cmap)
+
+        plot_obj = copy.copy(self)
+        plot_obj.axesList = []
+        if n_processes in [None, 1]:
+            _save_period_series_chunk(plot_obj, freq_list, vs, grid,
+                                      save_fn_list, plot_kwargs)
+        else:
+            index_chunks = [index for index in
+                            np.array_split(np.arange(len(save_fn_list)),
+                                           n_processes) if index.size > 0]
+            with ProcessPoolExecutor(max_workers=n_processes) as executor:
+                futures = [executor.submit(_save_period_series_chunk,
+                                           plot_obj,
+                                           freq_list[index],
+                                           vs[index],
+                                           grid,
+                                           [save_fn_list[ii] for ii in index],
+                                           plot_kwargs,
+                                           True)
+                           for index in index_chunks]
+                for future in futures:
+                    future.result()
+
+        return save_fn_list
     # end func
 # end class
 
 
+def _in_hull(p, hull):
+    """
+    Test if points in p are within the convex hull
+    """
+
+    try:
+        if not isinstance(hull, Delaunay):
+            hull = Delaunay(hull)
+
+        return hull.find_simplex(p)>=0
+    except:
+        from scipy.optimize import linprog
+
+        # Delaunay triangulation will fail if there are collinear points; in those instances
+        # use linear programming (much slower) to define a convex hull.
+        def in_hull_lp(points, x):
+            """
+            :param points:
+            :param x:
+            :return:
+            """
+            n_points = len(points)
+            n_dim = len(x)
+            c = np.zeros(n_points)
+            A = np.r_[points.T, np.ones((1, n_points))]
+            b = np.r_[x, np.ones(1)]
+            lp = linprog(c, A_eq=A, b_eq=b)
+            return not lp.success
+        # end func
+
+        result = []
+        for cp in p:
+            result.append(in_hull_lp(hull, cp))
+        # end for
+
+        return np.array(result)
+    # end try
+# end func
+
+
+def _save_period_series_chunk(plot_obj, freq_list, vs, grid, save_fn_list,
+                              plot_kwargs, use_agg=False):
+    """
+    make the maps for the first frequency and save a figure for each
+    frequency by redrawing the contours, used by
+    PlotResPhaseMaps.save_period_series
+    """
+    if use_agg:
+        plt.switch_backend('Agg')
+
+    plot_obj._make_figure(freq_list[0], vs=vs[0], grid=grid, **plot_kwargs)
+    for kk, save_fn in enumerate(save_fn_list):
+        if kk > 0:
+            plot_obj._set_frequency_data(freq_list[kk], vs[kk], grid)
+        plot_obj.fig.savefig(save_fn, dpi=plot_obj.fig_dpi)
+    plt.close(plot_obj.fig)
+
+    return save_fn_list
+
+
 # =============================================
 # Quick test
 # =============================================
@@ -453,67 +453,35 @@ class PlotResPhasePseudoSection(object):
 
         self.sort_by_offsets()
 
-        #create empty arrays to put data into need to reset to zero in case
-        #something has changed
-        ns = len(self.mt_list)
-        nt = len(self.plot_period)
-
-        self.resxx = np.zeros((nt, ns))
-        self.resxy = np.zeros((nt, ns))
-        self.resyx = np.zeros((nt, ns))
-        self.resyy = np.zeros((nt, ns))
-
-        self.phasexx = np.zeros((nt, ns))
-        self.phasexy = np.zeros((nt, ns))
-        self.phaseyx = np.zeros((nt, ns))
-        self.phaseyy = np.zeros((nt, ns))
-
-        #make a dictionary of the periods to plot for a reference
-        period_dict = dict([(key, vv)
-                             for vv, key in enumerate(self.plot_period)])
-
-        for ii, mt in enumerate(self.mt_list_sort):
-            #get resisitivity and phase in a dictionary and append to a list
-#            rp = mt.get_ResPhase()
-            rp = mt.Z
-
-            for rr, rper in enumerate(self.plot_period):
-                jj = None
-                for kk, iper in enumerate(mt.period):
-                    if iper == rper:
-                        jj = period_dict[rper]
-                        self.resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                        self.resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                        self.resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                        self.resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                        self.phasexx[jj, ii] = rp.phase_xx[kk]
-                        self.phasexy[jj, ii] = rp.phase_xy[kk]
-                        self.phaseyx[jj, ii] = rp.phase_yx[kk]
-                        self.phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                        break
-
-                    elif rper*(1-self.ftol) <= iper and \
-                         iper <= rper*(1+self.ftol):
-                             jj = period_dict[rper]
-                             self.resxx[jj, ii] = np.log10(rp.res_xx[kk])
-                             self.resxy[jj, ii] = np.log10(rp.res_xy[kk])
-                             self.resyx[jj, ii] = np.log10(rp.res_yx[kk])
-                             self.resyy[jj, ii] = np.log10(rp.res_yy[kk])
-
-                             self.phasexx[jj, ii] = rp.phase_xx[kk]
-                             self.phasexy[jj, ii] = rp.phase_xy[kk]
-                             self.phaseyx[jj, ii] = rp.phase_yx[kk]
-                             self.phaseyy[jj, ii] = rp.phase_yy[kk]
-
-                             break
-                    else:
-                        pass
-
-                if jj is None:
-                    print('did not find period {0:.6g} (s) for {1}'.format(
-                               rper, self.station_list[ii]))
+        #match the periods of each station to the plot periods, zero where
+        #a station does not have a period within the tolerance
+        period_index = mtpl.get_period_index(
+                            [mt.period for mt in self.mt_list_sort],
+                            self.plot_period,
+                            ftol=self.ftol)
+
+        res = mtpl.get_pseudosection_grid(
+                            [mt.Z.resistivity for mt in self.mt_list_sort],
+                            period_index,
+                            fill_value=1.)
+        phase = mtpl.get_pseudosection_grid(
+                            [mt.Z.phase for mt in self.mt_list_sort],
+                            period_index)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            res = np.log10(res)
+
+        self.resxx = res[:, :, 0, 0]
+        self.resxy = res[:, :, 0, 1]
+        self.resyx = res[:, :, 1, 0]
+        self.resyy = res[:, :, 1, 1]
+
+        self.phasexx = phase[:, :, 0, 0]
+        self.phasexy = phase[:, :, 0, 1]
+        self.phaseyx = phase[:, :, 1, 0]
+        self.phaseyy = phase[:, :, 1, 1]
+
+        mtpl._print_missing_periods(period_index, self.plot_period,
+                                    self.station_list)
 
     def plot(self, show=True, get_rp_arrays=True):
 
@@ -1071,7 +1039,7 @@ class PlotResPhasePseudoSection(object):
 
 
         for key in list(fn_dict.keys()):
-            fid = file(os.path.join(svpath, 'PseudoSection.'+key), 'w')
+            fid = open(os.path.join(svpath, 'PseudoSection.'+key), 'w')
             fid.write(''.join(header_list))
             for ii, per in enumerate(self.plot_period):
                 if key[0] == 'r':
@@ -12,7 +12,7 @@ import os
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import MultipleLocator
-from mtpy.analysis.zinvariants import Zinvariants
+import mtpy.analysis.geometry as MTgy
 import mtpy.imaging.mtplottools as mtpl
 from mtpy.utils.calculator import roundsf
 
@@ -108,6 +108,13 @@ class PlotStrike(object):
                             
         :param plot_orientation: [ 'h' | 'v' ] horizontal or vertical plots
 
+        :param n_processes: number of processes to estimate the strike angles
+                            of chunks of stations on, useful for large
+                            compilations. *Default* is 1
+
+        :param chunk_size: number of stations per chunk. *Default* is None
+                           to split the stations evenly over the processes
+
     :Example: ::
 
         >>> import glob
@@ -181,7 +188,9 @@ class PlotStrike(object):
         self.ring_spacing = 10
         self.ring_limits = None
         self.plot_orthogonal = True
-        
+        self.n_processes = 1
+        self.chunk_size = None
+
         self.font_size = 7
         self.text_pad = 0.6
         self.text_size = self.font_size
@@ -229,32 +238,21 @@ class PlotStrike(object):
         """
         make strike array
         """
-        inv_list = []
-        pt_list = []
-        tip_list = []
         # initialize some parameters
         nc = len(self.mt_list)
-        nt = 0
-        kk = 0
-        
-        
+
         # get period list
-        period_arr = []
-        sf=4
-        for mt in self.mt_list:
-            period_arr = np.append(period_arr,1./mt.Z.freq)
-        self.period_arr = np.unique(roundsf(period_arr,sf))
+        sf = 4
+        period_arr = np.concatenate([1./mt.Z.freq for mt in self.mt_list])
+        self.period_arr = np.unique(roundsf(period_arr, sf))
         nt = len(self.period_arr)
 
-        # make empty arrays to put data into for easy manipulation
-        medinv = np.zeros((nt, nc))
-        medpt = np.zeros((nt, nc))
-        medtipr = np.zeros((nt, nc))        
-
-
+        # stack the data of all stations on the common period axis
+        z_stack = np.zeros((nc, nt, 2, 2), dtype='complex')
+        tip_stack = np.zeros((nc, nt, 1, 2), dtype='complex')
 
         for dd, mt in enumerate(self.mt_list):
-            
+
             # interpolate onto period array that has all periods in dataset
             # use very small buffer around frequencies to ensure only periods
             # that are in original mt object are included in this array
@@ -262,88 +260,26 @@ class PlotStrike(object):
                                              bounds_error=False,
                                              period_buffer=10**(-sf+1))
 
-            # mt.period = self.period
-            
-            # if mt.period.size > nt:
-            #     nt = mt.period.size
-            #-----------get strike angle from invariants-----------------------
-            zinv = Zinvariants(mt.Z)
-
-            # add 90 degrees because invariants assume 0 is north, but plotting
-            # assumes that 90 is north and measures clockwise, thus the negative
-            # because the strike angle from invariants is measured
-            # counter-clockwise
-
-            zs = 90 - zinv.strike
-
-            # fold so the angle goes from 0 to 180
-            if self.fold == True:
-                # for plotting put the NW angles into the SE quadrant
-                zs[np.where(zs > 90)] -= 180
-                zs[np.where(zs < -90)] += 180
-
-            # leave as the total unit circle 0 to 360
-            elif self.fold == False:
-                zs %= 360
-                
-            # make a dictionary of strikes with keys as period
-            # mdictinv = dict([(ff, jj) for ff, jj in zip(self.period_arr, zs)])
-            # inv_list.append(mdictinv)
-            medinv[:,dd] = zs
-
-            #------------get strike from phase tensor strike angle-------------
-            pt = mt.pt
-            az = 90 - pt.azimuth
-            az_err = pt.azimuth_err
-            az[pt.phimax == 0] = np.nan
-
-            # need to add 90 because pt assumes 0 is north and
-            # negative because measures clockwise.
-            # put an error max on the estimation of strike angle
-            if self.pt_error_floor:
-                az[np.where(az_err > self.pt_error_floor)] = 0.0
-
-            # fold so the angle goes from 0 to 180
-            if self.fold:
-                az[np.where(az > 90)] -= 180
-                az[np.where(az < -90)] += 180
-
-            # leave as the total unit circle 0 to 360
-            elif self.fold == False:
-                az %= 360
-                
-            # make a dictionary of strikes with keys as period
-            # mdictpt = dict([(ff, jj) for ff, jj in zip(self.period_arr, az)])
-            # pt_list.append(mdictpt)
-            
-            medpt[:,dd] = az
-
-            #-----------get tipper strike------------------------------------
-            tip = mt.Tipper
-            if tip.tipper is None:
-                tip.tipper = np.zeros((len(self.period_arr), 1, 2),
-                                              dtype='complex')
-                tip.compute_components()
-
-            # needs to be negative because measures clockwise
-            tipr = -tip.angle_real
-
-            tipr[np.where(tipr == 180.)] = 0.0
-
-            # fold so the angle goes from 0 to 180
-            if self.fold == True:
-                tipr[np.where(tipr > 90)] -= 180
-                tipr[np.where(tipr < -90)] += 180
-
-            # leave as the total unit circle 0 to 360
-            elif self.fold == False:
-                tipr %= 360
-                tipr[np.where(tipr == 360.0)] = 0.0
-
-            # make a dictionary of strikes with keys as period
-            # tiprdict = dict([(ff, jj) for ff, jj in zip(self.period_arr, tipr)])
-            # tip_list.append(tiprdict)
-            medtipr[:,dd] = tipr
+            z_stack[dd] = mt.Z.z
+            if mt.Tipper.tipper is not None:
+                tip_stack[dd] = mt.Tipper.tipper
+
+        # strike angles from the invariants, phase tensor and tipper for all
+        # stations at once
+        self.strike_dict = MTgy.survey_strike(
+            z_stack,
+            tipper_array=tip_stack,
+            period=self.period_arr,
+            fold=self.fold,
+            pt_error_floor=self.pt_error_floor,
+            bin_width=self.bin_width,
+            n_processes=self.n_processes,
+            chunk_size=self.chunk_size)
+
+        # make arrays of (period, station) for easy manipulation
+        medinv = self.strike_dict['inv_strike'].T
+        medpt = self.strike_dict['pt_strike'].T
+        medtipr = self.strike_dict['tip_strike'].T
 
         #--> get min and max period
         self.max_per = np.amax(self.period_arr)#[np.max(list(mm.keys())) for mm in inv_list], axis=0)
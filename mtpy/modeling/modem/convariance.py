@@ -157,14 +157,22 @@ class Covariance(object):
                                      self.grid_dimensions[2]))
 
         # need to flip north and south.
-        write_mask_arr = self.mask_arr[::-1, :, :].copy()
-        for zz in range(self.mask_arr.shape[2]):
+        write_mask_arr = self.mask_arr[::-1, :, :]
+        mask_blocks = self._mask_to_blocks(write_mask_arr)
+        if mask_blocks is None:
+            mask_blocks = []
+            for zz in range(self.mask_arr.shape[2]):
+                mask_lines = []
+                for nn in range(self.mask_arr.shape[0]):
+                    cline = ''
+                    for ee in range(self.mask_arr.shape[1]):
+                        cline += '{0:^3.0f}'.format(write_mask_arr[nn, ee, zz])
+                    mask_lines.append(cline + '\n')
+                mask_blocks.append(''.join(mask_lines))
+
+        for zz, mask_block in enumerate(mask_blocks):
             clines.append(' {0:<8.0f}{0:<8.0f}\n'.format(zz + 1))
-            for nn in range(self.mask_arr.shape[0]):
-                cline = ''
-                for ee in range(self.mask_arr.shape[1]):
-                    cline += '{0:^3.0f}'.format(write_mask_arr[nn, ee, zz])
-                clines.append(cline + '\n')
+            clines.append(mask_block)
 
         with open(self.cov_fn, 'w') as cfid:
             cfid.writelines(clines)
@@ -192,7 +200,7 @@ class Covariance(object):
         north_find = False
         count = 0
 
-        for line in lines:
+        for ll, line in enumerate(lines):
             if line.find('+') >= 0 or line.find('|') >= 0:
                 continue
             else:
@@ -213,6 +221,14 @@ class Covariance(object):
                     self.smoothing_east = np.zeros(ny)
                     self.smoothing_north = np.zeros(nx)
                 elif len(line_list) == 2:
+                    # read all the mask blocks at once, _blocks_to_mask
+                    # checks every index and mask line and returns None
+                    # if the rest of the file is laid out differently
+                    if north_find and east_find:
+                        mask_arr = self._blocks_to_mask(lines[ll:], nx, ny, nz)
+                        if mask_arr is not None:
+                            self.mask_arr = mask_arr
+                            break
                     # starts at 1 but python starts at 0
                     index_00, index_01 = [int(ii) - 1 for ii in line_list]
                     count = 0
@@ -229,6 +245,75 @@ class Covariance(object):
                     self.mask_arr[count, :, index_00:index_01 + 1] = line_list
                     count += 1
 
+    @staticmethod
+    def _mask_to_blocks(write_mask_arr):
+        """
+        format the mask as one string of rows per layer, mapping each of the
+        few distinct mask values to its 3 character string once.  Returns
+        None if a value does not fit in 3 characters.
+        """
+        # -0 and 0 are written differently but are the same value
+        if np.any(np.signbit(write_mask_arr) & (write_mask_arr == 0)):
+            return None
+
+        mask_int = write_mask_arr.astype(np.int64)
+        if np.all(mask_int == write_mask_arr) and 0 <= mask_int.min() and \
+                mask_int.max() < 100:
+            # integer masks index the formatted values directly
+            values = np.arange(mask_int.max() + 1)
+            codes = mask_int
+        else:
+            values, codes = np.unique(write_mask_arr, return_inverse=True)
+        tokens = ['{0:^3.0f}'.format(value) for value in values]
+        if any([len(token) != 3 for token in tokens]):
+            return None
+        token_table = np.array([list(token.encode('ascii')) for token in tokens],
+                               dtype=np.uint8).reshape(len(tokens), 3)
+
+        n_north, n_east, n_z = write_mask_arr.shape
+        codes = codes.reshape(n_north, n_east, n_z)
+
+        # (layer, north, 3 * east characters + new line)
+        rows = np.empty((n_z, n_north, 3 * n_east + 1), dtype=np.uint8)
+        rows[:, :, -1] = ord('\n')
+        rows[:, :, :-1] = token_table[codes.transpose(2, 0, 1)].reshape(
+            n_z, n_north, 3 * n_east)
+
+        return [rows[zz].tobytes().decode('ascii') for zz in range(n_z)]
+
+    @staticmethod
+    def _blocks_to_mask(lines, nx, ny, nz):
+        """
+        read the mask blocks (a line of two layer indices followed by nx
+        lines of ny masks) in lines.  Returns None if lines are not laid
+        out exactly like that, so the caller can fall back to reading them
+        line by line.
+        """
+        lines = [line for line in lines if line.strip()]
+        n_blocks = len(lines) // (nx + 1)
+        if n_blocks * (nx + 1) != len(lines):
+            return None
+
+        mask_arr = np.ones((nx, ny, nz), dtype=np.int64)
+        for bb in range(n_blocks):
+            index_line = lines[bb * (nx + 1)].split()
+            rows = [line.split() for line in
+                    lines[bb * (nx + 1) + 1:(bb + 1) * (nx + 1)]]
+            if len(index_line) != 2 or \
+                    any([len(row) != ny for row in rows]):
+                return None
+            try:
+                # starts at 1 but python starts at 0
+                index_00, index_01 = [int(ii) - 1 for ii in index_line]
+                block = np.array(rows, dtype=np.int64)
+            except ValueError:
+                return None
+            if not 0 <= index_00 <= index_01 < nz:
+                return None
+            mask_arr[:, :, index_00:index_01 + 1] = block.reshape(nx, ny, 1)
+
+        return mask_arr
+
     def get_parameters(self):
 
         parameter_list = ['smoothing_north',
@@ -22,7 +22,8 @@ from mtpy.core import mt as mt
 from mtpy.core import z as mtz
 from mtpy.modeling import ws3dinv as ws
 from mtpy.utils import gis_tools as gis_tools
-from mtpy.utils.mtpy_decorator import deprecated
+import mtpy.utils.mesh_tools as mtmesh
+from mtpy.utils.mtpy_decorator import deprecated, timed
 from mtpy.utils.mtpylog import MtPyLog
 
 from mtpy.modeling.modem.exception import ModEMError, DataError
@@ -156,6 +157,8 @@ class Data(object):
     period_buffer          float or int
                            if specified, apply a buffer so that interpolation doesn't
                            stretch too far over periods
+    n_processes            number of processes to write the new edi files
+                           of fill_data_array with. *default* is 1
     period_dict            dictionary of period index for period_list
     period_list            list of periods to invert for
     period_max             maximum value of period to invert for
@@ -299,6 +302,7 @@ class Data(object):
         self.data_fn = 'ModEM_Data.dat'
         self.save_path = os.getcwd()
         self.fn_basename = None
+        self.n_processes = 1
 
         self.formatting = '1'
 
@@ -667,6 +671,7 @@ class Data(object):
         self.data_array = np.zeros(ns, dtype=self._dtype)
 
         rel_distance = False
+        write_list = []
         for ii, s_key in enumerate(sorted(self.mt_dict.keys())):
             mt_obj = self.mt_dict[s_key]
             if d_array:
@@ -754,17 +759,21 @@ class Data(object):
 
                 # FZ: try to output a new edi files. Compare with original edi?
                 if new_edi_dir is not None and os.path.isdir(new_edi_dir):
-                    # new_edifile = os.path.join(new_edi_dir, mt_obj.station + '.edi')
-                    mt_obj.write_mt_file(
-                        save_dir=new_edi_dir,
-                        fn_basename=mt_obj.station,
-                        file_type='edi',
-                        new_Z_obj=interp_z,
-                        new_Tipper_obj=interp_t,
-                        longitude_format=longitude_format)
+                    write_list.append((mt_obj, interp_z, interp_t))
             else:
                 pass
 
+        # write the new edi files of all stations in one go
+        if len(write_list) > 0:
+            mt_list, z_list, t_list = zip(*write_list)
+            mt.write_mt_files(list(mt_list), save_dir=new_edi_dir,
+                              new_Z_obj_list=list(z_list),
+                              new_Tipper_obj_list=list(t_list),
+                              fn_basename_list=[mt_obj.station for mt_obj in mt_list],
+                              file_type='edi',
+                              longitude_format=longitude_format,
+                              n_processes=self.n_processes)
+
         # BM: If we can't get relative locations from MT object, 
         #  then get them from Station object
         if not rel_distance:
@@ -955,9 +964,11 @@ class Data(object):
 
 
 
+    @timed()
     def write_data_file(self, save_path=None, fn_basename=None,
                         rotation_angle=None, compute_error=True, fill=True,
-                        elevation=False, use_original_freq=False, longitude_format='LON'):
+                        elevation=False, use_original_freq=False, longitude_format='LON',
+                        progress=None):
         """
         write data file for ModEM
         will save file as save_path/fn_basename
@@ -976,6 +987,11 @@ class Data(object):
                                 angle to rotate the data by assuming N = 0,
                                 E = 90. *default* is 0.0
 
+            **progress** : function
+                           called as progress(percent, message) after each
+                           station of each data block is written, it can
+                           raise an error to stop writing. *default* is None
+
         Outputs:
         ----------
             **data_fn** : string
@@ -1022,7 +1038,9 @@ class Data(object):
             self.center_point.elev = 0.0
 
         d_lines = []
-        for inv_mode in self.inv_mode_dict[self.inv_mode]:
+        inv_mode_list = self.inv_mode_dict[self.inv_mode]
+        n_stations = self.data_array['z'].shape[0]
+        for ii_mode, inv_mode in enumerate(inv_mode_list):
             if 'impedance' in inv_mode.lower():
                 d_lines.append(self.get_header_string(self.error_type_z,
                                                       self.error_value_z,
@@ -1128,6 +1146,12 @@ class Data(object):
                             dline = ''.join([per, sta, lat, lon, nor, eas, ele, com, rea, ima, abs_err, '\n'])
 
                             d_lines.append(dline)
+
+                if progress is not None:
+                    progress(100. * (ii_mode * n_stations + ss + 1) /
+                             (len(inv_mode_list) * n_stations),
+                             'Wrote {0} of station {1}'.format(
+                                 inv_mode, self.data_array[ss]['station']))
         print("self.data_fn ==",  self.data_fn)
         with open(self.data_fn, 'w') as dfid:
             dfid.writelines(d_lines)
@@ -1343,7 +1367,8 @@ class Data(object):
 
         return ws_data.data_fn, station_info.station_fn
 
-    def read_data_file(self, data_fn=None, center_utm=None):
+    @timed()
+    def read_data_file(self, data_fn=None, center_utm=None, progress=None):
         """ Read ModEM data file
 
        inputs:
@@ -1351,6 +1376,9 @@ class Data(object):
         center_utm = option to provide real world coordinates of the center of
                      the grid for putting the data and model back into
                      utm/grid coordinates, format [east_0, north_0, z_0]
+        progress = function called as progress(percent, message) after each
+                   block of lines is read and each station is filled, it can
+                   raise an error to stop reading.
 
 
         Fills attributes:
@@ -1384,7 +1412,10 @@ class Data(object):
         read_impedance = False
         read_tipper = False
         inv_list = []
-        for dline in dlines:
+        for ii_line, dline in enumerate(dlines):
+            if progress is not None and ii_line % 1000 == 0:
+                progress(50. * ii_line / len(dlines),
+                         'Read {0} of {1} lines'.format(ii_line, len(dlines)))
             if dline.find('#') == 0:
                 header_list.append(dline.strip())
             elif dline.find('>') == 0:
@@ -1601,6 +1632,10 @@ class Data(object):
             self.data_array[ii]['tip_err'][:] = mt_obj.Tipper.tipper_err
             self.data_array[ii]['tip_inv_err'][:] = mt_obj.Tipper.tipper_err
 
+            if progress is not None:
+                progress(50. + 50. * (ii + 1) / ns,
+                         'Read station {0}'.format(s_key))
+
         
         # option to provide real world coordinates in eastings/northings
         # (ModEM data file contains real world center in lat/lon but projection
@@ -1774,52 +1809,59 @@ class Data(object):
         :return:
         """
 
-        # sx = self.station_locations.station_locations['rel_east']
-        # sy = self.station_locations.station_locations['rel_north']
-
-        # find index of each station on grid
-        station_index_x = []
-        station_index_y = []
-        for sname in self.station_locations.station_locations['station']:
-            ss = np.where(self.station_locations.station_locations['station'] == sname)[0][0]
-            # relative locations of stations
-            sx, sy = self.station_locations.station_locations['rel_east'][ss], \
-                     self.station_locations.station_locations['rel_north'][ss]
-            # indices of stations on model grid
-            sxi = np.where((sx <= model_object.grid_east[1:]) & (
-                sx > model_object.grid_east[:-1]))[0][0]
-            syi = np.where((sy <= model_object.grid_north[1:]) & (
-                sy > model_object.grid_north[:-1]))[0][0]
-
-            # first, check if there are any air cells
-            if np.any(model_object.res_model[syi, sxi] > 0.95 * air_resistivity):
-                szi = np.amin(
-                    np.where((model_object.res_model[syi, sxi] < 0.95 * air_resistivity))[0])
-            # otherwise place station at the top of the model
-            else:
-                szi = 0
-            
-            # get relevant grid point elevation
-            topoval = model_object.grid_z[szi]
-            
-            station_index_x.append(sxi)
-            station_index_y.append(syi)
-
-            # update elevation in station locations and data array, +1 m as
-            # data elevation needs to be below the topography (as advised by Naser)
-            # ====================== ====================================================
-            # The following line have been commented as
-            # self.db_array and elf.station_locations.station_locations['elev'][ss]
-            # point to same location
-            # ====================== ====================================================
-            # self.station_locations.station_locations['elev'][ss] = topoval + 0.1
-            self.data_array['rel_elev'][ss] = topoval + 0.001
-            
-            print('{0} at E={1}, N={2}, z={3}, model_z={4}'.format(sname,
-                                                                   sxi,
-                                                                   syi,
-                                                                   topoval,
-                                                                   self.data_array['rel_elev'][ss]))
+        station_locations = self.station_locations.station_locations
+
+        # row of each station, the first one if a name is repeated
+        snames, first_index, inverse = np.unique(station_locations['station'],
+                                                 return_index=True,
+                                                 return_inverse=True)
+        ss = first_index[inverse]
+
+        # indices of stations on model grid
+        station_index_x, station_index_y = mtmesh.get_station_grid_index(
+            model_object.grid_east,
+            model_object.grid_north,
+            station_locations['rel_east'][ss],
+            station_locations['rel_north'][ss])
+
+        outside = (station_index_x < 0) | \
+                  (station_index_x >= model_object.grid_east.size - 1) | \
+                  (station_index_y < 0) | \
+                  (station_index_y >= model_object.grid_north.size - 1)
+        if np.any(outside):
+            raise DataError('Stations {0} are outside the model grid'.format(
+                ', '.join(station_locations['station'][outside])))
+
+        # first non-air cell below each station, top of the model if there
+        # is no air
+        station_index_z = mtmesh.get_first_earth_index(model_object.res_model,
+                                                       station_index_x,
+                                                       station_index_y,
+                                                       air_resistivity=air_resistivity)
+
+        # get relevant grid point elevation
+        topoval = model_object.grid_z[station_index_z]
+
+        # update elevation in station locations and data array, +1 m as
+        # data elevation needs to be below the topography (as advised by Naser)
+        # ====================== ====================================================
+        # The following line have been commented as
+        # self.db_array and elf.station_locations.station_locations['elev'][ss]
+        # point to same location
+        # ====================== ====================================================
+        # self.station_locations.station_locations['elev'][ss] = topoval + 0.1
+        self.data_array['rel_elev'][ss] = topoval + 0.001
+
+        for sname, sxi, syi, topo, elev in zip(station_locations['station'],
+                                              station_index_x,
+                                              station_index_y,
+                                              topoval,
+                                              self.data_array['rel_elev'][ss]):
+            self._logger.debug('{0} at E={1}, N={2}, z={3}, model_z={4}'.format(
+                sname, sxi, syi, topo, elev))
+
+        station_index_x = list(station_index_x)
+        station_index_y = list(station_index_y)
 
         # BM: After applying topography, center point of grid becomes
         #  highest point of surface model.
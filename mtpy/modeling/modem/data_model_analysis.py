@@ -26,6 +26,7 @@ from matplotlib.ticker import MultipleLocator
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 from mtpy.modeling.modem import Data, Model
+from mtpy.utils.mesh_tools import get_station_grid_index
 from mtpy.utils.mtpylog import MtPyLog
 
 logger = MtPyLog.get_mtpy_logger(__name__)
@@ -115,14 +116,12 @@ class DataModelAnalysis(object):
         # get grid centres (finite element cells centres)
         gceast, gcnorth = [np.mean([arr[:-1], arr[1:]], axis=0) for arr in
                            [self.modObj.grid_east, self.modObj.grid_north]]
+        # index of the nearest cell centre to each station
+        ix_list, iy_list = get_station_grid_index(gceast, gcnorth, sX, sY,
+                                                  method='nearest')
         n_stations = len(sX)
         for n in range(n_stations):
-            xdist = np.abs(gceast - sX[n])
-            snos = np.where(xdist == np.amin(xdist))
-            ix = snos[0][0]
-            ydist = np.abs(gcnorth - sY[n])
-            snos = np.where(ydist == np.amin(ydist))
-            iy = snos[0][0]
+            ix, iy = ix_list[n], iy_list[n]
 
             logger.debug("Station Index: (%s, %s)", ix, iy)
 
@@ -24,6 +24,7 @@ import mtpy.utils.calculator as mtcc
 from mtpy.modeling import ws3dinv as ws
 from mtpy.utils import mesh_tools as mtmesh, gis_tools as gis_tools, filehandling as mtfh
 from mtpy.utils.mtpylog import MtPyLog
+from mtpy.utils.mtpy_decorator import timed
 from .exception import ModelError
 import mtpy.utils.gocad as mtgocad
 
@@ -647,11 +648,12 @@ class Model(object):
         self._logger.debug("gcz is the cells centre coordinates: %s, %s" %
                            (len(gcz), gcz))
 
-        # assign resistivity value
-        for j in range(len(self.res_model)):
-            for i in range(len(self.res_model[j])):
-                ii = np.where((gcz > top_surface[j, i]) & (gcz <= bottom_surface[j, i]))[0]
-                self.res_model[j, i, ii] = resistivity_value
+        # assign resistivity value to the cells between the surfaces in every
+        # (north, east) column at once
+        n_north, n_east = self.res_model.shape[:2]
+        top_surface = np.asarray(top_surface)[:n_north, :n_east, np.newaxis]
+        bottom_surface = np.asarray(bottom_surface)[:n_north, :n_east, np.newaxis]
+        self.res_model[(gcz > top_surface) & (gcz <= bottom_surface)] = resistivity_value
 
     def plot_mesh(self, east_limits=None, north_limits=None, z_limits=None,
                   **kwargs):
@@ -1074,6 +1076,7 @@ class Model(object):
         
         
         
+    @timed()
     def write_model_file(self, **kwargs):
         """
         will write an initial file for ModEM.
@@ -1223,6 +1226,7 @@ class Model(object):
 
         self._logger.info('Wrote file to: {0}'.format(self.model_fn))
 
+    @timed()
     def read_model_file(self, model_fn=None):
         """
         read an initial file and return the pertinent information including
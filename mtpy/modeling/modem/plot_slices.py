@@ -22,7 +22,7 @@ from mtpy.modeling.modem.data import Model
 from mtpy.utils import exceptions as mtex,basemap_tools
 from mtpy.utils.gis_tools import get_epsg,epsg_project
 from mtpy.utils.calculator import nearest_index
-from mtpy.utils.mesh_tools import rotate_mesh
+from mtpy.utils.mesh_tools import rotate_mesh, get_station_grid_index
 
 from mtpy.imaging.seismic import Segy, VelocityModel
 
@@ -1389,12 +1389,16 @@ class PlotSlices(object):
         self.station_dict_east = dict([(gx, []) for gx in self.grid_east])
         self.station_dict_north = dict([(gy, []) for gy in self.grid_north])
         if self.station_east is not None:
-            for ss, sx in enumerate(self.station_east):
-                gx = np.where(self.grid_east <= sx)[0][-1]
+            # last grid line at or below each station
+            gx_list, gy_list = get_station_grid_index(self.grid_east,
+                                                      self.grid_north,
+                                                      self.station_east,
+                                                      self.station_north,
+                                                      method='right')
+            for ss, gx in enumerate(gx_list):
                 self.station_dict_east[self.grid_east[gx]].append(self.station_north[ss])
 
-            for ss, sy in enumerate(self.station_north):
-                gy = np.where(self.grid_north <= sy)[0][-1]
+            for ss, gy in enumerate(gy_list):
                 self.station_dict_north[self.grid_north[gy]].append(self.station_east[ss])
         else:
             return
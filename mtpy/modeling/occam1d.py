@@ -74,6 +74,7 @@ import mtpy.analysis.geometry as mtg
 import matplotlib.pyplot as plt
 import subprocess
 import string
+from concurrent.futures import ProcessPoolExecutor
 
 
 # ------------------------------------------------------------------------------
@@ -2518,6 +2519,9 @@ def parse_arguments(arguments):
     parser.add_argument('-s', '--master_savepath',
                         help='master directory to save suite of runs into',
                         default='inversion_suite')
+    parser.add_argument('-np', '--n_processes',
+                        help='number of stations to run at the same time',
+                        type=int, default=1)
 
     args = parser.parse_args(arguments)
     args.working_directory = os.path.abspath(args.working_directory)
@@ -2669,9 +2673,138 @@ def divide_inputs(work_to_do, size):
     return chunks
 
 
+def run_station(program_location, wd, startup_list, rms_factor=1.05,
+                rms_min=1.0, iteration_max=100, start_rho=100):
+    """
+    run Occam1D for each startup file in a station directory.
+
+    Occam is run twice for each mode. First to get the lowest possible
+    misfit, then with the target rms set to rms_factor times the minimum rms
+    achieved to get the smoothest model. The executable is started with
+    wd as its working directory, so the calling process does not change
+    directory and several stations can be run at the same time.
+
+    Arguments:
+    ----------
+        **program_location** : full path to the Occam1D executable
+
+        **wd** : full path to the station directory
+
+        **startup_list** : list of startup file names (basenames) in wd,
+                           named OccamStartup1D + mode
+
+        **rms_factor** : factor to multiply the minimum rms by to get the
+                         target rms for the second run. *default* is 1.05
+
+        **rms_min** : minimum target rms for the second run. *default* is 1.0
+
+        **iteration_max** : maximum number of iterations. *default* is 100
+
+        **start_rho** : starting resistivity. *default* is 100
+
+    Returns:
+    --------
+        **return_codes** : dictionary keyed by mode with a list of the
+                           return codes of the runs made for that mode
+    """
+    return_codes = {}
+    for startupfile in startup_list:
+        # define some parameters
+        mode = startupfile[14:]
+        iterstring = 'RMSmin' + mode
+        # run for minimum rms
+        return_codes[mode] = [subprocess.call([program_location,
+                                               startupfile,
+                                               iterstring],
+                                              cwd=wd)]
+        # read the iter file to get minimum rms
+        iterfilelist = [ff for ff in os.listdir(wd)
+                        if (ff.startswith(iterstring) and ff.endswith('.iter'))]
+        # only run a second lot of inversions if the first produced outputs
+        if len(iterfilelist) > 0:
+            iterfile = max(iterfilelist)
+            startup = Startup()
+            startup.read_startup_file(op.join(wd, iterfile))
+            # create a new startup file the same as the previous one but target rms is factor*minimum_rms
+            target_rms = float(startup.misfit_value) * rms_factor
+            if target_rms < rms_min:
+                target_rms = rms_min
+            startupnew = Startup(data_fn=op.join(wd, startup.data_file),
+                                 model_fn=op.join(wd, startup.model_file),
+                                 max_iter=iteration_max,
+                                 start_rho=start_rho,
+                                 target_rms=target_rms)
+            startupnew.write_startup_file(startup_fn=op.join(wd, startupfile), save_path=wd)
+            # run occam again
+            return_codes[mode].append(subprocess.call([program_location,
+                                                       startupfile,
+                                                       'Smooth' + mode],
+                                                      cwd=wd))
+
+    return return_codes
+
+
+def run_inversions(master_wkdir, run_directories, program_location,
+                   n_processes=1, **kwargs):
+    """
+    run the two stage Occam1D inversion (see run_station) for a suite of
+    station directories, using a pool of n_processes local processes.
+
+    Each station directory is one task, so the minimum rms and smooth runs
+    of a station always happen in order, while different stations run
+    concurrently.
+
+    Arguments:
+    ----------
+        **master_wkdir** : directory containing the station directories
+
+        **run_directories** : dictionary keyed by station directory name
+                              with a list of startup files to run, as
+                              returned by generate_inputfiles
+
+        **program_location** : full path to the Occam1D executable
+
+        **n_processes** : number of processes to run at once, if 1 the
+                          stations are run in series. *default* is 1
+
+        **kwargs** : rms_factor, rms_min, iteration_max and start_rho
+                     passed on to run_station
+
+    Returns:
+    --------
+        **return_codes** : dictionary keyed by station directory name with
+                           the return codes from run_station
+    """
+    station_kwargs = dict([(key, kwargs[key]) for key in
+                           ['rms_factor', 'rms_min', 'iteration_max',
+                            'start_rho'] if key in kwargs])
+
+    return_codes = {}
+    if n_processes is None or n_processes <= 1:
+        for rundir in list(run_directories.keys()):
+            return_codes[rundir] = run_station(program_location,
+                                               op.join(master_wkdir, rundir),
+                                               run_directories[rundir],
+                                               **station_kwargs)
+        return return_codes
+
+    with ProcessPoolExecutor(max_workers=n_processes) as executor:
+        futures = dict([(rundir, executor.submit(run_station,
+                                                 program_location,
+                                                 op.join(master_wkdir, rundir),
+                                                 run_directories[rundir],
+                                                 **station_kwargs))
+                        for rundir in list(run_directories.keys())])
+        for rundir in list(futures.keys()):
+            return_codes[rundir] = futures[rundir].result()
+
+    return return_codes
+
+
 def build_run():
     """
-    build input files and run a suite of models in series (pretty quick so won't bother parallelise)
+    build input files and run a suite of models, running n_processes
+    stations at once (set with -np on the command line, default is 1).
 
     run Occam1d on each set of inputs.
     Occam is run twice. First to get the lowest possible misfit.
@@ -2680,8 +2813,6 @@ def build_run():
 
     author: Alison Kirkby (2016)
     """
-    # from mpi4py import MPI
-
     # get command line arguments as a dictionary
     input_parameters = update_inputs()
 
@@ -2689,41 +2820,13 @@ def build_run():
     master_wkdir, run_directories = generate_inputfiles(**input_parameters)
 
     # run Occam1d on each set of inputs.
-    # Occam is run twice. First to get the lowest possible misfit.
-    # we then set the target rms to a factor (default 1.05) times the minimum rms achieved
-    # and run to get the smoothest model.
-    for rundir in list(run_directories.keys()):
-        wd = op.join(master_wkdir, rundir)
-        os.chdir(wd)
-        for startupfile in run_directories[rundir]:
-            # define some parameters
-            mode = startupfile[14:]
-            iterstring = 'RMSmin' + mode
-            # run for minimum rms
-            subprocess.call([input_parameters['program_location'],
-                             startupfile,
-                             iterstring])
-            # read the iter file to get minimum rms
-            iterfilelist = [ff for ff in os.listdir(wd) if (ff.startswith(iterstring) and ff.endswith('.iter'))]
-            # only run a second lot of inversions if the first produced outputs
-            if len(iterfilelist) > 0:
-                iterfile = max(iterfilelist)
-                startup = Startup()
-                startup.read_startup_file(op.join(wd, iterfile))
-                # create a new startup file the same as the previous one but target rms is factor*minimum_rms
-                target_rms = float(startup.misfit_value) * input_parameters['rms_factor']
-                if target_rms < input_parameters['rms_min']:
-                    target_rms = input_parameters['rms_min']
-                startupnew = Startup(data_fn=op.join(wd, startup.data_file),
-                                     model_fn=op.join(wd, startup.model_file),
-                                     max_iter=input_parameters['iteration_max'],
-                                     start_rho=input_parameters['start_rho'],
-                                     target_rms=target_rms)
-                startupnew.write_startup_file(startup_fn=op.join(wd, startupfile), save_path=wd)
-                # run occam again
-                subprocess.call([input_parameters['program_location'],
-                                 startupfile,
-                                 'Smooth' + mode])
+    run_inversions(master_wkdir, run_directories,
+                   input_parameters['program_location'],
+                   n_processes=input_parameters['n_processes'],
+                   rms_factor=input_parameters['rms_factor'],
+                   rms_min=input_parameters['rms_min'],
+                   iteration_max=input_parameters['iteration_max'],
+                   start_rho=input_parameters['start_rho'])
 
 
 if __name__ == '__main__':
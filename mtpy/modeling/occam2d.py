@@ -50,6 +50,7 @@ from mtpy.imaging.mtplottools import plot_errorbar
 import mtpy.utils.calculator as mtcc
 import mtpy.utils.mesh_tools as mtmesh
 from mtpy.utils import gis_tools
+from mtpy.utils.mtpy_decorator import timed
 
 
 # ==============================================================================
@@ -2038,6 +2039,13 @@ class Startup(object):
 
 
 # ------------------------------------------------------------------------------
+def _max_array(a, b):
+    """
+    element wise max(a, b), keeping a where b is nan as the builtin max does
+    """
+    return np.where(b > a, b, a)
+
+
 class Data(Profile):
     """
     Reads and writes data files and more.  
@@ -2133,6 +2141,7 @@ class Data(Profile):
     _fill_data                  fills the data array that is described above    
     _get_data_list              gets the lines to write to data file
     _get_frequencies            gets frequency list to invert for 
+    _get_station_arrays         stacks all stations onto the frequency list
     get_profile_origin          get profile origin in UTM coordinates
     mask_points                 masks points in data picked from 
                                 plot_mask_points  
@@ -2229,6 +2238,7 @@ class Data(Profile):
         self._data_header = '{0:<6}{1:<6}{2:<6} {3:<8} {4:<8}\n'.format(
             'SITE', 'FREQ', 'TYPE', 'DATUM', 'ERROR')
 
+    @timed()
     def read_data_file(self, data_fn=None):
         """
         Read in an existing data file and populate appropriate attributes
@@ -2425,6 +2435,99 @@ class Data(Profile):
                     indices -= 1
                 self.freq = self.freq[indices]
 
+    def _get_station_arrays(self):
+        """
+        Stack the TE and TM impedance and the tipper along the profile of
+        every station onto the frequencies to invert for.
+
+        Stations are interpolated all at once, or with freq_tol set the
+        closest station frequency within the tolerance is used.
+
+        :returns: freq np.ndarray(num_station, num_freq) of the frequency
+                  each value was measured at, z np.ndarray(num_station,
+                  num_freq, 2) of Zxy and Zyx, z_err, tipper
+                  np.ndarray(num_station, num_freq) of Ty, tipper_err and
+                  np.ndarray(num_station, num_freq) of bool True where the
+                  station has data
+        """
+        ns = len(self.edi_list)
+        n_max = max([edi.Z.freq.size for edi in self.edi_list])
+
+        # stack every station, padded to a common number of frequencies
+        station_freq = np.full((ns, n_max), np.nan)
+        tipper_freq = np.full((ns, n_max), np.nan)
+        z = np.zeros((ns, n_max, 2), dtype=complex)
+        z_err = np.zeros((ns, n_max, 2))
+        tipper = np.zeros((ns, n_max), dtype=complex)
+        tipper_err = np.zeros((ns, n_max))
+        has_tipper = np.zeros(ns, dtype=bool)
+        for ii, edi in enumerate(self.edi_list):
+            nf_ii = edi.Z.freq.size
+            station_freq[ii, :nf_ii] = edi.Z.freq
+            z[ii, :nf_ii, 0] = edi.Z.z[:, 0, 1]
+            z[ii, :nf_ii, 1] = edi.Z.z[:, 1, 0]
+            if edi.Z.z_err is not None:
+                z_err[ii, :nf_ii, 0] = edi.Z.z_err[:, 0, 1]
+                z_err[ii, :nf_ii, 1] = edi.Z.z_err[:, 1, 0]
+            if edi.Tipper.tipper is not None:
+                has_tipper[ii] = True
+                nt_ii = edi.Tipper.tipper.shape[0]
+                tipper_freq[ii, :nt_ii] = edi.Tipper.freq
+                tipper[ii, :nt_ii] = edi.Tipper.tipper[:, 0, 1]
+                if edi.Tipper.tipper_err is not None:
+                    tipper_err[ii, :nt_ii] = edi.Tipper.tipper_err[:, 0, 1]
+
+        with np.errstate(invalid='ignore'):
+            if self.freq_tol is None:
+                # every frequency within the range of the station
+                valid = (self.freq >= np.nanmin(station_freq, axis=1)[:, np.newaxis]) & \
+                        (self.freq <= np.nanmax(station_freq, axis=1)[:, np.newaxis])
+                freq = np.repeat(self.freq[np.newaxis, :], ns, axis=0)
+
+                # interpolate the non-zero values of each component,
+                # zero outside the range of each component
+                z_rows = z.transpose(0, 2, 1).reshape(2 * ns, n_max)
+                z_rows[z_rows == 0] = np.nan
+                z_freq = np.where(np.isnan(z_rows), np.nan,
+                                  np.repeat(station_freq, 2, axis=0))
+                z_err_rows = z_err.transpose(0, 2, 1).reshape(2 * ns, n_max)
+                tipper[tipper == 0] = np.nan
+                tipper_freq[np.isnan(tipper)] = np.nan
+
+                z = mtcc.interpolate_rows(z_freq, z_rows, self.freq)
+                z_err = mtcc.interpolate_rows(z_freq, z_err_rows, self.freq)
+                z = z.reshape(ns, 2, -1).transpose(0, 2, 1)
+                z_err = z_err.reshape(ns, 2, -1).transpose(0, 2, 1)
+                tipper_err = mtcc.interpolate_rows(tipper_freq, tipper_err,
+                                                   self.freq)
+                tipper = mtcc.interpolate_rows(tipper_freq, tipper, self.freq)
+                has_tipper[:] = True
+            else:
+                # closest station frequency within the tolerance
+                s_freq = station_freq[:, :, np.newaxis]
+                within = (s_freq >= self.freq * (1 - self.freq_tol)) & \
+                         (s_freq <= self.freq * (1 + self.freq_tol))
+                f_index = np.argmin(np.where(within, np.abs(s_freq - self.freq),
+                                             np.inf), axis=1)
+                valid = np.any(within, axis=1)
+
+                rows = np.arange(ns)[:, np.newaxis]
+                freq = station_freq[rows, f_index]
+                z = z[rows, f_index]
+                z_err = z_err[rows, f_index]
+                tipper = tipper[rows, f_index]
+                tipper_err = tipper_err[rows, f_index]
+                freq = np.where(valid, freq, self.freq)
+
+        valid_z = valid[:, :, np.newaxis]
+        z = np.where(valid_z, np.nan_to_num(z), 0)
+        z_err = np.where(valid_z, np.nan_to_num(z_err), 0)
+        tip_valid = valid & has_tipper[:, np.newaxis]
+        tipper = np.where(tip_valid, np.nan_to_num(tipper), 0)
+        tipper_err = np.where(tip_valid, np.nan_to_num(tipper_err), 0)
+
+        return freq, z, z_err, tipper, tipper_err, valid, tip_valid
+
     def _fill_data(self):
         """
         Read all Edi files. 
@@ -2446,286 +2549,113 @@ class Data(Profile):
         # --> get frequencies to invert for
         self._get_frequencies()
 
-        # set zero array size the first row will be the data and second the error
-        asize = (2, self.freq.shape[0])
-
-        # make a list of dictionaries for each station.
-        self.data = [{'station': station,
-                      'offset': offset,
-                      'te_phase': np.zeros(asize),
-                      'tm_phase': np.zeros(asize),
-                      're_tip': np.zeros(asize),
-                      'im_tip': np.zeros(asize),
-                      'te_res': np.zeros(asize),
-                      'tm_res': np.zeros(asize)}
-                     for station, offset in zip(self.station_list,
-                                                self.station_locations)]
-
-        # loop over mt object in edi_list and use a counter starting at 1
-        # because that is what occam starts at.
-        for s_index, edi in enumerate(self.edi_list):
-            station_freq = edi.Z.freq
-            interp_freq = self.freq[np.where((self.freq >= station_freq.min()) &
-                                             (self.freq <= station_freq.max()))] 
-            if self.freq_tol is None:
-               
-
-                # interpolate data onto given frequency list
-                z_interp, t_interp = edi.interpolate(interp_freq)
-                #                z_interp._compute_res_phase()
-                z_interp.compute_resistivity_phase()
-
-                rho = z_interp.resistivity
-                phi = z_interp.phase
-                rho_err = z_interp.resistivity_err
-                if t_interp is not None:
-                    tipper = t_interp.tipper
-                    tipper_err = t_interp.tipper_err
-                else:
-                    tipper = None
-                    tipper_err = None
-            else:
-                rho = edi.Z.resistivity
-                rho_err = edi.Z.resistivity_err
-                phi = edi.Z.phase
-                tipper = edi.Tipper.tipper
-                tipper_err = edi.Tipper.tipper_err
-
-            self.data[s_index]['station'] = edi.station
-            self.data[s_index]['offset'] = edi.offset
-
-            for freq_num, frequency in enumerate(self.freq):
-                if self.freq_tol is not None:
-                    try:
-                        # list of indices within tolerance
-                        f_index_list = np.where((station_freq >= frequency * (1 - self.freq_tol)) &
-                                                (station_freq <= frequency * (1 + self.freq_tol)))[0]
-                        # closest frequency
-                        diff = np.abs(station_freq[f_index_list] - frequency)
-                        f_index = f_index_list[np.where(diff==np.amin(diff))]
-
-                    except ValueError:
-                        f_index = None
-                else:
-                    # skip, if the listed frequency is not available for the station
-                    if (frequency in interp_freq):
-                        # find the respective frequency index for the station
-                        f_index = np.abs(interp_freq - frequency).argmin()
-                    else:
-                        f_index = None
-
-                if f_index == None:
-                    continue
-
-                # --> get te resistivity
-                self.data[s_index]['te_res'][0, freq_num] = rho[f_index, 0, 1]
-                # compute error
-                if rho[f_index, 0, 1] != 0.0:
-                    # --> get error from data
-                    if self.res_te_err is None:
-                        self.data[s_index]['te_res'][1, freq_num] = \
-                            np.abs(rho_err[f_index, 0, 1])
-                    # --> set generic error floor
-                    elif self.error_type == 'floor':
-                        self.data[s_index]['te_res'][1, freq_num] = \
-                            max(rho[f_index, 0, 1]*self.res_te_err/100.,
-                                rho_err[f_index, 0, 1])
-                    else:
-                        self.data[s_index]['te_res'][1, freq_num] = \
-                        rho[f_index, 0, 1]*self.res_te_err/100.
-
-                # --> get tm resistivity
-                self.data[s_index]['tm_res'][0, freq_num] = rho[f_index, 1, 0]
-                # compute error
-                if rho[f_index, 1, 0] != 0.0:
-                    # --> get error from data
-                    if self.res_tm_err is None:
-                        self.data[s_index]['tm_res'][1, freq_num] = \
-                            np.abs(rho_err[f_index, 1, 0])
-                    # --> set generic error floor
-                    elif self.error_type == 'floor':
-                        self.data[s_index]['tm_res'][1, freq_num] = \
-                            max(rho[f_index, 1, 0]*self.res_tm_err / 100.,
-                                rho_err[f_index, 1, 0])
-                    else:
-                        self.data[s_index]['tm_res'][1, freq_num] = \
-                        rho[f_index, 1, 0]*self.res_tm_err / 100.
-
-                # --> get te phase
-                phase_te = phi[f_index, 0, 1]
-                # be sure the phase is in the first quadrant
-                if phase_te > 180:
-                    phase_te -= 180
-                # remove any remaining phase values that are out of the first
-                # quadrant
-                if ((phase_te > 90) or (phase_te < 0)):
-                    phase_te = 0.
-
-                self.data[s_index]['te_phase'][0, freq_num] = phase_te
-                # compute error
-                # if phi[f_index, 0, 1] != 0.0:
-                # --> get error from data
-                phase_te_errorval = \
-                np.degrees(np.arcsin(.5 *
-                                     self.data[s_index]['te_res'][1, freq_num]/\
-                                     self.data[s_index]['te_res'][0, freq_num]))
-                if self.phase_te_err is None:
-                    self.data[s_index]['te_phase'][1, freq_num] =\
-                    phase_te_errorval
+        # stack all stations, the first row will be the data and second the
+        # error
+        freq, z, z_err, tipper, tipper_err, valid, tip_valid = \
+            self._get_station_arrays()
+        ns = valid.shape[0]
+        data_array = dict([(key, np.zeros((ns, 2, self.freq.shape[0])))
+                           for key in ['te_phase', 'tm_phase', 're_tip',
+                                       'im_tip', 'te_res', 'tm_res']])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rho = np.abs(z) ** 2 / freq[:, :, np.newaxis] * 0.2
+            rho_err = rho * (2. * (z_err / np.abs(z)))
+            phi = np.rad2deg(np.angle(z))
+
+            for index, res_key, res_err in [(0, 'te_res', self.res_te_err),
+                                            (1, 'tm_res', self.res_tm_err)]:
+                # --> get resistivity and error
+                data_array[res_key][:, 0] = rho[:, :, index]
+                if res_err is None:
+                    error = np.abs(rho_err[:, :, index])
                 # --> set generic error floor
                 elif self.error_type == 'floor':
-                    self.data[s_index]['te_phase'][1, freq_num] = \
-                        max((self.phase_te_err / 100.) * 57. / 2.,
-                            phase_te_errorval)
+                    error = _max_array(rho[:, :, index] * res_err / 100.,
+                                       rho_err[:, :, index])
                 else:
-                    self.data[s_index]['te_phase'][1, freq_num] = \
-                    (self.phase_te_err / 100.) * 57. / 2.
-                # --> get tm phase and be sure its in the first quadrant
-                phase_tm = phi[f_index, 1, 0] % 180            
-
+                    error = rho[:, :, index] * res_err / 100.
+                data_array[res_key][:, 1] = np.where(rho[:, :, index] != 0.0,
+                                                     error, 0)
+
+            # --> get te phase, be sure the phase is in the first quadrant
+            phase_te = phi[:, :, 0]
+            phase_te = np.where(phase_te > 180, phase_te - 180, phase_te)
+            # --> get tm phase and be sure its in the first quadrant
+            phase_tm = phi[:, :, 1] % 180
+
+            for phase, phase_key, res_key, phase_err in \
+                    [(phase_te, 'te_phase', 'te_res', self.phase_te_err),
+                     (phase_tm, 'tm_phase', 'tm_res', self.phase_tm_err)]:
                 # remove any remaining phase values that are out of the first
                 # quadrant
-                if ((phase_tm > 90) or (phase_tm < 0)):
-                    phase_tm = 0.
-                
+                phase[(phase > 90) | (phase < 0)] = 0.
+                data_array[phase_key][:, 0] = np.where(valid, phase, 0)
 
-                self.data[s_index]['tm_phase'][0, freq_num] = phase_tm
-                # compute error
-                # if phi[f_index, 1, 0] != 0.0:
                 # --> get error from data
-                phase_tm_errorval = \
-                np.degrees(np.arcsin(.5 *
-                                     self.data[s_index]['tm_res'][1, freq_num]/\
-                                     self.data[s_index]['tm_res'][0, freq_num]))
-                if self.phase_tm_err is None:
-                    self.data[s_index]['tm_phase'][1, freq_num] = \
-                        phase_tm_errorval
+                phase_errorval = np.degrees(np.arcsin(
+                    .5 * data_array[res_key][:, 1] / data_array[res_key][:, 0]))
+                if phase_err is None:
+                    error = phase_errorval
                 # --> set generic error floor
                 elif self.error_type == 'floor':
-                    self.data[s_index]['tm_phase'][1, freq_num] = \
-                        max((self.phase_tm_err / 100.) * 57. / 2.,
-                            phase_tm_errorval)
+                    error = _max_array((phase_err / 100.) * 57. / 2.,
+                                       phase_errorval)
                 else:
-                    self.data[s_index]['tm_phase'][1, freq_num] = \
-                    (self.phase_tm_err / 100.) * 57. / 2.
-                # --> get Tipper
-                if tipper is not None:
-                    self.data[s_index]['re_tip'][0, freq_num] = \
-                        tipper[f_index, 0, 1].real
-                    self.data[s_index]['im_tip'][0, freq_num] = \
-                        tipper[f_index, 0, 1].imag
-
-                    # get error
-                    if self.tipper_err is not None:
-                        self.data[s_index]['re_tip'][1, freq_num] = \
-                            self.tipper_err / 100.
-                        self.data[s_index]['im_tip'][1, freq_num] = \
-                            self.tipper_err / 100.
-                    else:
-                        self.data[s_index]['re_tip'][1, freq_num] = \
-                            tipper[f_index, 0, 1].real / tipper_err[f_index, 0, 1]
-                        self.data[s_index]['im_tip'][1, freq_num] = \
-                            tipper[f_index, 0, 1].imag / tipper_err[f_index, 0, 1]
+                    error = (phase_err / 100.) * 57. / 2.
+                data_array[phase_key][:, 1] = np.where(valid, error, 0)
+
+            # --> get Tipper and error
+            for tip_key, tip in [('re_tip', tipper.real),
+                                 ('im_tip', tipper.imag)]:
+                data_array[tip_key][:, 0] = tip
+                if self.tipper_err is not None:
+                    error = self.tipper_err / 100.
+                else:
+                    error = tip / tipper_err
+                data_array[tip_key][:, 1] = np.where(tip_valid, error, 0)
+
+        # make a list of dictionaries for each station.
+        self.data = [dict([('station', edi.station), ('offset', edi.offset)] +
+                          [(key, data_array[key][s_index])
+                           for key in data_array.keys()])
+                     for s_index, edi in enumerate(self.edi_list)]
 
     def _get_data_list(self):
         """
         Get all the data needed to write a data file.
         
         """
-        self.data_list = []
-        for ss, sdict in enumerate(self.data, 1):
-            for ff in range(self.freq.shape[0]):
-                for mmode in self.mode_dict[self.model_mode]:
-                    # log(te_res)
-                    if mmode == 1:
-                        if sdict['te_res'][0, ff] != 0.0:
-                            dvalue = np.log10(sdict['te_res'][0, ff])
-                            derror = sdict['te_res'][1, ff]/\
-                                     (sdict['te_res'][0,ff] * np.log(10))
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # te_res
-                    if mmode == 9:
-                        if sdict['te_res'][0, ff] != 0.0:
-                            dvalue = sdict['te_res'][0, ff]
-                            derror = sdict['te_res'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # te_phase
-                    if mmode == 2:
-                        if sdict['te_phase'][0, ff] != 0.0:
-                            dvalue = sdict['te_phase'][0, ff]
-                            derror = sdict['te_phase'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                            # log(tm_res)
-                    if mmode == 5:
-                        if sdict['tm_res'][0, ff] != 0.0:
-                            dvalue = np.log10(sdict['tm_res'][0, ff])
-                            derror = sdict['tm_res'][1, ff] /\
-                                     (sdict['tm_res'][0, ff]*np.log(10))
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # tm_res
-                    if mmode == 10:
-                        if sdict['tm_res'][0, ff] != 0.0:
-                            dvalue = sdict['tm_res'][0, ff]
-                            derror = sdict['tm_res'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # tm_phase
-                    if mmode == 6:
-                        if sdict['tm_phase'][0, ff] != 0.0:
-                            dvalue = sdict['tm_phase'][0, ff]
-                            derror = sdict['tm_phase'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # Re_tip
-                    if mmode == 3:
-                        if sdict['re_tip'][0, ff] != 0.0:
-                            dvalue = sdict['re_tip'][0, ff]
-                            derror = sdict['re_tip'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
-                    # Im_tip
-                    if mmode == 4:
-                        if sdict['im_tip'][0, ff] != 0.0:
-                            dvalue = sdict['im_tip'][0, ff]
-                            derror = sdict['im_tip'][1, ff]
-                            dstr = '{0:.4f}'.format(dvalue)
-                            derrstr = '{0:.4f}'.format(derror)
-                            line = self._data_string.format(ss, ff + 1, mmode,
-                                                            dstr, derrstr)
-                            self.data_list.append(line)
-
+        mode_list = self.mode_dict[self.model_mode]
+        data_shape = (len(self.data), self.freq.shape[0], len(mode_list))
+        value = np.zeros(data_shape)
+        error = np.zeros(data_shape)
+        has_data = np.zeros(data_shape, dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for mm, mmode in enumerate(mode_list):
+                # log(te_res) is filled from te_res, etc.
+                key = self.occam_dict[str(mmode)].replace('log_', '')
+                mdata = np.array([sdict[key] for sdict in self.data])
+                has_data[:, :, mm] = mdata[:, 0] != 0.0
+                if mmode in [1, 5]:
+                    value[:, :, mm] = np.log10(mdata[:, 0])
+                    error[:, :, mm] = mdata[:, 1] / (mdata[:, 0] * np.log(10))
+                else:
+                    value[:, :, mm] = mdata[:, 0]
+                    error[:, :, mm] = mdata[:, 1]
+
+        # one line per station, frequency and mode in that order
+        s_index, f_index, m_index = np.nonzero(has_data)
+        self.data_list = [
+            self._data_string.format(ss, ff, mmode, '{0:.4f}'.format(dvalue),
+                                     '{0:.4f}'.format(derror))
+            for ss, ff, mmode, dvalue, derror in
+            zip((s_index + 1).tolist(), (f_index + 1).tolist(),
+                np.array(mode_list)[m_index].tolist(),
+                value[has_data].tolist(), error[has_data].tolist())]
+
+    @timed()
     def write_data_file(self, data_fn=None):
         """
         Write a data file.
@@ -2801,9 +2731,9 @@ class Data(Profile):
         data_lines.append(self._data_header)
         data_lines += self.data_list
 
-        dfid = open(self.data_fn, 'w')
-        dfid.writelines(data_lines)
-        dfid.close()
+        # write the whole file in one go
+        with open(self.data_fn, 'w') as dfid:
+            dfid.write(''.join(data_lines))
 
         print('Wrote Occam2D data file to {0}'.format(self.data_fn))
 
@@ -3158,6 +3088,7 @@ class Model(Startup):
         self.mesh_x = None
         self.mesh_z = None
 
+    @timed()
     def read_iter_file(self, iter_fn=None):
         """
         Read an iteration file.
@@ -3182,7 +3113,7 @@ class Model(Startup):
         """
 
         if iter_fn is not None:
-            self.iter_fn == iter_fn
+            self.iter_fn = iter_fn
 
         if self.iter_fn is None:
             raise OccamInputError('iter_fn is None, input iteration file')
@@ -3218,16 +3149,10 @@ class Model(Startup):
         value = int(iline[1].strip())
         setattr(self, key, value)
 
+        # the model values are the rest of the file, parse them in one go
+        model_values = np.array(''.join(ilines[ii + 1:]).split(), dtype='float')
         self.model_values = np.zeros(self.param_count)
-        kk = int(ii + 1)
-
-        jj = 0
-        mv_index = 0
-        while jj < len(ilines) - kk:
-            iline = np.array(ilines[jj + kk].strip().split(), dtype='float')
-            self.model_values[mv_index:mv_index + iline.shape[0]] = iline
-            jj += 1
-            mv_index += iline.shape[0]
+        self.model_values[:model_values.shape[0]] = model_values
 
         # make sure data file is full path
         if os.path.isfile(self.data_fn) == False:
@@ -3279,32 +3204,25 @@ class Model(Startup):
         # read in the model and set the regularization block values to map onto
         # the FE mesh so that the model can be plotted as an image or regular
         # mesh.
-        mm = 0
-        for ii in range(len(r1.model_rows)):
-            # get the number of layers to combine
-            # this index will be the first index in the vertical direction
-            ny1 = r1.model_rows[:ii, 0].sum()
-            # the second index  in the vertical direction
-            ny2 = ny1 + r1.model_rows[ii][0]
-            # make the list of amalgamated columns an array for ease
-            lc = np.array(r1.model_columns[ii])
-            # loop over the number of amalgamated blocks
-            for jj in range(len(r1.model_columns[ii])):
-                # get first in index in the horizontal direction
-                nx1 = lc[:jj].sum()
-                # get second index in horizontal direction
-                nx2 = nx1 + lc[jj]
-                # put the apporpriate resistivity value into all the amalgamated
-                # model blocks of the regularization grid into the forward model
-                # grid
-                self.res_model[ny1:ny2, nx1:nx2] = self.model_values[mm]
-                mm += 1
+        # first and last mesh layer of each row of regularization blocks
+        ny2 = np.cumsum(r1.model_rows[:, 0])
+        ny1 = ny2 - r1.model_rows[:, 0]
+        # index of the first model value in each row
+        mm = np.cumsum([0] + [len(lc) for lc in r1.model_columns])
+        # index of the model value of each mesh cell, -1 if not in the model
+        nx = self.res_model.shape[1]
+        model_index = np.full(self.res_model.shape, -1, dtype=int)
+        for ii, lc in enumerate(r1.model_columns):
+            # each amalgamated block spans lc[jj] mesh columns
+            block_index = np.repeat(np.arange(len(lc)), lc)[:nx]
+            model_index[ny1[ii]:ny2[ii], :block_index.shape[0]] = \
+                mm[ii] + block_index
+        self.res_model[model_index >= 0] = \
+            self.model_values[model_index[model_index >= 0]]
 
         # make some arrays for plotting the model
-        self.plot_x = np.array([r1.x_nodes[:ii + 1].sum()
-                                for ii in range(len(r1.x_nodes))])
-        self.plot_z = np.array([r1.z_nodes[:ii + 1].sum()
-                                for ii in range(len(r1.z_nodes))])
+        self.plot_x = np.cumsum(r1.x_nodes)
+        self.plot_z = np.cumsum(r1.z_nodes)
 
         # center the grid onto the station coordinates
         x0 = bndgoff - self.plot_x[r1.model_columns[0][0]]
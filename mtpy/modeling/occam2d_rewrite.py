@@ -3229,16 +3229,10 @@ class Model(Startup):
         value = int(iline[1].strip())
         setattr(self, key, value)
 
+        # the model values are the rest of the file, parse them in one go
+        model_values = np.array(''.join(ilines[ii + 1:]).split(), dtype='float')
         self.model_values = np.zeros(self.param_count)
-        kk = int(ii + 1)
-
-        jj = 0
-        mv_index = 0
-        while jj < len(ilines) - kk:
-            iline = np.array(ilines[jj + kk].strip().split(), dtype='float')
-            self.model_values[mv_index:mv_index + iline.shape[0]] = iline
-            jj += 1
-            mv_index += iline.shape[0]
+        self.model_values[:model_values.shape[0]] = model_values
 
         # make sure data file is full path
         if os.path.isfile(self.data_fn) == False:
@@ -3289,32 +3283,25 @@ class Model(Startup):
         # read in the model and set the regularization block values to map onto
         # the FE mesh so that the model can be plotted as an image or regular
         # mesh.
-        mm = 0
-        for ii in range(len(r1.model_rows)):
-            # get the number of layers to combine
-            # this index will be the first index in the vertical direction
-            ny1 = r1.model_rows[:ii, 0].sum()
-            # the second index  in the vertical direction
-            ny2 = ny1 + r1.model_rows[ii][0]
-            # make the list of amalgamated columns an array for ease
-            lc = np.array(r1.model_columns[ii])
-            # loop over the number of amalgamated blocks
-            for jj in range(len(r1.model_columns[ii])):
-                # get first in index in the horizontal direction
-                nx1 = lc[:jj].sum()
-                # get second index in horizontal direction
-                nx2 = nx1 + lc[jj]
-                # put the apporpriate resistivity value into all the amalgamated
-                # model blocks of the regularization grid into the forward model
-                # grid
-                self.res_model[ny1:ny2, nx1:nx2] = self.model_values[mm]
-                mm += 1
+        # first and last mesh layer of each row of regularization blocks
+        ny2 = np.cumsum(r1.model_rows[:, 0])
+        ny1 = ny2 - r1.model_rows[:, 0]
+        # index of the first model value in each row
+        mm = np.cumsum([0] + [len(lc) for lc in r1.model_columns])
+        # index of the model value of each mesh cell, -1 if not in the model
+        nx = self.res_model.shape[1]
+        model_index = np.full(self.res_model.shape, -1, dtype=int)
+        for ii, lc in enumerate(r1.model_columns):
+            # each amalgamated block spans lc[jj] mesh columns
+            block_index = np.repeat(np.arange(len(lc)), lc)[:nx]
+            model_index[ny1[ii]:ny2[ii], :block_index.shape[0]] = \
+                mm[ii] + block_index
+        self.res_model[model_index >= 0] = \
+            self.model_values[model_index[model_index >= 0]]
 
         # make some arrays for plotting the model
-        self.plot_x = np.array([r1.x_nodes[:ii + 1].sum()
-                                for ii in range(len(r1.x_nodes))])
-        self.plot_z = np.array([r1.z_nodes[:ii + 1].sum()
-                                for ii in range(len(r1.z_nodes))])
+        self.plot_x = np.cumsum(r1.x_nodes)
+        self.plot_z = np.cumsum(r1.z_nodes)
 
         # center the grid onto the station coordinates
         x0 = bndgoff - self.plot_x[r1.model_columns[0][0]]
@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""
+mtpy/processing/robust_tf.py
+
+Estimate MT transfer functions (impedance and tipper) directly from time
+series held in memory, without writing BIRRP input files and reading the
+J files back.
+
+The estimate is made in the usual steps:
+
+    1. window the time series with overlapping tapered windows and compute
+       the Fourier coefficients of every window in one FFT call
+    2. average the Fourier coefficients into frequency bands equally spaced
+       on a log scale
+    3. solve for the transfer function in every band with an iteratively
+       re-weighted (Huber M-estimator) least squares regression, using a
+       remote reference if one is given
+
+All bands (and all output channels) are solved at the same time as stacks
+of 2 x 2 systems.  The time series are expected to be calibrated, electric
+fields in mV/km and magnetic fields in nT give an impedance in the units
+used in .edi files.
+
+:Example: ::
+
+    >>> import mtpy.processing.robust_tf as robust_tf
+    >>> from mtpy.core.mt import MT
+    >>> tf_obj = robust_tf.RobustTF(window_length=1024)
+    >>> z_obj, t_obj = tf_obj.estimate_mtts([ex, ey, hx, hy, hz],
+    ...                                     rr_ts_list=[rrhx, rrhy])
+    >>> mt_obj = MT()
+    >>> mt_obj.station = ex.station
+    >>> mt_obj.write_mt_file(save_dir=r"/home/edi",
+    ...                      new_Z_obj=z_obj,
+    ...                      new_Tipper_obj=t_obj)
+
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.signal as signal
+
+import mtpy.core.z as mtz
+
+# =============================================================================
+
+
+class RobustTFError(Exception):
+    pass
+
+
+class RobustTF(object):
+    """
+    Robust transfer function estimator working on arrays or MTTS objects.
+
+    ==================== ======================================================
+    Attributes           Description
+    ==================== ======================================================
+    window_length        number of samples in each FFT window
+                         *default* is 1024
+    overlap              fraction of window overlap *default* is 0.5
+    window               taper applied to each window, any window
+                         understood by scipy.signal.get_window
+                         *default* is 'hann'
+    bands_per_decade     number of frequency bands per decade
+                         *default* is 8
+    min_cycles           lowest frequency estimated has at least this many
+                         cycles in a window *default* is 8
+    max_freq_fraction    highest frequency estimated as a fraction of the
+                         sampling rate *default* is 0.25
+    min_observations     minimum number of Fourier coefficients in a band
+                         for it to be estimated *default* is 16
+    huber_k              Huber threshold in units of the residual scale
+                         *default* is 1.5
+    max_iter             maximum number of re-weighting iterations
+                         *default* is 20
+    tol                  relative change in the transfer function below
+                         which the iterations stop *default* is 1E-4
+    block_windows        number of windows read from the time series and
+                         transformed at a time *default* is 256
+    ==================== ======================================================
+
+    ==================== ======================================================
+    Methods              Description
+    ==================== ======================================================
+    compute_spectra      windowed Fourier coefficients of a channel array
+    get_bands            band centre frequencies and Fourier bin indices
+    estimate             estimate Z and Tipper from arrays
+    estimate_mtts        estimate Z and Tipper from a list of MTTS objects
+    ==================== ======================================================
+    """
+
+    def __init__(self, **kwargs):
+        self.window_length = 1024
+        self.overlap = 0.5
+        self.window = 'hann'
+        self.bands_per_decade = 8
+        self.min_cycles = 8
+        self.max_freq_fraction = 0.25
+        self.min_observations = 16
+        self.huber_k = 1.5
+        self.max_iter = 20
+        self.tol = 1E-4
+        self.block_windows = 256
+
+        for key in list(kwargs.keys()):
+            setattr(self, key, kwargs[key])
+
+    def compute_spectra(self, data, sampling_rate, n_samples=None,
+                        bins=None):
+        """
+        compute the Fourier coefficients of every window of every channel.
+
+        The windows are computed in blocks of block_windows windows and only
+        the samples of a block are read from each channel, so memory mapped
+        channels are never read into memory as a whole.
+
+        :param data: time series, one channel per row or a list of channels
+        :type data: np.ndarray(n_channels, n_samples) or list of
+                    np.ndarray(n_samples)
+
+        :param sampling_rate: sampling rate in samples per second
+        :type sampling_rate: float
+
+        :param n_samples: number of samples to use from each channel,
+                          *default* is the length of the shortest channel
+        :type n_samples: int, optional
+
+        :param bins: Fourier coefficients to keep, *default* is all
+        :type bins: slice, optional
+
+        :returns: frequencies of the Fourier coefficients
+        :rtype: np.ndarray(n_freq)
+
+        :returns: Fourier coefficients
+        :rtype: np.ndarray(n_channels, n_windows, n_freq), complex
+        """
+        if isinstance(data, np.ndarray) and data.ndim == 1:
+            data = [data]
+        if n_samples is None:
+            n_samples = min([len(ch) for ch in data])
+
+        step = max(int(round(self.window_length * (1 - self.overlap))), 1)
+        if n_samples < self.window_length:
+            raise RobustTFError('Time series has {0} samples, need at least '
+                                'window_length = {1}'.format(n_samples,
+                                                             self.window_length))
+        n_windows = 1 + (n_samples - self.window_length) // step
+
+        freq = np.fft.rfftfreq(self.window_length, 1. / sampling_rate)
+        if bins is None:
+            bins = slice(None)
+        freq = freq[bins]
+
+        taper = signal.get_window(self.window, self.window_length)
+        spectra = np.zeros((len(data), n_windows, freq.size), dtype=complex)
+        block = max(int(self.block_windows), 1)
+        for w0 in range(0, n_windows, block):
+            w1 = min(w0 + block, n_windows)
+            start = w0 * step
+            stop = (w1 - 1) * step + self.window_length
+            for ii, ch in enumerate(data):
+                segment = np.asarray(ch[start:stop], dtype=float)
+                windows = np.lib.stride_tricks.as_strided(
+                    segment,
+                    shape=(w1 - w0, self.window_length),
+                    strides=(step * segment.strides[0], segment.strides[0]),
+                    writeable=False)
+                windows = signal.detrend(windows, axis=-1,
+                                         type='linear') * taper
+                spectra[ii, w0:w1] = np.fft.rfft(windows, axis=-1)[:, bins]
+
+        return freq, spectra
+
+    def get_bands(self, freq, sampling_rate):
+        """
+        get the band centre frequencies and the Fourier coefficients that
+        fall in each band.
+
+        A coefficient belongs to the band whose centre is nearest on a log
+        scale, so every coefficient is used once and each band is a
+        contiguous run of coefficients.
+
+        :returns: band centre frequencies, lowest first
+        :rtype: np.ndarray(n_bands)
+
+        :returns: index of the first Fourier coefficient of each band and
+                  one past the last coefficient of the last band
+        :rtype: np.ndarray(n_bands + 1), int
+        """
+        f_min = self.min_cycles * sampling_rate / float(self.window_length)
+        f_max = self.max_freq_fraction * sampling_rate
+        if f_min >= f_max:
+            raise RobustTFError('No frequency bands between {0} and {1} Hz, '
+                                'use a longer window'.format(f_min, f_max))
+
+        n_bands = int(np.floor(np.log10(f_max / f_min) *
+                               self.bands_per_decade)) + 1
+        band_freq = f_max * 10 ** (-np.arange(n_bands)[::-1] /
+                                   float(self.bands_per_decade))
+        half_width = 10 ** (0.5 / self.bands_per_decade)
+
+        edges = np.searchsorted(freq, np.append(band_freq / half_width,
+                                                band_freq[-1] * half_width))
+        keep = np.diff(edges) > 0
+        band_freq = band_freq[keep]
+        edges = np.append(edges[:-1][keep], edges[-1])
+
+        return band_freq, edges
+
+    def _gather_bands(self, spectra, edges):
+        """
+        gather Fourier coefficients into (n_channels, n_obs), ordered so
+        that the observations of each band are contiguous.
+
+        :returns: observations and the offset of each band in them
+        """
+        n_channels, n_windows = spectra.shape[0:2]
+        obs = spectra[:, :, edges[0]:edges[-1]].swapaxes(1, 2)
+        obs = obs.reshape(n_channels, -1)
+        offsets = (edges - edges[0]) * n_windows
+
+        return obs, offsets
+
+    def _regression(self, y, x, r, offsets):
+        """
+        iteratively re-weighted least squares with Huber weights, solved for
+        all outputs and bands at once.
+
+        Sums over the observations of a band are segment sums
+        (np.add.reduceat) over the contiguous observations of that band.
+
+        :param y: output channels (n_out, n_obs)
+        :param x: input channels (2, n_obs)
+        :param r: reference channels (2, n_obs)
+        :param offsets: offset of each band in the observations and the
+                        total number of observations (n_bands + 1)
+
+        :returns: transfer function (n_out, n_bands, 2) and its standard
+                  deviation (n_out, n_bands, 2), NaN where a band could not
+                  be solved
+        """
+        n_out = y.shape[0]
+        starts = offsets[:-1]
+        n_obs = np.diff(offsets)
+        n_bands = n_obs.size
+
+        def band_sum(values):
+            return np.add.reduceat(values, starts, axis=-1)
+
+        # products that do not change between iterations
+        rc = r.conj()
+        rx = [[rc[ii] * x[jj] for jj in range(2)] for ii in range(2)]
+        ry = [rc[ii] * y for ii in range(2)]
+
+        weights = np.ones(y.shape)
+        tf = np.zeros((n_out, n_bands, 2), dtype=complex)
+        a = np.zeros((n_out, n_bands, 2, 2), dtype=complex)
+        c = np.zeros((n_out, n_bands, 2), dtype=complex)
+        for kk in range(self.max_iter + 1):
+            for ii in range(2):
+                c[:, :, ii] = band_sum(weights * ry[ii])
+                for jj in range(2):
+                    a[:, :, ii, jj] = band_sum(weights * rx[ii][jj])
+
+            det = a[..., 0, 0] * a[..., 1, 1] - a[..., 0, 1] * a[..., 1, 0]
+            good = np.isfinite(det) & (np.abs(det) > 0)
+            a[~good] = np.identity(2)
+            tf_new = np.linalg.solve(a, c[..., np.newaxis])[..., 0]
+            tf_new[~good] = np.nan
+
+            tf_obs = np.repeat(tf_new, n_obs, axis=1)
+            residual = y - tf_obs[..., 0] * x[0] - tf_obs[..., 1] * x[1]
+            abs_res = np.abs(residual)
+
+            change = np.abs(tf_new - tf) / np.maximum(np.abs(tf_new),
+                                                      np.finfo(float).tiny)
+            change = change[np.isfinite(change)]
+            tf = tf_new
+            if kk > 0 and (change.size == 0 or change.max() < self.tol):
+                break
+
+            # robust scale of the residuals in each band
+            scale = np.array([np.median(abs_res[:, st:st + nn], axis=-1)
+                              for st, nn in zip(starts, n_obs)]).T / 0.6745
+            scale[~(scale > 0)] = np.finfo(float).tiny
+            u = abs_res / (self.huber_k * np.repeat(scale, n_obs, axis=1))
+            weights = np.minimum(1., 1. / np.where(u > 0, u, 1.))
+
+        # error propagation for the weighted estimate
+        # cov = sigma^2 A^-1 (R^H W^2 R) A^-H
+        rwr = np.zeros_like(a)
+        for ii in range(2):
+            for jj in range(2):
+                rwr[:, :, ii, jj] = band_sum(weights ** 2 * rc[ii] * r[jj])
+        a_inv = np.linalg.inv(a)
+        dof = np.maximum(band_sum(weights) - 2, 1)
+        sigma2 = band_sum(weights * abs_res ** 2) / dof
+        cov = sigma2[..., np.newaxis, np.newaxis] * \
+            np.matmul(np.matmul(a_inv, rwr), a_inv.conj().swapaxes(-1, -2))
+        tf_err = np.sqrt(np.abs(np.real(np.diagonal(cov, axis1=-2, axis2=-1))))
+
+        bad = ~good | (n_obs < self.min_observations)[np.newaxis, :]
+        tf[bad] = np.nan
+        tf_err[bad] = np.nan
+
+        return tf, tf_err
+
+    def estimate(self, ex, ey, hx, hy, sampling_rate, hz=None,
+                 rrhx=None, rrhy=None):
+        """
+        estimate the impedance and tipper from time series arrays.
+
+        All arrays must be sampled at the same time, if they have different
+        lengths they are trimmed to the shortest.  Memory mapped arrays are
+        accepted.
+
+        :param ex, ey, hx, hy: electric and magnetic channels
+        :type ex, ey, hx, hy: np.ndarray(n_samples)
+
+        :param sampling_rate: sampling rate in samples per second
+        :type sampling_rate: float
+
+        :param hz: vertical magnetic channel, if None no tipper is estimated
+        :type hz: np.ndarray(n_samples), optional
+
+        :param rrhx, rrhy: remote reference magnetic channels, if None the
+                           local magnetic channels are used
+        :type rrhx, rrhy: np.ndarray(n_samples), optional
+
+        :returns: impedance, bands that could not be estimated are removed
+        :rtype: mtpy.core.z.Z
+
+        :returns: tipper, None if hz is None
+        :rtype: mtpy.core.z.Tipper
+        """
+        channels = [ex, ey, hx, hy]
+        if hz is not None:
+            channels.append(hz)
+        remote = rrhx is not None and rrhy is not None
+        if remote:
+            channels += [rrhx, rrhy]
+        elif rrhx is not None or rrhy is not None:
+            raise RobustTFError('Need both rrhx and rrhy for remote reference')
+
+        # only the Fourier coefficients in the bands are kept, the time
+        # series are read a block of windows at a time
+        freq = np.fft.rfftfreq(self.window_length, 1. / sampling_rate)
+        band_freq, edges = self.get_bands(freq, sampling_rate)
+        freq, spectra = self.compute_spectra(
+            channels, sampling_rate, bins=slice(edges[0], edges[-1]))
+        obs, offsets = self._gather_bands(spectra, edges - edges[0])
+
+        n_out = 3 if hz is not None else 2
+        y = obs[[0, 1] + ([4] if hz is not None else [])]
+        x = obs[[2, 3]]
+        if remote:
+            r = obs[[-2, -1]]
+        else:
+            r = x
+
+        tf, tf_err = self._regression(y, x, r, offsets)
+
+        # highest frequency first, as in .edi files
+        tf = tf[:, ::-1]
+        tf_err = tf_err[:, ::-1]
+        band_freq = band_freq[::-1]
+        good = np.all(np.isfinite(tf[0:2]), axis=(0, 2))
+        band_freq = band_freq[good]
+
+        z_obj = mtz.Z(z_array=np.moveaxis(tf[0:2, good], 0, 1),
+                      z_err_array=np.moveaxis(tf_err[0:2, good], 0, 1),
+                      freq=band_freq)
+
+        t_obj = None
+        if n_out == 3:
+            t_array = tf[2:3, good].swapaxes(0, 1)
+            t_err_array = tf_err[2:3, good].swapaxes(0, 1)
+            t_array[~np.isfinite(t_array)] = 0
+            t_err_array[~np.isfinite(t_err_array)] = 0
+            t_obj = mtz.Tipper(tipper_array=t_array,
+                               tipper_err_array=t_err_array,
+                               freq=band_freq)
+
+        return z_obj, t_obj
+
+    def estimate_mtts(self, ts_list, rr_ts_list=None):
+        """
+        estimate the impedance and tipper from MTTS objects.
+
+        :param ts_list: MTTS objects for ex, ey, hx, hy and optionally hz,
+                        the component attribute says which is which
+        :type ts_list: list of mtpy.core.ts.MTTS
+
+        :param rr_ts_list: MTTS objects for the remote reference hx and hy
+        :type rr_ts_list: list of mtpy.core.ts.MTTS, optional
+
+        :returns: impedance and tipper, see estimate
+        """
+        ts_dict = dict([(ts_obj.component.lower(), ts_obj)
+                        for ts_obj in ts_list])
+        for comp in ['ex', 'ey', 'hx', 'hy']:
+            if comp not in ts_dict:
+                raise RobustTFError('Missing component {0}'.format(comp))
+
+        kw_dict = {}
+        if 'hz' in ts_dict:
+            kw_dict['hz'] = ts_dict['hz'].ts.data.values
+        if rr_ts_list is not None:
+            rr_dict = dict([(ts_obj.component.lower(), ts_obj)
+                            for ts_obj in rr_ts_list])
+            kw_dict['rrhx'] = rr_dict['hx'].ts.data.values
+            kw_dict['rrhy'] = rr_dict['hy'].ts.data.values
+
+        return self.estimate(ts_dict['ex'].ts.data.values,
+                             ts_dict['ey'].ts.data.values,
+                             ts_dict['hx'].ts.data.values,
+                             ts_dict['hy'].ts.data.values,
+                             ts_dict['ex'].sampling_rate,
+                             **kw_dict)
+
+
+def _estimate_station(kw_dict, tf_kwargs):
+    """
+    estimate one station, top level so it can be sent to a worker process
+    """
+    return RobustTF(**tf_kwargs).estimate(**kw_dict)
+
+
+def estimate_survey(station_dict, n_processes=1, **kwargs):
+    """
+    estimate transfer functions for many stations, running n_processes
+    stations at once.
+
+    :param station_dict: keys are station names, values are dictionaries of
+                         keyword arguments for RobustTF.estimate, i.e.
+                         ex, ey, hx, hy, sampling_rate and optionally hz,
+                         rrhx, rrhy
+    :type station_dict: dictionary
+
+    :param n_processes: number of worker processes, if 1 the stations are
+                        estimated in series. *default* is 1
+    :type n_processes: int
+
+    :param kwargs: attributes of RobustTF, e.g. window_length
+
+    :returns: keys are station names, values are (Z, Tipper)
+    :rtype: dictionary
+    """
+    if n_processes is None or n_processes <= 1:
+        tf_obj = RobustTF(**kwargs)
+        return dict([(station, tf_obj.estimate(**station_dict[station]))
+                     for station in list(station_dict.keys())])
+
+    tf_dict = {}
+    with ProcessPoolExecutor(max_workers=n_processes) as executor:
+        futures = dict([(station, executor.submit(_estimate_station,
+                                                  station_dict[station],
+                                                  kwargs))
+                        for station in list(station_dict.keys())])
+        for station in list(futures.keys()):
+            tf_dict[station] = futures[station].result()
+
+    return tf_dict
+
+
+def synthetic_time_series(n_samples, sampling_rate, z_function,
+                          tipper_function=None, noise=0.0, seed=None):
+    """
+    make synthetic time series from a known transfer function.
+
+    The magnetic fields are white noise, the electric fields (and hz) are
+    made by multiplying their spectra by the transfer function.  Useful for
+    testing and benchmarking RobustTF.
+
+    :param n_samples: number of samples
+    :param sampling_rate: sampling rate in samples per second
+
+    :param z_function: function returning the impedance (n_freq, 2, 2) for
+                       an array of frequencies
+    :param tipper_function: function returning the tipper (n_freq, 1, 2),
+                            if None no hz is made
+
+    :param noise: standard deviation of gaussian noise added to the
+                  electric channels, relative to their standard deviation
+    :param seed: random seed
+
+    :returns: dictionary with keys ex, ey, hx, hy, sampling_rate (and hz)
+              that can be passed straight to RobustTF.estimate
+    """
+    rng = np.random.RandomState(seed)
+    hx = rng.randn(n_samples)
+    hy = rng.randn(n_samples)
+
+    freq = np.fft.rfftfreq(n_samples, 1. / sampling_rate)
+    h_spectra = np.array([np.fft.rfft(hx), np.fft.rfft(hy)])
+    z = np.zeros((freq.size, 2, 2), dtype=complex)
+    z[1:] = z_function(freq[1:])
+    e_spectra = np.einsum('fij,jf->if', z, h_spectra)
+
+    ts_dict = {'hx': hx,
+               'hy': hy,
+               'ex': np.fft.irfft(e_spectra[0], n_samples),
+               'ey': np.fft.irfft(e_spectra[1], n_samples),
+               'sampling_rate': sampling_rate}
+
+    if tipper_function is not None:
+        t = np.zeros((freq.size, 1, 2), dtype=complex)
+        t[1:] = tipper_function(freq[1:])
+        ts_dict['hz'] = np.fft.irfft(np.einsum('fij,jf->if', t, h_spectra)[0],
+                                     n_samples)
+
+    if noise > 0:
+        for comp in ['ex', 'ey']:
+            ts_dict[comp] = ts_dict[comp] + \
+                noise * ts_dict[comp].std() * rng.randn(n_samples)
+
+    return ts_dict
@@ -24,6 +24,7 @@ import pandas as pd
 import logging
 
 from mtpy.core import ts
+from mtpy.utils.mtpy_decorator import timed
 
 from matplotlib import pyplot as plt
 
@@ -1110,6 +1111,7 @@ class NIMS(NIMSHeader):
         
         return return_info_array, return_data_array, duplicate_list
         
+    @timed()
     def read_nims(self, fn=None):
         """
         Read NIMS DATA.BIN file.
@@ -1149,7 +1151,6 @@ class NIMS(NIMSHeader):
         if fn is not None:
             self.fn = fn
 
-        st = datetime.datetime.now()
         ### read in header information and get the location of end of header
         self.read_header(self.fn)
         
@@ -1235,9 +1236,6 @@ class NIMS(NIMSHeader):
                                                        self.gps_list)
         ### align data 
         self.ts = self.align_data(data_array, self.stamps) 
-        et = datetime.datetime.now()
-        
-        print('--> Took {0:.2f} seconds'.format((et-st).total_seconds()))
 
     def _get_first_gps_stamp(self, stamps):
         """
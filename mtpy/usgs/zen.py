@@ -24,6 +24,7 @@ import numpy as np
 
 import mtpy.imaging.plotspectrogram as plotspectrogram
 import mtpy.core.ts as mtts
+from mtpy.utils.mtpy_decorator import timed
 
 try:
     import win32api
@@ -747,7 +748,6 @@ class Zen3D(object):
         >>> zt = zen.Zen3D(r"/home/mt/mt00/mt00_20150522_080000_256_EX.Z3D")
         >>> zt.read_z3d()
         >>> ------- Reading /home/mt/mt00/mt00_20150522_080000_256_EX.Z3D -----
-            --> Reading data took: 0.322 seconds
             Scheduled time was 2015-05-22,08:00:16 (GPS time)
             1st good stamp was 2015-05-22,08:00:18 (GPS time)
             difference of 2.00 seconds
@@ -1094,6 +1094,7 @@ class Zen3D(object):
             self._read_metadata(fid=file_id)
 
     #======================================
+    @timed()
     def read_z3d(self, Z3Dfn=None):
         """
         read in z3d file and populate attributes accordingly
@@ -1114,7 +1115,6 @@ class Zen3D(object):
             self.fn = Z3Dfn
 
         #print(u'------- Reading {0} ---------'.format(self.fn))
-        st = time.time()
 
         #get the file size to get an estimate of how many data points there are
         file_size = os.path.getsize(self.fn)
@@ -1194,10 +1194,6 @@ class Zen3D(object):
         print('    found {0} GPS time stamps'.format(self.gps_stamps.shape[0]))
         print('    found {0} data points'.format(self.ts_obj.ts.data.size))
 
-        # time it
-        et = time.time()
-        print('INFO: --> Reading data took: {0:.3f} seconds'.format(et-st))
-
     #=================================================
     def _fill_ts_obj(self, ts_data):
         """
@@ -707,7 +707,7 @@ class ZenCache(object):
         """
         self.save_fn_rw = mtfh.make_unique_filename(self.save_fn)
         
-        cfid = file(self.save_fn_rw, 'wb+')
+        cfid = open(self.save_fn_rw, 'wb+')
         
         n_fn = self.ts.shape[1]
         
@@ -715,8 +715,7 @@ class ZenCache(object):
         cfid.write(struct.pack('<i', self._nav_len))
         cfid.write(struct.pack('<i', self._flag))
         cfid.write(struct.pack('<h', self._type_dict['nav']))
-        for nd in range(self._nav_len-2):
-            cfid.write(struct.pack('<b', 0))
+        cfid.write(bytes(self._nav_len-2))
         cfid.write(struct.pack('<i', self._nav_len))
         
         #--> write meta data
@@ -729,7 +728,7 @@ class ZenCache(object):
         cfid.write(struct.pack('<i', meta_len+2))
         cfid.write(struct.pack('<i', self._flag))
         cfid.write(struct.pack('<h', self._type_dict['meta']))
-        cfid.write(meta_str)
+        cfid.write(meta_str.encode('latin-1'))
         cfid.write(struct.pack('<i', meta_len+2))
         
         #--> write calibrations
@@ -744,22 +743,23 @@ class ZenCache(object):
         cfid.write(struct.pack('<i', cal_len+2))
         cfid.write(struct.pack('<i', self._flag))
         cfid.write(struct.pack('<h', self._type_dict['cal']))
-        cfid.write(cal_data[:-1]+'\n')
+        cfid.write((cal_data[:-1]+'\n').encode('latin-1'))
         cfid.write(struct.pack('<i', cal_len+2))
         
         #--> write data
         ts_block_len = self.ts.shape[0]*n_fn*4+2
         
-        #--> make sure none of the data is above the allowed level
-        self.ts[np.where(self.ts>2.14e9)] = 2.14e9
-        self.ts[np.where(self.ts<-2.14e9)] = -2.14e9
-        
         #--> write time series block
         cfid.write(struct.pack('<i', ts_block_len))
         cfid.write(struct.pack('<i', self._flag))
         cfid.write(struct.pack('<h', self._type_dict['ts']))
-        for zz in range(self.ts.shape[0]):
-            cfid.write(struct.pack('<'+'i'*n_fn, *self.ts[zz]))
+
+        #--> make sure none of the data is above the allowed level, a chunk
+        #    at a time so a memory mapped time series is not read at once
+        n_chunk = max(1, int(2**24/n_fn))
+        for zz in range(0, self.ts.shape[0], n_chunk):
+            ts_chunk = np.clip(self.ts[zz:zz+n_chunk], -2.14e9, 2.14e9)
+            cfid.write(ts_chunk.astype('<i4').tobytes())
                                 
         cfid.write(struct.pack('<i', ts_block_len))
                  
@@ -767,170 +767,147 @@ class ZenCache(object):
         
         print('Rewrote {0}\n to {1}'.format(self.save_fn, self.save_fn_rw))        
     
-    #==================================================    
-    def read_cache_metadata(self, cache_fn):
+    #==================================================
+    def _read_block(self, cfid, block_name, error, read_data=True):
         """
-        read only the meta data from the cache file
+        read the stamp of the next block in a cache file and check that the
+        length at the end of the block is the same as in the stamp.
+
+        Arguments:
+        -----------
+            **cfid** : open cache file positioned at the start of a block
+
+            **block_name** : name of the block for error messages
+
+            **error** : exception raised if the block lengths are not equal
+
+            **read_data** : [ True | False ] if False the data of the block
+                            are skipped and the position of the data in
+                            the file is returned instead
+
+        Outputs:
+        --------
+            **block_len** : length of the block from the stamp
+
+            **data** : bytes of the block or the position of the data
         """
-        
-        self.save_fn = cache_fn
-        #open cache file to read in as a binary file
-        cfid = file(cache_fn, 'rb')
-        
-        #read into a long string
-        cdata = cfid.read(1050)
-        
-        #--> read navigation data
-        nav_block = np.fromstring(cdata[0:self._stamp_len], 
-                                  dtype=self._data_type)
-        
-        #get starting and ending indices for navigation block
-        ii = int(self._stamp_len)
-        jj = self._stamp_len+nav_block['len']-2
-        self.nav_data = np.fromstring(cdata[ii:jj], dtype=np.int8)
-        
-        #get indicies for length of block
-        ii = int(jj)
-        jj = ii+4
-        nav_len_check = np.fromstring(cdata[ii:jj], np.int32)
-        if nav_len_check != nav_block['len']:
+        stamp = cfid.read(self._stamp_len)
+        if len(stamp) < self._stamp_len:
+            raise error('Could not find {0} block in {1}'.format(block_name,
+                                                                self.save_fn))
+        block_len = int(np.frombuffer(stamp, dtype=self._data_type)['len'][0])
+        if block_len < 2:
+            raise error('{0} block length {1} is too short'.format(block_name,
+                                                                   block_len))
+
+        if read_data:
+            data = cfid.read(block_len-2)
+        else:
+            data = cfid.tell()
+            cfid.seek(block_len-2, 1)
+
+        len_check = np.frombuffer(cfid.read(4), dtype=np.int32)
+        if len_check.size != 1 or len_check[0] != block_len:
             if self.verbose:
-                print('Index for second navigation length is {0}'.format(ii))
-            raise CacheNavigationError('Navigation length in data block are'
-                                       'not equal: {0} != {1}'.format(
-                                       nav_block['len'], nav_len_check))
-        
-        #--> read meta data
-        ii = int(jj)
-        jj = ii+self._stamp_len
-        
-        meta_block = np.fromstring(cdata[ii:jj], dtype=self._data_type)
-        ii = int(jj)
-        jj = ii+meta_block['len']-2
+                print('Index for second {0} length is {1}'.format(
+                      block_name, cfid.tell()-len_check.nbytes))
+            raise error('{0} length in data blocks are not equal: '
+                        '{1} != {2}'.format(block_name, block_len, len_check))
+
+        return block_len, data
+
+    def _read_meta_block(self, cfid, strip=False):
+        """
+        read the navigation and meta data blocks into nav_data and meta_data
+        """
+        nav_len, nav_str = self._read_block(cfid, 'Navigation',
+                                            CacheNavigationError)
+        self.nav_data = np.frombuffer(nav_str, dtype=np.int8)
+
+        meta_len, meta_str = self._read_block(cfid, 'Meta', CacheMetaDataError)
         self.meta_data = {}
-        meta_list = cdata[ii:jj].split('\n')
-        for mm in meta_list:
+        for mm in meta_str.decode('latin-1').split('\n'):
             mfind = mm.find(',')
-            self.meta_data[mm[0:mfind]] = [ms.strip() for ms in 
-                                            mm[mfind+1:].split(',')]
-        
-        #get index for second length test
-        ii = int(jj)
-        jj = ii+4
-        meta_len_check = np.fromstring(cdata[ii:jj], dtype=np.int32)
-        if meta_len_check != meta_block['len']:
-            if self.verbose:
-                print('Index for second meta length is {0}'.format(ii))
-            raise CacheMetaDataError('Meta length in data blocks are not '
-                                     'equal: {0} != {1}'.format(
-                                     meta_block['len'], meta_len_check))
-        cfid.close()
-        
+            meta_list = mm[mfind+1:].split(',')
+            if strip:
+                meta_list = [ms.strip() for ms in meta_list]
+            self.meta_data[mm[0:mfind]] = meta_list
+
+    #==================================================
+    def read_cache_metadata(self, cache_fn):
+        """
+        read only the meta data from the cache file
+        """
+
+        self.save_fn = cache_fn
+        with open(cache_fn, 'rb') as cfid:
+            self._read_meta_block(cfid, strip=True)
+
     #==================================================
     def read_cache(self, cache_fn):
         """
         read a cache file
-        
+
+        Only the headers of the navigation, meta data and calibration blocks
+        are read, the time series block is memory mapped as ts, a read only
+        np.memmap(num_points, num_channels), so opening a large cache file
+        does not read the time series.  Slices of ts and get_channel_ts only
+        read the bytes needed from disk.
+
         """
-        
+
         self.save_fn = cache_fn
-        #open cache file to read in as a binary file
-        cfid = file(cache_fn, 'rb')
-        
-        #read into a long string
-        cdata = cfid.read()
-        
-        #--> read navigation data
-        nav_block = np.fromstring(cdata[0:self._stamp_len], 
-                                  dtype=self._data_type)
-        
-        #get starting and ending indices for navigation block
-        ii = int(self._stamp_len)
-        jj = self._stamp_len+nav_block['len']-2
-        self.nav_data = np.fromstring(cdata[ii:jj], dtype=np.int8)
-        
-        #get indicies for length of block
-        ii = int(jj)
-        jj = ii+4
-        nav_len_check = np.fromstring(cdata[ii:jj], np.int32)
-        if nav_len_check != nav_block['len']:
-            if self.verbose:
-                print('Index for second navigation length is {0}'.format(ii))
-            raise CacheNavigationError('Navigation length in data block are'
-                                       'not equal: {0} != {1}'.format(
-                                       nav_block['len'], nav_len_check))
-        
-        #--> read meta data
-        ii = int(jj)
-        jj = ii+self._stamp_len
-        
-        meta_block = np.fromstring(cdata[ii:jj], dtype=self._data_type)
-        ii = int(jj)
-        jj = ii+meta_block['len']-2
-        self.meta_data = {}
-        meta_list = cdata[ii:jj].split('\n')
-        for mm in meta_list:
-            mfind = mm.find(',')
-            self.meta_data[mm[0:mfind]] = mm[mfind+1:].split(',')
-        
-        #get index for second length test
-        ii = int(jj)
-        jj = ii+4
-        meta_len_check = np.fromstring(cdata[ii:jj], dtype=np.int32)
-        if meta_len_check != meta_block['len']:
-            if self.verbose:
-                print('Index for second meta length is {0}'.format(ii))
-            raise CacheMetaDataError('Meta length in data blocks are not'
-                                     'equal: {0} != {1}'.format(
-                                     meta_block['len'], meta_len_check))
-        
-        #--> read calibrations
-        ii = int(jj)
-        jj = ii+self._stamp_len
-        cal_block = np.fromstring(cdata[ii:jj], dtype=self._data_type)
-        
-        ii = int(jj)
-        jj = ii+cal_block['len']-2
-        self.cal_data = cdata[ii:jj]
-                
-        
-        ii = int(jj)
-        jj = ii+4
-        cal_len_check = np.fromstring(cdata[ii:jj], dtype=np.int32)
-        if cal_len_check != cal_block['len']:
-            if self.verbose:
-                print('Index for second cal length is {0}'.format(ii))
-            raise CacheCalibrationError('Cal length in data blocks are not'
-                                        'equal: {0} != {1}'.format(
-                                        cal_block['len'], cal_len_check))
-        
-        #--> read data
-        ii = int(jj)
-        jj = ii+self._stamp_len
-        
-        ts_block = np.fromstring(cdata[ii:jj], dtype=self._data_type)
-        
-        #get time series data
-        ii = int(jj)
-        jj = ii+ts_block['len']-2
-        self.ts = np.fromstring(cdata[ii:jj], dtype=self._ts_dtype)
-        #resize time series to be length of each channel
+        with open(cache_fn, 'rb') as cfid:
+            self._read_meta_block(cfid)
+
+            cal_len, cal_str = self._read_block(cfid, 'Cal',
+                                                CacheCalibrationError)
+            self.cal_data = cal_str.decode('latin-1')
+
+            ts_len, ts_start = self._read_block(cfid, 'ts',
+                                                CacheTimeSeriesError,
+                                                read_data=False)
+
+        # shape the time series to be length of each channel
+        ts_dtype = np.dtype(self._ts_dtype).newbyteorder('<')
+        num_pts = int((ts_len-2)/ts_dtype.itemsize)
         num_chn = len(self.meta_data['ch.cmp'.upper()])
-        if self.ts.shape[0]%num_chn != 0:
-            print('Trimming TS by {0} points'.format(self.ts.shape[0]%num_chn))
-        self.ts = np.resize(self.ts, (int(self.ts.shape[0]/num_chn), num_chn))
-        
-        ii = int(jj)
-        jj = ii+4
-        ts_len_check = np.fromstring(cdata[ii:jj], dtype=np.int32)
-        if ts_len_check != ts_block['len']:
-            if self.verbose:
-                print('Index for second ts length is {0}'.format(ii))
-            raise CacheTimeSeriesError('ts length in data blocks are not'
-                                       'equal: {0} != {1}'.format(
-                                       ts_block['len'], ts_len_check))
+        if num_pts%num_chn != 0:
+            print('Trimming TS by {0} points'.format(num_pts%num_chn))
+
+        self.ts = np.memmap(cache_fn, dtype=ts_dtype, mode='r',
+                            offset=ts_start,
+                            shape=(int(num_pts/num_chn), num_chn))
+
+    #==================================================
+    def get_channel_ts(self, ch_cmp, start=0, stop=None):
+        """
+        get the time series of one channel after read_cache
+
+        Arguments:
+        -----------
+            **ch_cmp** : channel component, e.g. 'ex' or 'hy'
+
+            **start** : index of first sample, *default* is 0
+
+            **stop** : index after the last sample, *default* is None for the
+                       end of the time series
+
+        Outputs:
+        --------
+            **ts** : strided view into the memory mapped time series, only
+                     the samples used are read from disk
+        """
+        ch_list = [cc.strip().lower() for cc in self.meta_data['CH.CMP']]
+        try:
+            ch_index = ch_list.index(ch_cmp.lower())
+        except ValueError:
+            raise CacheTimeSeriesError('Could not find channel {0} in '
+                                       '{1}'.format(ch_cmp, ch_list))
+
+        return self.ts[start:stop, ch_index]
+
 
-    
 #==============================================================================
 # 
 #==============================================================================
@@ -1,58 +1,156 @@
-# Check for gdal availability at module level so we don't have to
-# do this every time a function in gis_tools is being called.
-from .mtpy_decorator import gdal_data_check
+# Check for gdal availability once per process, the first time HAS_GDAL or
+# NEW_GDAL is asked for, so we don't have to do this every time a function in
+# gis_tools is being called, and importing mtpy does not pay for it.
+# EPSG_DICT is filled the first time it is used for the same reason.
 import os, re
-import numpy as np
 
-HAS_GDAL = gdal_data_check(None)._gdal_data_found
-NEW_GDAL = False
 
-if (not HAS_GDAL):
+def _check_gdal():
+    """
+    check that GDAL (or else pyproj) is working, returns HAS_GDAL, NEW_GDAL
+    """
+    from .mtpy_decorator import gdal_data_check
+
+    has_gdal = gdal_data_check(None)._gdal_data_found
+    new_gdal = False
+
+    if (not has_gdal):
+        try:
+            import pyproj
+        except ImportError:
+            raise RuntimeError("Either GDAL or PyProj must be installed")
+    else:
+        import osgeo
+        if hasattr(osgeo, '__version__') and int(osgeo.__version__[0]) >= 3:
+            new_gdal = True
+
+    return has_gdal, new_gdal
+
+
+def _load_epsg_dict():
+    """
+    load EPSG codes and the corresponding proj4 projection strings
+    """
+    epsg_dict = {}
     try:
         import pyproj
-    except ImportError:
-        raise RuntimeError("Either GDAL or PyProj must be installed")
-else:
-    import osgeo
-    if hasattr(osgeo, '__version__') and int(osgeo.__version__[0]) >= 3:
-        NEW_GDAL = True
-
-EPSG_DICT = {}
-try:
-    import pyproj
-
-    epsgfn = os.path.join(pyproj.pyproj_datadir, 'epsg')
-
-    f = open(epsgfn, 'r')
-    lines = f.readlines()
-
-    for line in lines:
-        if ('#' in line): continue
-
-        epsg_code_val = re.compile('<(\d+)>').findall(line)
-
-        # print( "epsg_code_val", epsg_code_val)
-
-        if epsg_code_val is not None and len(epsg_code_val) > 0 and \
-            epsg_code_val[0].isdigit():
-            epsg_code = int(epsg_code_val[0])
-            epsg_string = re.compile('>(.*)<').findall(line)[0].strip()
-
-            EPSG_DICT[epsg_code] = epsg_string
-        else:
-            pass  #print("epsg_code_val NOT found for this line ", line, epsg_code_val)
-    #end for
-except Exception:
-    # Failed to load EPSG codes and corresponding proj4 projections strings
-    # from pyproj.
-    # Since version 1.9.5 the epsg file stored in pyproj_datadir has been
-    #removed and replaced by 'proj.db', which is stored in a different folder.
-    # Since the underlying proj4 projection strings haven't changed, we 
-    # simply load a local copy of these mappings to ensure backward
-    # compatibility.
-
-    path = os.path.dirname(os.path.abspath(__file__))
-    epsg_dict_fn = os.path.join(path, 'epsg.npy')
-
-    EPSG_DICT = np.load(epsg_dict_fn, allow_pickle=True).item()
-# end try
+
+        epsgfn = os.path.join(pyproj.pyproj_datadir, 'epsg')
+
+        f = open(epsgfn, 'r')
+        lines = f.readlines()
+
+        for line in lines:
+            if ('#' in line): continue
+
+            epsg_code_val = re.compile(r'<(\d+)>').findall(line)
+
+            # print( "epsg_code_val", epsg_code_val)
+
+            if epsg_code_val is not None and len(epsg_code_val) > 0 and \
+                epsg_code_val[0].isdigit():
+                epsg_code = int(epsg_code_val[0])
+                epsg_string = re.compile('>(.*)<').findall(line)[0].strip()
+
+                epsg_dict[epsg_code] = epsg_string
+            else:
+                pass  #print("epsg_code_val NOT found for this line ", line, epsg_code_val)
+        #end for
+    except Exception:
+        # Failed to load EPSG codes and corresponding proj4 projections strings
+        # from pyproj.
+        # Since version 1.9.5 the epsg file stored in pyproj_datadir has been
+        #removed and replaced by 'proj.db', which is stored in a different folder.
+        # Since the underlying proj4 projection strings haven't changed, we
+        # simply load a local copy of these mappings to ensure backward
+        # compatibility.
+        import numpy as np
+
+        path = os.path.dirname(os.path.abspath(__file__))
+        epsg_dict_fn = os.path.join(path, 'epsg.npy')
+
+        epsg_dict = np.load(epsg_dict_fn, allow_pickle=True).item()
+    # end try
+
+    return epsg_dict
+
+
+class _LazyEPSGDict(dict):
+    """
+    dictionary of EPSG code: proj4 string that is only filled the first
+    time it is read
+    """
+    _loaded = False
+
+    def _load(self):
+        if not self._loaded:
+            self._loaded = True
+            epsg_dict = _load_epsg_dict()
+            # keep anything set before loading, e.g. a custom projection
+            epsg_dict.update(dict.items(self))
+            dict.update(self, epsg_dict)
+
+    def __getitem__(self, key):
+        self._load()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        self._load()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load()
+        return dict.__len__(self)
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def __eq__(self, other):
+        self._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._load()
+        return dict.__ne__(self, other)
+
+    def __reduce__(self):
+        self._load()
+        return (dict, (dict(self),))
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def get(self, key, default=None):
+        self._load()
+        return dict.get(self, key, default)
+
+    def copy(self):
+        self._load()
+        return dict.copy(self)
+
+
+EPSG_DICT = _LazyEPSGDict()
+
+
+def __getattr__(name):
+    # module level lazy attributes (PEP 562)
+    if name in ('HAS_GDAL', 'NEW_GDAL'):
+        has_gdal, new_gdal = _check_gdal()
+        globals().update(HAS_GDAL=has_gdal, NEW_GDAL=new_gdal)
+        return globals()[name]
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__,
+                                                                     name))
@@ -124,6 +124,58 @@ def nearest_index(val,array):
     return np.where(diff==min(diff))[0][0]
 
 
+def interpolate_rows(x, y, new_x):
+    """
+    linearly interpolate every row of y(x) onto new_x at once.
+
+    :param x: np.ndarray(n_rows, n) of abscissae, nan where there is no data
+    :param y: np.ndarray(n_rows, n) of values, nan where there is no data
+    :param new_x: np.ndarray(n_new) to interpolate every row onto, or
+                  np.ndarray(n_rows, n_new) to interpolate each row onto its
+                  own values, nan where there is nothing to interpolate
+    :returns: np.ndarray(n_rows, n_new), nan outside the range of each row
+    """
+    x = np.where(np.isnan(y), np.nan, x)
+    # pad with an empty column so every row has an upper neighbour
+    x = np.hstack([x, np.full((x.shape[0], 1), np.nan)])
+    y = np.hstack([y, np.full((y.shape[0], 1), np.nan, dtype=y.dtype)])
+    n_rows, n_cols = x.shape
+    new_x = np.broadcast_to(np.asarray(new_x, dtype=float),
+                            (n_rows, np.shape(new_x)[-1]))
+
+    # sort each row, missing values go to the end
+    order = np.argsort(x, axis=1)
+    rows = np.arange(n_rows)[:, np.newaxis]
+    x = x[rows, order]
+    y = y[rows, order]
+    n_valid = np.sum(~np.isnan(x), axis=1)
+
+    # upper neighbour of each new value within its row.  The values are
+    # replaced by their rank among all values so that the sorted rows can be
+    # offset into one increasing array and searched at once
+    values = np.unique(np.concatenate([x[~np.isnan(x)],
+                                       new_x[~np.isnan(new_x)]]))
+    offset = rows * (values.size + 1)
+    x_rank = np.searchsorted(values, x) + offset
+    new_rank = np.searchsorted(values, new_x) + offset
+    hi = np.searchsorted(x_rank.ravel(), new_rank.ravel()).reshape(
+        new_x.shape) - rows * n_cols
+    hi = np.clip(hi, 1, np.maximum(n_valid - 1, 1)[:, np.newaxis])
+    lo = hi - 1
+
+    dx = x[rows, hi] - x[rows, lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(dx > 0, (new_x - x[rows, lo]) / dx, 0.)
+        in_range = (new_x >= x[:, :1]) & \
+                   (new_x <= x[np.arange(n_rows),
+                               np.maximum(n_valid - 1, 0)][:, np.newaxis])
+
+    new_y = y[rows, lo] * (1 - weight) + y[rows, hi] * weight
+    new_y[~in_range] = np.nan
+
+    return new_y
+
+
 def make_log_increasing_array(z1_layer, target_depth, n_layers, increment_factor=0.999):
     """
     create depth array with log increasing cells, down to target depth,
@@ -529,6 +581,26 @@ def rotatematrix_incl_errors(inmatrix, angle, inmatrix_err = None) :
     return rotated_matrix, errmat
 
 
+def rotatematrix_array(inmatrix, angle):
+    """
+    rotate a stack of matrices (..., 2, 2) by angles (...) in degrees at once,
+    with the same convention as rotatematrix_incl_errors. nan angles are
+    taken as 0.
+    """
+    phi = np.radians(np.nan_to_num(angle) % 360)
+    cphi = np.cos(phi)
+    sphi = np.sin(phi)
+
+    rotmat = np.zeros(np.shape(phi) + (2, 2))
+    rotmat[..., 0, 0] = cphi
+    rotmat[..., 0, 1] = sphi
+    rotmat[..., 1, 0] = -sphi
+    rotmat[..., 1, 1] = cphi
+
+    # the inverse of a rotation is its transpose
+    return np.matmul(np.matmul(rotmat, inmatrix), np.swapaxes(rotmat, -1, -2))
+
+
 def rotatevector_incl_errors(invector, angle, invector_err = None):
     #check for row or column vector 
     
@@ -32,18 +32,23 @@ Revised: 5/2020 JP
 # ==============================================================================
 import numpy as np
 from mtpy.utils.mtpylog import MtPyLog
-from mtpy.utils import HAS_GDAL, EPSG_DICT, NEW_GDAL
+import mtpy.utils
+from mtpy.utils import EPSG_DICT
 
-if HAS_GDAL:
-    from osgeo import osr
-    from osgeo.ogr import OGRERR_NONE
+_logger = MtPyLog.get_mtpy_logger(__name__)
 
-else:
-    import pyproj
 
-_logger = MtPyLog.get_mtpy_logger(__name__)
-if NEW_GDAL:
-    _logger.info('INFO: GDAL version 3 detected')
+def __getattr__(name):
+    # HAS_GDAL and NEW_GDAL are worked out the first time they are needed,
+    # so importing this module does not load GDAL or pyproj (PEP 562)
+    if name in ('HAS_GDAL', 'NEW_GDAL'):
+        if mtpy.utils.NEW_GDAL:
+            _logger.info('INFO: GDAL version 3 detected')
+        globals().update(HAS_GDAL=mtpy.utils.HAS_GDAL,
+                         NEW_GDAL=mtpy.utils.NEW_GDAL)
+        return globals()[name]
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__,
+                                                                     name))
 
 # =============================================================================
 # GIS Error container
@@ -397,6 +402,9 @@ def _get_gdal_coordinate_system(datum):
     :rtype: osr.SpatialReference
 
     """
+    from osgeo import osr
+    from osgeo.ogr import OGRERR_NONE
+
     # set lat lon coordinate system
     cs = osr.SpatialReference()
     if isinstance(datum, int):
@@ -551,6 +559,7 @@ def _get_gdal_projection_ll2utm(datum, utm_zone, epsg):
         zone_number, is_northern = split_utm_zone(utm_zone)
         utm_cs.SetUTM(zone_number, is_northern)
 
+    from osgeo import osr
     return osr.CoordinateTransformation(ll_cs, utm_cs).TransformPoint
 
 
@@ -587,6 +596,7 @@ def _get_gdal_projection_utm2ll(datum, utm_zone, epsg):
         utm_cs.SetUTM(zone_number, is_northern)
 
     ll_cs = utm_cs.CloneGeogCS()
+    from osgeo import osr
     return osr.CoordinateTransformation(utm_cs, ll_cs).TransformPoint
 
 
@@ -612,6 +622,8 @@ def _get_pyproj_projection(datum, utm_zone, epsg):
     :rtype: pyproj.Proj function
 
     """
+    import pyproj
+
     if utm_zone is None and epsg is None:
         raise GISError('Need to input either UTM zone or EPSG number')
 
@@ -686,7 +698,7 @@ def project_point_ll2utm(lat, lon, datum='WGS84', utm_zone=None, epsg=None):
         zone_number, is_northern, utm_zone = get_utm_zone(lat.mean(),
                                                           lon.mean())
     epsg = validate_epsg(epsg)
-    if HAS_GDAL:
+    if mtpy.utils.HAS_GDAL:
         ll2utm = _get_gdal_projection_ll2utm(datum, utm_zone, epsg)
     else:
         ll2utm = _get_pyproj_projection(datum, utm_zone, epsg)
@@ -698,14 +710,14 @@ def project_point_ll2utm(lat, lon, datum='WGS84', utm_zone=None, epsg=None):
                                                 ('utm_zone', 'U3')])
 
     for ii in range(lat.size):
-        if NEW_GDAL:
+        if mtpy.utils.NEW_GDAL:
             point = ll2utm(lat[ii], lon[ii])
         else:
             point = ll2utm(lon[ii], lat[ii])
 
         projected_point['easting'][ii] = point[0]
         projected_point['northing'][ii] = point[1]
-        if HAS_GDAL:
+        if mtpy.utils.HAS_GDAL:
             projected_point['elev'][ii] = point[2]
 
         projected_point['utm_zone'][ii] = utm_zone
@@ -770,7 +782,7 @@ def project_point_utm2ll(easting, northing, utm_zone, datum='WGS84', epsg=None):
     northing = validate_input_values(northing)
     epsg = validate_epsg(epsg)
 
-    if HAS_GDAL:
+    if mtpy.utils.HAS_GDAL:
         utm2ll = _get_gdal_projection_utm2ll(datum, utm_zone, epsg)
     else:
         utm2ll = _get_pyproj_projection(datum, utm_zone, epsg)
@@ -780,7 +792,7 @@ def project_point_utm2ll(easting, northing, utm_zone, datum='WGS84', epsg=None):
                                     dtype=[('latitude', np.float),
                                            ('longitude', np.float)])
     for ii in range(easting.size):
-        if HAS_GDAL:
+        if mtpy.utils.HAS_GDAL:
             point = utm2ll(easting[ii], northing[ii], 0.0)
 
             try:
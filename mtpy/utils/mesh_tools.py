@@ -309,16 +309,78 @@ def get_station_buffer(grid_east,grid_north,station_east,station_north,buf=10e3)
     returns a 2D boolean (True/False) array
     
     """
-    first = True
-    for xs,ys in np.vstack([station_east,station_north]).T:
-        xgrid,ygrid = np.meshgrid(grid_east,grid_north)
-        station_distance = ((xs - xgrid)**2 + (ys - ygrid)**2)**0.5
-        if first:
-            where = station_distance < buf
-            first = False
-        else:
-            where = np.any([where,station_distance < buf],axis=0)
+    from scipy.spatial import cKDTree
+
+    xgrid,ygrid = np.meshgrid(grid_east,grid_north)
+    
+    # distance from each cell to the nearest station
+    tree = cKDTree(np.vstack([station_east,station_north]).T)
+    station_distance = tree.query(np.vstack([xgrid.ravel(),
+                                             ygrid.ravel()]).T)[0]
             
-    return where
+    return (station_distance < buf).reshape(xgrid.shape)
+    
+    
+
+
+def get_grid_index(grid, values, method='left'):
+    """
+    get the index of the grid cell or grid point of each value using a
+    binary search of the sorted grid
+    
+    :param grid: sorted 1D array, cell edges for 'left' and 'right',
+                 cell centres (or any points) for 'nearest'
+    :param values: values to find
+    :param method: 'left': grid[i] < value <= grid[i+1]
+                   'right': grid[i] <= value < grid[i+1], i.e. the last
+                            grid point at or below the value
+                   'nearest': nearest grid point, the lower one if two are
+                              equally close
+    :returns: index: integer array, for 'left' and 'right' values outside
+                     the grid give -1 or len(grid) - 1
+    """
+    grid = np.asarray(grid)
+    values = np.asarray(values)
+    
+    if method in ['left','right']:
+        return np.searchsorted(grid, values, side=method) - 1
+    elif method == 'nearest':
+        index = np.searchsorted(grid, values)
+        lower = np.clip(index - 1, 0, grid.size - 1)
+        upper = np.clip(index, 0, grid.size - 1)
+        use_lower = np.abs(grid[lower] - values) <= np.abs(grid[upper] - values)
+        return np.where(use_lower, lower, upper)
+    else:
+        raise ValueError("method must be 'left', 'right' or 'nearest'")
+
+
+def get_station_grid_index(grid_east,grid_north,station_east,station_north,
+                           method='left'):
+    """
+    get the (east, north) indices of the stations on a model grid, see
+    get_grid_index for the options of method
+    
+    :returns: index_east, index_north: integer arrays (number of stations)
+    """
+    return get_grid_index(grid_east, station_east, method=method), \
+           get_grid_index(grid_north, station_north, method=method)
+
+
+def get_first_earth_index(res_model,index_east,index_north,air_resistivity=1e12):
+    """
+    get the vertical index of the first cell below the air in the model
+    columns at (index_north, index_east); 0 if there is no air in a column
+    
+    :param res_model: resistivity model (n_north, n_east, n_z)
+    :param index_east: east indices of the columns
+    :param index_north: north indices of the columns
+    :param air_resistivity: resistivity of air, cells above 0.95 of this
+                            are treated as air
+    :returns: index_z: integer array
+    """
+    columns = res_model[index_north, index_east]
     
+    has_air = np.any(columns > 0.95 * air_resistivity, axis=-1)
+    first_earth = np.argmax(columns < 0.95 * air_resistivity, axis=-1)
     
+    return np.where(has_air, first_earth, 0)
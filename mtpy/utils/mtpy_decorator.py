@@ -1,6 +1,11 @@
+import atexit
+import datetime
 import functools
 import inspect
+import json
 import os
+import threading
+import time
 from mtpy.utils.mtpylog import MtPyLog
 
 
@@ -126,3 +131,189 @@ class gdal_data_check(object):
             else:
                 self._logger.error("GDAL_DATA is set to: {}, but the path does not exist.".format(os.environ['GDAL_DATA']))
                 return False
+
+
+class RunTimings(object):
+    """
+        Description:
+            aggregates the number of calls, durations and counters of the code
+            timed with :class:`timed` during a run, so a batch job can find out
+            where it spends its time without attaching a profiler.
+
+            The timings are kept in the module instance run_timings. If the
+            environment variable MTPY_TIMINGS_FILE is set they are written to
+            that file as JSON when python exits.
+
+        Usage:
+            >>> from mtpy.utils.mtpy_decorator import run_timings
+            >>> run_timings.reset()
+            >>> ... process the survey ...
+            >>> run_timings.to_json(r"/home/mt/timings.json")
+    """
+    _logger = MtPyLog.get_mtpy_logger(__name__)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        forget all the timings and start a new run
+        """
+        with self._lock:
+            self.start_time = datetime.datetime.utcnow()
+            self._stats = {}
+
+    def add(self, name, duration, **counters):
+        """
+        add one call of name that took duration seconds, counters are summed
+        over all calls, for example n_samples=len(data)
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = {'count': 0, 'total': 0., 'min': duration,
+                         'max': duration, 'counters': {}}
+                self._stats[name] = stats
+            stats['count'] += 1
+            stats['total'] += duration
+            stats['min'] = min(stats['min'], duration)
+            stats['max'] = max(stats['max'], duration)
+            for key, value in counters.items():
+                stats['counters'][key] = stats['counters'].get(key, 0) + value
+
+    def get_summary(self):
+        """
+        get the timings of the run as a dictionary that can be written as
+        JSON, names are sorted by the total time spent
+        """
+        with self._lock:
+            timings = {}
+            for name, stats in sorted(self._stats.items(),
+                                      key=lambda item: -item[1]['total']):
+                timings[name] = dict(stats, counters=dict(stats['counters']),
+                                     mean=stats['total'] / stats['count'])
+            end_time = datetime.datetime.utcnow()
+
+        return {'start_time': self.start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'elapsed': (end_time - self.start_time).total_seconds(),
+                'timings': timings}
+
+    def to_json(self, fn=None, indent=4):
+        """
+        dump the timings as JSON to the file fn, returns the JSON string
+        """
+        json_str = json.dumps(self.get_summary(), indent=indent)
+        if fn is not None:
+            with open(fn, 'w') as fid:
+                fid.write(json_str)
+            self._logger.info("Wrote timings to {}".format(fn))
+
+        return json_str
+
+    def log_summary(self):
+        """
+        log the total time spent in each timed name
+        """
+        for name, stats in self.get_summary()['timings'].items():
+            self._logger.info("{}: {} calls took {:.3f} s".format(
+                name, stats['count'], stats['total']))
+
+
+run_timings = RunTimings()
+
+if os.environ.get('MTPY_TIMINGS_FILE'):
+    atexit.register(run_timings.to_json, os.environ['MTPY_TIMINGS_FILE'])
+
+
+class timed(object):
+    """
+        Description:
+            time a function, method or block of code and add the duration to
+            run_timings (or the given RunTimings). The duration of each call
+            is logged at debug level.
+
+        Usage:
+            as a decorator, the name defaults to module.function
+
+            >>> @timed()
+            >>> def read_data_file(self, data_fn=None):
+
+            as a context manager, with counters, the name is required
+
+            >>> with timed('process_survey') as timer:
+            >>>     ...
+            >>>     timer.count('n_samples', data.size)
+            >>> print(timer.elapsed)
+
+            or with start and stop
+
+            >>> timer = timed('process_survey').start()
+            >>> ...
+            >>> timer.stop(n_samples=self.ts.shape[0])
+    """
+    _logger = MtPyLog.get_mtpy_logger(__name__)
+
+    def __init__(self, name=None, timings=None):
+        if inspect.isclass(name) or inspect.isfunction(name):
+            raise TypeError("timed must be called, use @timed()")
+        self.name = name
+        self.timings = timings
+        self.counters = {}
+        self.elapsed = None
+        self._start = None
+
+    def __call__(self, func):
+        name = self.name
+        if name is None:
+            name = '{}.{}'.format(func.__module__, func.__qualname__)
+        timings = self.timings
+        logger = self._logger
+
+        @functools.wraps(func)
+        def new_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                (run_timings if timings is None else timings).add(name,
+                                                                  elapsed)
+                logger.debug("%s took %.6f s", name, elapsed)
+
+        return new_func
+
+    def start(self):
+        if self.name is None:
+            raise ValueError("timed needs a name when it is used as a "
+                             "context manager or started by hand")
+        self.counters = {}
+        self.elapsed = None
+        self._start = time.perf_counter()
+        return self
+
+    def count(self, key, value=1):
+        """
+        add value to the counter key of this call
+        """
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def stop(self, **counters):
+        """
+        stop the timer and add the call to the run timings
+        """
+        self.elapsed = time.perf_counter() - self._start
+        for key, value in counters.items():
+            self.count(key, value)
+        timings = run_timings if self.timings is None else self.timings
+        timings.add(self.name, self.elapsed, **self.counters)
+        self._logger.debug("%s took %.6f s", self.name, self.elapsed)
+        return self.elapsed
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
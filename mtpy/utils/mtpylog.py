@@ -8,7 +8,6 @@ see also: http://www.cdotson.com/2015/11/python-logging-best-practices/
 
 import os
 # import json
-import yaml
 import logging
 import logging.config
 import inspect
@@ -46,6 +45,8 @@ class MtPyLog(object):
             logging.info('Effective yaml configuration file %s', yaml_path)
 
             if os.path.exists(yaml_path):
+                import yaml
+
                 with open(yaml_path, 'rt') as f:
                     config = yaml.safe_load(f.read())
                 logging.config.dictConfig(config)
@@ -27,9 +27,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from mpl_toolkits.axes_grid1 import make_axes_locatable
-from shapely.geometry import Point, Polygon, LineString, LinearRing
+from shapely.geometry import Point, Polygon, LineString
 
 from mtpy.core.edi_collection import EdiCollection
+import mtpy.imaging.mtplottools as mtplottools
 from mtpy.utils.mtpy_decorator import deprecated
 from mtpy.utils.mtpylog import MtPyLog
 from mtpy.utils.edi_folders import recursive_glob
@@ -42,6 +43,74 @@ _logger = MtPyLog.get_mtpy_logger(__name__)  # logger inside this file/module
 _logger.setLevel(logging.DEBUG)  # set your logger level
 
 
+def get_ellipse_size(phi_min, phi_max, ellipsize):
+    """
+    width and height of phase tensor ellipses, scaled so that the major axis
+    is ellipsize. Ellipses with a zero or out of range (>100) phi_min or
+    phi_max are shrunk to a dot.
+
+    :param phi_min: array of phi_min values
+    :param phi_max: array of phi_max values
+    :param ellipsize: size of the major axis in units of the CRS
+    :return: (width, height) arrays
+    """
+    phi_min = np.asarray(phi_min, dtype=float)
+    phi_max = np.asarray(phi_max, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaling = ellipsize / phi_max
+    width = phi_max * scaling
+    height = phi_min * scaling
+
+    # Find invalid ellipses
+    bad = (phi_min == 0) | (phi_min > 100) | (phi_max == 0) | (phi_max > 100)
+    dot = 0.0000001 * ellipsize
+    width[bad] = dot
+    height[bad] = dot
+
+    return width, height
+
+
+def get_tipper_vertices(x0, y0, tip_mag, tip_ang, line_length):
+    """
+    start and end points of induction arrow lines for many tippers at once.
+
+    :param x0: array of station x (lon)
+    :param y0: array of station y (lat)
+    :param tip_mag: array of tipper magnitudes
+    :param tip_ang: array of tipper angles in degrees
+    :param line_length: length of a unit tipper in units of the CRS, scalar
+                        or array
+    :return: array of shape (n_lines, 2, 2) of x, y vertices
+    """
+    x0 = np.asarray(x0, dtype=float)
+    y0 = np.asarray(y0, dtype=float)
+    length = line_length * np.asarray(tip_mag, dtype=float)
+    angle = -np.deg2rad(np.asarray(tip_ang, dtype=float))
+
+    vertices = np.zeros((x0.size, 2, 2))
+    vertices[:, 0, 0] = x0
+    vertices[:, 0, 1] = y0
+    vertices[:, 1, 0] = x0 + length * np.cos(angle)
+    vertices[:, 1, 1] = y0 + length * np.sin(angle)
+
+    return vertices
+
+
+def get_tipper_line_length(tip_mag, line_length, groups=None):
+    """
+    length of a unit tipper so that the longest arrow is line_length, in each
+    group (e.g. period) if groups is given.
+    """
+    tip_mag = pd.Series(np.asarray(tip_mag, dtype=float))
+    if groups is None:
+        tip_mag_max = np.full(tip_mag.size, tip_mag.max())
+    else:
+        tip_mag_max = tip_mag.groupby(np.asarray(groups)).transform('max').values
+
+    return np.where(tip_mag_max > 0.00000001, line_length / tip_mag_max,
+                    line_length)
+
+
 class ShapefilesCreator(EdiCollection):
     """ Extend the EdiCollection parent class,
     create phase tensor and tipper shapefiles for a list of edifiles
@@ -146,37 +215,13 @@ class ShapefilesCreator(EdiCollection):
 
         geopdf = gpd.GeoDataFrame(pdf, crs=self.orig_crs, geometry=mt_locations)
 
-        # points to trace out the polygon-ellipse
-        theta = np.arange(0, 2 * np.pi, np.pi / 30.)
-        azimuth = -np.deg2rad(geopdf['azimuth'])
-        scaling = ellipsize / geopdf['phi_max']
-        width = geopdf['phi_max'] * scaling
-        height = geopdf['phi_min'] * scaling
-        x0 = geopdf['lon']
-        y0 = geopdf['lat']
-
-        # Find invalid ellipses
-        bad_min = np.where(np.logical_or(geopdf['phi_min'] == 0, geopdf['phi_min'] > 100))[0]
-        bad_max = np.where(np.logical_or(geopdf['phi_max'] == 0, geopdf['phi_max'] > 100))[0]
-        dot = 0.0000001 * ellipsize
-        height[bad_min] = dot
-        height[bad_max] = dot
-        width[bad_min] = dot
-        width[bad_max] = dot
-
-        # apply formula to generate ellipses
-        ellipse_list = []
-        for i in range(0, len(azimuth)):
-            x = x0[i] + height[i] * np.cos(theta) * np.cos(azimuth[i]) - \
-                width[i] * np.sin(theta) * np.sin(azimuth[i])
-            y = y0[i] + height[i] * np.cos(theta) * np.sin(azimuth[i]) + \
-                width[i] * np.sin(theta) * np.cos(azimuth[i])
-
-            polyg = Polygon(LinearRing([xy for xy in zip(x, y)]))
-
-            # print polyg  # an ellispe
-
-            ellipse_list.append(polyg)
+        width, height = get_ellipse_size(geopdf['phi_min'], geopdf['phi_max'],
+                                         ellipsize)
+        # full axes and an angle anti-clockwise from x for mtplottools
+        vertices = mtplottools.get_ellipse_vertices(
+            geopdf['lon'], geopdf['lat'], 2 * height, 2 * width,
+            -geopdf['azimuth'], n_points=60)
+        ellipse_list = [Polygon(xy) for xy in vertices]
 
         geopdf = gpd.GeoDataFrame(geopdf, crs=self.orig_crs, geometry=ellipse_list)
 
@@ -216,21 +261,14 @@ class ShapefilesCreator(EdiCollection):
 
         pdf = pd.DataFrame(pt)
 
-        tip_mag_re_maxval = pdf['tip_mag_re'].max()
-
-        if (tip_mag_re_maxval > 0.00000001):
-            line_length_normalized = line_length / tip_mag_re_maxval
-        else:
-            line_length_normalized = line_length
+        line_length_normalized = get_tipper_line_length(pdf['tip_mag_re'],
+                                                        line_length)
 
         self._logger.debug(pdf['period'])
 
-        pdf['tip_re'] = pdf.apply(lambda x:
-                                  LineString([(float(x.lon), float(x.lat)),
-                                              (float(x.lon) + line_length_normalized * x.tip_mag_re * np.cos(
-                                                  -np.deg2rad(x.tip_ang_re)),
-                                               float(x.lat) + line_length_normalized * x.tip_mag_re * np.sin(
-                                                   -np.deg2rad(x.tip_ang_re)))]), axis=1)
+        vertices = get_tipper_vertices(pdf['lon'], pdf['lat'], pdf['tip_mag_re'],
+                                       pdf['tip_ang_re'], line_length_normalized)
+        pdf['tip_re'] = [LineString(xy) for xy in vertices]
 
         geopdf = gpd.GeoDataFrame(pdf, crs=self.orig_crs, geometry='tip_re')
 
@@ -271,21 +309,14 @@ class ShapefilesCreator(EdiCollection):
 
         pdf = pd.DataFrame(pt)
 
-        tip_mag_im_maxval = pdf['tip_mag_im'].max()
-
-        if (tip_mag_im_maxval > 0.00000001):
-            line_length_normalized = line_length / tip_mag_im_maxval
-        else:
-            line_length_normalized = line_length
+        line_length_normalized = get_tipper_line_length(pdf['tip_mag_im'],
+                                                        line_length)
 
         self._logger.debug(pdf['period'])
 
-        pdf['tip_im'] = pdf.apply(lambda x: LineString([(float(x.lon), float(x.lat)),
-                                                        (float(x.lon) + line_length_normalized * x.tip_mag_im * np.cos(
-                                                            -np.deg2rad(x.tip_ang_im)),
-                                                         float(x.lat) + line_length_normalized * x.tip_mag_im * np.sin(
-                                                             -np.deg2rad(x.tip_ang_im)))]),
-                                  axis=1)
+        vertices = get_tipper_vertices(pdf['lon'], pdf['lat'], pdf['tip_mag_im'],
+                                       pdf['tip_ang_im'], line_length_normalized)
+        pdf['tip_im'] = [LineString(xy) for xy in vertices]
 
         geopdf = gpd.GeoDataFrame(pdf, crs=self.orig_crs, geometry='tip_im')
 
@@ -304,6 +335,128 @@ class ShapefilesCreator(EdiCollection):
 
         return (geopdf, path2shp)
 
+    def get_phase_tensor_tipper_layers(self, period_list=None, ellipsize=None,
+                                       line_length=None, interpolate=True,
+                                       target_epsg_code=4283):
+        """
+        phase tensor ellipses, real and imaginary tipper lines of all stations
+        and periods, built from one survey table as array operations.
+
+        The geometries are the same as create_phase_tensor_shp,
+        create_tipper_real_shp and create_tipper_imag_shp for each period,
+        the tipper lines are normalised by the largest tipper of each period.
+
+        :param period_list: list of periods, default all unique periods
+        :param ellipsize: max ellipse size, default half of the 1% quantile of
+                          the station distances
+        :param line_length: max tipper length, default the 1% quantile of
+                            the station distances
+        :param interpolate: interpolate the stations onto period_list
+        :param target_epsg_code: epsg code of the layers, None to keep the
+                                 original CRS
+        :return: dict of geopandas dataframes with keys 'Phase_Tensor',
+                 'Tipper_Real' and 'Tipper_Imag'
+        """
+        if period_list is None:
+            period_list = self.all_unique_periods
+        if ellipsize is None:
+            ellipsize = self.stations_distances.get("Q1PERCENT") / 2
+            self._logger.debug("Automatically Selected Max-Ellispse Size = %s", ellipsize)
+        if line_length is None:
+            line_length = self.stations_distances.get("Q1PERCENT")
+            self._logger.debug("Automatically Selected Max Tipper Length  = %s", line_length)
+
+        survey_df = self.get_survey_table(period_list, interpolate=interpolate)
+
+        # stations out of the period range have no phase tensor
+        no_data = survey_df[['phi_min', 'phi_max', 'azimuth']].isnull().any(axis=1)
+        if no_data.any():
+            self._logger.warn("%s of %s station periods have no data. Skipping!!!",
+                              no_data.sum(), len(survey_df))
+        survey_df = survey_df[~no_data]
+
+        pdf = pd.DataFrame({'station': survey_df['STATION'].values,
+                            'period': 1. / survey_df['FREQ'].values,
+                            'lon': survey_df['LON'].values,
+                            'lat': survey_df['LAT'].values})
+        for key in ['phi_min', 'phi_max', 'azimuth', 'skew', 'n_skew',
+                    'elliptic', 'tip_mag_re', 'tip_mag_im', 'tip_ang_re',
+                    'tip_ang_im']:
+            pdf[key] = survey_df[key].values
+
+        width, height = get_ellipse_size(pdf['phi_min'], pdf['phi_max'],
+                                         ellipsize)
+        # full axes and an angle anti-clockwise from x for mtplottools
+        vertices = mtplottools.get_ellipse_vertices(
+            pdf['lon'], pdf['lat'], 2 * height, 2 * width, -pdf['azimuth'],
+            n_points=60)
+        layers = {'Phase_Tensor': [Polygon(xy) for xy in vertices]}
+
+        for layer, comp in [('Tipper_Real', 're'), ('Tipper_Imag', 'im')]:
+            line_length_normalized = get_tipper_line_length(
+                pdf['tip_mag_' + comp], line_length, groups=survey_df['FREQ'])
+            vertices = get_tipper_vertices(pdf['lon'], pdf['lat'],
+                                           pdf['tip_mag_' + comp],
+                                           pdf['tip_ang_' + comp],
+                                           line_length_normalized)
+            layers[layer] = [LineString(xy) for xy in vertices]
+
+        for layer, geometry in layers.items():
+            geopdf = gpd.GeoDataFrame(pdf.copy(), crs=self.orig_crs,
+                                      geometry=geometry)
+            if target_epsg_code is not None:
+                geopdf.to_crs(epsg=target_epsg_code, inplace=True)
+            layers[layer] = geopdf
+
+        return layers
+
+    def create_phase_tensor_tipper_layers(self, period_list=None, ellipsize=None,
+                                          line_length=None, interpolate=True,
+                                          target_epsg_code=4283, driver='GPKG',
+                                          file_name=None):
+        """
+        write phase tensor ellipses, real and imaginary tipper lines of all
+        stations and periods in one go, see get_phase_tensor_tipper_layers.
+
+        With driver 'GPKG' the three layers are written to a single GeoPackage,
+        with 'ESRI Shapefile' to a shapefile for each layer.
+
+        :param driver: 'GPKG' or 'ESRI Shapefile'
+        :param file_name: name of the GeoPackage in outdir, default
+                          Phase_Tensor_Tipper_EPSG_<target_epsg_code>.gpkg
+        :return: (dict of geopandas dataframes, list of paths to the files)
+        """
+        if driver not in ['GPKG', 'ESRI Shapefile']:
+            raise ValueError("driver must be 'GPKG' or 'ESRI Shapefile', not {}".format(driver))
+
+        layers = self.get_phase_tensor_tipper_layers(
+            period_list=period_list, ellipsize=ellipsize,
+            line_length=line_length, interpolate=interpolate,
+            target_epsg_code=target_epsg_code)
+        if target_epsg_code is None:
+            target_epsg_code = self.orig_crs['init'][5:]
+
+        path_list = []
+        if driver == 'GPKG':
+            if file_name is None:
+                file_name = 'Phase_Tensor_Tipper_EPSG_{}.gpkg'.format(target_epsg_code)
+            outpath = os.path.join(self.outdir, file_name)
+            if os.path.exists(outpath):
+                os.remove(outpath)
+            for layer, geopdf in layers.items():
+                geopdf.to_file(outpath, layer=layer, driver=driver)
+            path_list.append(outpath)
+        else:
+            for layer, geopdf in layers.items():
+                outpath = os.path.join(self.outdir, '{}_EPSG_{}.shp'.format(
+                    layer, target_epsg_code))
+                geopdf.to_file(outpath, driver=driver)
+                path_list.append(outpath)
+
+        self._logger.info("Saved phase tensor and tipper layers to %s", path_list)
+
+        return (layers, path_list)
+
 
 def create_tensor_tipper_shapefiles(edi_dir, out_dir, periods,
                                     pt_base_size=None, pt_phi_max=None,
@@ -418,27 +571,13 @@ def create_ellipse_shp_from_csv(csvfile, esize=0.03, target_epsg_code=4283):
     phi_max_v = pdf['phi_max'].max()  # the max of this group of ellipse
 
     # points to trace out the polygon-ellipse
-    theta = np.arange(0, 2 * np.pi, np.pi / 30.)
-    azimuth = -np.deg2rad(pdf['azimuth'])
     width = esize * (pdf['phi_max'] / phi_max_v)
     height = esize * (pdf['phi_min'] / phi_max_v)
-    x0 = pdf['lon']
-    y0 = pdf['lat']
-
-    # apply formula to generate ellipses
-
-    ellipse_list = []
-    for i in range(0, len(azimuth)):
-        x = x0[i] + height[i] * np.cos(theta) * np.cos(azimuth[i]) - \
-            width[i] * np.sin(theta) * np.sin(azimuth[i])
-        y = y0[i] + height[i] * np.cos(theta) * np.sin(azimuth[i]) + \
-            width[i] * np.sin(theta) * np.cos(azimuth[i])
-
-        polyg = Polygon(LinearRing([xy for xy in zip(x, y)]))
-
-        # print polyg  # an ellispe
-
-        ellipse_list.append(polyg)
+    # full axes and an angle anti-clockwise from x for mtplottools
+    vertices = mtplottools.get_ellipse_vertices(
+        pdf['lon'], pdf['lat'], 2 * height, 2 * width, -pdf['azimuth'],
+        n_points=60)
+    ellipse_list = [Polygon(xy) for xy in vertices]
 
     pdf = gpd.GeoDataFrame(pdf, crs=crs, geometry=ellipse_list)
 
@@ -474,12 +613,9 @@ def create_tipper_real_shp_from_csv(csvfile, line_length=0.03, target_epsg_code=
 
     # geo_df = gpd.GeoDataFrame(pdf, crs=crs, geometry=mt_locations)
 
-    pdf['tip_re'] = pdf.apply(lambda x:
-                              LineString([(float(x.lon), float(x.lat)),
-                                          (float(x.lon) + line_length * x.tip_mag_re * np.cos(
-                                              -np.deg2rad(x.tip_ang_re)),
-                                           float(x.lat) + line_length * x.tip_mag_re * np.sin(
-                                               -np.deg2rad(x.tip_ang_re)))]), axis=1)
+    vertices = get_tipper_vertices(pdf['lon'], pdf['lat'], pdf['tip_mag_re'],
+                                   pdf['tip_ang_re'], line_length)
+    pdf['tip_re'] = [LineString(xy) for xy in vertices]
 
     pdf = gpd.GeoDataFrame(pdf, crs=crs, geometry='tip_re')
 
@@ -515,12 +651,9 @@ def create_tipper_imag_shp_from_csv(csvfile, line_length=0.03, target_epsg_code=
 
     # geo_df = gpd.GeoDataFrame(pdf, crs=crs, geometry=mt_locations)
 
-    pdf['tip_im'] = pdf.apply(lambda x:
-                              LineString([(float(x.lon), float(x.lat)),
-                                          (float(x.lon) + line_length * x.tip_mag_im * np.cos(
-                                              -np.deg2rad(x.tip_ang_im)),
-                                           float(x.lat) + line_length * x.tip_mag_im * np.sin(
-                                               -np.deg2rad(x.tip_ang_im)))]), axis=1)
+    vertices = get_tipper_vertices(pdf['lon'], pdf['lat'], pdf['tip_mag_im'],
+                                   pdf['tip_ang_im'], line_length)
+    pdf['tip_im'] = [LineString(xy) for xy in vertices]
 
     pdf = gpd.GeoDataFrame(pdf, crs=crs, geometry='tip_im')
 
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+TEST mtpy.analysis.distortion for single stations and surveys
+"""
+import copy
+import glob
+import os
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.distortion as distortion
+import mtpy.core.z as MTz
+from mtpy.core.mt import MT
+from tests import EDI_DATA_DIR, EDI_DATA_DIR2
+
+
+class Test_Distortion(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_list = [MT(fn) for fn in
+                       sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[:5] +
+                       sorted(glob.glob(os.path.join(EDI_DATA_DIR2, '*.edi')))[:5]]
+
+    def test_1d_distortion(self):
+        # a distorted 1D impedance gives D normalised by its determinant
+        freq = np.logspace(-2, 2, 20)
+        zxy = (1 + 1j) * np.sqrt(freq)
+        z0 = np.zeros((freq.size, 2, 2), dtype=complex)
+        z0[:, 0, 1] = zxy
+        z0[:, 1, 0] = -zxy
+        dis = np.array([[1.2, .3], [-.2, .8]])
+        z_obj = MTz.Z(z_array=np.matmul(dis, z0),
+                      z_err_array=np.abs(np.matmul(dis, z0)) * .05,
+                      freq=freq)
+
+        dis_est, dis_err = distortion.find_distortion(z_obj)
+        self.assertTrue(np.allclose(dis_est, dis / np.sqrt(np.linalg.det(dis))))
+        self.assertTrue(np.all(dis_err > 0))
+
+        d, new_z_obj = distortion.remove_distortion(z_object=z_obj)
+        self.assertTrue(np.allclose(new_z_obj.z,
+                                    z0 * np.sqrt(np.linalg.det(dis))))
+
+    def test_survey(self):
+        # stations padded with nan to a common number of frequencies
+        nf = max([mt_obj.Z.freq.size for mt_obj in self.mt_list])
+        z_array = np.full((len(self.mt_list), nf, 2, 2), np.nan, dtype=complex)
+        z_err_array = np.full((len(self.mt_list), nf, 2, 2), np.nan)
+        for ii, mt_obj in enumerate(self.mt_list):
+            z_array[ii, :mt_obj.Z.freq.size] = mt_obj.Z.z
+            z_err_array[ii, :mt_obj.Z.freq.size] = mt_obj.Z.z_err
+
+        for num_freq in [None, 12]:
+            dis, dis_err = distortion.find_distortion_array(
+                z_array, z_err_array, num_freq=num_freq)
+            self.assertEqual(dis.shape, (len(self.mt_list), 2, 2))
+            for ii, mt_obj in enumerate(self.mt_list):
+                dis_ii, dis_err_ii = distortion.find_distortion(
+                    copy.deepcopy(mt_obj.Z), num_freq=num_freq)
+                self.assertTrue(np.allclose(dis[ii], dis_ii))
+                self.assertTrue(np.allclose(dis_err[ii], dis_err_ii))
+
+    def test_num_freq_too_high(self):
+        z_obj = copy.deepcopy(self.mt_list[0].Z)
+        with self.assertLogs(distortion._logger, level='DEBUG') as log:
+            dis, dis_err = distortion.find_distortion(
+                z_obj, num_freq=z_obj.freq.size + 10)
+        self.assertIn('setting num_freq to {0}'.format(z_obj.freq.size),
+                      log.output[0])
+        dis_all, dis_err_all = distortion.find_distortion(z_obj)
+        self.assertTrue(np.allclose(dis, dis_all))
+
+    def test_remove_distortion_array(self):
+        # same as removing the distortion one frequency at a time
+        dis = np.array([[1.1, .2], [.1, .9]])
+        dis_err = np.array([[.01, .02], [.03, .04]])
+        for mt_obj in self.mt_list[:3]:
+            z_obj = copy.deepcopy(mt_obj.Z)
+            d, z_loop, z_err_loop = z_obj.remove_distortion(
+                dis, distortion_err_tensor=dis_err)
+            z_new, z_err_new = distortion.remove_distortion_array(
+                z_obj.z, z_obj.z_err, dis, dis_err)
+            self.assertTrue(np.allclose(z_new, z_loop))
+            self.assertTrue(np.allclose(z_err_new, z_err_loop))
+
+    def test_remove_distortion_survey(self):
+        dis, z_obj_list = distortion.remove_distortion_survey(self.mt_list)
+        for ii, mt_obj in enumerate(self.mt_list):
+            d, new_z_obj = distortion.remove_distortion(
+                z_object=copy.deepcopy(mt_obj.Z))
+            self.assertTrue(np.allclose(dis[ii], d))
+            self.assertTrue(np.allclose(z_obj_list[ii].z, new_z_obj.z))
+            self.assertTrue(np.allclose(z_obj_list[ii].z_err, new_z_obj.z_err))
+
+    def test_masks(self):
+        z_obj = copy.deepcopy(self.mt_list[0].Z)
+        dis, dis_err = distortion.find_distortion(z_obj)
+
+        # zeros in z are no distortion, nan frequencies are left out
+        z_array = np.concatenate([z_obj.z, np.zeros((2, 2, 2)),
+                                  np.full((3, 2, 2), np.nan)])
+        z_err_array = np.concatenate([z_obj.z_err, np.zeros((2, 2, 2)),
+                                      np.full((3, 2, 2), np.nan)])
+        dis_contrib, dis_err_contrib = distortion._distortion_contributions(
+            z_array, z_err_array)
+        self.assertTrue(np.all(dis_contrib[-5:-3] == np.identity(2)))
+        self.assertTrue(np.all(dis_err_contrib[-5:-3] == 1))
+
+        dis_nan, dis_err_nan = distortion.find_distortion_array(
+            np.concatenate([z_obj.z, np.full((3, 2, 2), np.nan)]),
+            np.concatenate([z_obj.z_err, np.full((3, 2, 2), np.nan)]))
+        self.assertTrue(np.allclose(dis_nan, dis))
+
+        # no valid frequency gives no distortion
+        dis_none, dis_err_none = distortion.find_distortion_array(
+            np.full((4, 2, 2), np.nan, dtype=complex))
+        self.assertTrue(np.all(dis_none == np.identity(2)))
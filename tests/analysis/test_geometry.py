@@ -112,3 +112,62 @@ class Test_Geometry(TestCase):
                 strike_angle_pb42c[np.isfinite(strike_angle_pb42c)],
                 1e-8)
         )
+
+
+class Test_SurveyStrike(TestCase):
+    def setUp(self):
+        edi_path = os.path.join(TEST_MTPY_ROOT, 'examples/data/edi_files')
+        self.mt_list = [MT(os.path.join(edi_path, fn)) for fn in
+                        sorted(os.listdir(edi_path))[:6]]
+        self.nf = min([mt_obj.Z.z.shape[0] for mt_obj in self.mt_list])
+        self.z = np.array([mt_obj.Z.z[:self.nf] for mt_obj in self.mt_list])
+        self.tipper = np.array([mt_obj.Tipper.tipper[:self.nf]
+                                for mt_obj in self.mt_list])
+        self.period = 1. / self.mt_list[0].Z.freq[:self.nf]
+
+    def test_matches_station_by_station(self):
+        from mtpy.analysis.pt import PhaseTensor
+        from mtpy.analysis.zinvariants import Zinvariants
+        s_dict = mtg.survey_strike(self.z, tipper_array=self.tipper)
+        for ii in range(len(self.mt_list)):
+            zs = 90 - Zinvariants(z_array=self.z[ii],
+                                  freq=self.mt_list[ii].Z.freq[:self.nf]).strike
+            zs[zs > 90] -= 180
+            zs[zs < -90] += 180
+            pt_obj = PhaseTensor(z_array=self.z[ii])
+            az = 90 - pt_obj.azimuth
+            az[pt_obj.phimax == 0] = np.nan
+            az[az > 90] -= 180
+            az[az < -90] += 180
+            tipr = -np.rad2deg(np.arctan2(-self.tipper[ii, :, 0, 1].real,
+                                          -self.tipper[ii, :, 0, 0].real))
+            tipr[tipr == 180.] = 0.0
+            tipr[tipr > 90] -= 180
+            tipr[tipr < -90] += 180
+
+            self.assertTrue(np.allclose(s_dict['inv_strike'][ii], zs,
+                                        equal_nan=True))
+            self.assertTrue(np.allclose(s_dict['pt_strike'][ii], az,
+                                        equal_nan=True))
+            self.assertTrue(np.allclose(s_dict['tip_strike'][ii], tipr,
+                                        equal_nan=True))
+            self.assertTrue(np.all(s_dict['dimensionality'][ii] ==
+                                   mtg.dimensionality(z_array=self.z[ii])))
+
+    def test_parallel_chunks(self):
+        s_serial = mtg.survey_strike(self.z, tipper_array=self.tipper,
+                                     period=self.period, fold=False)
+        s_parallel = mtg.survey_strike(self.z, tipper_array=self.tipper,
+                                       period=self.period, fold=False,
+                                       n_processes=2, chunk_size=4)
+        for key, value in s_serial.items():
+            self.assertTrue(np.allclose(s_parallel[key], value,
+                                        equal_nan=True), key)
+
+    def test_histograms(self):
+        s_dict = mtg.survey_strike(self.z, period=self.period, bin_width=10)
+        strike = s_dict['inv_strike']
+        n_good = np.count_nonzero(np.isfinite(strike) & (strike != 0))
+        self.assertEqual(s_dict['inv_hist'].shape,
+                         (len(s_dict['band_edges']) - 1, 18))
+        self.assertEqual(s_dict['inv_hist'].sum(), n_good)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+TEST mtpy.analysis.niblettbostick against period by period loops
+"""
+import copy
+import glob
+import os
+from unittest import TestCase
+
+import numpy as np
+import scipy.interpolate as spi
+
+import mtpy.analysis.geometry as mtg
+import mtpy.analysis.niblettbostick as mtnb
+import mtpy.utils.calculator as mtcc
+from mtpy.core.mt import MT
+from tests import EDI_DATA_DIR, EDI_DATA_DIR2
+
+
+def _resphi(z, period):
+    return 0.2 * np.abs(z) ** 2 * period, np.rad2deg(np.angle(z))
+
+
+def _loop_depth_nb(z_object):
+    # calculate_depth_nb as it was, one period at a time
+    z_obj = copy.deepcopy(z_object)
+    periods = 1. / z_obj.freq
+    dimensions = mtg.dimensionality(z_array=z_obj.z)
+    angles = mtg.strike_angle(z_array=z_obj.z)
+    angles_2d = np.nan_to_num(angles[np.where(dimensions != 3)][:, 0])
+    periods_2d = periods[np.where(dimensions != 3)]
+    strike_interp = spi.interp1d(periods_2d, angles_2d, bounds_error=False,
+                                 fill_value=0)
+    z_obj.rotate(strike_interp(periods))
+
+    depth_list = []
+    for ii, per in enumerate(periods):
+        te_rho, te_depth = mtnb.rhophi2rhodepth(z_obj.resistivity[ii, 0, 1],
+                                                z_obj.phase[ii, 0, 1], per)
+        tm_rho, tm_depth = mtnb.rhophi2rhodepth(z_obj.resistivity[ii, 1, 0],
+                                                z_obj.phase[ii, 1, 0], per)
+        depth_list.append([min(te_depth, tm_depth), max(te_depth, tm_depth),
+                           min(te_rho, tm_rho), max(te_rho, tm_rho)])
+    return np.array(depth_list)
+
+
+def _loop_rho_minmax(z, periods, rotsteps=360):
+    # calculate_rho_minmax as it was, a rotation at a time
+    dimensions = mtg.dimensionality(z_array=z)
+    rotangles = np.arange(rotsteps) * 180. / rotsteps
+    lo_nb_max = []
+    lo_nb_min = []
+    for z_curr, per in zip(z[dimensions != 3], periods[dimensions != 3]):
+        temp_vals = np.zeros((rotsteps, 4))
+        for jj, d in enumerate(rotangles):
+            new_z = mtcc.rotatematrix_incl_errors(z_curr, d)[0]
+            res, phs = _resphi(new_z, per)
+            te_rho, te_depth = mtnb.rhophi2rhodepth(res[0, 1], phs[0, 1], per)
+            tm_rho, tm_depth = mtnb.rhophi2rhodepth(res[1, 0], phs[1, 0], per)
+            temp_vals[jj] = [te_depth, te_rho, tm_depth, tm_rho]
+
+        column = np.argmax([np.max(temp_vals[:, 1]),
+                            np.max(temp_vals[:, 3])]) * 2 + 1
+        maxidx = np.argmax(temp_vals[:, column])
+        # the other mode at the angle of the maximum
+        min_column = 4 - column
+        lo_nb_max.append([temp_vals[maxidx, column - 1],
+                          temp_vals[maxidx, column], rotangles[maxidx]])
+        lo_nb_min.append([temp_vals[maxidx, min_column - 1],
+                          temp_vals[maxidx, min_column]])
+    return np.array(lo_nb_max), np.array(lo_nb_min)
+
+
+def _loop_znb(z, periods):
+    # calculate_znb one period at a time
+    dimensions = mtg.dimensionality(z_array=z)
+    angles = mtg.strike_angle(z_array=z)[dimensions != 3, 0]
+    periods2 = periods[dimensions != 3]
+    angles_incl1D = mtnb.interpolate_strike_angles(angles, periods2)
+    lo_nb_max = []
+    lo_nb_min = []
+    for z_curr, per, angle in zip(z[dimensions != 3], periods2, angles_incl1D):
+        res, phs = _resphi(mtcc.rotatematrix_incl_errors(z_curr, -angle)[0], per)
+        te = mtnb.rhophi2rhodepth(res[0, 1], phs[0, 1], per)[::-1]
+        tm = mtnb.rhophi2rhodepth(res[1, 0], phs[1, 0], per)[::-1]
+        if te[1] > tm[1]:
+            lo_nb_max.append(te)
+            lo_nb_min.append(tm)
+        else:
+            lo_nb_max.append(tm)
+            lo_nb_min.append(te)
+    return np.array(lo_nb_max), np.array(lo_nb_min)
+
+
+class Test_NiblettBostick(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mt_list = [MT(fn) for fn in
+                       sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[:4] +
+                       sorted(glob.glob(os.path.join(EDI_DATA_DIR2, '*.edi')))[:4]]
+
+    def test_depth_nb(self):
+        for mt_obj in self.mt_list:
+            depth_array = mtnb.calculate_depth_nb(z_object=mt_obj.Z)
+            expected = _loop_depth_nb(mt_obj.Z)
+            for ii, key in enumerate(['depth_min', 'depth_max', 'rho_min',
+                                      'rho_max']):
+                self.assertTrue(np.allclose(depth_array[key], expected[:, ii],
+                                            equal_nan=True))
+
+    def test_depth_nb_survey(self):
+        # stations on a common period axis in one go
+        mt_list = self.mt_list[:4]
+        z_array = np.array([mt_obj.Z.z for mt_obj in mt_list])
+        depth_array = mtnb.calculate_depth_nb_array(z_array,
+                                                    1. / mt_list[0].Z.freq)
+        self.assertEqual(depth_array.shape, z_array.shape[:2])
+        for ii, mt_obj in enumerate(mt_list):
+            station_array = mtnb.calculate_depth_nb(z_object=mt_obj.Z)
+            self.assertTrue(np.allclose(depth_array[ii]['depth_max'],
+                                        station_array['depth_max'],
+                                        equal_nan=True))
+
+    def test_depth_nb_no_side_effect(self):
+        z_obj = self.mt_list[0].Z
+        z_before = z_obj.z.copy()
+        mtnb.calculate_depth_nb(z_object=z_obj)
+        self.assertTrue(np.all(z_obj.z == z_before))
+
+    def test_rho_minmax(self):
+        mt_obj = self.mt_list[0]
+        z = mt_obj.Z.z[::4]
+        periods = 1. / mt_obj.Z.freq[::4]
+        nb_max, nb_min = mtnb.calculate_rho_minmax(z_array=z, periods=periods)
+        expected_max, expected_min = _loop_rho_minmax(z, periods)
+        self.assertTrue(nb_max.shape[0] > 0)
+        self.assertTrue(np.allclose(nb_max[:, :2], expected_max[:, :2]))
+        self.assertTrue(np.allclose(nb_min, expected_min))
+        # TE and TM swap for a rotation of 90 degrees, so the angle of the
+        # maximum is only defined modulo 90 degrees
+        angle_diff = (nb_max[:, 2] - expected_max[:, 2]) % 90
+        self.assertTrue(np.all(np.minimum(angle_diff, 90 - angle_diff) < 1e-6))
+
+    def test_znb(self):
+        for mt_obj in self.mt_list[:3]:
+            z = mt_obj.Z.z
+            periods = 1. / mt_obj.Z.freq
+            nb_max, nb_min = mtnb.calculate_znb(z_array=z, periods=periods)
+            expected_max, expected_min = _loop_znb(z, periods)
+            self.assertTrue(np.allclose(nb_max, expected_max))
+            self.assertTrue(np.allclose(nb_min, expected_min))
+
+    def test_interpolate_strike_angles(self):
+        angles = np.array([np.nan, 10., np.nan, np.nan, 40., 20., np.nan, 5.])
+        periods = np.logspace(-2, 2, 8)
+        new_angles = mtnb.interpolate_strike_angles(angles, periods)
+
+        self.assertEqual(new_angles[0], 0)
+        self.assertTrue(np.allclose(new_angles[[1, 4, 5, 7]],
+                                    angles[[1, 4, 5, 7]]))
+        self.assertTrue(np.allclose(new_angles[2:4],
+                                    np.interp(periods[2:4], periods[[1, 4]],
+                                              angles[[1, 4]])))
+        # order of the input does not matter
+        self.assertTrue(np.allclose(
+            mtnb.interpolate_strike_angles(angles[::-1], periods[::-1]),
+            new_angles[::-1]))
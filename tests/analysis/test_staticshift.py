@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+TEST mtpy.analysis.staticshift survey corrector against station by station
+interpolation
+"""
+import glob
+import os
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.analysis.staticshift as ss
+import mtpy.utils.gis_tools as gis_tools
+from mtpy.core.mt import MT
+from tests import EDI_DATA_DIR, EDI_DATA_DIR2, make_temp_dir
+
+
+def _loop_static_shift(mt_list, radius, num_freq=20, freq_skip=4):
+    # median filter of each station, interpolating one neighbour at a time
+    utm_points = gis_tools.project_point_ll2utm(
+        np.array([mt_obj.lat for mt_obj in mt_list]),
+        np.array([mt_obj.lon for mt_obj in mt_list]))
+    station_index, neighbour_index, distance = ss.get_station_neighbours(
+        utm_points['easting'], utm_points['northing'], radius)
+
+    static_shift = np.ones((len(mt_list), 2))
+    for ii, mt_obj in enumerate(mt_list):
+        neighbours = neighbour_index[station_index == ii]
+        if neighbours.size == 0:
+            continue
+        interp_freq = mt_obj.Z.freq[freq_skip:num_freq + freq_skip]
+        res_array = np.full((neighbours.size, interp_freq.size, 2), np.nan)
+        for kk, jj in enumerate(neighbours):
+            mt_obj_kk = mt_list[jj]
+            interp_idx = np.where((interp_freq >= mt_obj_kk.Z.freq.min()) &
+                                  (interp_freq <= mt_obj_kk.Z.freq.max()))[0]
+            z_interp, tip_interp = mt_obj_kk.interpolate(interp_freq[interp_idx])
+            res_array[kk, interp_idx, 0] = z_interp.resistivity[:, 0, 1]
+            res_array[kk, interp_idx, 1] = z_interp.resistivity[:, 1, 0]
+
+        res = mt_obj.Z.resistivity[freq_skip:num_freq + freq_skip]
+        static_shift[ii] = [
+            np.nanmedian(res[:, 0, 1] / np.nanmedian(res_array[:, :, 0], axis=0)),
+            np.nanmedian(res[:, 1, 0] / np.nanmedian(res_array[:, :, 1], axis=0))]
+    return static_shift
+
+
+class Test_StaticShift(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.edi_list = sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))
+        cls.mt_list = [MT(fn) for fn in cls.edi_list]
+
+    def test_neighbours(self):
+        east = np.array([0., 100., 250., 1000., 1000.])
+        north = np.array([0., 0., 0., 0., 0.])
+        station_index, neighbour_index, distance = \
+            ss.get_station_neighbours(east, north, 200.)
+        pairs = sorted(zip(station_index, neighbour_index))
+        self.assertEqual(pairs, [(0, 1), (1, 0), (1, 2), (2, 1), (3, 4), (4, 3)])
+        self.assertTrue(np.allclose(
+            distance, np.abs(east[station_index] - east[neighbour_index])))
+
+    def test_survey(self):
+        ss_dict = ss.estimate_static_shift_survey(mt_obj_list=self.mt_list,
+                                                  radius=1500, shift_tol=0)
+        self.assertTrue(np.all(ss_dict['station'] ==
+                               [mt_obj.station for mt_obj in self.mt_list]))
+        expected = _loop_static_shift(self.mt_list, 1500)
+        self.assertTrue(np.allclose(ss_dict['ss_x'], expected[:, 0]))
+        self.assertTrue(np.allclose(ss_dict['ss_y'], expected[:, 1]))
+        # stations without neighbours are not corrected
+        self.assertTrue(np.all(ss_dict['ss_x'][ss_dict['n_neighbours'] == 0] == 1))
+
+    def test_survey_different_periods(self):
+        mt_list = [MT(fn) for fn in
+                   sorted(glob.glob(os.path.join(EDI_DATA_DIR2, '*.edi')))[:10]]
+        ss_dict = ss.estimate_static_shift_survey(mt_obj_list=mt_list,
+                                                  radius=40000, shift_tol=0)
+        expected = _loop_static_shift(mt_list, 40000)
+        self.assertTrue(np.allclose(ss_dict['ss_x'], expected[:, 0]))
+        self.assertTrue(np.allclose(ss_dict['ss_y'], expected[:, 1]))
+
+    def test_shift_tol(self):
+        ss_dict = ss.estimate_static_shift_survey(mt_obj_list=self.mt_list,
+                                                  radius=1500, shift_tol=.15)
+        for key in ['ss_x', 'ss_y']:
+            self.assertFalse(np.any((np.abs(ss_dict[key] - 1) < .15) &
+                                    (ss_dict[key] != 1)))
+
+    def test_remove_static_shift_survey(self):
+        save_path = os.path.join(self._temp_dir, 'SS')
+        for n_processes in [1, 2]:
+            new_edi_list, ss_dict = ss.remove_static_shift_survey(
+                self.edi_list[:5], save_path=save_path, radius=1500,
+                n_processes=n_processes)
+            self.assertEqual(len(new_edi_list), 5)
+            for ii, new_edi_fn in enumerate(new_edi_list):
+                mt_obj = self.mt_list[ii]
+                mt_ss = MT(new_edi_fn)
+                self.assertTrue(np.allclose(
+                    mt_ss.Z.z[:, 0, 1],
+                    mt_obj.Z.z[:, 0, 1] / np.sqrt(ss_dict['ss_x'][ii]),
+                    rtol=1e-3))
+                self.assertTrue(np.allclose(
+                    mt_ss.Z.z[:, 1, 0],
+                    mt_obj.Z.z[:, 1, 0] / np.sqrt(ss_dict['ss_y'][ii]),
+                    rtol=1e-3))
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+TEST mtpy.analysis.zinvariants
+"""
+import glob
+import os
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.analysis.zinvariants import Zinvariants, compute_invariants
+from mtpy.core.mt import MT
+from tests import TEST_MTPY_ROOT
+
+
+def _strike_loop(z):
+    """
+    strike and strike error one frequency at a time as originally written
+    """
+    strike = np.zeros(z.shape[0])
+    strike_err = np.zeros(z.shape[0])
+    for ii in range(z.shape[0]):
+        x1 = .5 * (z[ii, 0, 0].real + z[ii, 1, 1].real)
+        x2 = .5 * (z[ii, 0, 1].real + z[ii, 1, 0].real)
+        x3 = .5 * (z[ii, 0, 0].real - z[ii, 1, 1].real)
+        x4 = .5 * (z[ii, 0, 1].real - z[ii, 1, 0].real)
+        e1 = .5 * (z[ii, 0, 0].imag + z[ii, 1, 1].imag)
+        e2 = .5 * (z[ii, 0, 1].imag + z[ii, 1, 0].imag)
+        e3 = .5 * (z[ii, 0, 0].imag - z[ii, 1, 1].imag)
+        e4 = .5 * (z[ii, 0, 1].imag - z[ii, 1, 0].imag)
+        ex = x1 * e1 - x2 * e2 - x3 * e3 + x4 * e4
+        if ex == 0.0:
+            strike[ii] = np.nan
+            strike_err[ii] = np.nan
+            continue
+        d12 = (x1 * e2 - x2 * e1) / ex
+        d34 = (x3 * e4 - x4 * e3) / ex
+        d13 = (x1 * e3 - x3 * e1) / ex
+        d24 = (x2 * e4 - x4 * e2) / ex
+        d41 = (x4 * e1 - x1 * e4) / ex
+        d23 = (x2 * e3 - x3 * e2) / ex
+        q = np.sqrt((d12 - d34) ** 2 + (d13 + d24) ** 2)
+        inv7 = (d41 - d23) / q
+        strike[ii] = (180 / np.pi) * .5 * np.arctan2(d12 - d34, d13 + d24)
+        strike_err[ii] = (180 / np.pi) * abs(.5 * np.arcsin(inv7))
+    return strike, strike_err
+
+
+class TestZinvariants(TestCase):
+    def setUp(self):
+        edi_path = os.path.join(TEST_MTPY_ROOT, 'examples/data/edi_files')
+        self.mt_list = [MT(fn) for fn in
+                        sorted(glob.glob(os.path.join(edi_path, '*.edi')))[:5]]
+
+    def test_strike_matches_loop(self):
+        for mt_obj in self.mt_list:
+            zinv = Zinvariants(mt_obj.Z)
+            strike, strike_err = _strike_loop(mt_obj.Z.z)
+            self.assertTrue(np.allclose(zinv.strike, strike, equal_nan=True))
+            self.assertTrue(np.allclose(zinv.strike_err, strike_err,
+                                        equal_nan=True))
+
+    def test_stack(self):
+        nf = min([mt_obj.Z.z.shape[0] for mt_obj in self.mt_list])
+        z_stack = np.array([mt_obj.Z.z[:nf] for mt_obj in self.mt_list])
+        inv_dict = compute_invariants(z_stack)
+        self.assertEqual(inv_dict['strike'].shape, (len(self.mt_list), nf))
+        for ii, mt_obj in enumerate(self.mt_list):
+            inv_one = compute_invariants(mt_obj.Z.z[:nf])
+            for key, value in inv_one.items():
+                self.assertTrue(np.allclose(inv_dict[key][ii], value,
+                                            equal_nan=True))
+
+    def test_undefined_is_nan(self):
+        z = self.mt_list[0].Z.z.copy()
+        z[2] = 0
+        z[4] = np.nan
+        inv_dict = compute_invariants(z)
+        for key, value in inv_dict.items():
+            self.assertTrue(np.isnan(value[2]), key)
+            self.assertTrue(np.isnan(value[4]), key)
+            self.assertTrue(np.isfinite(value[0]), key)
+
+    def test_all_zeros(self):
+        inv_dict = compute_invariants(np.zeros((3, 4, 2, 2), dtype=complex))
+        for value in inv_dict.values():
+            self.assertEqual(value.shape, (3, 4))
+            self.assertTrue(np.all(value == 0))
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+TEST writing edi data blocks and many edi files at once
+"""
+import glob
+import os
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.core.mt as mt
+from mtpy.core.edi import Edi
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+def _loop_data_block(edi_obj, data_comp_arr, data_key):
+    # one value at a time as Edi._write_data_block used to
+    block_lines = edi_obj._write_data_block(data_comp_arr, data_key)[:1]
+    for d_index, d_comp in enumerate(data_comp_arr, 1):
+        if d_comp == 0.0 and data_key.lower() not in ['zrot', 'trot']:
+            d_comp = float(edi_obj.Header.empty)
+        num_str = '{0:{1}}'.format(d_comp, edi_obj._num_format)
+        if d_index % edi_obj._block_len == 0:
+            num_str += '\n'
+        if d_index == data_comp_arr.size:
+            num_str += '\n'
+        block_lines.append(num_str)
+    return ''.join(block_lines)
+
+
+class Test_EdiWrite(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.edi_list = sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[:4]
+
+    def test_data_block(self):
+        edi_obj = Edi()
+        for n in [0, 1, 5, 6, 7, 12, 13]:
+            data = np.linspace(-3., 1.e4, n)
+            data[::3] = 0
+            for data_key in ['freq', 'zrot', 'zxyi', 'txr.exp']:
+                self.assertEqual(
+                    ''.join(edi_obj._write_data_block(data, data_key)),
+                    _loop_data_block(edi_obj, data, data_key))
+
+    def test_round_trip(self):
+        mt_obj = mt.MT(self.edi_list[0])
+        new_fn = mt_obj.write_mt_file(save_dir=self._temp_dir,
+                                      fn_basename='round_trip')
+        new_mt_obj = mt.MT(new_fn)
+        self.assertTrue(np.allclose(new_mt_obj.Z.freq, mt_obj.Z.freq))
+        self.assertTrue(np.allclose(new_mt_obj.Z.z, mt_obj.Z.z, rtol=1e-5))
+
+    def test_write_mt_files(self):
+        mt_list = [mt.MT(fn) for fn in self.edi_list]
+        new_freq = np.logspace(-2, 2, 9)
+        interp_list = [mt_obj.interpolate(new_freq, bounds_error=False)
+                       for mt_obj in mt_list]
+        text = {}
+        for n_processes in [1, 2]:
+            save_dir = make_temp_dir('n_processes_{0}'.format(n_processes),
+                                     base_dir=self._temp_dir)
+            fn_list = mt.write_mt_files(
+                mt_list, save_dir=save_dir,
+                new_Z_obj_list=[zt[0] for zt in interp_list],
+                new_Tipper_obj_list=[zt[1] for zt in interp_list],
+                n_processes=n_processes)
+            self.assertEqual([os.path.basename(fn) for fn in fn_list],
+                             ['{0}.edi'.format(mt_obj.station)
+                              for mt_obj in mt_list])
+            # the file date is the time of writing
+            text[n_processes] = [
+                [line for line in open(fn).readlines()
+                 if 'FILEDATE=' not in line] for fn in fn_list]
+            for fn in fn_list:
+                self.assertTrue(np.allclose(np.sort(mt.MT(fn).Z.freq),
+                                            new_freq))
+        self.assertEqual(text[1], text[2])
+
+        with self.assertRaises(mt.MTError):
+            mt.write_mt_files(mt_list, save_dir=self._temp_dir,
+                              fn_basename_list=['a.edi'])
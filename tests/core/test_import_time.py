@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Guard the imports of mtpy.core.mt.
+
+Runs ``python -X importtime -c "import mtpy.core.mt"`` in a fresh
+interpreter to list the imported modules and checks that the heavy
+optional packages (projection backends, scipy submodules, readers for other
+file formats, yaml) are not imported until they are used.
+"""
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from tests import TEST_MTPY_ROOT
+
+
+def imported_modules(module_name):
+    """
+    import module_name in a new interpreter with -X importtime
+
+    :returns: set of the names of the modules imported
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([TEST_MTPY_ROOT] +
+                                        [pp for pp in
+                                         [env.get('PYTHONPATH')] if pp])
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                           'import {0}'.format(module_name)],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, env=env,
+                          cwd=TEST_MTPY_ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not cumulative_us.strip().isdigit():
+            continue
+        modules.add(name.strip())
+    return modules
+
+
+class TestImportTime(TestCase):
+    # modules that only some functions need and that are slow to import
+    deferred_modules = ['osgeo', 'pyproj', 'yaml', 'matplotlib',
+                        'scipy.stats', 'scipy.interpolate',
+                        'mtpy.core.mt_xml', 'mtpy.core.zmm',
+                        'mtpy.core.jfile']
+
+    def test_import_mt_defers_heavy_modules(self):
+        modules = imported_modules('mtpy.core.mt')
+        self.assertIn('mtpy.core.mt', modules)
+
+        loaded = [name for name in self.deferred_modules if name in modules]
+        self.assertEqual(loaded, [],
+                         'import mtpy.core.mt loads {0}'.format(loaded))
+
+    def test_epsg_dict_is_lazy(self):
+        import mtpy.utils
+
+        epsg_dict = mtpy.utils._LazyEPSGDict()
+        self.assertFalse(epsg_dict._loaded)
+        epsg_dict[0] = '+proj=longlat +datum=WGS84'
+        self.assertFalse(epsg_dict._loaded)
+        # reading fills the table and keeps what was set before
+        self.assertEqual(epsg_dict[32755],
+                         mtpy.utils._load_epsg_dict()[32755])
+        self.assertTrue(epsg_dict._loaded)
+        self.assertEqual(epsg_dict[0], '+proj=longlat +datum=WGS84')
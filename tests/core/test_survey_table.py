@@ -0,0 +1,117 @@
+import glob
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import mtpy.analysis.pt as MTpt
+import mtpy.imaging.mtplottools as mtplottools
+from mtpy.core.edi_collection import EdiCollection, SURVEY_TABLE_COLUMNS
+from tests import EDI_DATA_DIR, make_temp_dir
+
+try:
+    import pyarrow
+    HAS_PARQUET = True
+except ImportError:
+    try:
+        import fastparquet
+        HAS_PARQUET = True
+    except ImportError:
+        HAS_PARQUET = False
+
+
+class TestSurveyTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.edi_collection = EdiCollection(
+            sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[:6])
+        cls.period_list = [0.01, 0.3, 10., 1000.]
+
+    def test_interpolated(self):
+        survey_df = self.edi_collection.get_survey_table(self.period_list)
+        mt_list = self.edi_collection.mt_obj_list
+        self.assertEqual(len(survey_df), len(self.period_list) * len(mt_list))
+        self.assertEqual(list(survey_df.columns),
+                         [key for key, dtype in SURVEY_TABLE_COLUMNS])
+
+        # the same as interpolating each station at each period on its own
+        for pp, period in enumerate(self.period_list):
+            for ii, mt_obj in enumerate(mt_list):
+                row = survey_df.iloc[pp * len(mt_list) + ii]
+                self.assertEqual(row['STATION'], mt_obj.station)
+                self.assertEqual(row['FREQ'], 1. / period)
+
+                new_z, new_tipper = mt_obj.interpolate([1. / period],
+                                                       bounds_error=False)
+                pt = MTpt.PhaseTensor(z_object=new_z)
+                res_phase = mtplottools.ResPhase(z_object=new_z)
+                self.assertTrue(np.isclose(row['ZXYim'], new_z.z[0, 0, 1].imag))
+                self.assertTrue(np.isclose(row['TYre'],
+                                           new_tipper.tipper[0, 0, 1].real))
+                self.assertTrue(np.isclose(row['RHOyx'], res_phase.resyx[0]))
+                self.assertTrue(np.isclose(row['PHSyx'], res_phase.phaseyx[0]))
+                self.assertTrue(np.isclose(row['phi_max'], pt.phimax[0]))
+                self.assertTrue(np.isclose(row['azimuth'], pt.azimuth[0]))
+                self.assertTrue(np.isclose(row['tip_ang_re'],
+                                           new_tipper.angle_real[0]))
+
+    def test_not_interpolated(self):
+        mt_obj = self.edi_collection.mt_obj_list[0]
+        period_list = [1. / mt_obj.Z.freq[3], 1. / mt_obj.Z.freq[10], 1.e6]
+        survey_df = self.edi_collection.get_survey_table(period_list,
+                                                         interpolate=False)
+        # no station has data at the last period
+        self.assertFalse(np.any(survey_df['FREQ'] == 1.e-6))
+
+        row = survey_df.iloc[0]
+        res_phase = mtplottools.ResPhase(z_object=mt_obj.Z)
+        self.assertEqual(row['STATION'], mt_obj.station)
+        self.assertEqual(row['ZXXre'], mt_obj.Z.z[3, 0, 0].real)
+        self.assertTrue(np.isclose(row['RHOxy'], res_phase.resxy[3]))
+        self.assertTrue(np.isclose(row['PHSyx'], res_phase.phaseyx[3]))
+        self.assertTrue(np.isclose(row['skew'], mt_obj.pt.beta[3]))
+
+    def test_export_csv(self):
+        dest_file = os.path.join(self._temp_dir, 'survey.csv')
+        self.edi_collection.export_survey_table(dest_file, self.period_list,
+                                                columns=['FREQ', 'STATION',
+                                                         'phi_min'])
+        survey_df = pd.read_csv(dest_file)
+        self.assertEqual(list(survey_df.columns), ['FREQ', 'STATION', 'phi_min'])
+        self.assertEqual(len(survey_df), len(self.period_list) *
+                         len(self.edi_collection.mt_obj_list))
+
+        with self.assertRaises(ValueError):
+            self.edi_collection.export_survey_table(
+                os.path.join(self._temp_dir, 'survey.txt'))
+
+    @unittest.skipUnless(HAS_PARQUET, "parquet engine not installed")
+    def test_export_parquet(self):
+        dest_file = os.path.join(self._temp_dir, 'survey.parquet')
+        self.edi_collection.export_survey_table(dest_file, self.period_list)
+        survey_df = pd.read_parquet(dest_file)
+        self.assertTrue(np.allclose(
+            survey_df['RHOxy'],
+            self.edi_collection.get_survey_table(self.period_list)['RHOxy']))
+
+    def test_csv_files(self):
+        save_path = make_temp_dir('csv_files', base_dir=self._temp_dir)
+        pt_dict = self.edi_collection.create_phase_tensor_csv(
+            save_path, period_list=self.period_list)
+        self.assertEqual(sorted(pt_dict.keys()),
+                         sorted(1. / np.array(self.period_list)))
+        for freq in pt_dict.keys():
+            self.assertTrue(os.path.isfile(os.path.join(
+                save_path, 'phase_tensor_{0}Hz.csv'.format(freq))))
+
+        csvfname = self.edi_collection.create_measurement_csv(
+            save_path, period_list=self.period_list)
+        survey_df = pd.read_csv(csvfname)
+        self.assertEqual(list(survey_df.columns)[:4],
+                         ['FREQ', 'STATION', 'LON', 'LAT'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+TEST running, cancelling and reporting errors of tasks in the Qt5 task pool
+"""
+import os
+import threading
+import time
+from unittest import TestCase
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from PyQt5 import QtCore
+
+from mtpy.gui.task_pool_qt5 import Task, TaskCancelled, TaskPool, get_progress
+import mtpy.modeling.modem as modem
+from tests import SAMPLE_DIR
+
+app = QtCore.QCoreApplication.instance()
+if app is None:
+    app = QtCore.QCoreApplication([])
+
+
+def _add(a, b=0):
+    return a + b
+
+
+def _raise_error():
+    raise ValueError('bad value')
+
+
+def _wait_for_cancel(started, task=None):
+    started.set()
+    while True:
+        task.report_progress(0, 'waiting')
+        time.sleep(0.01)
+
+
+def _read_data_file(data_fn, task=None):
+    modem_data = modem.Data()
+    modem_data.read_data_file(data_fn, progress=get_progress(task))
+    return modem_data
+
+
+class TestTaskPool(TestCase):
+    def setUp(self):
+        self.thread_pool = QtCore.QThreadPool()
+        self.task_pool = TaskPool(thread_pool=self.thread_pool)
+        self.outcome = {'result': [], 'error': [], 'progress': [],
+                        'finished': 0}
+
+    def tearDown(self):
+        self.task_pool.cancel_all()
+        self.task_pool.wait_for_done()
+        self._process_events()
+
+    def _process_events(self):
+        # the signals of the tasks are queued to this thread
+        for ii in range(5):
+            app.processEvents()
+            time.sleep(0.01)
+
+    def _run_task(self, func, **kwargs):
+        def finished():
+            self.outcome['finished'] += 1
+
+        return self.task_pool.run_task(
+            func,
+            on_result=self.outcome['result'].append,
+            on_error=self.outcome['error'].append,
+            on_progress=lambda *args: self.outcome['progress'].append(args),
+            on_finished=finished,
+            **kwargs)
+
+    def _wait(self):
+        self.assertTrue(self.task_pool.wait_for_done(10000))
+        self._process_events()
+
+    def test_result(self):
+        self._run_task(_add, args=(1,), kwargs={'b': 2})
+        self._wait()
+
+        self.assertEqual(self.outcome['result'], [3])
+        self.assertEqual(self.outcome['error'], [])
+        self.assertEqual(self.outcome['finished'], 1)
+        self.assertEqual(self.task_pool.active_count, 0)
+
+    def test_error(self):
+        self._run_task(_raise_error)
+        self._wait()
+
+        self.assertEqual(self.outcome['result'], [])
+        self.assertEqual(len(self.outcome['error']), 1)
+        self.assertIn('ValueError: bad value', self.outcome['error'][0])
+        self.assertEqual(self.outcome['finished'], 1)
+
+    def test_cancel_running(self):
+        started = threading.Event()
+        task = self._run_task(_wait_for_cancel, args=(started,),
+                              pass_task=True)
+        self.assertTrue(started.wait(10))
+        self.task_pool.cancel(task)
+        self._wait()
+
+        self.assertTrue(task.is_cancelled())
+        self.assertEqual(self.outcome['result'], [])
+        self.assertEqual(self.outcome['error'], [])
+        self.assertEqual(self.outcome['finished'], 1)
+
+    def test_cancel_queued(self):
+        self.thread_pool.setMaxThreadCount(1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(10)
+            return 'first'
+
+        self._run_task(block)
+        self.assertTrue(started.wait(10))
+        queued = self._run_task(_add, args=(1, 2))
+        self.task_pool.cancel(queued)
+        release.set()
+        self._wait()
+
+        self.assertEqual(self.outcome['result'], ['first'])
+        self.assertEqual(self.outcome['finished'], 2)
+        self.assertEqual(self.task_pool.active_count, 0)
+
+    def test_read_data_file_progress(self):
+        data_fn = os.path.join(SAMPLE_DIR, 'ModEM', 'ModEM_Data.dat')
+        self._run_task(_read_data_file, args=(data_fn,), pass_task=True)
+        self._wait()
+
+        self.assertEqual(len(self.outcome['result']), 1)
+        self.assertGreater(len(self.outcome['progress']), 1)
+        self.assertEqual(self.outcome['progress'][-1][0], 100)
+
+    def test_read_data_file_cancel(self):
+        data_fn = os.path.join(SAMPLE_DIR, 'ModEM', 'ModEM_Data.dat')
+        task = Task(_read_data_file, args=(data_fn,), pass_task=True)
+        task.signals.result.connect(self.outcome['result'].append)
+        task.cancel()
+        # reading stops at the first progress report
+        with self.assertRaises(TaskCancelled):
+            _read_data_file(data_fn, task=task)
+        task.run()
+
+        self.assertEqual(self.outcome['result'], [])
@@ -0,0 +1,98 @@
+import unittest
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.patches as patches
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mtpy.imaging.mtcolors as mtcl
+import mtpy.imaging.mtplottools as mtpl
+
+
+class TestPlotColors(unittest.TestCase):
+    def setUp(self):
+        self.values = np.array([-12., -9., -4.5, -2., 0., 1.5, 3., 4.4, 7.9, 30.])
+
+    def _compare(self, comp, cmap, ckmin, ckmax, bounds=None):
+        colors = mtcl.get_plot_color(self.values, comp, cmap, ckmin, ckmax,
+                                     bounds=bounds)
+        self.assertEqual(colors.shape, (self.values.size, 4))
+        for value, color in zip(self.values, colors):
+            self.assertTrue(np.allclose(mtcl.get_plot_color(value, comp, cmap,
+                                                            ckmin, ckmax,
+                                                            bounds=bounds),
+                                        color))
+
+    def test_continuous(self):
+        self._compare('phimin', 'mt_bl2gr2rd', 0, 90)
+        self._compare('skew', 'mt_bl2wh2rd', -9, 9)
+
+    def test_segmented(self):
+        self._compare('skew_seg', 'mt_seg_bl2wh2rd', -9, 9,
+                      bounds=np.arange(-9, 12, 3))
+
+    def test_scalar_returns_tuple(self):
+        color = mtcl.get_plot_color(4.4, 'skew_seg', 'mt_seg_bl2wh2rd', -9, 9,
+                                    bounds=np.arange(-9, 12, 3))
+        self.assertIsInstance(color, tuple)
+
+
+class TestEllipseCollection(unittest.TestCase):
+    def setUp(self):
+        self.x = np.array([0., 1., -2.])
+        self.y = np.array([0., 3., 1.])
+        self.width = np.array([1., 2., .5])
+        self.height = np.array([.5, 2., .1])
+        self.angle = np.array([0., 30., 125.])
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_vertices_on_ellipse(self):
+        vertices = mtpl.get_ellipse_vertices(self.x, self.y, self.width,
+                                             self.height, self.angle,
+                                             n_points=32)
+        self.assertEqual(vertices.shape, (3, 32, 2))
+        for ii in range(3):
+            ellipse = patches.Ellipse((self.x[ii], self.y[ii]), self.width[ii],
+                                      self.height[ii], angle=self.angle[ii])
+            # rotate back into the frame of the ellipse, all points have
+            # to be on the unit circle
+            unit = ellipse.get_patch_transform().inverted().transform(vertices[ii])
+            self.assertTrue(np.allclose(np.hypot(unit[:, 0], unit[:, 1]), 1))
+
+    def test_collection(self):
+        fig, ax = plt.subplots()
+        colors = mtcl.get_plot_color(np.array([10., 45., 80.]), 'phimin',
+                                     'mt_bl2gr2rd', 0, 90)
+        collection = mtpl.plot_ellipse_collection(ax, self.x, self.y,
+                                                  self.width, self.height,
+                                                  self.angle, colors,
+                                                  edgecolors='k', lw=.5)
+        self.assertEqual(len(collection.get_paths()), 3)
+        self.assertTrue(np.allclose(collection.get_facecolor(), colors))
+        self.assertEqual(len(ax.collections), 1)
+        fig.canvas.draw()
+
+    def test_arrows(self):
+        fig, ax = plt.subplots()
+        quiver = mtpl.plot_arrows(ax, self.x, self.y, [1., 0., np.nan],
+                                  [0., 0., 1.], width=.01, head_width=.05,
+                                  head_length=.1, color='k')
+        # zero and nan length arrows are not drawn
+        self.assertEqual(quiver.N, 3)
+        self.assertEqual(np.ma.count(np.ma.array(quiver.U, mask=quiver.Umask)), 1)
+        # the head is added to the end of the arrow like ax.arrow
+        self.assertTrue(np.allclose(quiver.U[0], 1.1))
+        fig.canvas.draw()
+
+        mtpl.update_arrows(quiver, [0., 0., 2.], [0., 0., 0.])
+        self.assertEqual(np.ma.count(np.ma.array(quiver.U, mask=quiver.Umask)), 1)
+        self.assertTrue(np.allclose(quiver.U[2], 2.1))
+        fig.canvas.draw()
+
+
+if __name__ == '__main__':
+    unittest.main()
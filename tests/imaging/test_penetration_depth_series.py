@@ -0,0 +1,58 @@
+import glob
+import os
+import unittest
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from mtpy.core.mt import MT
+from mtpy.imaging.penetration import Depth3D
+from tests import TEST_MTPY_ROOT, make_temp_dir
+
+
+class TestPenetrationDepthSeries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.mt_list = [MT(fn) for fn in sorted(glob.glob(
+            os.path.join(TEST_MTPY_ROOT, 'data', 'edifiles', '*.edi')))]
+        # the first period has no data within the tolerance
+        cls.period_list = [10., 0.01, 0.02]
+
+    def tearDown(self):
+        plt.close('all')
+
+    def _check_series(self, n_processes):
+        save_path = os.path.join(self._temp_dir,
+                                 'series_{0}'.format(n_processes))
+        depth3d = Depth3D(edis=self.mt_list, period=self.period_list[0])
+        fn_list = depth3d.save_period_series(self.period_list, save_path,
+                                             fig_dpi=60,
+                                             n_processes=n_processes)
+        self.assertEqual(len(fn_list), len(self.period_list))
+
+        # updating the image gives the same figure as making it again
+        for period, fn in zip(self.period_list, fn_list):
+            self.assertTrue(os.path.isfile(fn))
+            plt.close('all')
+            depth3d = Depth3D(edis=self.mt_list, period=period)
+            depth3d.plot()
+            ref_fn = os.path.join(self._temp_dir, 'ref.png')
+            depth3d.export_image(ref_fn, dpi=60, bbox_inches='tight')
+            ref = plt.imread(ref_fn)
+            image = plt.imread(fn)
+            self.assertEqual(image.shape, ref.shape)
+            self.assertTrue(np.allclose(image, ref))
+
+    def test_save_period_series(self):
+        self._check_series(1)
+
+    def test_save_period_series_processes(self):
+        self._check_series(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
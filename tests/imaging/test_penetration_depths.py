@@ -0,0 +1,78 @@
+import glob
+import os
+import unittest
+
+import numpy as np
+
+from mtpy.core.mt import MT
+from mtpy.imaging.penetration import get_penetration_depths, \
+    get_penetration_depth_by_index, get_penetration_depth_by_period
+from tests import EDI_DATA_DIR2
+
+
+class TestPenetrationDepths(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        scale_param = np.sqrt(1.0 / (2.0 * np.pi * 4 * np.pi * 10 ** (-7)))
+        cls.mt_list = [MT(fn) for fn in
+                       sorted(glob.glob(os.path.join(EDI_DATA_DIR2, '*.edi')))[:6]]
+
+        # depths of each station computed from its own Z object
+        cls.expected = []
+        for mt_obj in cls.mt_list:
+            periods = 1.0 / mt_obj.Z.freq
+            cls.expected.append(
+                {'period': periods,
+                 'zxy': scale_param * np.sqrt(mt_obj.Z.resistivity[:, 0, 1] * periods),
+                 'zyx': scale_param * np.sqrt(mt_obj.Z.resistivity[:, 1, 0] * periods),
+                 'det': scale_param * np.sqrt(0.2 * periods * np.abs(mt_obj.Z.det) * periods)})
+
+    def test_all_periods(self):
+        depth_dict = get_penetration_depths(self.mt_list)
+        for ii, expected in enumerate(self.expected):
+            nf = expected['period'].size
+            self.assertTrue(np.allclose(depth_dict['period'][:nf, ii],
+                                        expected['period']))
+            self.assertTrue(np.all(np.isnan(depth_dict['period'][nf:, ii])))
+            for rho in ['det', 'zxy', 'zyx']:
+                self.assertTrue(np.allclose(depth_dict[rho][:nf, ii],
+                                            expected[rho]))
+
+    def test_selected_periods(self):
+        selected = [0.01, 2.857, 100., 7.e4]
+        depth_dict = get_penetration_depths(self.mt_list, selected, ptol=0.1)
+        self.assertEqual(depth_dict['det'].shape, (4, len(self.mt_list)))
+        for pp, period in enumerate(selected):
+            for rho in ['det', 'zxy', 'zyx']:
+                stations, periods, depths, latlons = \
+                    get_penetration_depth_by_period(self.mt_list, period,
+                                                    ptol=0.1, whichrho=rho)
+                self.assertTrue(np.allclose(depth_dict[rho][pp], depths,
+                                            equal_nan=True))
+            for ii, expected in enumerate(self.expected):
+                kk = depth_dict['index'][pp, ii]
+                if kk < 0:
+                    self.assertEqual(depth_dict['period'][pp, ii], period)
+                    self.assertTrue(np.isnan(depth_dict['det'][pp, ii]))
+                else:
+                    self.assertLessEqual(abs(expected['period'][kk] - period),
+                                         0.1 * period)
+                    self.assertTrue(np.isclose(depth_dict['det'][pp, ii],
+                                               expected['det'][kk]))
+
+    def test_by_index(self):
+        stations, periods, depths, latlons = \
+            get_penetration_depth_by_index(self.mt_list, 3, whichrho='zyx')
+        self.assertEqual(stations, [mt_obj.station for mt_obj in self.mt_list])
+        self.assertTrue(np.allclose(depths, [-expected['zyx'][3]
+                                             for expected in self.expected]))
+        with self.assertRaises(Exception):
+            get_penetration_depth_by_index(self.mt_list, 1000)
+
+    def test_unsupported_rho(self):
+        with self.assertRaises(Exception):
+            get_penetration_depths(self.mt_list, [1.], rholist=['zxx'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import glob
+import os
+import unittest
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from mtpy.imaging.phase_tensor_maps import PlotPhaseTensorMaps
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+class TestPhaseTensorMapSeries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.freq_list = [1., .1, .01]
+        cls.plot_kwargs = dict(fn_list=sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi'))),
+                               interpolate=True,
+                               mapscale='deg',
+                               ellipse_size=.05,
+                               plot_tipper='yri',
+                               arrow_size=.05,
+                               arrow_head_length=.005,
+                               arrow_head_width=.003,
+                               arrow_lw=.001,
+                               fig_size=(6, 6),
+                               fig_dpi=60,
+                               plot_yn='n')
+        cls.ptmap = PlotPhaseTensorMaps(**cls.plot_kwargs)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_period_series_data(self):
+        period_data = self.ptmap.get_period_series_data(self.freq_list)
+        ns = len(self.ptmap.mt_list)
+        self.assertEqual(period_data['z'].shape, (3, ns, 2, 2))
+        self.assertEqual(period_data['tipper'].shape, (3, ns, 4))
+        self.assertTrue(period_data['valid'].all())
+
+        # same as interpolating each frequency on its own
+        mt_obj = self.ptmap.mt_list[0]
+        new_z, new_tipper = mt_obj.interpolate([self.freq_list[1]],
+                                               bounds_error=False)
+        self.assertTrue(np.allclose(period_data['z'][1, 0], new_z.z[0]))
+        self.assertTrue(np.isclose(period_data['tipper'][1, 0, 0],
+                                   new_tipper.mag_real[0]))
+
+        # interpolation gives no data outside the frequencies of a station
+        period_data = self.ptmap.get_period_series_data([1e8])
+        self.assertFalse(period_data['valid'].any())
+
+    def test_save_period_series(self):
+        save_path = os.path.join(self._temp_dir, 'series')
+        fn_list = self.ptmap.save_period_series(self.freq_list, save_path)
+        self.assertEqual(len(fn_list), len(self.freq_list))
+
+        # updating the figure gives the same image as making it again
+        for freq, fn in zip(self.freq_list, fn_list):
+            self.assertTrue(os.path.isfile(fn))
+            ptmap = PlotPhaseTensorMaps(plot_freq=freq, **self.plot_kwargs)
+            ptmap.plot(show=False)
+            ref_fn = os.path.join(self._temp_dir, 'ref_{0}.png'.format(freq))
+            ptmap.fig.savefig(ref_fn, dpi=60, bbox_inches='tight')
+            self.assertTrue(np.allclose(plt.imread(fn), plt.imread(ref_fn)))
+
+
+if __name__ == '__main__':
+    unittest.main()
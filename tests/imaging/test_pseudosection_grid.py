@@ -0,0 +1,114 @@
+import glob
+import os
+import unittest
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mtpy.imaging.mtplottools as mtpl
+from mtpy.imaging.phase_tensor_pseudosection import PlotPhaseTensorPseudoSection
+from mtpy.imaging.plotpseudosection import PlotResPhasePseudoSection
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+def _loop_period_index(period_list, plot_period, ftol):
+    # the nested loops the pseudosections used to fill their grids with
+    period_index = -np.ones((len(plot_period), len(period_list)), dtype=int)
+    for ii, period in enumerate(period_list):
+        for rr, rper in enumerate(plot_period):
+            for kk, iper in enumerate(period):
+                if iper == rper or rper * (1 - ftol) <= iper <= rper * (1 + ftol):
+                    period_index[rr, ii] = kk
+                    break
+    return period_index
+
+
+class TestPeriodIndex(unittest.TestCase):
+    def test_against_loops(self):
+        np.random.seed(1)
+        plot_period = np.logspace(-3, 3, 40)
+        period_list = [np.logspace(-3, 3, 60),
+                       np.logspace(3, -2.5, 45),
+                       np.random.permutation(np.logspace(-2, 2, 30)),
+                       np.logspace(-3, 3, 60) * 1.15,
+                       np.array([1., 1., 1.02, .99]),
+                       np.array([])]
+        for ftol in [0, .05, .1, .3]:
+            self.assertTrue(np.all(
+                mtpl.get_period_index(period_list, plot_period, ftol=ftol) ==
+                _loop_period_index(period_list, plot_period, ftol)))
+
+    def test_grid(self):
+        period_index = np.array([[0, -1], [2, 1]])
+        values = [np.array([1., 2., 3.]), np.array([4., 5.])]
+        grid = mtpl.get_pseudosection_grid(values, period_index,
+                                           fill_value=-9)
+        self.assertTrue(np.all(grid == [[1., -9], [3., 5.]]))
+
+        values = [np.arange(12.).reshape(3, 2, 2), np.ones((2, 2, 2))]
+        grid = mtpl.get_pseudosection_grid(values, period_index)
+        self.assertEqual(grid.shape, (2, 2, 2, 2))
+        self.assertTrue(np.all(grid[1, 0] == values[0][2]))
+        self.assertTrue(np.all(grid[0, 1] == 0))
+
+
+class TestPseudoSectionArrays(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.fn_list = sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_res_phase_arrays(self):
+        rp_section = PlotResPhasePseudoSection(fn_list=self.fn_list,
+                                               plot_yn='n')
+        rp_section.get_rp_arrays()
+
+        period_index = _loop_period_index(
+            [mt.period for mt in rp_section.mt_list_sort],
+            rp_section.plot_period, rp_section.ftol)
+        for ii, mt in enumerate(rp_section.mt_list_sort):
+            for rr in range(len(rp_section.plot_period)):
+                kk = period_index[rr, ii]
+                if kk < 0:
+                    self.assertEqual(rp_section.resxy[rr, ii], 0)
+                    continue
+                self.assertEqual(rp_section.resxy[rr, ii],
+                                 np.log10(mt.Z.res_xy[kk]))
+                self.assertEqual(rp_section.phaseyx[rr, ii],
+                                 mt.Z.phase_yx[kk])
+
+    def test_pt_arrays(self):
+        pt_section = PlotPhaseTensorPseudoSection(fn_list=self.fn_list[:5],
+                                                  plot_yn='n')
+        mt_list = pt_section.mt_list
+        plot_period = mt_list[0].period[::3]
+        phimin, phimax, skew, azimuth, ellip, slist, olist = \
+            mtpl.get_pt_arrays(mt_list, plot_period=plot_period)
+
+        self.assertEqual(phimin.shape, (plot_period.size, len(mt_list)))
+        mt_list_sort = mtpl.sort_by_offsets(mt_list)[0]
+        for ii, mt in enumerate(mt_list_sort):
+            self.assertTrue(np.allclose(phimin[:, ii], mt.pt.phimin[::3]))
+            self.assertTrue(np.allclose(skew[:, ii], mt.pt.beta[::3]))
+
+    def test_pt_text_files(self):
+        pt_section = PlotPhaseTensorPseudoSection(fn_list=self.fn_list[:5],
+                                                  plot_yn='n')
+        pt_section.plot(show=False)
+        pt_section.writeTextFiles(save_path=self._temp_dir)
+
+        data = np.loadtxt(os.path.join(self._temp_dir, 'PseudoSection.phimin'),
+                          skiprows=1)
+        self.assertEqual(data.shape[1], len(pt_section.stationlist) + 1)
+        self.assertTrue(os.path.isfile(
+            os.path.join(self._temp_dir, 'PseudoSection.tipper_ang_imag')))
+
+
+if __name__ == '__main__':
+    unittest.main()
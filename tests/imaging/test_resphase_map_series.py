@@ -0,0 +1,63 @@
+import glob
+import os
+import unittest
+
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+from mtpy.imaging.plot_resphase_maps import PlotResPhaseMaps
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+class TestResPhaseMapSeries(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.freq_list = [1., .1, .01]
+        cls.fn_list = sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))
+        cls.plot_kwargs = dict(extrapolation_buffer_degrees=0.1,
+                               regular_grid_nx=40,
+                               regular_grid_ny=40)
+
+    def tearDown(self):
+        plt.close('all')
+
+    def _check_series(self, plot_type, vmin, vmax, **kwargs):
+        series_path = os.path.join(self._temp_dir, plot_type + '_series')
+        ref_path = os.path.join(self._temp_dir, plot_type + '_ref')
+        for path in [series_path, ref_path]:
+            if not os.path.isdir(path):
+                os.mkdir(path)
+
+        rpmaps = PlotResPhaseMaps(fn_list=self.fn_list, fig_dpi=60)
+        fn_list = rpmaps.save_period_series(self.freq_list, plot_type, vmin,
+                                            vmax, save_path=series_path,
+                                            **dict(self.plot_kwargs, **kwargs))
+        self.assertEqual(len(fn_list), len(self.freq_list))
+
+        # redrawing the contours gives the same image as making it again
+        for freq, fn in zip(self.freq_list, fn_list):
+            self.assertTrue(os.path.isfile(fn))
+            # plot reuses figure 1, start each reference from a new one
+            plt.close('all')
+            rpmaps = PlotResPhaseMaps(fn_list=self.fn_list, fig_dpi=60)
+            rpmaps.plot(freq, plot_type, vmin, vmax, save_path=ref_path,
+                        show=False, **self.plot_kwargs)
+            ref_fn = os.path.join(ref_path, os.path.basename(fn))
+            self.assertTrue(np.allclose(plt.imread(fn), plt.imread(ref_fn)))
+
+    def test_save_res_series(self):
+        self._check_series('res', 0.1, 1e4)
+
+    def test_save_phase_series(self):
+        self._check_series('phase', -180, 180)
+
+    def test_save_series_processes(self):
+        self._check_series('res', 0.1, 1e4, n_processes=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+TEST updating an error bar in place against plotting a new one
+"""
+from unittest import TestCase
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import mtpy.imaging.mtplottools as mtplottools
+from tests.imaging import reset_matplotlib
+
+
+class TestUpdateErrorbar(TestCase):
+    def setUp(self):
+        reset_matplotlib()
+        self.fig, self.ax = plt.subplots()
+
+    def tearDown(self):
+        plt.close(self.fig)
+
+    def test_update(self):
+        eb = mtplottools.plot_errorbar(self.ax, np.arange(5.), np.ones(5),
+                                       np.ones(5) * .1)
+        x = np.logspace(-2, 2, 8)
+        y = np.linspace(1, 10, 8)
+        y_err = y * .05
+        mtplottools.update_errorbar(eb, x, y, y_err)
+
+        new_eb = mtplottools.plot_errorbar(self.ax, x, y, y_err)
+        self.assertTrue(np.all(eb[0].get_xydata() == new_eb[0].get_xydata()))
+        for cap, new_cap in zip(eb[1], new_eb[1]):
+            self.assertTrue(np.allclose(cap.get_xydata(),
+                                        new_cap.get_xydata()))
+        self.assertTrue(np.allclose(eb[2][0].get_segments(),
+                                    new_eb[2][0].get_segments()))
+
+    def test_no_error(self):
+        eb = mtplottools.plot_errorbar(self.ax, np.arange(5.), np.ones(5))
+        mtplottools.update_errorbar(eb, [1., 2.], [3., 4.])
+        self.assertTrue(np.all(eb[0].get_xydata() == [[1., 3.], [2., 4.]]))
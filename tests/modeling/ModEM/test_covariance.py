@@ -0,0 +1,80 @@
+import os
+from unittest import TestCase
+
+import numpy as np
+
+from mtpy.modeling.modem import Covariance
+from tests import make_temp_dir
+
+
+def _write_mask_lines(mask_arr):
+    """
+    mask lines formatted one cell at a time
+    """
+    clines = []
+    write_mask_arr = mask_arr[::-1, :, :].copy()
+    for zz in range(mask_arr.shape[2]):
+        clines.append(' {0:<8.0f}{0:<8.0f}\n'.format(zz + 1))
+        for nn in range(mask_arr.shape[0]):
+            cline = ''
+            for ee in range(mask_arr.shape[1]):
+                cline += '{0:^3.0f}'.format(write_mask_arr[nn, ee, zz])
+            clines.append(cline + '\n')
+    return ''.join(clines)
+
+
+class TestCovariance(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+
+    def setUp(self):
+        np.random.seed(1)
+        self.mask_arr = np.random.choice([0, 1, 9], size=(12, 15, 7)).astype(
+            float)
+        self.cov_fn = os.path.join(self._temp_dir,
+                                   '{0}.cov'.format(self._testMethodName))
+
+    def _check_file(self, mask_arr):
+        cov = Covariance(grid_dimensions=mask_arr.shape)
+        cov.mask_arr = mask_arr
+        cov.write_covariance_file(cov_fn=self.cov_fn)
+        with open(self.cov_fn, 'r') as fid:
+            text = fid.read()
+        self.assertTrue(text.endswith(_write_mask_lines(mask_arr)))
+
+    def test_write_mask(self):
+        self._check_file(self.mask_arr)
+
+    def test_write_mask_unusual_values(self):
+        self.mask_arr[0, 0, 0] = 10
+        self.mask_arr[1, 2, 3] = -5
+        self.mask_arr[2, 3, 4] = 2.6
+        self._check_file(self.mask_arr)
+        # values that do not fit in 3 characters
+        self.mask_arr[3, 4, 5] = 1234
+        self._check_file(self.mask_arr)
+
+    def test_read_mask(self):
+        cov = Covariance(grid_dimensions=self.mask_arr.shape)
+        cov.mask_arr = self.mask_arr
+        cov.write_covariance_file(cov_fn=self.cov_fn)
+
+        cov_read = Covariance()
+        cov_read.read_cov_file(self.cov_fn)
+        self.assertEqual(cov_read.grid_dimensions, self.mask_arr.shape)
+        # the file is written south to north and read in file order
+        self.assertTrue(np.all(cov_read.mask_arr == self.mask_arr[::-1]))
+        self.assertTrue(np.allclose(cov_read.smoothing_north, 0.3))
+
+    def test_read_mask_narrow_grid(self):
+        # mask lines of 2 or 3 values look like the index and grid lines
+        for n_east in [2, 3]:
+            mask_arr = self.mask_arr[:, 0:n_east, :].copy()
+            cov = Covariance(grid_dimensions=mask_arr.shape)
+            cov.mask_arr = mask_arr
+            cov.write_covariance_file(cov_fn=self.cov_fn)
+
+            cov_read = Covariance()
+            cov_read.read_cov_file(self.cov_fn)
+            self.assertTrue(np.all(cov_read.mask_arr == mask_arr[::-1]))
@@ -11,7 +11,7 @@ import matplotlib.pyplot as plt
 from mtpy.core.edi_collection import EdiCollection
 from mtpy.modeling.modem import Data
 # patch that changes the matplotlib behaviour
-from tests import make_temp_dir
+from tests import SAMPLE_DIR, make_temp_dir
 from tests.imaging import plt_wait, plt_close
 import numpy as np
 
@@ -171,3 +171,44 @@ for edi_path in edi_paths:
 
 if 'test_func' in globals():
     del globals()['test_func']
+
+
+class TestDataProgress(TestCase):
+    """
+    the progress function is called while reading and writing a data file
+    and can stop reading by raising an error
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls._data_fn = os.path.join(SAMPLE_DIR, 'ModEM', 'ModEM_Data.dat')
+
+    def test_read_write_progress(self):
+        progress_list = []
+        data_obj = Data()
+        data_obj.read_data_file(
+            self._data_fn,
+            progress=lambda percent, message: progress_list.append(percent))
+        self.assertGreater(len(progress_list), len(data_obj.mt_dict))
+        self.assertEqual(progress_list, sorted(progress_list))
+        self.assertEqual(progress_list[-1], 100)
+
+        progress_list = []
+        data_obj.write_data_file(
+            save_path=self._temp_dir, fn_basename='ModEM_Data.dat',
+            compute_error=False, fill=False,
+            elevation=True,
+            progress=lambda percent, message: progress_list.append(percent))
+        n_blocks = len(data_obj.inv_mode_dict[data_obj.inv_mode])
+        self.assertEqual(len(progress_list), n_blocks * len(data_obj.mt_dict))
+        self.assertEqual(progress_list[-1], 100)
+
+    def test_read_stopped(self):
+        class Stop(Exception):
+            pass
+
+        def stop(percent, message):
+            raise Stop()
+
+        with self.assertRaises(Stop):
+            Data().read_data_file(self._data_fn, progress=stop)
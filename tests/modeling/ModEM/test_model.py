@@ -2,6 +2,8 @@ import glob
 import os
 from unittest import TestCase
 
+import numpy as np
+
 from mtpy.core.edi_collection import EdiCollection
 from mtpy.modeling.modem import Data, Model
 from tests import make_temp_dir
@@ -101,3 +103,31 @@ for edi_path in edi_paths:
     _func = _test_gen(edi_path)
     _func.__name__ = "test_{}".format(os.path.basename(edi_path))
     setattr(TestModel, _func.__name__, _func)
+
+
+class TestModelSurfaceData(TestCase):
+    def test_assign_resistivity_from_surfacedata(self):
+        np.random.seed(0)
+        model = Model()
+        model.grid_z = np.hstack([[-500, -250, -100], np.cumsum(
+            np.r_[0, 50 * 1.2 ** np.arange(30)])])
+        model.res_model = np.ones((20, 25, model.grid_z.size - 1)) * 100.
+        expected = model.res_model.copy()
+
+        topography = np.random.uniform(-300, 400, (20, 25))
+        top = np.zeros_like(topography) + model.grid_z[0]
+        bottom = -topography
+
+        # reference: np.where over the cell centres of each column
+        gcz = np.mean([model.grid_z[:-1], model.grid_z[1:]], axis=0)
+        for value, top_surface in [(1e12, top), (0.3, np.zeros_like(top))]:
+            for j in range(expected.shape[0]):
+                for i in range(expected.shape[1]):
+                    ii = np.where((gcz > top_surface[j, i]) &
+                                  (gcz <= bottom[j, i]))[0]
+                    expected[j, i, ii] = value
+
+        model.assign_resistivity_from_surfacedata(top, bottom, 1e12)
+        model.assign_resistivity_from_surfacedata(np.zeros_like(top), bottom,
+                                                  0.3)
+        self.assertTrue(np.all(model.res_model == expected))
@@ -29,6 +29,7 @@ Current issue:
 # import section
 
 import os
+import sys
 
 import numpy as np
 
@@ -185,3 +186,83 @@ class TestOccam1D(TestCase):
         tests.imaging.plt_close()
 
         assert(os.path.exists(p2file))
+
+
+# stand in for the Occam1D executable: copy the startup file to an iteration
+# file with a misfit of 1.5 and record the working directory it was run in
+_STUB_OCCAM1D = """#!{python}
+import os
+import sys
+
+startup_fn, iter_root = sys.argv[1], sys.argv[2]
+with open(startup_fn) as fid:
+    lines = fid.readlines()
+with open(iter_root + '_1.iter', 'w') as fid:
+    for line in lines:
+        if line.startswith('Misfit Value:'):
+            line = '{{0:<21}}{{1}}\\n'.format('Misfit Value:', 1.5)
+        fid.write(line)
+with open('stub_calls.log', 'a') as fid:
+    fid.write('{{0}} {{1}} {{2}}\\n'.format(os.getcwd(), startup_fn, iter_root))
+"""
+
+
+class TestOccam1DRunInversions(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls._edi_dir = make_temp_dir('edi', base_dir=cls._temp_dir)
+        for edi_fn in ['pb23c.edi', 'pb25c.edi', 'pb27c.edi']:
+            with open(os.path.join(EDI_DATA_DIR, edi_fn)) as fid:
+                edi_lines = fid.read()
+            with open(os.path.join(cls._edi_dir, edi_fn), 'w') as fid:
+                fid.write(edi_lines)
+
+        cls._occam_path = os.path.join(cls._temp_dir, 'occam1d_stub')
+        with open(cls._occam_path, 'w') as fid:
+            fid.write(_STUB_OCCAM1D.format(python=sys.executable))
+        os.chmod(cls._occam_path, 0o755)
+
+    def _run(self, n_processes):
+        input_parameters = vars(mtoc1d.parse_arguments(
+            [self._edi_dir,
+             '-l', self._occam_path,
+             '-wd', make_temp_dir(self._testMethodName, base_dir=self._temp_dir),
+             '-m', 'TE', 'TM',
+             '-nl', '20',
+             '-np', str(n_processes)]))
+        cwd = os.getcwd()
+        master_wkdir, run_directories = mtoc1d.generate_inputfiles(**input_parameters)
+        return_codes = mtoc1d.run_inversions(master_wkdir, run_directories,
+                                             self._occam_path,
+                                             n_processes=n_processes,
+                                             rms_factor=1.1,
+                                             rms_min=1.0)
+        self.assertEqual(cwd, os.getcwd())
+        return master_wkdir, run_directories, return_codes
+
+    def _check(self, master_wkdir, run_directories, return_codes):
+        self.assertEqual(sorted(return_codes.keys()),
+                         ['stationpb23', 'stationpb25', 'stationpb27'])
+        for rundir in run_directories:
+            wd = os.path.join(master_wkdir, rundir)
+            self.assertEqual(return_codes[rundir], {'TE': [0, 0], 'TM': [0, 0]})
+            with open(os.path.join(wd, 'stub_calls.log')) as fid:
+                calls = [line.split() for line in fid.readlines()]
+            # both modes run in order, minimum rms before smooth, in the
+            # station directory
+            self.assertEqual([call[2] for call in calls],
+                             ['RMSminTE', 'SmoothTE', 'RMSminTM', 'SmoothTM'])
+            for call in calls:
+                self.assertEqual(os.path.realpath(call[0]), os.path.realpath(wd))
+            # the smooth run targets rms_factor * minimum rms
+            for mode in ['TE', 'TM']:
+                startup = mtoc1d.Startup()
+                startup.read_startup_file(os.path.join(wd, 'Smooth{0}_1.iter'.format(mode)))
+                self.assertAlmostEqual(float(startup.target_misfit), 1.65)
+
+    def test_run_inversions_serial(self):
+        self._check(*self._run(1))
+
+    def test_run_inversions_parallel(self):
+        self._check(*self._run(2))
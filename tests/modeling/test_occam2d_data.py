@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+TEST building the Occam2D data block for all profile stations at once
+against interpolating each station on its own
+"""
+import os
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.modeling.occam2d as occam2d
+from tests import EDI_DATA_DIR, SAMPLE_DIR, make_temp_dir
+from tests.imaging import reset_matplotlib, plt_close
+
+
+class TestOccam2DData(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        reset_matplotlib()
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.station_list = [edi[0:-4] for edi in os.listdir(EDI_DATA_DIR)
+                            if edi.find('.edi') > 0]
+
+    def _get_data(self, **kwargs):
+        ocd = occam2d.Data(edi_path=EDI_DATA_DIR,
+                           station_list=self.station_list,
+                           freq_min=1, freq_max=10000, **kwargs)
+        ocd._fill_data()
+        plt_close()
+        return ocd
+
+    def test_fill_data(self):
+        ocd = self._get_data()
+        for edi, sdict in zip(ocd.edi_list, ocd.data):
+            self.assertEqual(sdict['station'], edi.station)
+            in_range = (ocd.freq >= edi.Z.freq.min()) & \
+                       (ocd.freq <= edi.Z.freq.max())
+            z_interp, t_interp = edi.interpolate(ocd.freq[in_range])
+            self.assertTrue(np.allclose(sdict['te_res'][0, in_range],
+                                        z_interp.resistivity[:, 0, 1]))
+            self.assertTrue(np.allclose(sdict['tm_res'][0, in_range],
+                                        z_interp.resistivity[:, 1, 0]))
+            self.assertTrue(np.allclose(sdict['re_tip'][0, in_range],
+                                        t_interp.tipper[:, 0, 1].real))
+            self.assertTrue(np.all(sdict['te_res'][:, ~in_range] == 0))
+
+            # error floor of 10 percent in resistivity
+            rho = sdict['te_res'][0]
+            self.assertTrue(np.all(sdict['te_res'][1][rho != 0] >=
+                                   rho[rho != 0] * .1 * (1 - 1e-12)))
+            phase = sdict['tm_phase'][0]
+            self.assertTrue(np.all((phase >= 0) & (phase <= 90)))
+
+    def test_freq_tol(self):
+        ocd = self._get_data(freq_tol=.05)
+        for edi, sdict in zip(ocd.edi_list[:4], ocd.data[:4]):
+            for ff, freq in enumerate(ocd.freq):
+                diff = np.abs(edi.Z.freq - freq)
+                f_index = np.argmin(diff)
+                if diff[f_index] > .05 * freq:
+                    self.assertEqual(sdict['te_res'][0, ff], 0)
+                else:
+                    self.assertAlmostEqual(sdict['te_res'][0, ff],
+                                           edi.Z.resistivity[f_index, 0, 1])
+
+    def test_data_list(self):
+        ocd = self._get_data(model_mode='log_all')
+        ocd._get_data_list()
+
+        data_list = []
+        for ss, sdict in enumerate(ocd.data, 1):
+            for ff in range(ocd.freq.shape[0]):
+                for mmode in ocd.mode_dict[ocd.model_mode]:
+                    key = ocd.occam_dict[str(mmode)]
+                    dvalue, derror = sdict[key.replace('log_', '')][:, ff]
+                    if dvalue == 0.0:
+                        continue
+                    if key.startswith('log_'):
+                        derror = derror / (dvalue * np.log(10))
+                        dvalue = np.log10(dvalue)
+                    data_list.append(ocd._data_string.format(
+                        ss, ff + 1, mmode, '{0:.4f}'.format(dvalue),
+                        '{0:.4f}'.format(derror)))
+        self.assertEqual(ocd.data_list, data_list)
+
+        data_fn = os.path.join(self._temp_dir, 'OccamDataFile.dat')
+        ocd.write_data_file(data_fn=data_fn)
+        new_ocd = occam2d.Data()
+        new_ocd.read_data_file(data_fn)
+        self.assertEqual(len(new_ocd.data), len(ocd.data))
+        self.assertTrue(np.allclose(new_ocd.freq, ocd.freq))
+
+    def test_data_file_baseline(self):
+        # data files written by interpolating each station on its own
+        baseline_dir = os.path.join(SAMPLE_DIR, 'Occam2d', 'fill_data')
+        freq = np.logspace(0, 4, 23)
+        configs = {'default': {},
+                   'freq_num': {'freq_num': 10},
+                   'freq': {'freq': freq},
+                   'freq_te': {'freq': freq, 'model_mode': '5'},
+                   'freq_tol': {'freq': freq, 'freq_tol': .05},
+                   'freq_strike': {'freq': freq, 'model_mode': '7',
+                                   'geoelectric_strike': 30.}}
+        station_list = sorted(self.station_list)
+        for name, kwargs in configs.items():
+            ocd = occam2d.Data(edi_path=EDI_DATA_DIR,
+                               station_list=station_list,
+                               freq_min=1, freq_max=10000, **kwargs)
+            data_fn = os.path.join(self._temp_dir, '{0}.dat'.format(name))
+            ocd.write_data_file(data_fn=data_fn)
+            plt_close()
+            with open(data_fn) as fid:
+                data_lines = fid.readlines()
+            with open(os.path.join(baseline_dir, '{0}.dat'.format(name))) as fid:
+                self.assertEqual(data_lines, fid.readlines(), name)
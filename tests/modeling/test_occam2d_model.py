@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+TEST building the Occam2D resistivity model from an iteration file against
+filling the mesh one regularization block at a time
+"""
+import os
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.modeling.occam2d as occam2d
+from tests import SAMPLE_DIR
+
+
+def _loop_res_model(model_values, model_rows, model_columns, shape):
+    # one regularization block at a time as Model.build_model used to
+    res_model = np.zeros(shape)
+    mm = 0
+    for ii in range(len(model_rows)):
+        ny1 = model_rows[:ii, 0].sum()
+        ny2 = ny1 + model_rows[ii][0]
+        lc = np.array(model_columns[ii])
+        for jj in range(len(model_columns[ii])):
+            nx1 = lc[:jj].sum()
+            nx2 = nx1 + lc[jj]
+            res_model[ny1:ny2, nx1:nx2] = model_values[mm]
+            mm += 1
+    return np.flipud(res_model)
+
+
+class TestOccam2DModel(TestCase):
+    def setUp(self):
+        self.iter_fn = os.path.join(SAMPLE_DIR, 'Occam2d', 'ITER12.iter')
+
+    def test_read_iter_file(self):
+        model = occam2d.Model(iter_fn=self.iter_fn)
+        model.read_iter_file()
+        self.assertEqual(model.model_values.shape[0], model.param_count)
+        self.assertTrue(np.allclose(model.model_values[:4],
+                                    [0.8743036, 0.9095424, 0.7514058,
+                                     0.6899601]))
+        self.assertTrue(np.allclose(model.model_values[-2:],
+                                    [1.876732, 1.874999]))
+        self.assertEqual(model.misfit_value, 0.9999997)
+
+    def test_build_model(self):
+        model = occam2d.Model(iter_fn=self.iter_fn)
+        model.build_model()
+        self.assertTrue(np.all(model.res_model == _loop_res_model(
+            model.model_values, model.model_rows, model.model_columns,
+            model.res_model.shape)))
+        self.assertEqual(model.plot_z[-1], 0)
+        self.assertTrue(np.all(np.diff(model.plot_x) > 0))
+        self.assertEqual(model.mesh_x.shape, model.res_model.shape)
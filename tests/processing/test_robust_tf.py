@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Test mtpy.processing.robust_tf on synthetic time series made from a known
+impedance and tipper.
+"""
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.processing.robust_tf as robust_tf
+
+
+def _z_function(freq):
+    # 2D response, 100 Ohm-m along strike and 10 Ohm-m across, Z in mV/km/nT
+    z = np.zeros((freq.size, 2, 2), dtype=complex)
+    z_te = np.sqrt(5 * freq * 100) * np.exp(1j * np.pi / 4)
+    z_tm = np.sqrt(5 * freq * 10) * np.exp(1j * np.pi / 3)
+    z[:, 0, 1] = z_te
+    z[:, 1, 0] = -z_tm
+    z[:, 0, 0] = 0.1 * z_te
+    return z
+
+
+def _tipper_function(freq):
+    t = np.zeros((freq.size, 1, 2), dtype=complex)
+    t[:, 0, 0] = 0.2 + 0.05j
+    t[:, 0, 1] = -0.1 + 0.1j
+    return t
+
+
+class TestRobustTF(TestCase):
+    def setUp(self):
+        self.ts_dict = robust_tf.synthetic_time_series(2 ** 16, 256.,
+                                                       _z_function,
+                                                       _tipper_function,
+                                                       noise=0.05,
+                                                       seed=0)
+
+    def _check(self, z_obj, t_obj, rtol=0.05):
+        self.assertTrue(z_obj.freq.size > 5)
+        self.assertTrue(np.all(np.diff(z_obj.freq) < 0))
+        z_true = _z_function(z_obj.freq)
+        # misfit of every element relative to the size of the tensor
+        misfit = np.abs(z_obj.z - z_true) / \
+            np.abs(z_true[:, 0, 1])[:, np.newaxis, np.newaxis]
+        self.assertTrue(np.all(misfit < rtol))
+        self.assertTrue(np.all(z_obj.z_err[:, 0:2, 0:2] > 0))
+        self.assertTrue(np.allclose(t_obj.tipper, _tipper_function(t_obj.freq),
+                                    atol=rtol * 0.2))
+
+    def test_estimate(self):
+        tf_obj = robust_tf.RobustTF(window_length=512)
+        z_obj, t_obj = tf_obj.estimate(**self.ts_dict)
+        self._check(z_obj, t_obj)
+
+    def test_estimate_remote_reference(self):
+        # remote reference is the local field plus uncorrelated noise
+        rng = np.random.RandomState(1)
+        self.ts_dict['rrhx'] = self.ts_dict['hx'] + 0.3 * rng.randn(2 ** 16)
+        self.ts_dict['rrhy'] = self.ts_dict['hy'] + 0.3 * rng.randn(2 ** 16)
+        # noisy local magnetics bias a single station estimate low
+        self.ts_dict['hx'] = self.ts_dict['hx'] + 0.3 * rng.randn(2 ** 16)
+        self.ts_dict['hy'] = self.ts_dict['hy'] + 0.3 * rng.randn(2 ** 16)
+
+        tf_obj = robust_tf.RobustTF(window_length=512)
+        z_rr, t_rr = tf_obj.estimate(**self.ts_dict)
+        self._check(z_rr, t_rr, rtol=0.1)
+
+        self.ts_dict.pop('rrhx')
+        self.ts_dict.pop('rrhy')
+        z_ss, t_ss = tf_obj.estimate(**self.ts_dict)
+        z_true = _z_function(z_ss.freq)
+        self.assertTrue(np.median(np.abs(z_ss.z[:, 0, 1]) /
+                                  np.abs(z_true[:, 0, 1])) < 0.95)
+
+    def test_robust_to_outliers(self):
+        # a burst of noise on ex, least squares is off by up to 30 %
+        rng = np.random.RandomState(2)
+        self.ts_dict['ex'][10000:16000] += 10 * self.ts_dict['ex'].std() * \
+            rng.randn(6000)
+        tf_obj = robust_tf.RobustTF(window_length=512)
+        z_obj, t_obj = tf_obj.estimate(**self.ts_dict)
+        z_true = _z_function(z_obj.freq)
+        self.assertTrue(np.allclose(z_obj.z[:, 0, 1], z_true[:, 0, 1],
+                                    rtol=0.05, atol=0))
+
+    def test_estimate_survey(self):
+        station_dict = {'mt01': self.ts_dict,
+                        'mt02': robust_tf.synthetic_time_series(2 ** 15, 256.,
+                                                                _z_function,
+                                                                seed=3)}
+        serial = robust_tf.estimate_survey(station_dict, window_length=512)
+        parallel = robust_tf.estimate_survey(station_dict, n_processes=2,
+                                             window_length=512)
+        for station in station_dict:
+            self.assertTrue(np.allclose(serial[station][0].z,
+                                        parallel[station][0].z))
+        self.assertIsNone(serial['mt02'][1])
+        self._check(*serial['mt01'])
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+TEST reading Zonge cache files with a memory mapped time series
+"""
+import os
+import struct
+from unittest import TestCase
+
+import numpy as np
+
+import mtpy.usgs.zonge_cache as zc
+from tests import make_temp_dir
+
+
+class Test_ZenCache(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.ts = np.random.RandomState(0).randint(
+            -2**20, 2**20, size=(1000, 4)).astype(np.int32)
+
+        zen_cache = zc.ZenCache()
+        zen_cache.verbose = False
+        zen_cache.save_fn = os.path.join(cls._temp_dir, 'test.cac')
+        zen_cache.meta_data = {'TS.NPNT': ['1000'],
+                               'TS.ADFREQ': ['256'],
+                               'CH.CMP': ['EX', 'EY', 'HX', 'HY']}
+        zen_cache.ts = cls.ts
+        zen_cache.rewrite_cache_file()
+        cls.cache_fn = zen_cache.save_fn_rw
+
+    def test_read_cache_metadata(self):
+        zen_cache = zc.ZenCache()
+        zen_cache.read_cache_metadata(self.cache_fn)
+        self.assertEqual(zen_cache.meta_data['CH.CMP'], ['EX', 'EY', 'HX', 'HY'])
+        self.assertEqual(zen_cache.meta_data['TS.NPNT'], ['1000'])
+        self.assertEqual(zen_cache.nav_data.size, zen_cache._nav_len - 2)
+
+    def test_read_cache(self):
+        zen_cache = zc.ZenCache()
+        zen_cache.read_cache(self.cache_fn)
+        self.assertIsInstance(zen_cache.ts, np.memmap)
+        self.assertTrue(np.all(zen_cache.ts == self.ts))
+        self.assertTrue(zen_cache.cal_data.startswith('HEADER.TYPE,Calibrate'))
+
+        hy = zen_cache.get_channel_ts('hy', 10, 20)
+        self.assertTrue(np.all(hy == self.ts[10:20, 3]))
+        # a view into the file, not a copy
+        self.assertFalse(hy.flags['OWNDATA'])
+        with self.assertRaises(zc.CacheTimeSeriesError):
+            zen_cache.get_channel_ts('hz')
+
+    def test_rewrite(self):
+        zen_cache = zc.ZenCache()
+        zen_cache.verbose = False
+        zen_cache.read_cache(self.cache_fn)
+        zen_cache.rewrite_cache_file()
+        with open(self.cache_fn, 'rb') as fid:
+            old_bytes = fid.read()
+        with open(zen_cache.save_fn_rw, 'rb') as fid:
+            self.assertEqual(fid.read(), old_bytes)
+
+    def test_bad_block_length(self):
+        with open(self.cache_fn, 'rb') as fid:
+            cache_bytes = bytearray(fid.read())
+        # break the length at the end of the time series block
+        cache_bytes[-4:] = struct.pack('<i', 10)
+        bad_fn = os.path.join(self._temp_dir, 'bad.cac')
+        with open(bad_fn, 'wb') as fid:
+            fid.write(cache_bytes)
+
+        zen_cache = zc.ZenCache()
+        zen_cache.verbose = False
+        with self.assertRaises(zc.CacheTimeSeriesError):
+            zen_cache.read_cache(bad_fn)
+
+        # file cut off in the meta data block
+        short_fn = os.path.join(self._temp_dir, 'short.cac')
+        with open(short_fn, 'wb') as fid:
+            fid.write(cache_bytes[:70])
+        with self.assertRaises(zc.CacheMetaDataError):
+            zen_cache.read_cache_metadata(short_fn)
@@ -3,7 +3,8 @@ import numpy as np
 import pytest
 
 from mtpy.utils.calculator import get_period_list, make_log_increasing_array,\
-                                  z_error2r_phi_error, nearest_index
+                                  z_error2r_phi_error, nearest_index,\
+                                  interpolate_rows
 
 
 class TestCalculator(TestCase):
@@ -107,3 +108,37 @@ class TestCalculator(TestCase):
         
         self.assertTrue(np.all(np.abs(res_rel_err-res_rel_err_test[0,0,1])/res_rel_err_test[0,0,1] < 1e-8))
         self.assertTrue(np.all(np.abs(phase_err-phase_err_test[0,0,1])/phase_err_test[0,0,1] < 1e-8))        
+
+
+    def test_interpolate_rows(self):
+        x = np.array([[3., 1., 2., np.nan],
+                      [10., 20., 30., 40.],
+                      [1., 5., np.nan, np.nan]])
+        y = np.array([[30., 10., 20., 0.],
+                      [1., np.nan, 3., 4.],
+                      [2., 10., 5., 5.]])
+        new_x = np.array([0., 1., 1.5, 3., 5., 25., 40., 45.])
+
+        def interp_row(row, row_x):
+            valid = ~np.isnan(x[row]) & ~np.isnan(y[row])
+            order = np.argsort(x[row][valid])
+            xp, fp = x[row][valid][order], y[row][valid][order]
+            new_y = np.interp(row_x, xp, fp)
+            new_y[(row_x < xp[0]) | (row_x > xp[-1]) | np.isnan(row_x)] = np.nan
+            return new_y
+
+        new_y = interpolate_rows(x, y, new_x)
+        self.assertEqual(new_y.shape, (3, new_x.size))
+        for row in range(3):
+            self.assertTrue(np.allclose(new_y[row], interp_row(row, new_x),
+                                        equal_nan=True))
+
+        # each row onto its own values, nan where there is nothing to do
+        row_new_x = np.array([[1., 2.5, np.nan],
+                              [15., 40., 35.],
+                              [4., 0., 1.]])
+        new_y = interpolate_rows(x, y, row_new_x)
+        for row in range(3):
+            self.assertTrue(np.allclose(new_y[row],
+                                        interp_row(row, row_new_x[row]),
+                                        equal_nan=True))
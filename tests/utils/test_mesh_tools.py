@@ -0,0 +1,76 @@
+from unittest import TestCase
+import numpy as np
+
+from mtpy.utils.mesh_tools import get_station_buffer, get_grid_index, \
+                                  get_station_grid_index, get_first_earth_index
+
+
+class TestMeshTools(TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        # irregular grid with padding cells
+        core = np.arange(-20e3, 20e3 + 1, 500.)
+        pad = np.cumsum(500 * 1.5 ** np.arange(1, 8))
+        self.grid_east = np.hstack([-20e3 - pad[::-1], core, 20e3 + pad])
+        self.grid_north = self.grid_east[::2] * 1.3
+        self.station_east = np.random.uniform(-15e3, 15e3, 50)
+        self.station_north = np.random.uniform(-15e3, 15e3, 50)
+
+    def test_get_station_buffer(self):
+        buf = 3e3
+        # reference: one meshgrid per station
+        xgrid, ygrid = np.meshgrid(self.grid_east, self.grid_north)
+        expected = np.zeros(xgrid.shape, dtype=bool)
+        for xs, ys in zip(self.station_east, self.station_north):
+            expected |= ((xs - xgrid)**2 + (ys - ygrid)**2)**0.5 < buf
+
+        where = get_station_buffer(self.grid_east, self.grid_north,
+                                   self.station_east, self.station_north,
+                                   buf=buf)
+        self.assertEqual(where.shape, expected.shape)
+        self.assertTrue(np.all(where == expected))
+
+    def test_get_station_buffer_on_grid(self):
+        # stations exactly one buffer away from a cell are outside
+        where = get_station_buffer(np.array([0., 1000., 2000.]),
+                                   np.array([0.]),
+                                   [0.], [0.], buf=1000.)
+        self.assertTrue(np.all(where == np.array([[True, False, False]])))
+
+    def test_get_station_grid_index(self):
+        ix, iy = get_station_grid_index(self.grid_east, self.grid_north,
+                                        self.station_east, self.station_north)
+        for ss, (sx, sy) in enumerate(zip(self.station_east,
+                                          self.station_north)):
+            sxi = np.where((sx <= self.grid_east[1:]) &
+                           (sx > self.grid_east[:-1]))[0][0]
+            syi = np.where((sy <= self.grid_north[1:]) &
+                           (sy > self.grid_north[:-1]))[0][0]
+            self.assertEqual((ix[ss], iy[ss]), (sxi, syi))
+
+    def test_get_grid_index_on_grid_lines(self):
+        grid = np.array([0., 10., 20., 30.])
+        values = np.array([10., 15., 30.])
+        self.assertTrue(np.all(get_grid_index(grid, values, 'left') ==
+                               [0, 1, 2]))
+        self.assertTrue(np.all(get_grid_index(grid, values, 'right') ==
+                               [1, 1, 3]))
+        # equally close to 10 and 20 gives the lower one
+        self.assertTrue(np.all(get_grid_index(grid, values, 'nearest') ==
+                               [1, 1, 3]))
+
+    def test_get_grid_index_nearest(self):
+        centres = np.mean([self.grid_east[1:], self.grid_east[:-1]], axis=0)
+        values = np.hstack([self.station_east, [-1e7, 1e7]])
+        index = get_grid_index(centres, values, method='nearest')
+        for value, ii in zip(values, index):
+            dist = np.abs(centres - value)
+            self.assertEqual(ii, np.where(dist == np.amin(dist))[0][0])
+
+    def test_get_first_earth_index(self):
+        res_model = np.ones((3, 4, 6)) * 100.
+        res_model[0, 1, :3] = 1e12
+        res_model[2, 3, :5] = 1e12
+        index_z = get_first_earth_index(res_model, np.array([1, 3, 0]),
+                                        np.array([0, 2, 1]))
+        self.assertTrue(np.all(index_z == [3, 5, 0]))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+TEST the timers and the run timings of mtpy_decorator
+"""
+import glob
+import json
+import os
+from unittest import TestCase
+
+from mtpy.core.edi import Edi
+from mtpy.utils.mtpy_decorator import RunTimings, run_timings, timed
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+class TestTimed(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+
+    def test_decorator(self):
+        timings = RunTimings()
+
+        @timed(timings=timings)
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(add(1, b=2), 3)
+        self.assertEqual(add(3, 4), 7)
+        summary = timings.get_summary()['timings']
+        name = '{}.{}'.format(__name__, add.__qualname__)
+        self.assertEqual(list(summary.keys()), [name])
+        self.assertEqual(summary[name]['count'], 2)
+        self.assertGreaterEqual(summary[name]['max'], summary[name]['min'])
+        self.assertAlmostEqual(summary[name]['mean'],
+                               summary[name]['total'] / 2)
+
+        with self.assertRaises(TypeError):
+            timed(add)
+
+    def test_context_manager(self):
+        timings = RunTimings()
+        for n in [3, 4]:
+            with timed('block', timings=timings) as timer:
+                timer.count('n_samples', n)
+            self.assertGreaterEqual(timer.elapsed, 0)
+
+        # the timing is kept when the block raises an error
+        with self.assertRaises(ValueError):
+            with timed('error', timings=timings):
+                raise ValueError()
+
+        timer = timed('start_stop', timings=timings).start()
+        self.assertEqual(timer.stop(n_samples=5), timer.elapsed)
+
+        summary = timings.get_summary()['timings']
+        self.assertEqual(summary['block']['count'], 2)
+        self.assertEqual(summary['block']['counters'], {'n_samples': 7})
+        self.assertEqual(summary['error']['count'], 1)
+        self.assertEqual(summary['start_stop']['counters'], {'n_samples': 5})
+
+        # there is no function to name the timing after
+        with self.assertRaises(ValueError):
+            with timed(timings=timings):
+                pass
+        self.assertNotIn(None, timings.get_summary()['timings'])
+
+        timings.reset()
+        self.assertEqual(timings.get_summary()['timings'], {})
+
+    def test_run_timings(self):
+        run_timings.reset()
+        edi_fn = sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[0]
+        Edi(edi_fn)
+
+        json_fn = os.path.join(self._temp_dir, 'timings.json')
+        run_timings.to_json(json_fn)
+        with open(json_fn) as fid:
+            summary = json.load(fid)
+        self.assertEqual(
+            summary['timings']['mtpy.core.edi.Edi.read_edi_file']['count'], 1)
+        self.assertGreater(
+            summary['timings']['mtpy.core.z.ResPhase.compute_resistivity_phase']['count'],
+            0)
+        self.assertGreaterEqual(summary['elapsed'], 0)
@@ -0,0 +1,90 @@
+import glob
+import os
+import unittest
+
+import fiona
+import numpy as np
+
+import mtpy.imaging.mtplottools as mtplottools
+from mtpy.utils.shapefiles_creator import ShapefilesCreator, \
+    get_ellipse_size, get_tipper_vertices
+from tests import EDI_DATA_DIR, make_temp_dir
+
+
+class TestShapefilesCreator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._temp_dir = make_temp_dir(cls.__name__)
+        cls.sfc = ShapefilesCreator(
+            sorted(glob.glob(os.path.join(EDI_DATA_DIR, '*.edi')))[:8],
+            cls._temp_dir)
+        cls.period_list = [0.01, 1., 100.]
+
+    def test_ellipse_vertices(self):
+        # one ellipse at a time as the original loop
+        x0 = np.array([140., 141.])
+        y0 = np.array([-20., -21.])
+        azimuth = np.array([30., -75.])
+        width, height = get_ellipse_size(np.array([20., 0.]),
+                                         np.array([40., 50.]), 0.1)
+        self.assertTrue(np.allclose(width, [0.1, 1e-8]))
+        self.assertTrue(np.allclose(height, [0.05, 1e-8]))
+
+        # as converted for the shapefiles, 60 points from the azimuth
+        vertices = mtplottools.get_ellipse_vertices(
+            x0, y0, 2 * height, 2 * width, -azimuth, n_points=60)
+        theta = np.arange(0, 2 * np.pi, np.pi / 30.)
+        for ii in range(2):
+            az = -np.deg2rad(azimuth[ii])
+            x = x0[ii] + height[ii] * np.cos(theta) * np.cos(az) - \
+                width[ii] * np.sin(theta) * np.sin(az)
+            y = y0[ii] + height[ii] * np.cos(theta) * np.sin(az) + \
+                width[ii] * np.sin(theta) * np.cos(az)
+            self.assertTrue(np.allclose(vertices[ii], np.array([x, y]).T))
+
+    def test_tipper_vertices(self):
+        vertices = get_tipper_vertices(np.array([140.]), np.array([-20.]),
+                                       np.array([.5]), np.array([90.]), 0.1)
+        self.assertTrue(np.allclose(vertices[0], [[140., -20.],
+                                                  [140., -20.05]]))
+
+    def test_layers(self):
+        layers = self.sfc.get_phase_tensor_tipper_layers(self.period_list,
+                                                         target_epsg_code=4326)
+        for period in self.period_list:
+            pt_gpdf = self.sfc.create_phase_tensor_shp(period,
+                                                       target_epsg_code=4326)[0]
+            tip_gpdf = self.sfc.create_tipper_real_shp(period,
+                                                       target_epsg_code=4326)[0]
+            pt_layer = layers['Phase_Tensor'][
+                np.isclose(layers['Phase_Tensor']['period'], period)]
+            tip_layer = layers['Tipper_Real'][
+                np.isclose(layers['Tipper_Real']['period'], period)]
+            self.assertEqual(list(pt_layer['station']),
+                             list(pt_gpdf['station']))
+            for geom, expected in zip(pt_layer.geometry, pt_gpdf.geometry):
+                self.assertTrue(np.allclose(geom.exterior.coords,
+                                            expected.exterior.coords))
+            for geom, expected in zip(tip_layer.geometry, tip_gpdf.geometry):
+                self.assertTrue(np.allclose(geom.coords, expected.coords))
+
+    def test_write_layers(self):
+        layers, path_list = self.sfc.create_phase_tensor_tipper_layers(
+            self.period_list, target_epsg_code=4326)
+        self.assertEqual(len(path_list), 1)
+        self.assertEqual(sorted(fiona.listlayers(path_list[0])),
+                         ['Phase_Tensor', 'Tipper_Imag', 'Tipper_Real'])
+
+        layers, path_list = self.sfc.create_phase_tensor_tipper_layers(
+            self.period_list, target_epsg_code=4326, driver='ESRI Shapefile')
+        self.assertEqual(len(path_list), 3)
+        for path in path_list:
+            self.assertTrue(os.path.isfile(path))
+
+        with self.assertRaises(ValueError):
+            self.sfc.create_phase_tensor_tipper_layers(self.period_list,
+                                                       driver='KML')
+
+
+if __name__ == '__main__':
+    unittest.main()